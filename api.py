@@ -0,0 +1,620 @@
+"""
+Mental Math Training API
+Headless HTTP entry point for non-Streamlit clients (mobile, kiosk)
+
+A plain ASGI application: no web framework, just ``SessionManager``,
+``SessionFinalizer``, ``PerformanceTracker`` and ``DatabaseManager``
+behind a small router. Each request is handled on the event loop, and its
+blocking database and generation work runs in the default thread pool
+(``asyncio.to_thread``). Running sessions live in a ``SessionStore``,
+keyed by session ID, with the same eviction and spill rules as the
+Streamlit page.
+
+Clients validate answers themselves (``frontend/validator.js`` against the
+question payloads' ``rule``) and post their results. Verdicts are audited
+at finalize exactly as for the practice_loop component, and badges are
+awarded as on the results page; the completing post returns the summary
+with the badges earned and the progress towards the rest. A completing
+post whose save fails leaves the session running, so it can be retried.
+
+Endpoints (JSON in, JSON out):
+
+    GET    /health
+    POST   /sessions                    start; body is a SessionConfig,
+                                        plus optional "batch" (questions)
+    GET    /sessions/{id}               progress of a running session
+    POST   /sessions/{id}/questions     next batch; body {"count": int}
+    POST   /sessions/{id}/results       body {"results": [...],
+                                        "results_from": int,
+                                        "completed": bool}
+    DELETE /sessions/{id}               abandon without saving
+    GET    /analytics/overview          ?days=
+    GET    /analytics/categories
+    GET    /analytics/trend             ?days=
+    GET    /analytics/sessions          ?limit=&days=
+    GET    /analytics/weak-areas        ?threshold=
+
+Run with any ASGI server, e.g. ``uvicorn api:app``. ``InProcessClient``
+drives the app without a server (for tests and scripts).
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode
+
+import pandas as pd
+
+from src.analytics.performance_tracker import PerformanceTracker
+from src.database.db_manager import DatabaseManager
+from src.game_logic import validation_spec
+from src.game_logic.finalize import SessionFinalizer, question_payloads
+from src.game_logic.session_manager import SessionManager
+from src.game_logic.session_store import SessionStore, StoredSession
+from src.gamification.badge_manager import BadgeManager
+from src.models.session import SessionConfig, SessionSummary
+from src.models.user_stats import Badge
+
+MODES = ("sprint", "marathon", "targeted")
+DIFFICULTIES = ("easy", "medium", "hard", "adaptive")
+DEFAULT_BATCH = 10
+MAX_BATCH = 100
+# Questions a counted session may be served beyond its question_count
+# (skips and refills in flight), as on the practice page.
+EXTRA_QUESTIONS = 5
+
+
+class HTTPError(Exception):
+    """Raised by handlers to produce an error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    params: Dict[str, str] = field(default_factory=dict)
+
+    def json(self) -> Dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body)
+        except (UnicodeDecodeError, ValueError):
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+
+    def query_int(self, name: str, default: Optional[int]) -> Optional[int]:
+        raw = self.query.get(name)
+        if raw is None or raw == "":
+            return default
+        try:
+            return int(raw)
+        except ValueError:
+            raise HTTPError(400, f"Query parameter '{name}' must be an integer")
+
+    def query_float(self, name: str, default: float) -> float:
+        raw = self.query.get(name)
+        if raw is None or raw == "":
+            return default
+        try:
+            return float(raw)
+        except ValueError:
+            raise HTTPError(400, f"Query parameter '{name}' must be a number")
+
+
+Handler = Callable[[Request], Awaitable[Tuple[int, Any]]]
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame rows as JSON-safe dicts (NaN becomes null, dates ISO)."""
+    if df is None or df.empty:
+        return []
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _badge_payload(badge: Badge) -> Dict[str, Any]:
+    return {
+        "badge_name": badge.badge_name,
+        "description": badge.description,
+        "category": badge.category,
+        "icon": badge.icon,
+    }
+
+
+def _summary_payload(summary: SessionSummary) -> Dict[str, Any]:
+    total = summary.total_questions
+    badges = summary.badges
+    return {
+        "session_id": summary.session_id,
+        "mode_type": summary.config.mode_type,
+        "category": summary.config.category,
+        "difficulty": summary.config.difficulty,
+        "total_questions": total,
+        "correct_answers": summary.correct_answers,
+        "accuracy": summary.correct_answers / total * 100 if total else 0.0,
+        "total_score": summary.total_score,
+        "avg_time_per_question": summary.avg_time_per_question,
+        "duration_seconds": summary.duration_seconds,
+        "timestamp": summary.timestamp.isoformat(),
+        "results": [
+            {
+                "question_text": r.question.question_text,
+                "correct_answer": r.question.correct_answer,
+                "user_answer": r.user_answer,
+                "is_correct": r.is_correct,
+                "was_skipped": r.was_skipped,
+                "time_taken": r.time_taken,
+            }
+            for r in summary.results
+        ],
+        "badges_earned": [_badge_payload(b) for b in badges.earned] if badges else [],
+        "badge_progress": {
+            name: {key: entry[key] for key in ("progress", "target", "description")}
+            for name, entry in badges.progress.items()
+        } if badges else {},
+    }
+
+
+class MentalMathAPI:
+    """ASGI application exposing practice sessions and analytics."""
+
+    def __init__(
+        self,
+        db_manager: Optional[DatabaseManager] = None,
+        *,
+        db_path: str = "data/mentalmath.db",
+        store: Optional[SessionStore] = None,
+        audit_rate: Optional[float] = None,
+    ):
+        """Create the app. Nothing touches the database until first use.
+
+        Args:
+            db_manager: Database to serve; defaults to one at ``db_path``
+            db_path: Used when ``db_manager`` is not given
+            store: Running-session store; defaults to a fresh one spilling
+                next to the database
+            audit_rate: Share of client verdicts re-checked at finalize
+                (see ``SessionFinalizer``)
+        """
+        self._db = db_manager
+        self.db_path = db_manager.db_path if db_manager is not None else db_path
+        self._store = store
+        self.audit_rate = audit_rate
+        self._sm: Optional[SessionManager] = None
+        self._init_lock = threading.Lock()
+        # One lock per running session: requests for the same session are
+        # serialized, different sessions run in parallel.
+        self._session_locks: Dict[str, threading.Lock] = {}
+        self._routes: List[Tuple[str, re.Pattern, Handler]] = [
+            ("GET", re.compile(r"^/health$"), self.health),
+            ("POST", re.compile(r"^/sessions$"), self.start_session),
+            ("GET", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)$"), self.session_status),
+            ("POST", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/questions$"), self.next_questions),
+            ("POST", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)/results$"), self.submit_results),
+            ("DELETE", re.compile(r"^/sessions/(?P<session_id>[0-9a-f]+)$"), self.abandon_session),
+            ("GET", re.compile(r"^/analytics/overview$"), self.analytics_overview),
+            ("GET", re.compile(r"^/analytics/categories$"), self.analytics_categories),
+            ("GET", re.compile(r"^/analytics/trend$"), self.analytics_trend),
+            ("GET", re.compile(r"^/analytics/sessions$"), self.analytics_sessions),
+            ("GET", re.compile(r"^/analytics/weak-areas$"), self.analytics_weak_areas),
+        ]
+
+    # ------------------------------------------------------------------
+    # Lazily built dependencies
+    # ------------------------------------------------------------------
+
+    def _ensure_ready(self):
+        with self._init_lock:
+            if self._db is None:
+                self._db = DatabaseManager(self.db_path)
+            if self._sm is None:
+                self._sm = SessionManager(self._db)
+            if self._store is None:
+                self._store = SessionStore(spill_dir=Path(self.db_path).parent / "session_spill")
+
+    @property
+    def db(self) -> DatabaseManager:
+        self._ensure_ready()
+        return self._db
+
+    @property
+    def sm(self) -> SessionManager:
+        self._ensure_ready()
+        return self._sm
+
+    @property
+    def store(self) -> SessionStore:
+        self._ensure_ready()
+        return self._store
+
+    def _lock_for(self, session_id: str) -> threading.Lock:
+        with self._init_lock:
+            return self._session_locks.setdefault(session_id, threading.Lock())
+
+    def _entry(self, session_id: str) -> StoredSession:
+        entry = self.store.get(session_id)
+        if entry is None:
+            with self._init_lock:
+                self._session_locks.pop(session_id, None)
+            raise HTTPError(404, "Unknown or expired session")
+        return entry
+
+    # ------------------------------------------------------------------
+    # ASGI plumbing
+    # ------------------------------------------------------------------
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        query = {
+            key: values[-1]
+            for key, values in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()
+        }
+        request = Request(method=scope["method"].upper(), path=scope["path"], query=query, body=body)
+        try:
+            status, payload = await self._dispatch(request)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            print(f"Error handling {request.method} {request.path}: {e}")
+            status, payload = 500, {"error": "Internal server error"}
+        await self._respond(send, status, payload)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await asyncio.to_thread(self._ensure_ready)
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, request: Request) -> Tuple[int, Any]:
+        allowed = []
+        for method, pattern, handler in self._routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            request.params = match.groupdict()
+            return await handler(request)
+        if allowed:
+            raise HTTPError(405, f"Method not allowed; use {', '.join(allowed)}")
+        raise HTTPError(404, "Not found")
+
+    @staticmethod
+    async def _respond(send, status: int, payload: Any):
+        body = json.dumps(payload).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    async def health(self, request: Request) -> Tuple[int, Any]:
+        sessions = await asyncio.to_thread(lambda: len(self.store))
+        return 200, {"status": "ok", "sessions": sessions}
+
+    async def start_session(self, request: Request) -> Tuple[int, Any]:
+        payload = request.json()
+        config = await asyncio.to_thread(self._parse_config, payload)
+        batch = self._batch_size(payload.get("batch", DEFAULT_BATCH))
+        return 201, await asyncio.to_thread(self._start_session, config, batch)
+
+    def _parse_config(self, payload: Dict[str, Any]) -> SessionConfig:
+        mode = payload.get("mode_type")
+        if mode not in MODES:
+            raise HTTPError(400, f"mode_type must be one of {', '.join(MODES)}")
+        difficulty = payload.get("difficulty", "adaptive")
+        if difficulty not in DIFFICULTIES:
+            raise HTTPError(400, f"difficulty must be one of {', '.join(DIFFICULTIES)}")
+        category = payload.get("category", "mixed")
+        if category != "targeted" and category not in self.sm.category_generators and category not in self.sm.generators:
+            raise HTTPError(400, f"Unknown category '{category}'")
+        try:
+            duration = int(payload["duration_seconds"]) if payload.get("duration_seconds") is not None else None
+            count = int(payload["question_count"]) if payload.get("question_count") is not None else None
+        except (TypeError, ValueError):
+            raise HTTPError(400, "duration_seconds and question_count must be integers")
+        if mode == "sprint" and not (duration and duration > 0):
+            raise HTTPError(400, "Sprint sessions need a positive duration_seconds")
+        if mode != "sprint":
+            count = count or 25
+            if count <= 0:
+                raise HTTPError(400, "question_count must be positive")
+        return SessionConfig(
+            mode_type=mode,
+            category=category,
+            difficulty=difficulty,
+            duration_seconds=duration,
+            question_count=count,
+        )
+
+    @staticmethod
+    def _batch_size(raw: Any) -> int:
+        try:
+            count = int(raw)
+        except (TypeError, ValueError):
+            raise HTTPError(400, "count must be an integer")
+        if not 0 <= count <= MAX_BATCH:
+            raise HTTPError(400, f"count must be between 0 and {MAX_BATCH}")
+        return count
+
+    @staticmethod
+    def _question_limit(config: SessionConfig) -> Optional[int]:
+        if config.mode_type == "sprint":
+            return None
+        return int(config.question_count or 25) + EXTRA_QUESTIONS
+
+    def _serve(self, entry: StoredSession, count: int) -> List[Dict[str, Any]]:
+        """Generate up to ``count`` more questions for the session."""
+        limit = self._question_limit(entry.state.config)
+        if limit is not None:
+            count = min(count, max(limit - len(entry.questions), 0))
+        start = len(entry.questions)
+        for _ in range(count):
+            if entry.questions:
+                entry.questions.append(self.sm.get_next_question(entry.state))
+            else:
+                entry.questions.append(entry.state.current_question)
+        return question_payloads(entry.questions[start:], start)
+
+    def _status(self, session_id: str, entry: StoredSession) -> Dict[str, Any]:
+        limit = self._question_limit(entry.state.config)
+        return {
+            "session_id": session_id,
+            "config": {
+                "mode_type": entry.state.config.mode_type,
+                "category": entry.state.config.category,
+                "difficulty": entry.state.config.difficulty,
+                "duration_seconds": entry.state.config.duration_seconds,
+                "question_count": entry.state.config.question_count,
+            },
+            "started_at": entry.state.start_time.isoformat(),
+            "questions_served": len(entry.questions),
+            "journaled": entry.journaled,
+            "has_more": limit is None or len(entry.questions) < limit,
+        }
+
+    def _start_session(self, config: SessionConfig, batch: int) -> Dict[str, Any]:
+        state = self.sm.start_session(config)
+        session_id = state.journal_key
+        entry = StoredSession(state=state, component_key=session_id)
+        questions = self._serve(entry, batch)
+        self.store.put(session_id, entry)
+        return {
+            **self._status(session_id, entry),
+            "questions": questions,
+            "validation_spec": validation_spec.SPEC,
+        }
+
+    async def session_status(self, request: Request) -> Tuple[int, Any]:
+        session_id = request.params["session_id"]
+
+        def work():
+            with self._lock_for(session_id):
+                return self._status(session_id, self._entry(session_id))
+
+        return 200, await asyncio.to_thread(work)
+
+    async def next_questions(self, request: Request) -> Tuple[int, Any]:
+        session_id = request.params["session_id"]
+        count = self._batch_size(request.json().get("count", DEFAULT_BATCH))
+
+        def work():
+            with self._lock_for(session_id):
+                entry = self._entry(session_id)
+                questions = self._serve(entry, count)
+                self.store.put(session_id, entry)
+                return {**self._status(session_id, entry), "questions": questions}
+
+        return 200, await asyncio.to_thread(work)
+
+    async def submit_results(self, request: Request) -> Tuple[int, Any]:
+        session_id = request.params["session_id"]
+        payload = request.json()
+        results = payload.get("results") or []
+        if not isinstance(results, list) or not all(isinstance(r, dict) for r in results):
+            raise HTTPError(400, "results must be a list of objects")
+        try:
+            results_from = int(payload.get("results_from") or 0)
+        except (TypeError, ValueError):
+            raise HTTPError(400, "results_from must be an integer")
+        completed = bool(payload.get("completed"))
+
+        def work():
+            with self._lock_for(session_id):
+                entry = self._entry(session_id)
+                finalizer = SessionFinalizer(self.sm, audit_rate=self.audit_rate)
+                if not completed:
+                    if results:
+                        entry.journaled = finalizer.checkpoint(entry.state, entry.questions, results, results_from)
+                        self.store.put(session_id, entry)
+                    return {**self._status(session_id, entry), "completed": False}
+                if results_from:
+                    raise HTTPError(400, "A completing post must carry every result (results_from 0)")
+
+                # Finalize a copy and drop the stored session only once it is
+                # saved: if the save fails (e.g. a locked database), the
+                # client can post again and the journal stays live.
+                state = copy.deepcopy(entry.state)
+                report = finalizer.replay(state, entry.questions, results)
+                summary = self.sm.end_session(state)
+                self.store.pop(session_id)
+                with self._init_lock:
+                    self._session_locks.pop(session_id, None)
+                BadgeManager(self.db).evaluate_session(summary)
+                return {
+                    "completed": True,
+                    "summary": _summary_payload(summary),
+                    "finalize": {
+                        "mode": report.mode,
+                        "answers": report.answers,
+                        "validated": report.validated,
+                        "escalation": report.escalation,
+                        "mismatches": len(report.mismatches),
+                    },
+                }
+
+        return 200, await asyncio.to_thread(work)
+
+    async def abandon_session(self, request: Request) -> Tuple[int, Any]:
+        session_id = request.params["session_id"]
+
+        def work():
+            with self._lock_for(session_id):
+                entry = self._entry(session_id)
+                self.store.pop(session_id)
+                if entry.state.journal_key is not None:
+                    self.sm.journal.discard(entry.state.journal_key)
+            with self._init_lock:
+                self._session_locks.pop(session_id, None)
+            return {"session_id": session_id, "discarded": True}
+
+        return 200, await asyncio.to_thread(work)
+
+    # ------------------------------------------------------------------
+    # Analytics
+    # ------------------------------------------------------------------
+
+    async def analytics_overview(self, request: Request) -> Tuple[int, Any]:
+        days = request.query_int("days", None)
+        return 200, await asyncio.to_thread(lambda: PerformanceTracker(self.db).get_overall_stats(days=days))
+
+    async def analytics_categories(self, request: Request) -> Tuple[int, Any]:
+        return 200, await asyncio.to_thread(lambda: _records(PerformanceTracker(self.db).get_stats_by_category()))
+
+    async def analytics_trend(self, request: Request) -> Tuple[int, Any]:
+        days = request.query_int("days", 30)
+        return 200, await asyncio.to_thread(lambda: _records(PerformanceTracker(self.db).get_historical_trend(days=days)))
+
+    async def analytics_sessions(self, request: Request) -> Tuple[int, Any]:
+        limit = request.query_int("limit", 10)
+        days = request.query_int("days", None)
+        return 200, await asyncio.to_thread(
+            lambda: _records(PerformanceTracker(self.db).get_recent_sessions(limit=limit, days=days))
+        )
+
+    async def analytics_weak_areas(self, request: Request) -> Tuple[int, Any]:
+        threshold = request.query_float("threshold", 0.75)
+        return 200, await asyncio.to_thread(
+            lambda: {"weak_areas": PerformanceTracker(self.db).identify_weak_areas(threshold=threshold)}
+        )
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes
+    headers: Dict[str, str]
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class InProcessClient:
+    """Calls an ASGI app directly, without a server or sockets."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request_async(
+        self,
+        method: str,
+        path: str,
+        json_body: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Response:
+        body = json.dumps(json_body).encode("utf-8") if json_body is not None else b""
+        query = urlencode(params or {})
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": query.encode("utf-8"),
+            "headers": [(b"content-type", b"application/json")],
+        }
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status = 500
+        headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.update((k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return Response(status=status, body=b"".join(chunks), headers=headers)
+
+    def request(self, method: str, path: str, json_body: Any = None, params: Optional[Dict[str, Any]] = None) -> Response:
+        return asyncio.run(self.request_async(method, path, json_body, params))
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Response:
+        return self.request("GET", path, params=params)
+
+    def post(self, path: str, json_body: Any = None) -> Response:
+        return self.request("POST", path, json_body)
+
+    def delete(self, path: str) -> Response:
+        return self.request("DELETE", path)
+
+
+app = MentalMathAPI()
@@ -3,7 +3,7 @@ Mental Math Training Application
 Main entry point for Streamlit app
 """
 import streamlit as st
-from src.database.db_manager import DatabaseManager
+from src.ui.cache import get_db_manager
 from src.ui.styles import get_custom_css
 from src.ui.pages.home_dashboard import show_home_dashboard
 from src.ui.pages.mode_selection import show_mode_selection
@@ -19,10 +19,11 @@ def initialize_session_state():
         st.session_state.page = 'home'
     
     if 'db_manager' not in st.session_state:
-        st.session_state.db_manager = DatabaseManager()
+        # Shared by every browser session (see src.ui.cache).
+        st.session_state.db_manager = get_db_manager()
     
-    if 'active_session' not in st.session_state:
-        st.session_state.active_session = None
+    if 'practice_session_id' not in st.session_state:
+        st.session_state.practice_session_id = None
     
     if 'session_summary' not in st.session_state:
         st.session_state.session_summary = None
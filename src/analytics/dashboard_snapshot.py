@@ -0,0 +1,434 @@
+"""Single-read dashboard snapshot.
+
+The home and analytics dashboards used to call ``PerformanceTracker``
+methods one after another. Each call opened a connection and rescanned
+``questions_answered``, and the goal, baseline and weekly widgets fetched
+the daily trend again on every call. ``DashboardSnapshot.build`` reads
+everything once, inside one read transaction:
+
+- ``activity``: one scan of ``questions_answered`` grouped by hour of the
+  day and lookback window. The overall stats, daily trends and
+  time-of-day chart are rolled up from it in memory.
+- ``breakdown``: one scan of the attempts grouped by question type and
+  difficulty, for the category, difficulty and weak-area widgets.
+- Session counts and score per lookback window, plus the completed
+  sessions the recent-history lists need.
+- The activity bitmap (practice days) and the user preferences.
+
+Both scans group on few, cheap keys. One scan at the combined grain
+returns thousands of groups and costs more than the tracker's separate
+queries did.
+
+``SnapshotPerformanceTracker`` serves the ``PerformanceTracker`` API from
+a snapshot, so the derived metrics (goal progress, baseline, weekly
+summary, recommendations) run unchanged on top of it. Lookback windows
+the snapshot was not built with fall through to the database.
+
+Snapshots are tagged with the data version they were read at.
+``SnapshotPerformanceTracker.build`` reuses the snapshot for the current
+version, so reruns and tab switches skip the reads entirely until a save
+lands (see ``src.analytics.memo``).
+"""
+
+# pyright: reportGeneralTypeIssues=false, reportMissingTypeStubs=false
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from src.analytics import memo, resample
+from src.analytics.memo import LRUCache
+from src.analytics.performance_tracker import GoalSettings, PerformanceTracker
+from src.analytics.resample import Frequency
+from src.database.db_manager import DatabaseManager
+from src.gamification.activity import ActivityBitmap, load_activity_bitmap
+
+# Lookback windows every snapshot covers: the goal (7), home trend (14),
+# baseline (30) and weekly summary (8 weeks) widgets.
+DEFAULT_WINDOWS = (7, 14, 30, 56)
+
+_DIFFICULTY_ORDER = {"easy": 1, "medium": 2, "hard": 3}
+
+# Snapshots by database, data version, day and build arguments.
+_SNAPSHOTS = LRUCache(maxsize=8)
+
+_TREND_COLUMNS = ["date", "questions", "skipped", "correct", "accuracy", "avg_time", "total_time"]
+
+_ATTEMPT_AGGREGATES = """
+    COUNT(*) as questions,
+    SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct,
+    SUM(time_taken_seconds) as time_sum,
+    COUNT(time_taken_seconds) as timed
+"""
+
+
+def _cutoff(now: datetime, days: int) -> str:
+    return (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _lookback_case(windows: list[int]) -> str:
+    """SQL mapping ``timestamp`` to the smallest window containing it
+    (NULL when older than all of them)."""
+    branches = " ".join(f"WHEN timestamp >= ? THEN {days}" for days in windows)
+    return f"CASE {branches} ELSE NULL END"
+
+
+def _rollup(rows: pd.DataFrame, key: str, columns: list[str]) -> dict[str, np.ndarray]:
+    """Sum ``columns`` per ``key`` (sorted) and add ``accuracy`` (percent of
+    attempts, NaN without any) and ``avg_time`` (NaN without timings).
+
+    The frames rolled up here hold a few hundred rows, so ``np.unique`` and
+    ``bincount`` beat a pandas groupby, whose fixed cost dominated the
+    widgets. Returns plain arrays for one DataFrame constructor per widget.
+    """
+    keys, groups = np.unique(rows[key].to_numpy(), return_inverse=True)
+    out = {key: keys}
+    for column in columns:
+        values = rows[column].to_numpy()
+        sums = np.bincount(groups, weights=values, minlength=len(keys))
+        out[column] = sums if values.dtype.kind == "f" else sums.astype(np.int64)
+    attempts = out["attempts"]
+    timed = out["timed"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["accuracy"] = np.where(attempts > 0, out["correct"] / attempts * 100, np.nan)
+        out["avg_time"] = np.where(timed > 0, out["time_sum"] / timed, np.nan)
+    return out
+
+
+def _split_skips(activity: pd.DataFrame) -> pd.DataFrame:
+    """Turn per-``was_skipped`` rows into questions/skipped/attempts columns,
+    keeping correctness and timing for attempts only."""
+    skipped = activity["was_skipped"] == 1
+    attempted = activity["was_skipped"] == 0
+    return pd.DataFrame({
+        "date": pd.to_datetime(activity["day_hour"].str.slice(0, 10), format="%Y-%m-%d"),
+        "hour": pd.to_numeric(activity["day_hour"].str.slice(11, 13)),
+        "lookback": pd.to_numeric(activity["lookback"]),
+        "questions": activity["questions"],
+        "skipped": activity["questions"].where(skipped, 0),
+        "attempts": activity["questions"].where(attempted, 0),
+        "correct": activity["correct"].where(attempted, 0),
+        "time_sum": activity["time_sum"].where(attempted, 0.0),
+        "timed": activity["timed"].where(attempted, 0),
+    })
+
+
+@dataclass
+class DashboardSnapshot:
+    """Pre-aggregated dashboard data read in one transaction."""
+
+    built_at: datetime
+    data_version: int  # read before the data, so never newer than it
+    cutoffs: dict[int, str]  # window (days) -> timestamp cutoff
+    activity: pd.DataFrame  # per hour and window, see module docstring
+    breakdown: pd.DataFrame  # attempts per question type and difficulty
+    session_totals: pd.DataFrame  # lookback, sessions, score
+    sessions: pd.DataFrame  # completed sessions, newest first
+    recent_limit: int
+    session_days: int  # ``sessions`` holds every completed session this recent
+    active_days: ActivityBitmap = field(default_factory=ActivityBitmap)
+    preferences: dict[str, str] = field(default_factory=dict)
+    # Rollups already computed, by widget and arguments.
+    _memo: dict[tuple, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(
+        cls,
+        db_manager: DatabaseManager,
+        windows: Iterable[int] = (),
+        recent_limit: int = 25,
+        session_days: int = 7,
+    ) -> "DashboardSnapshot":
+        """Read a snapshot.
+
+        Args:
+            db_manager: Database to read
+            windows: Lookback windows (days) needed beyond ``DEFAULT_WINDOWS``
+            recent_limit: Most recent completed sessions to keep
+            session_days: Keep every completed session from this many days
+        """
+        version = db_manager.data_version
+        now = datetime.now()
+        ordered = sorted(set(DEFAULT_WINDOWS) | set(windows) | {session_days})
+        cutoffs = {days: _cutoff(now, days) for days in ordered}
+        cutoff_params = [cutoffs[days] for days in ordered]
+        lookback_sql = _lookback_case(ordered)
+
+        conn = db_manager.get_connection()
+        try:
+            # One read transaction, so every widget sees the same data.
+            conn.execute("BEGIN")
+            activity = pd.read_sql_query(
+                f"""
+                SELECT
+                    strftime('%Y-%m-%d %H', timestamp) as day_hour,
+                    {lookback_sql} as lookback,
+                    was_skipped,
+                    {_ATTEMPT_AGGREGATES}
+                FROM questions_answered
+                GROUP BY 1, 2, 3
+                """,
+                conn,
+                params=cutoff_params,
+            )
+            breakdown = pd.read_sql_query(
+                f"""
+                SELECT
+                    difficulty,
+                    question_type,
+                    {_ATTEMPT_AGGREGATES}
+                FROM questions_answered
+                WHERE was_skipped = 0
+                GROUP BY 1, 2
+                """,
+                conn,
+            )
+            session_totals = pd.read_sql_query(
+                f"""
+                SELECT {lookback_sql} as lookback, COUNT(*) as sessions, SUM(total_score) as score
+                FROM sessions
+                GROUP BY 1
+                """,
+                conn,
+                params=cutoff_params,
+            )
+            sessions = pd.read_sql_query(
+                """
+                SELECT * FROM sessions
+                WHERE completed = 1 AND (
+                    timestamp >= ?
+                    OR id IN (
+                        SELECT id FROM sessions
+                        WHERE completed = 1
+                        ORDER BY timestamp DESC
+                        LIMIT ?
+                    )
+                )
+                ORDER BY timestamp DESC
+                """,
+                conn,
+                params=[cutoffs[session_days], recent_limit],
+            )
+            active_days = load_activity_bitmap(conn.cursor())
+            preferences = {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM user_preferences")}
+            conn.commit()
+        finally:
+            conn.close()
+
+        # NULL (older than every window) becomes NaN, never <= days.
+        session_totals["lookback"] = pd.to_numeric(session_totals["lookback"])
+        breakdown = breakdown.rename(columns={"questions": "attempts"})
+
+        return cls(
+            built_at=now,
+            data_version=version,
+            cutoffs=cutoffs,
+            activity=_split_skips(activity),
+            breakdown=breakdown,
+            session_totals=session_totals,
+            sessions=sessions,
+            recent_limit=recent_limit,
+            session_days=session_days,
+            active_days=active_days,
+            preferences=preferences,
+        )
+
+    @classmethod
+    def current(
+        cls,
+        db_manager: DatabaseManager,
+        windows: Iterable[int] = (),
+        recent_limit: int = 25,
+        session_days: int = 7,
+    ) -> "DashboardSnapshot":
+        """The snapshot for the current data version, built on first use.
+
+        Shared between callers; its widget methods return copies.
+        """
+        key = (
+            db_manager.db_path,
+            db_manager.data_version,
+            memo.today(),
+            tuple(sorted(set(windows))),
+            recent_limit,
+            session_days,
+        )
+        hit, snapshot = _SNAPSHOTS.get(key)
+        if not hit:
+            snapshot = cls.build(db_manager, windows, recent_limit, session_days)
+            _SNAPSHOTS.put(key, snapshot)
+        return snapshot
+
+    def _cached(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Compute a rollup once; callers get their own DataFrame copy."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        value = self._memo[key]
+        return value.copy() if isinstance(value, (pd.DataFrame, dict, list)) else value
+
+    def covers(self, days: int | None) -> bool:
+        """Whether lookback ``days`` (None = all time) can be served."""
+        return days is None or days in self.cutoffs
+
+    def _activity_in(self, days: int | None) -> pd.DataFrame:
+        if days is None:
+            return self.activity
+        return self.activity[self.activity["lookback"] <= days]
+
+    # ------------------------------------------------------------------
+    # Widgets (same shapes as the PerformanceTracker methods)
+    # ------------------------------------------------------------------
+
+    def overall_stats(self, days: int | None = None) -> dict[str, float | int]:
+        return self._cached(("overall", days), lambda: self._overall_stats(days))
+
+    def _overall_stats(self, days: int | None) -> dict[str, float | int]:
+        rows = self._activity_in(days)
+        attempts = int(rows["attempts"].sum())
+        correct = int(rows["correct"].sum())
+        timed = int(rows["timed"].sum())
+        totals = self.session_totals
+        if days is not None:
+            totals = totals[totals["lookback"] <= days]
+        return {
+            "total_questions": attempts,
+            "correct_answers": correct,
+            "accuracy": correct / attempts * 100 if attempts > 0 else 0,
+            "avg_time": float(rows["time_sum"].sum()) / timed if timed > 0 else 0,
+            "total_sessions": int(totals["sessions"].sum()),
+            "total_score": int(totals["score"].sum()),
+            "current_streak": self.active_days.current_streak(),
+            "longest_streak": self.active_days.longest_streak(),
+        }
+
+    def historical_trend(self, days: int = 30) -> pd.DataFrame:
+        return self._cached(("trend", days), lambda: self._historical_trend(days))
+
+    def _historical_trend(self, days: int) -> pd.DataFrame:
+        rows = self._activity_in(days)
+        if rows.empty:
+            return pd.DataFrame(columns=_TREND_COLUMNS)
+        day = _rollup(rows, "date", ["questions", "skipped", "attempts", "correct", "time_sum", "timed"])
+        return pd.DataFrame({
+            "date": day["date"],
+            "questions": day["questions"].astype(int),
+            "skipped": day["skipped"].astype(int),
+            "correct": day["correct"],
+            "accuracy": np.nan_to_num(day["accuracy"], nan=0.0),
+            "avg_time": np.nan_to_num(day["avg_time"], nan=0.0),
+            "total_time": day["time_sum"],
+        })
+
+    def _attempts_by(self, rows: pd.DataFrame, key: str, count_column: str, correct_column: str) -> pd.DataFrame:
+        rows = rows[rows["attempts"] > 0]
+        group = _rollup(rows, key, ["attempts", "correct", "time_sum", "timed"])
+        return pd.DataFrame({
+            key: group[key],
+            count_column: group["attempts"],
+            correct_column: group["correct"],
+            "accuracy": group["accuracy"],
+            "avg_time": group["avg_time"],
+        })
+
+    def stats_by_category(self) -> pd.DataFrame:
+        return self._cached(("category",), self._stats_by_category)
+
+    def _stats_by_category(self) -> pd.DataFrame:
+        df = self._attempts_by(self.breakdown, "question_type", "questions_answered", "correct_answers")
+        # Key order from the groupby, then by volume: ties stay alphabetical.
+        return df.sort_values("questions_answered", ascending=False, kind="stable").reset_index(drop=True)
+
+    def stats_by_difficulty(self) -> pd.DataFrame:
+        return self._cached(("difficulty",), self._stats_by_difficulty)
+
+    def _stats_by_difficulty(self) -> pd.DataFrame:
+        df = self._attempts_by(self.breakdown, "difficulty", "questions_answered", "correct_answers")
+        rank = df["difficulty"].map(_DIFFICULTY_ORDER).fillna(4)
+        return df.iloc[rank.argsort(kind="stable")].reset_index(drop=True)
+
+    def time_of_day_performance(self) -> pd.DataFrame:
+        return self._cached(("time_of_day",), lambda: self._attempts_by(self.activity, "hour", "questions", "correct"))
+
+    def weak_areas(self, threshold: float = 0.75) -> list[str]:
+        df = self.stats_by_category()
+        weak = df[(df["questions_answered"] >= 10) & (df["accuracy"] / 100 < threshold)]
+        return sorted(weak["question_type"].tolist())
+
+    def covers_sessions(self, limit: int, days: int | None) -> bool:
+        """Whether ``recent_sessions(limit, days)`` can be served."""
+        if days is None:
+            return limit <= self.recent_limit
+        return days <= self.session_days and days in self.cutoffs
+
+    def recent_sessions(self, limit: int = 10, days: int | None = None) -> pd.DataFrame:
+        df = self.sessions
+        if days is not None:
+            df = df[df["timestamp"] >= self.cutoffs[days]]
+        return df.head(limit).reset_index(drop=True)
+
+    def goal_settings(self) -> GoalSettings:
+        return PerformanceTracker.goals_from_preferences(self.preferences)
+
+
+class SnapshotPerformanceTracker(PerformanceTracker):
+    """``PerformanceTracker`` reading from a ``DashboardSnapshot``.
+
+    Writes (``save_goal_settings``) still go to the database; build a new
+    snapshot to see them.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, snapshot: DashboardSnapshot):
+        super().__init__(db_manager)
+        self.snapshot = snapshot
+
+    @classmethod
+    def build(cls, db_manager: DatabaseManager, **kwargs) -> "SnapshotPerformanceTracker":
+        """Wrap the current snapshot (see ``DashboardSnapshot.current``)."""
+        return cls(db_manager, DashboardSnapshot.current(db_manager, **kwargs))
+
+    def memo_scope(self) -> tuple:
+        # Derived metrics reflect the snapshot's data, not the latest.
+        return (type(self).__qualname__, self.db.db_path, self.snapshot.data_version, memo.today())
+
+    def get_overall_stats(self, days: int | None = None) -> dict[str, float | int]:
+        if not self.snapshot.covers(days):
+            return super().get_overall_stats(days)
+        return self.snapshot.overall_stats(days)
+
+    def get_stats_by_category(self) -> pd.DataFrame:
+        return self.snapshot.stats_by_category()
+
+    def get_stats_by_difficulty(self) -> pd.DataFrame:
+        return self.snapshot.stats_by_difficulty()
+
+    def get_historical_trend(self, days: int = 30) -> pd.DataFrame:
+        if not self.snapshot.covers(days):
+            return super().get_historical_trend(days)
+        return self.snapshot.historical_trend(days)
+
+    def _bucket_summary(self, frequency: Frequency, days: int, start: date | None = None) -> pd.DataFrame:
+        if not self.snapshot.covers(days):
+            return super()._bucket_summary(frequency, days, start)
+        trend = self.snapshot.historical_trend(days)
+        if start is not None:
+            trend = trend[trend["date"] >= pd.Timestamp(start)]
+        return resample.summarize(trend, frequency)
+
+    def get_recent_sessions(self, limit: int = 10, days: int | None = None) -> pd.DataFrame:
+        if not self.snapshot.covers_sessions(limit, days):
+            return super().get_recent_sessions(limit, days)
+        return self.snapshot.recent_sessions(limit, days)
+
+    def get_time_of_day_performance(self) -> pd.DataFrame:
+        return self.snapshot.time_of_day_performance()
+
+    def identify_weak_areas(self, threshold: float = 0.75) -> list[str]:
+        return self.snapshot.weak_areas(threshold)
+
+    def get_goal_settings(self) -> GoalSettings:
+        return self.snapshot.goal_settings()
@@ -0,0 +1,98 @@
+"""Response-time sketches per day, question type and difficulty.
+
+``LatencyFold`` adds each non-skipped answer's time to the ``DDSketch``
+for its day, type and difficulty as ``DatabaseManager.save_session``
+writes it. ``get_latency_sketches`` merges the day sketches over a
+window, so percentiles never sort the raw answers.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.analytics.sketch import DDSketch
+from src.database.db_manager import DatabaseManager
+from src.database.derived import DerivedFold
+
+
+@DatabaseManager.register_fold
+class LatencyFold(DerivedFold):
+    """Folds new answers into ``latency_sketches``.
+
+    ``folded`` counts the answers read; skipped ones only advance the
+    watermark.
+    """
+
+    SOURCES = {"questions_answered": "latency_sketches"}
+    TABLES = ("latency_sketches",)
+
+    def __init__(self, cursor):
+        self.sketches: Dict[Tuple[str, str, str], DDSketch] = {}
+        self.folded = 0
+
+    def add(self, source, rows):
+        self.folded += len(rows)
+        chunk: Dict[Tuple[str, str, str], List[float]] = {}
+        for row in rows:
+            if not row["was_skipped"]:
+                chunk.setdefault((row["day"], row["question_type"], row["difficulty"]), []).append(
+                    row["time_taken_seconds"]
+                )
+        for key, values in chunk.items():
+            self.sketches.setdefault(key, DDSketch()).extend(values)
+
+    def finish(self, cursor):
+        for key, sketch in self.sketches.items():
+            cursor.execute(
+                "SELECT sketch FROM latency_sketches WHERE day = ? AND question_type = ? AND difficulty = ?",
+                key,
+            )
+            existing = cursor.fetchone()
+            if existing:
+                sketch.merge(DDSketch.from_bytes(existing[0]))
+            cursor.execute("""
+                INSERT OR REPLACE INTO latency_sketches (day, question_type, difficulty, sketch)
+                VALUES (?, ?, ?, ?)
+            """, (*key, sketch.to_bytes()))
+
+
+def catch_up_latency_sketches(db: DatabaseManager) -> int:
+    """Fold answers not yet in ``latency_sketches`` (e.g. existing history).
+
+    ``save_session`` keeps the sketches current; this picks up older
+    databases and rows written by other paths. Returns answers read.
+    """
+    fold = db.catch_up(LatencyFold)
+    return fold.folded if fold is not None else 0
+
+
+def rebuild_latency_sketches(db: DatabaseManager) -> int:
+    """Drop and rebuild every latency sketch from ``questions_answered``."""
+    return db.rebuild(LatencyFold).folded
+
+
+def get_latency_sketches(db: DatabaseManager, days: Optional[int] = None) -> Dict[Tuple[str, str], DDSketch]:
+    """Response-time sketches per (question_type, difficulty).
+
+    Merged over the last ``days`` calendar days (today included), or all
+    history when None. Non-skipped answers only.
+    """
+    catch_up_latency_sketches(db)
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    query = "SELECT question_type, difficulty, sketch FROM latency_sketches"
+    params: list = []
+    if days is not None:
+        query += " WHERE day >= ?"
+        params.append((datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d"))
+    cursor.execute(query, params)
+    sketches: Dict[Tuple[str, str], DDSketch] = {}
+    for question_type, difficulty, blob in cursor.fetchall():
+        sketch = DDSketch.from_bytes(blob)
+        key = (question_type, difficulty)
+        if key in sketches:
+            sketches[key].merge(sketch)
+        else:
+            sketches[key] = sketch
+    conn.close()
+    return sketches
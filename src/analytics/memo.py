@@ -0,0 +1,141 @@
+"""Memoization keyed on the database's data version.
+
+Every Streamlit rerun builds a fresh ``PerformanceTracker`` and recomputes
+every widget, even when nothing was saved in between. ``memoize`` caches a
+method's results per (tracker class, database file, data version, day,
+arguments). Cached results are shared across reruns, tabs and tracker
+instances until ``DatabaseManager.data_version`` moves; see there for
+which writes bump it.
+
+The current date is part of the key because the lookback windows and the
+current streak are relative to today, even when no data changes.
+
+Each decorated method has its own bounded LRU. Entries for superseded
+versions are never hit again and age out of it. Mutable results are
+copied on the way out, so callers that modify them cannot corrupt the
+cache.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_MAXSIZE = 32
+
+_IMMUTABLE = (int, float, complex, str, bytes, bool, type(None), tuple, frozenset)
+
+
+def today() -> date:
+    """Today's date, part of every cache scope (a seam for tests)."""
+    return date.today()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """``(True, value)`` on a hit, ``(False, None)`` on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.stats.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return True, self._entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def copy_result(value: Any) -> Any:
+    """A copy of a cached result that the caller may mutate freely."""
+    if isinstance(value, _IMMUTABLE):
+        return value
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def tracker_scope(tracker) -> Optional[Hashable]:
+    """Cache scope for a ``PerformanceTracker`` method call.
+
+    Trackers may define ``memo_scope()`` to override it. None disables
+    caching for the call.
+    """
+    scope = getattr(tracker, "memo_scope", None)
+    return scope() if callable(scope) else None
+
+
+def memoize(
+    maxsize: int = DEFAULT_MAXSIZE,
+    scope: Callable[[Any], Optional[Hashable]] = tracker_scope,
+) -> Callable:
+    """Cache a method's results per ``scope(self)`` and arguments.
+
+    Arguments are normalized against the signature (defaults applied), so
+    ``f(7)`` and ``f(days=7)`` share an entry. The wrapper exposes
+    ``cache`` (the ``LRUCache``) and ``cache_clear()``.
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+        cache = LRUCache(maxsize)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            scope_key = scope(self)
+            if scope_key is None:
+                return fn(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())[1:]
+            try:
+                key = (scope_key, arguments)
+                hash(key)
+            except TypeError:  # unhashable argument: just compute
+                return fn(self, *args, **kwargs)
+            hit, value = cache.get(key)
+            if not hit:
+                value = fn(self, *args, **kwargs)
+                cache.put(key, value)
+            return copy_result(value)
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -5,12 +5,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import pandas as pd
 
+from src.analytics import memo
+from src.analytics.memo import memoize
+from src.analytics.latency import get_latency_sketches
+from src.analytics.resample import SUMMARY_COLUMNS, Frequency, bucket_sql
+from src.analytics.sketch import DDSketch
 from src.database.db_manager import DatabaseManager
+from src.gamification.activity import get_activity_bitmap
+
+LATENCY_GROUPINGS = ("question_type", "difficulty", None)
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+# Seconds; the last interval collects everything slower than a minute.
+LATENCY_HISTOGRAM_EDGES = (0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0, 15.0, 20.0, 30.0, 60.0, float("inf"))
 
 
 @dataclass
@@ -29,17 +40,25 @@ class PerformanceTracker:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
 
+    def memo_scope(self) -> tuple:
+        """Cache scope for the ``@memoize``d reads (see ``src.analytics.memo``)."""
+        return (type(self).__qualname__, self.db.db_path, self.db.data_version, memo.today())
+
+    @memoize()
     def get_overall_stats(self, days: int | None = None) -> dict[str, float | int]:
         """Get overall performance statistics."""
         stats = self.db.get_performance_stats(days=days)
-        stats["current_streak"] = self.db.get_current_streak()
-        stats["longest_streak"] = self.db.get_longest_streak()
+        active_days = get_activity_bitmap(self.db)
+        stats["current_streak"] = active_days.current_streak()
+        stats["longest_streak"] = active_days.longest_streak()
         return stats
 
+    @memoize()
     def get_stats_by_category(self) -> pd.DataFrame:
         """Get performance breakdown by question type."""
         return self.db.get_category_performance()
 
+    @memoize()
     def get_stats_by_difficulty(self) -> pd.DataFrame:
         """Get performance breakdown by difficulty level.
 
@@ -69,6 +88,7 @@ class PerformanceTracker:
         conn.close()
         return df
 
+    @memoize()
     def get_historical_trend(self, days: int = 30) -> pd.DataFrame:
         """Get daily trend over the selected number of days.
 
@@ -112,10 +132,12 @@ class PerformanceTracker:
         df["total_time"] = df["total_time"].fillna(0.0)
         return df
 
+    @memoize()
     def get_recent_sessions(self, limit: int = 10, days: int | None = None) -> pd.DataFrame:
         """Get recent session summaries."""
         return self.db.get_session_history(limit=limit, days=days)
 
+    @memoize()
     def get_time_of_day_performance(self) -> pd.DataFrame:
         """Get performance breakdown by hour of day.
 
@@ -139,10 +161,12 @@ class PerformanceTracker:
         conn.close()
         return df
 
+    @memoize()
     def identify_weak_areas(self, threshold: float = 0.75) -> list[str]:
         """Identify question types with accuracy below threshold."""
         return self.db.get_weak_areas(threshold)
 
+    @memoize()
     def identify_slow_areas(self, threshold: float = 5.0) -> list[str]:
         """Identify question types with average time above threshold."""
         df = self.get_stats_by_category()
@@ -151,6 +175,59 @@ class PerformanceTracker:
         slow = df[df["avg_time"] > threshold]
         return slow["question_type"].tolist()
 
+    def _latency_groups(self, by: str | None, days: int | None) -> dict[str, DDSketch]:
+        """Sketches merged per ``by`` ("question_type", "difficulty" or None)."""
+        if by not in LATENCY_GROUPINGS:
+            raise ValueError(f"Unknown latency grouping: {by!r}")
+        groups: dict[str, DDSketch] = {}
+        for (question_type, difficulty), sketch in get_latency_sketches(self.db, days=days).items():
+            key = {"question_type": question_type, "difficulty": difficulty, None: "all"}[by]
+            groups.setdefault(key, DDSketch()).merge(sketch)
+        return groups
+
+    @memoize()
+    def get_latency_percentiles(
+        self,
+        by: str | None = "question_type",
+        days: int | None = None,
+        quantiles: tuple[float, ...] = LATENCY_QUANTILES,
+    ) -> pd.DataFrame:
+        """Response-time percentiles (p50/p90/p99 by default) per ``by``.
+
+        Served from the per-day latency sketches, so values are within 1%
+        of the exact percentile. Skipped questions are excluded.
+        """
+        rows = []
+        for key, sketch in sorted(self._latency_groups(by, days).items()):
+            row: dict[str, Any] = {by or "group": key, "count": sketch.count}
+            for q, value in zip(quantiles, sketch.quantiles(quantiles)):
+                row[f"p{q * 100:g}"] = value
+            row["avg_time"] = sketch.total / sketch.count
+            rows.append(row)
+        columns = [by or "group", "count", *(f"p{q * 100:g}" for q in quantiles), "avg_time"]
+        return pd.DataFrame(rows, columns=columns)
+
+    @memoize()
+    def get_latency_histogram(
+        self,
+        by: str | None = None,
+        days: int | None = None,
+        edges: tuple[float, ...] = LATENCY_HISTOGRAM_EDGES,
+    ) -> pd.DataFrame:
+        """Answer counts per response-time interval ``[bin_start, bin_end)``."""
+        frames = []
+        for key, sketch in sorted(self._latency_groups(by, days).items()):
+            frames.append(pd.DataFrame({
+                by or "group": key,
+                "bin_start": edges[:-1],
+                "bin_end": edges[1:],
+                "count": sketch.histogram(edges),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=[by or "group", "bin_start", "bin_end", "count"])
+        return pd.concat(frames, ignore_index=True)
+
+    @memoize()
     def get_session_details(self, session_id: int) -> dict[str, Any] | None:
         """Get detailed information about a specific session."""
         conn = self.db.get_connection()
@@ -170,14 +247,19 @@ class PerformanceTracker:
         conn.close()
         return {"session": dict(session), "questions": questions_df}
 
+    @memoize()
     def get_goal_settings(self) -> GoalSettings:
         """Read persisted goals with defaults."""
-        prefs = self.db.get_user_preferences()
+        return self.goals_from_preferences(self.db.get_user_preferences())
+
+    @classmethod
+    def goals_from_preferences(cls, prefs: dict[str, str]) -> GoalSettings:
+        """Goals from a user-preferences mapping, with defaults."""
         return GoalSettings(
-            daily_questions=self._safe_int(prefs.get("goal_daily_questions"), 40),
-            weekly_sessions=self._safe_int(prefs.get("goal_weekly_sessions"), 5),
-            target_accuracy=self._safe_float(prefs.get("goal_target_accuracy"), 85.0),
-            target_avg_time=self._safe_float(prefs.get("goal_target_avg_time"), 4.0),
+            daily_questions=cls._safe_int(prefs.get("goal_daily_questions"), 40),
+            weekly_sessions=cls._safe_int(prefs.get("goal_weekly_sessions"), 5),
+            target_accuracy=cls._safe_float(prefs.get("goal_target_accuracy"), 85.0),
+            target_avg_time=cls._safe_float(prefs.get("goal_target_avg_time"), 4.0),
         )
 
     def save_goal_settings(self, goals: GoalSettings):
@@ -197,6 +279,7 @@ class PerformanceTracker:
     # scores live in [0, 200].
     COACHING_SCORE_FRESH_INSTALL: int = -1
 
+    @memoize()
     def get_goal_progress(self, lookback_days: int = 7) -> dict[str, float | int | bool]:
         """Calculate progress against personal goals.
 
@@ -253,6 +336,7 @@ class PerformanceTracker:
             "goal_hit_speed": avg_time > 0 and avg_time <= goals.target_avg_time,
         }
 
+    @memoize()
     def get_personal_baseline(self, days: int = 30) -> dict[str, float]:
         """Get a baseline profile from historical data."""
         trend = self.get_historical_trend(days=days)
@@ -272,35 +356,73 @@ class PerformanceTracker:
             "consistency_days": round(float(len(trend.index) / total_days * 100), 1),
         }
 
+    @memoize()
     def get_weekly_summary(self, weeks: int = 8) -> pd.DataFrame:
         """Aggregate trends to week-level metrics for analytics charts."""
-        days = max(weeks * 7, 7)
-        trend = self.get_historical_trend(days=days)
-        if trend.empty:
-            return trend
-
-        trend = pd.DataFrame(trend).copy()
-        trend["week_start"] = trend["date"] - pd.to_timedelta(trend["date"].dt.weekday, unit="D")
-        trend["weighted_accuracy"] = trend["accuracy"] * trend["questions"]
-        grouped = pd.DataFrame(
-            trend.groupby("week_start", as_index=False)
-            .agg(
-                questions=("questions", "sum"),
-                total_time=("total_time", "sum"),
-                weighted_acc=("weighted_accuracy", "sum"),
+        summary = self._bucket_summary(Frequency("W"), days=max(weeks * 7, 7))
+        return summary.rename(columns={"bucket_start": "week_start"})
+
+    @memoize()
+    def get_monthly_summary(self, months: int = 12) -> pd.DataFrame:
+        """Month-level metrics for the current month and the ones before it."""
+        return self.get_summary("M", periods=months)
+
+    @memoize()
+    def get_summary(self, frequency: str = "W", periods: int = 8) -> pd.DataFrame:
+        """Metrics per calendar bucket (see ``src.analytics.resample``).
+
+        Covers the current bucket and the ``periods - 1`` whole buckets
+        before it. ``frequency`` is e.g. ``"W"``, ``"2W"``, ``"M"`` or ``"Q"``.
+        """
+        if periods < 1:
+            raise ValueError("periods must be at least 1")
+        freq = Frequency.parse(frequency)
+        today = datetime.now().date()
+        start = freq.shift(freq.bucket_start(today), 1 - periods)
+        return self._bucket_summary(freq, days=(today - start).days + 1, start=start)
+
+    def _bucket_summary(self, frequency: Frequency, days: int, start: date | None = None) -> pd.DataFrame:
+        """Bucket the trailing ``days`` of answers in SQL, from ``start`` if given."""
+        cutoff = datetime.now() - timedelta(days=days)
+        if start is not None:
+            cutoff = max(cutoff, datetime.combine(start, datetime.min.time()))
+        # Same daily rollup as get_historical_trend, bucketed in the database.
+        query = f"""
+            SELECT
+                {bucket_sql(frequency, "answer_date")} as bucket_start,
+                SUM(questions) as questions,
+                SUM(COALESCE(accuracy, 0) * questions) as weighted_acc,
+                SUM(COALESCE(total_time, 0)) as total_time
+            FROM (
+                SELECT
+                    DATE(timestamp) as answer_date,
+                    COUNT(*) as questions,
+                    CAST(SUM(CASE WHEN was_skipped = 0 AND is_correct = 1 THEN 1 ELSE 0 END) AS FLOAT)
+                        / NULLIF(SUM(CASE WHEN was_skipped = 0 THEN 1 ELSE 0 END), 0) * 100 as accuracy,
+                    SUM(CASE WHEN was_skipped = 0 THEN time_taken_seconds ELSE 0 END) as total_time
+                FROM questions_answered
+                WHERE timestamp >= ?
+                GROUP BY DATE(timestamp)
             )
-        )
-        grouped["accuracy"] = grouped.apply(
-            lambda row: row["weighted_acc"] / max(row["questions"], 1),
-            axis=1,
-        )
-        grouped["avg_time"] = grouped.apply(
-            lambda row: row["total_time"] / max(row["questions"], 1),
-            axis=1,
-        )
-        result = pd.DataFrame(grouped.loc[:, ["week_start", "questions", "accuracy", "avg_time"]])
-        return result
+            GROUP BY bucket_start
+            ORDER BY bucket_start
+        """
+        conn = self.db.get_connection()
+        df = pd.read_sql_query(query, conn, params=[cutoff.strftime("%Y-%m-%d %H:%M:%S")])
+        conn.close()
+
+        if df.empty:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+        denominator = df["questions"].clip(lower=1)
+        return pd.DataFrame({
+            "bucket_start": pd.to_datetime(df["bucket_start"]),
+            "questions": df["questions"].astype(int),
+            "accuracy": df["weighted_acc"] / denominator,
+            "avg_time": df["total_time"] / denominator,
+        })
 
+    @memoize()
     def get_training_recommendations(self) -> list[dict[str, str]]:
         """Generate focused recommendations for the solo user."""
         recommendations: list[dict[str, str]] = []
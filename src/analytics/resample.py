@@ -0,0 +1,131 @@
+"""Calendar bucketing of the daily trend (weeks, months, quarters).
+
+A ``Frequency`` is a unit and a bucket size: ``"W"`` is ISO weeks
+starting on Monday, ``"2W"`` fortnights, ``"M"`` months, ``"Q"`` quarters
+and ``"2Q"`` half-years. Buckets are aligned to a fixed origin, so a date
+always lands in the same bucket whatever range is being summarized:
+
+- Weeks count from Monday 1970-01-05.
+- Months and quarters count from January of year 0, so every size that
+  divides 12 starts on a calendar boundary.
+
+There are two equivalent implementations:
+
+- ``bucket_sql`` computes a bucket start in SQLite, so
+  ``PerformanceTracker`` groups multi-year histories in the database and
+  reads back one row per bucket.
+- ``summarize`` buckets a daily trend frame that is already in memory,
+  as the dashboard snapshot has. It works on integer day numbers with
+  numpy and does no per-row Python work.
+
+Both compute the same metrics per bucket. ``questions`` is the sum of
+daily volume, skips included. ``accuracy`` is the daily accuracy
+weighted by that volume. ``avg_time`` is the answering time divided by
+that volume.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_COLUMNS = ["bucket_start", "questions", "accuracy", "avg_time"]
+
+# Monday 1970-01-05, as days since the Unix epoch.
+_WEEK_ORIGIN = 4
+_YEAR_ZERO_MONTHS = 1970 * 12
+_FREQUENCY = re.compile(r"^\s*(\d*)\s*([WMQ])\s*$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Frequency:
+    """A bucket size: ``count`` weeks (unit ``"W"``) or months (``"M"``)."""
+
+    unit: str
+    count: int = 1
+
+    def __post_init__(self):
+        if self.unit not in ("W", "M"):
+            raise ValueError(f"Unknown bucket unit: {self.unit!r}")
+        if self.count < 1:
+            raise ValueError("Bucket size must be at least 1")
+
+    @classmethod
+    def parse(cls, spec: "str | Frequency") -> "Frequency":
+        """``"W"``, ``"2W"``, ``"M"``, ``"3M"``, ``"Q"`` (= ``"3M"``), ..."""
+        if isinstance(spec, Frequency):
+            return spec
+        match = _FREQUENCY.match(spec)
+        if not match:
+            raise ValueError(f"Unknown bucket frequency: {spec!r}")
+        count = int(match.group(1) or 1)
+        unit = match.group(2).upper()
+        if unit == "Q":
+            return cls("M", count * 3)
+        return cls(unit, count)
+
+    def bucket_start(self, day: date) -> date:
+        """First day of the bucket containing ``day``."""
+        if self.unit == "W":
+            offset = ((day - date(1970, 1, 1)).days - _WEEK_ORIGIN) % (7 * self.count)
+            return day - timedelta(days=offset)
+        months = day.year * 12 + day.month - 1
+        months -= months % self.count
+        return date(months // 12, months % 12 + 1, 1)
+
+    def shift(self, start: date, buckets: int) -> date:
+        """The bucket start ``buckets`` buckets after (or before) ``start``."""
+        if self.unit == "W":
+            return start + timedelta(weeks=buckets * self.count)
+        months = start.year * 12 + start.month - 1 + buckets * self.count
+        return date(months // 12, months % 12 + 1, 1)
+
+
+def bucket_sql(frequency: Frequency, day_column: str) -> str:
+    """SQLite expression for the bucket start of ``day_column`` ('YYYY-MM-DD')."""
+    if frequency.unit == "W":
+        span = 7 * frequency.count
+        return (
+            f"DATE({day_column}, '-' || ((CAST(julianday({day_column}) - julianday('1970-01-05') AS INTEGER)"
+            f" % {span})) || ' days')"
+        )
+    months = (
+        f"(CAST(strftime('%Y', {day_column}) AS INTEGER) * 12"
+        f" + CAST(strftime('%m', {day_column}) AS INTEGER) - 1)"
+    )
+    bucket = f"({months} - {months} % {frequency.count})"
+    return f"printf('%04d-%02d-01', {bucket} / 12, {bucket} % 12 + 1)"
+
+
+def bucket_starts(dates: pd.Series, frequency: Frequency) -> np.ndarray:
+    """Bucket start (datetime64[D]) for each date, vectorized."""
+    days = dates.to_numpy(dtype="datetime64[D]")
+    if frequency.unit == "W":
+        numbers = days.astype(np.int64)
+        return (numbers - (numbers - _WEEK_ORIGIN) % (7 * frequency.count)).astype("datetime64[D]")
+    months = days.astype("datetime64[M]").astype(np.int64) + _YEAR_ZERO_MONTHS
+    months -= months % frequency.count
+    return (months - _YEAR_ZERO_MONTHS).astype("datetime64[M]").astype("datetime64[D]")
+
+
+def summarize(trend: pd.DataFrame, frequency: "str | Frequency") -> pd.DataFrame:
+    """Bucket a ``get_historical_trend`` frame into ``SUMMARY_COLUMNS``."""
+    frequency = Frequency.parse(frequency)
+    if trend.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    starts, inverse = np.unique(bucket_starts(trend["date"], frequency), return_inverse=True)
+    questions = trend["questions"].to_numpy(dtype=np.int64)
+    weighted_acc = np.bincount(inverse, weights=trend["accuracy"].to_numpy(dtype=float) * questions)
+    total_time = np.bincount(inverse, weights=trend["total_time"].to_numpy(dtype=float))
+    volume = np.bincount(inverse, weights=questions).astype(np.int64)
+    denominator = np.maximum(volume, 1)
+    return pd.DataFrame({
+        "bucket_start": pd.Series(starts).astype(trend["date"].dtype),
+        "questions": volume,
+        "accuracy": weighted_acc / denominator,
+        "avg_time": total_time / denominator,
+    })
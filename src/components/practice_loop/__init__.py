@@ -2,8 +2,9 @@
 
 This replaces the prior inline-JS hacks living inside ``practice_session.py``.
 The component owns the entire client-side game loop: timer, current question,
-input field, score / combo, skip and quit. Python only does setup (pre-generate
-questions, configure mode) and teardown (persist results, route to results
+input field, score / combo, skip and quit. Python only does setup (initial
+question batch, configure mode), answers refill requests when the component's
+question buffer runs low, and teardown (persist results, route to results
 page).
 
 Hot-reload caveat (v1):
@@ -36,26 +37,59 @@ def practice_loop(
     question_count: Optional[int] = None,
     category_label: str = "",
     difficulty_label: str = "",
+    has_more: bool = False,
+    refill_at: int = 0,
+    journaled: int = 0,
+    checkpoint_every: int = 0,
+    validation_spec: Optional[Dict[str, Any]] = None,
     key: str = "practice_loop",
     height: int = 640,
 ) -> Optional[Dict[str, Any]]:
     """Render the practice loop component.
 
     Args:
-        questions: Pre-generated, JSON-safe questions. Each dict contains
+        questions: JSON-safe questions served so far. Each dict contains
             ``id``, ``text``, ``acceptable_answers`` (list[str]),
-            ``correct_answer``, and ``needs_fraction_keyboard`` (bool).
+            ``correct_answer``, ``needs_fraction_keyboard`` (bool) and
+            ``rule`` (the question's ``matcher.to_spec()``; exact-rational
+            questions are checked by that rule instead of the float cascade).
+            The list only ever grows within a session; on re-render the
+            component appends any ids it hasn't seen yet.
         mode: One of ``"sprint"``, ``"marathon"``, ``"targeted"``.
         duration_seconds: Sprint duration. Required for sprint mode.
         question_count: Marathon/targeted count. Required for those modes.
         category_label: Display label (e.g. ``"Arithmetic"``).
         difficulty_label: Display label (e.g. ``"Adaptive"``).
+        has_more: True if Python can supply more questions on request. When
+            False, running out of questions ends the session.
+        refill_at: Ask for a refill once this many unanswered questions
+            remain (only while ``has_more``).
+        journaled: How many of the component's results Python has
+            journaled. Mid-session updates carry the results from there on.
+        checkpoint_every: Send an update (without a refill) once this many
+            results are unjournaled. 0 means answers only travel with
+            refills and the final result.
+        validation_spec: The shared normalization/tolerance spec
+            (``src.game_logic.validation_spec.SPEC``) that configures the
+            client-side validator in ``frontend/validator.js``.
         key: Streamlit component key. Bump it to force a fresh mount when a
             new session starts.
         height: iframe height in pixels.
 
     Returns:
-        ``None`` while the loop is still running. Once the user finishes
+        ``None`` while the loop is still running. When the question buffer
+        runs low, or ``checkpoint_every`` answers are unjournaled, it returns
+        an update (the caller journals the results and, for a refill,
+        appends questions and reruns; the component keeps running)::
+
+            {"completed": False, "refill": bool, "seq": int, "have": int,
+             "answered": int, "elapsed_seconds": float,
+             "results_from": int, "results": [...]}
+
+        ``results`` holds the results from index ``results_from`` (the last
+        ``journaled`` value seen) onward, shaped as below.
+
+        Once the user finishes
         (timer hits 0, question count met, quit), returns a dict shaped::
 
             {
@@ -75,6 +109,11 @@ def practice_loop(
         question_count=question_count,
         category_label=category_label,
         difficulty_label=difficulty_label,
+        has_more=has_more,
+        refill_at=refill_at,
+        journaled=journaled,
+        checkpoint_every=checkpoint_every,
+        validation_spec=validation_spec,
         key=key,
         default=None,
         height=height,
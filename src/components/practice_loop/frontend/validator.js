@@ -0,0 +1,331 @@
+// ---------------------------------------------------------------------------
+// Answer validator: a port of src/game_logic/validator.py and
+// src/game_logic/exact_validator.py.
+//
+// Every normalization rule and tolerance comes from the shared spec
+// (src/game_logic/validation_spec.json), which Python passes in as the
+// `validation_spec` component arg; call configure(spec) before use. Exact
+// rational questions also carry a per-question `rule` (ExactMatcher.to_spec)
+// so the client applies the same rule as the server.
+//
+// Loaded as a plain <script> by index.html (exposes window.AnswerValidator)
+// and with require() by the differential fuzz harness
+// (python -m src.tools.validator_fuzz). Change both sides together and
+// re-run the harness.
+// ---------------------------------------------------------------------------
+(function (root, factory) {
+  if (typeof module === "object" && module.exports) {
+    module.exports = factory();
+  } else {
+    root.AnswerValidator = factory();
+  }
+})(typeof self !== "undefined" ? self : this, function () {
+  "use strict";
+
+  let STRIP = new Set();
+  let CHAR_RE = null;
+  let CHAR_MAP = {};
+  let NUMBER_RE = /^$/;
+  let COMMA_DECIMAL_MAX_DIGITS = 2;
+  let MAX_EXPONENT = 30;
+  let MAX_DIGITS = 300;
+  let PCT_TOLERANCE = 0.1;
+  let PCT_RATIO_RANGE = [0, 1];
+  let PCT_PLAIN_RANGE = [-100, 100];
+  let FRAC_TOLERANCE = 0.001;
+  let NUM_RELATIVE_ABOVE = 10;
+  let NUM_RELATIVE_TOLERANCE = 0.01;
+  let NUM_ABSOLUTE_TOLERANCE = 0.1;
+
+  function _escapeClass(ch) {
+    return ch.replace(/[\\\]\[^-]/g, "\\$&");
+  }
+
+  function configure(spec) {
+    if (!spec) return;
+    STRIP = new Set(Array.from(spec.strip_chars || ""));
+    CHAR_MAP = spec.char_map || {};
+    const keys = Object.keys(CHAR_MAP);
+    CHAR_RE = keys.length ? new RegExp("[" + keys.map(_escapeClass).join("") + "]", "g") : null;
+    NUMBER_RE = new RegExp(spec.number_pattern);
+    COMMA_DECIMAL_MAX_DIGITS = spec.comma_decimal_max_digits;
+    MAX_EXPONENT = spec.max_exponent;
+    MAX_DIGITS = spec.max_digits;
+    PCT_TOLERANCE = spec.percent.tolerance;
+    PCT_RATIO_RANGE = spec.percent.ratio_range;
+    PCT_PLAIN_RANGE = spec.percent.plain_range;
+    FRAC_TOLERANCE = spec.fraction.tolerance;
+    NUM_RELATIVE_ABOVE = spec.numeric.relative_above;
+    NUM_RELATIVE_TOLERANCE = spec.numeric.relative_tolerance;
+    NUM_ABSOLUTE_TOLERANCE = spec.numeric.absolute_tolerance;
+  }
+
+  // -- normalization (validation_spec.py) -----------------------------------
+
+  function strip(s) {
+    let i = 0;
+    let j = s.length;
+    while (i < j && STRIP.has(s[i])) i++;
+    while (j > i && STRIP.has(s[j - 1])) j--;
+    return s.slice(i, j);
+  }
+
+  function normalize(raw) {
+    if (raw === null || raw === undefined) return "";
+    const s = strip(String(raw));
+    return CHAR_RE ? s.replace(CHAR_RE, (ch) => CHAR_MAP[ch]) : s;
+  }
+
+  function asciiLower(s) {
+    return s.replace(/[A-Z]/g, (ch) => String.fromCharCode(ch.charCodeAt(0) + 32));
+  }
+
+  function parseNumber(text) {
+    return NUMBER_RE.test(text) ? Number(text) : null;
+  }
+
+  function commaDecimal(text) {
+    if (text.split(",").length !== 2 || text.includes(".")) return null;
+    const [left, right] = text.split(",");
+    if (/^-*[0-9]+$/.test(left) && /^[0-9]+$/.test(right) && right.length <= COMMA_DECIMAL_MAX_DIGITS) {
+      return left + "." + right;
+    }
+    return null;
+  }
+
+  // Convert input into the form both validators record it in.
+  function canonicalize(raw) {
+    const s = normalize(raw);
+    const decimal = commaDecimal(s);
+    return decimal === null ? s : decimal;
+  }
+
+  // -- float cascade (validator.py) -----------------------------------------
+
+  function normalizeNumeric(text) {
+    let s = strip(text);
+    if (s.endsWith("%")) s = strip(s.slice(0, -1));
+    if (s.startsWith("+")) s = s.slice(1);
+    const decimal = commaDecimal(s);
+    return decimal === null ? s.replace(/,/g, "") : decimal;
+  }
+
+  function parseNumeric(text) {
+    return parseNumber(normalizeNumeric(text));
+  }
+
+  function extractPct(text) {
+    let s = strip(text);
+    if (s.startsWith("+")) s = s.slice(1);
+    if (s.endsWith("%")) {
+      const body = strip(s.slice(0, -1));
+      return parseNumber(commaDecimal(body) || body);
+    }
+    const val = parseNumber(commaDecimal(s) || s);
+    if (val === null) return null;
+    if (PCT_RATIO_RANGE[0] <= val && val <= PCT_RATIO_RANGE[1]) return val * 100;
+    if (PCT_PLAIN_RANGE[0] <= val && val <= PCT_PLAIN_RANGE[1]) return val;
+    return null;
+  }
+
+  function parseFraction(text) {
+    const parts = text.split("/");
+    if (parts.length !== 2) return null;
+    const n = parseNumber(strip(parts[0]));
+    const d = parseNumber(strip(parts[1]));
+    if (n === null || d === null || d === 0) return null;
+    return n / d;
+  }
+
+  function numericClose(u, x) {
+    if (Math.abs(x) > NUM_RELATIVE_ABOVE) {
+      return Math.abs(u - x) / Math.abs(x) < NUM_RELATIVE_TOLERANCE;
+    }
+    return Math.abs(u - x) < NUM_ABSOLUTE_TOLERANCE;
+  }
+
+  function _acceptable(text) {
+    const s = normalize(text);
+    return {
+      lower: asciiLower(s),
+      pct: extractPct(s),
+      frac: s.includes("/") ? parseFraction(s) : null,
+      num: parseNumeric(s),
+    };
+  }
+
+  const _cascadeCache = new WeakMap();
+
+  function _compileCascade(acceptables) {
+    let compiled = _cascadeCache.get(acceptables);
+    if (!compiled) {
+      const answers = acceptables.map((a) => _acceptable(String(a)));
+      compiled = { answers, exact: new Set(answers.map((a) => a.lower)) };
+      _cascadeCache.set(acceptables, compiled);
+    }
+    return compiled;
+  }
+
+  // Each acceptable answer is decided by the first stage both sides parse
+  // in (percent, then fraction, then number), like CompiledMatcher.matches.
+  function cascadeMatches(user, acceptables) {
+    const { answers, exact } = _compileCascade(acceptables);
+    if (exact.has(asciiLower(user))) return true;
+    const userPct = extractPct(user);
+    const userFrac = user.includes("/") ? parseFraction(user) : null;
+    const userNum = parseNumeric(user);
+    for (const acc of answers) {
+      if (userPct !== null && acc.pct !== null) {
+        if (Math.abs(userPct - acc.pct) < PCT_TOLERANCE) return true;
+        continue;
+      }
+      if (userFrac !== null && acc.frac !== null) {
+        if (Math.abs(userFrac - acc.frac) < FRAC_TOLERANCE) return true;
+        continue;
+      }
+      if (userNum === null || acc.num === null) continue;
+      if (numericClose(userNum, acc.num)) return true;
+    }
+    return false;
+  }
+
+  // -- exact rationals (exact_validator.py) ----------------------------------
+
+  function _abs(x) {
+    return x < 0n ? -x : x;
+  }
+
+  function _gcd(a, b) {
+    a = _abs(a);
+    b = _abs(b);
+    while (b) [a, b] = [b, a % b];
+    return a;
+  }
+
+  function _reduce(num, den) {
+    if (den < 0n) {
+      num = -num;
+      den = -den;
+    }
+    const g = _gcd(num, den);
+    return g > 1n ? [num / g, den / g] : [num, den];
+  }
+
+  function _parseDecimal(text) {
+    const m = NUMBER_RE.exec(text);
+    if (!m) return null;
+    let [, sign, whole, frac, bareFrac, exp] = m;
+    if (whole === undefined) {
+      whole = "0";
+      frac = bareFrac;
+    }
+    frac = frac || "";
+    if (whole.length + frac.length > MAX_DIGITS || (exp && exp.length > MAX_DIGITS)) return null;
+    const exponent = exp ? parseInt(exp, 10) : 0;
+    if (Math.abs(exponent) > MAX_EXPONENT) return null;
+    let num = BigInt(whole + frac);
+    if (sign === "-") num = -num;
+    const places = frac.length - exponent;
+    if (places >= 0) return [num, 10n ** BigInt(places), places];
+    return [num * 10n ** BigInt(-places), 1n, places];
+  }
+
+  // [[num, den], places | null] or null, like exact_validator.parse_rational.
+  function parseRational(text) {
+    let s = strip(text);
+    if (!s) return null;
+    const percent = s.endsWith("%");
+    if (percent) s = strip(s.slice(0, -1));
+    if (s.startsWith("+")) s = s.slice(1);
+
+    let num, den, places;
+    if (s.includes("/")) {
+      const parts = s.split("/");
+      if (parts.length !== 2) return null;
+      const top = _parseDecimal(strip(parts[0]));
+      const bottom = _parseDecimal(strip(parts[1]));
+      if (top === null || bottom === null || bottom[0] === 0n) return null;
+      num = top[0] * bottom[1];
+      den = top[1] * bottom[0];
+      places = null;
+    } else {
+      const decimal = commaDecimal(s);
+      const parsed = _parseDecimal(decimal === null ? s.replace(/,/g, "") : decimal);
+      if (parsed === null) return null;
+      [num, den, places] = parsed;
+    }
+    if (percent) {
+      den *= 100n;
+      if (places !== null) places += 2;
+    }
+    return [_reduce(num, den), places];
+  }
+
+  function _pair(p) {
+    return p ? [BigInt(p[0]), BigInt(p[1])] : null;
+  }
+
+  const _exactCache = new WeakMap();
+
+  function _compileExact(rule) {
+    let compiled = _exactCache.get(rule);
+    if (!compiled) {
+      const values = (rule.values || []).map(_pair);
+      compiled = {
+        exact: new Set(rule.exact || []),
+        values,
+        keys: new Set(values.map(([n, d]) => n + "/" + d)),
+        low: _pair(rule.low),
+        high: _pair(rule.high),
+        roundingRef: _pair(rule.rounding_ref),
+        minPlaces: rule.min_places || 0,
+        tolerant: !!rule.tolerant,
+        tolerance: (rule.tolerance || []).map(_pair),
+      };
+      _exactCache.set(rule, compiled);
+    }
+    return compiled;
+  }
+
+  function exactMatches(user, rule) {
+    const m = _compileExact(rule);
+    if (m.exact.has(asciiLower(user))) return true;
+    const parsed = parseRational(user);
+    if (parsed === null) return false;
+    const [[num, den], places] = parsed;
+    if (m.keys.has(num + "/" + den)) return true;
+
+    if (m.low !== null && m.high !== null) {
+      const [loN, loD] = m.low;
+      const [hiN, hiD] = m.high;
+      if (num * loD >= loN * den && num * hiD <= hiN * den) return true;
+    }
+    if (m.roundingRef !== null && places !== null && places >= m.minPlaces) {
+      const [refN, refD] = m.roundingRef;
+      if (_abs(num * refD - refN * den) * 2n * 10n ** BigInt(places) <= den * refD) return true;
+    }
+    if (m.tolerant) {
+      const [[aboveN, aboveD], [relN, relD], [tolN, tolD]] = m.tolerance;
+      for (const [tN, tD] of m.values) {
+        const diff = _abs(num * tD - tN * den);
+        if (_abs(tN) * aboveD > aboveN * tD) {
+          if (diff * relD < relN * _abs(tN) * den) return true;
+        } else if (diff * tolD < tolN * den * tD) {
+          return true;
+        }
+      }
+    }
+    return false;
+  }
+
+  // -- entry point (AnswerValidator.validate) --------------------------------
+
+  function isCorrect(userRaw, acceptables, rule) {
+    const user = normalize(userRaw);
+    if (!user) return false;
+    if (rule && rule.kind === "exact") return exactMatches(user, rule);
+    return cascadeMatches(user, Array.isArray(acceptables) ? acceptables : []);
+  }
+
+  return { configure, normalize, canonicalize, parseRational, isCorrect };
+});
@@ -27,6 +27,7 @@ from src.question_generator.arithmetic import (
     MultiplicationGenerator,
     SubtractionGenerator,
 )
+from src.question_generator.base import GENERATION_LOCK
 from src.question_generator.estimation import EstimationGenerator
 from src.question_generator.fractions import FractionsGenerator
 from src.question_generator.percentage import PercentageGenerator
@@ -86,14 +87,16 @@ class DailyChallenge:
 
         # Seed the global random module so generators are deterministic.
         # Combine with the index so each slot draws from a different stream.
-        prior_state = random.getstate()
-        try:
-            questions: List[Question] = []
-            for idx, generator in enumerate(plan):
-                random.seed(self._seed * 31 + idx)
-                questions.append(generator.generate(DAILY_DIFFICULTY))
-        finally:
-            random.setstate(prior_state)
+        # The lock keeps prefetch threads from drawing from it meanwhile.
+        with GENERATION_LOCK:
+            prior_state = random.getstate()
+            try:
+                questions: List[Question] = []
+                for idx, generator in enumerate(plan):
+                    random.seed(self._seed * 31 + idx)
+                    questions.append(generator.generate(DAILY_DIFFICULTY))
+            finally:
+                random.setstate(prior_state)
 
         return questions
 
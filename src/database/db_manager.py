@@ -1,15 +1,31 @@
 """Database manager for Mental Math Training App."""
 
+import json
+import math
+import os
 import sqlite3
+import threading
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
 
 import pandas as pd
 
+from src.database.derived import SOURCE_QUERIES, DerivedFold
+from src.database.reader import DEFAULT_CHUNK_SIZE, ChunkedReader
+from src.models.question import Question, question_fingerprint
+from src.models.review import ReviewItem
 from src.models.session import SessionConfig, SessionSummary, QuestionResult
 from src.models.user_stats import Badge
 
+# Data version per database file, shared by every DatabaseManager in the
+# process (one per browser session). See ``DatabaseManager.data_version``.
+_DATA_VERSIONS: Dict[str, int] = {}
+_DATA_VERSION_LOCK = threading.Lock()
+# Per thread: database file -> (inode, connection) kept open to read the
+# stored data version without connecting on every lookup.
+_VERSION_READERS = threading.local()
+
 
 class DatabaseManager:
     """Manages all database operations."""
@@ -31,12 +47,75 @@ class DatabaseManager:
         "targeted": "mixed",
     }
     
+    # User preference holding per-question-type sampling weights as a JSON
+    # object, e.g. {"division": 2, "estimation": 0.5}.
+    GENERATOR_WEIGHTS_PREF_KEY = "generator_weights"
+
+    # Derived-table folds, registered by the modules that own them (see
+    # ``src.database.derived``).
+    _FOLDS: List[Type[DerivedFold]] = []
+    # Source rows fetched per round trip when folding.
+    FOLD_CHUNK_SIZE = 5000
+
     def __init__(self, db_path: str = "data/mentalmath.db"):
         """Initialize database connection."""
         self.db_path = db_path
         # Ensure data directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         self.initialize_db()
+        # The file may have been replaced or migrated since anything was
+        # cached for this path.
+        self.bump_data_version()
+
+    @property
+    def _version_key(self) -> str:
+        return self.db_path if self.db_path == ":memory:" else os.path.realpath(self.db_path)
+
+    @property
+    def data_version(self) -> int:
+        """Counter that changes whenever data the analytics read changes.
+
+        Monotonic per database file. It is bumped by ``save_session``,
+        ``award_badge``, ``set_user_preference`` and ``update_streak``
+        (``StreakTracker.record_activity``), so caches keyed on it stay
+        valid until one of those writes lands. It is the sum of this
+        process's counter and the ``data_version`` row those writes bump
+        in their transactions, so writes from other processes sharing the
+        file (the API next to the Streamlit app) move it too.
+        """
+        with _DATA_VERSION_LOCK:
+            local = _DATA_VERSIONS.get(self._version_key, 0)
+        return local + self._stored_data_version()
+
+    def _stored_data_version(self) -> int:
+        if self.db_path == ":memory:":
+            return 0
+        readers = getattr(_VERSION_READERS, "conns", None)
+        if readers is None:
+            readers = _VERSION_READERS.conns = {}
+        key = self._version_key
+        try:
+            inode = os.stat(key).st_ino
+            reader = readers.get(key)
+            if reader is None or reader[0] != inode:
+                # First lookup here, or the file was replaced.
+                if reader is not None:
+                    reader[1].close()
+                reader = readers[key] = (inode, sqlite3.connect(key))
+            row = reader[1].execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+        except (OSError, sqlite3.Error):
+            return 0
+        return row[0] if row else 0
+
+    @staticmethod
+    def _bump_stored_data_version(cursor):
+        cursor.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+    def bump_data_version(self):
+        """Mark cached analytics for this database as stale."""
+        with _DATA_VERSION_LOCK:
+            key = self._version_key
+            _DATA_VERSIONS[key] = _DATA_VERSIONS.get(key, 0) + 1
     
     def get_connection(self) -> sqlite3.Connection:
         """Get a database connection."""
@@ -73,6 +152,8 @@ class DatabaseManager:
         """
         migrations = [
             ("questions_answered", "was_skipped", "BOOLEAN NOT NULL DEFAULT 0"),
+            ("journal_sessions", "owner", "TEXT"),
+            ("journal_sessions", "heartbeat_at", "DATETIME"),
         ]
         for table, column, definition in migrations:
             try:
@@ -120,8 +201,15 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?)
             """, (badge_name, description, category, icon))
     
-    def save_session(self, summary: SessionSummary) -> int:
-        """Save a completed session and return session_id."""
+    def save_session(self, summary: SessionSummary, journal_key: Optional[str] = None) -> int:
+        """Save a completed session and return session_id.
+
+        With ``journal_key``, the session's journal is compacted in the same
+        transaction. When it holds exactly one row per result, its rows are
+        copied into ``questions_answered`` with a single INSERT ... SELECT.
+        Otherwise the results are written from ``summary``. The journal is
+        deleted either way.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -162,14 +250,24 @@ class DatabaseManager:
         session_id = int(raw_session_id)
         
         # Save all question results
-        for result in summary.results:
-            self.save_question_answer(cursor, session_id, result)
+        if journal_key is not None and self._journal_length(cursor, journal_key) == len(summary.results):
+            self._compact_journal(cursor, session_id, journal_key)
+        else:
+            for result in summary.results:
+                self.save_question_answer(cursor, session_id, result)
+        if journal_key is not None:
+            self._delete_journal(cursor, journal_key)
         
-        # Update daily streak
+        # Update daily streak (and the stored data version)
         self.update_streak(cursor, summary.timestamp.date())
+
+        # The inserts above hold the write lock, so no other writer can
+        # fold the same rows.
+        self._fold(cursor, self._FOLDS)
         
         conn.commit()
         conn.close()
+        self.bump_data_version()
         
         return session_id
     
@@ -194,6 +292,291 @@ class DatabaseManager:
             result.timestamp
         ))
     
+    # -- Session journal ---------------------------------------------------
+
+    def append_journal(
+        self,
+        journal_key: str,
+        config: SessionConfig,
+        start_time: datetime,
+        entries: Iterable[Tuple[int, QuestionResult]],
+        owner: Optional[str] = None,
+    ):
+        """Write ``(seq, result)`` entries to a session's journal.
+
+        Entries are keyed by ``(journal_key, seq)``, so re-writing a seq
+        replaces it (a later, server-validated verdict wins over a
+        checkpointed client one). The journal is stamped with ``owner``
+        and the current time.
+        """
+        rows = [
+            (
+                journal_key,
+                seq,
+                result.question.question_type,
+                result.question.category,
+                result.question.difficulty,
+                result.question.question_text,
+                result.question.correct_answer,
+                json.dumps(result.question.acceptable_answers),
+                json.dumps(result.question.metadata, default=str),
+                result.user_answer,
+                result.is_correct,
+                result.was_skipped,
+                result.time_taken,
+                result.timestamp,
+            )
+            for seq, result in entries
+        ]
+        if not rows:
+            return
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                """
+                INSERT INTO journal_sessions (
+                    session_key, mode_type, category, difficulty,
+                    duration_seconds, question_count, start_time, owner, heartbeat_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(session_key) DO UPDATE SET
+                    owner = excluded.owner, heartbeat_at = excluded.heartbeat_at
+                """,
+                (
+                    journal_key,
+                    config.mode_type,
+                    config.category,
+                    config.difficulty,
+                    config.duration_seconds,
+                    config.question_count,
+                    start_time,
+                    owner,
+                    datetime.now(),
+                ),
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO journal_answers (
+                    session_key, seq, question_type, category, difficulty,
+                    question_text, correct_answer, acceptable_answers, metadata,
+                    user_answer, is_correct, was_skipped, time_taken_seconds, timestamp
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_journal_sessions(self) -> List[Dict]:
+        """Every journaled (unsaved) session, oldest first.
+
+        Each dict has ``session_key``, ``config`` (SessionConfig),
+        ``start_time``, ``answers``, ``last_answer_at``, ``owner`` and
+        ``heartbeat_at`` (None for journals written before they existed).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT s.*, COUNT(a.seq) AS answers, MAX(a.timestamp) AS last_answer_at
+            FROM journal_sessions s
+            LEFT JOIN journal_answers a ON a.session_key = s.session_key
+            GROUP BY s.session_key
+            ORDER BY s.start_time
+        """)
+        sessions = [
+            {
+                'session_key': row['session_key'],
+                'config': SessionConfig(
+                    mode_type=row['mode_type'],
+                    category=row['category'],
+                    difficulty=row['difficulty'],
+                    duration_seconds=row['duration_seconds'],
+                    question_count=row['question_count'],
+                ),
+                'start_time': self._parse_timestamp(row['start_time']),
+                'answers': row['answers'],
+                'last_answer_at': (
+                    self._parse_timestamp(row['last_answer_at']) if row['last_answer_at'] else None
+                ),
+                'owner': row['owner'],
+                'heartbeat_at': (
+                    self._parse_timestamp(row['heartbeat_at']) if row['heartbeat_at'] else None
+                ),
+            }
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return sessions
+
+    def get_journal_answers(self, journal_key: str) -> List[QuestionResult]:
+        """A session's journaled results in answer order."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM journal_answers WHERE session_key = ? ORDER BY seq",
+            (journal_key,),
+        )
+        results = [
+            QuestionResult(
+                question=Question(
+                    question_type=row['question_type'],
+                    category=row['category'],
+                    difficulty=row['difficulty'],
+                    question_text=row['question_text'],
+                    correct_answer=row['correct_answer'],
+                    acceptable_answers=json.loads(row['acceptable_answers']),
+                    metadata=json.loads(row['metadata']),
+                ),
+                user_answer=row['user_answer'] or "",
+                is_correct=bool(row['is_correct']),
+                time_taken=row['time_taken_seconds'],
+                timestamp=self._parse_timestamp(row['timestamp']),
+                was_skipped=bool(row['was_skipped']),
+            )
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return results
+
+    def delete_journal(self, journal_key: str):
+        """Drop a session's journal without saving it."""
+        conn = self.get_connection()
+        self._delete_journal(conn.cursor(), journal_key)
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _parse_timestamp(value) -> datetime:
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+    @staticmethod
+    def _journal_length(cursor, journal_key: str) -> int:
+        cursor.execute("SELECT COUNT(*) FROM journal_answers WHERE session_key = ?", (journal_key,))
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def _compact_journal(cursor, session_id: int, journal_key: str):
+        """Copy a journal's rows into ``questions_answered`` in seq order."""
+        cursor.execute("""
+            INSERT INTO questions_answered (
+                session_id, question_type, difficulty, question_text,
+                correct_answer, user_answer, is_correct, was_skipped,
+                time_taken_seconds, timestamp
+            )
+            SELECT ?, question_type, difficulty, question_text,
+                   correct_answer, user_answer, is_correct, was_skipped,
+                   time_taken_seconds, timestamp
+            FROM journal_answers
+            WHERE session_key = ?
+            ORDER BY seq
+        """, (session_id, journal_key))
+
+    @staticmethod
+    def _delete_journal(cursor, journal_key: str):
+        cursor.execute("DELETE FROM journal_answers WHERE session_key = ?", (journal_key,))
+        cursor.execute("DELETE FROM journal_sessions WHERE session_key = ?", (journal_key,))
+
+    # -- Derived tables ------------------------------------------------------
+
+    @classmethod
+    def register_fold(cls, fold: Type[DerivedFold]) -> Type[DerivedFold]:
+        """Have ``save_session`` keep ``fold``'s table current (usable as a decorator)."""
+        if fold not in cls._FOLDS:
+            cls._FOLDS.append(fold)
+        return fold
+
+    @staticmethod
+    def watermark(cursor, name: str) -> int:
+        """Highest source-row id folded under ``derived_watermarks`` entry ``name``."""
+        cursor.execute("SELECT last_id FROM derived_watermarks WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _set_watermark(cursor, name: str, last_id: int):
+        cursor.execute(
+            "INSERT OR REPLACE INTO derived_watermarks (name, last_id) VALUES (?, ?)",
+            (name, last_id),
+        )
+
+    @staticmethod
+    def _behind(cursor, table: str, name: str) -> bool:
+        """Whether ``table`` has rows past watermark ``name``."""
+        cursor.execute(f"""
+            SELECT COALESCE((SELECT MAX(id) FROM {table}), 0)
+                 > COALESCE((SELECT last_id FROM derived_watermarks WHERE name = ?), 0)
+        """, (name,))
+        return bool(cursor.fetchone()[0])
+
+    def _fold(self, cursor, folds: Sequence[Type[DerivedFold]]) -> List[DerivedFold]:
+        """Fold source rows past the watermarks into each of ``folds``.
+
+        Each source table is read once, from the lowest watermark among
+        the folds that read it. Must run inside a write transaction.
+        Returns the finished passes.
+        """
+        passes = [fold(cursor) for fold in folds]
+        reader = cursor.connection.cursor()
+        for source, query in SOURCE_QUERIES.items():
+            readers = [(p, self.watermark(cursor, p.SOURCES[source])) for p in passes if source in p.SOURCES]
+            if not readers:
+                continue
+            last_id = min(mark for _, mark in readers)
+            reader.execute(query, (last_id,))
+            while True:
+                rows = reader.fetchmany(self.FOLD_CHUNK_SIZE)
+                if not rows:
+                    break
+                for fold_pass, mark in readers:
+                    new = rows if rows[0]["id"] > mark else [r for r in rows if r["id"] > mark]
+                    if new:
+                        fold_pass.add(source, new)
+                last_id = rows[-1]["id"]
+            for fold_pass, mark in readers:
+                if last_id > mark:
+                    self._set_watermark(cursor, fold_pass.SOURCES[source], last_id)
+        for fold_pass in passes:
+            fold_pass.finish(cursor)
+        return passes
+
+    def catch_up(self, fold: Type[DerivedFold], conn: Optional[sqlite3.Connection] = None) -> Optional[DerivedFold]:
+        """Fold rows ``save_session`` didn't (older history, other writers).
+
+        Uses ``conn`` if given, leaving it open. Returns the finished
+        pass, or None when ``fold``'s table was already current.
+        """
+        own = conn is None
+        conn = self.get_connection() if own else conn
+        cursor = conn.cursor()
+        try:
+            if not any(self._behind(cursor, table, name) for table, name in fold.SOURCES.items()):
+                return None
+            cursor.execute("BEGIN IMMEDIATE")
+            fold_pass = self._fold(cursor, [fold])[0]
+            conn.commit()
+            return fold_pass
+        finally:
+            if own:
+                conn.close()
+
+    def rebuild(self, fold: Type[DerivedFold]) -> DerivedFold:
+        """Drop ``fold``'s tables and fold the whole history again."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for table in fold.TABLES:
+                cursor.execute(f"DELETE FROM {table}")
+            cursor.executemany(
+                "DELETE FROM derived_watermarks WHERE name = ?",
+                [(name,) for name in fold.SOURCES.values()],
+            )
+            fold_pass = self._fold(cursor, [fold])[0]
+            conn.commit()
+            return fold_pass
+        finally:
+            conn.close()
+
     def get_session_history(self, limit: int = 50, days: Optional[int] = None) -> pd.DataFrame:
         """Retrieve past sessions."""
         conn = self.get_connection()
@@ -219,6 +602,18 @@ class DatabaseManager:
         conn.close()
         return df
     
+    def iter_answers(self, chunk_size: int = DEFAULT_CHUNK_SIZE, **options) -> Iterator[pd.DataFrame]:
+        """Stream ``questions_answered`` as compact typed chunks.
+
+        For reads over the whole history; see ``ChunkedReader.answers`` for
+        ``options``.
+        """
+        return ChunkedReader(self, chunk_size).answers(**options)
+
+    def iter_sessions(self, chunk_size: int = DEFAULT_CHUNK_SIZE, **options) -> Iterator[pd.DataFrame]:
+        """Stream completed sessions as compact typed chunks (``ChunkedReader.sessions``)."""
+        return ChunkedReader(self, chunk_size).sessions(**options)
+
     def get_questions_by_type(self, question_type: Optional[str] = None, limit: int = 100) -> pd.DataFrame:
         """Filter questions by category."""
         conn = self.get_connection()
@@ -240,6 +635,25 @@ class DatabaseManager:
         conn.close()
         return df
     
+    def get_recent_question_fingerprints(self, limit: int = 100) -> List[str]:
+        """Fingerprints of the most recently answered questions, newest first."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT question_type, question_text FROM questions_answered
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+        fingerprints = [
+            question_fingerprint(row['question_type'], row['question_text'])
+            for row in cursor.fetchall()
+        ]
+        conn.close()
+        return fingerprints
+
     def get_performance_stats(self, days: Optional[int] = None) -> Dict:
         """Get aggregate performance statistics.
 
@@ -354,8 +768,10 @@ class DatabaseManager:
                 INSERT INTO user_badges (badge_id, earned_timestamp)
                 VALUES (?, ?)
             """, (badge_id, datetime.now()))
+            self._bump_stored_data_version(cursor)
             
             conn.commit()
+            self.bump_data_version()
             return True
         except Exception as e:
             print(f"Error awarding badge: {e}")
@@ -370,68 +786,7 @@ class DatabaseManager:
             VALUES (?, 1)
             ON CONFLICT(date) DO UPDATE SET sessions_completed = sessions_completed + 1
         """, (activity_date,))
-    
-    def get_current_streak(self) -> int:
-        """Get current consecutive day streak."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT date FROM daily_streaks
-            ORDER BY date DESC
-        """)
-        
-        dates = [row['date'] for row in cursor.fetchall()]
-        conn.close()
-        
-        if not dates:
-            return 0
-        
-        # Convert strings to dates
-        dates = [datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d for d in dates]
-        
-        streak = 0
-        current_date = date.today()
-        
-        for activity_date in dates:
-            if activity_date == current_date or activity_date == current_date - timedelta(days=1):
-                streak += 1
-                current_date = activity_date - timedelta(days=1)
-            else:
-                break
-        
-        return streak
-    
-    def get_longest_streak(self) -> int:
-        """Get the longest streak ever achieved."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT date FROM daily_streaks
-            ORDER BY date ASC
-        """)
-        
-        dates = [row['date'] for row in cursor.fetchall()]
-        conn.close()
-        
-        if not dates:
-            return 0
-        
-        # Convert strings to dates
-        dates = [datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d for d in dates]
-        
-        max_streak = 1
-        current_streak = 1
-        
-        for i in range(1, len(dates)):
-            if dates[i] == dates[i-1] + timedelta(days=1):
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 1
-        
-        return max_streak
+        self._bump_stored_data_version(cursor)
     
     def get_weak_areas(self, threshold: float = 0.75) -> List[str]:
         """Identify categories with accuracy below threshold.
@@ -507,6 +862,170 @@ class DatabaseManager:
             """,
             (key, value),
         )
+        self._bump_stored_data_version(cursor)
+        conn.commit()
+        conn.close()
+        self.bump_data_version()
+
+    def get_generator_weight_overrides(self) -> Dict[str, float]:
+        """Per-question-type sampling weights saved in user preferences.
+
+        Malformed JSON or non-numeric / non-finite / negative entries are
+        ignored so a bad preference can't break question generation.
+        """
+        raw = self.get_user_preference(self.GENERATOR_WEIGHTS_PREF_KEY)
+        if not raw:
+            return {}
+        try:
+            parsed = json.loads(raw)
+        except ValueError:
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+        overrides = {}
+        for key, value in parsed.items():
+            try:
+                weight = float(value)
+            except (TypeError, ValueError):
+                continue
+            if math.isfinite(weight) and weight >= 0:
+                overrides[str(key)] = weight
+        return overrides
+
+    # Review timestamps are stored in one fixed format so due_at range scans
+    # compare correctly as text.
+    _REVIEW_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    @classmethod
+    def _review_item_from_row(cls, row: sqlite3.Row) -> ReviewItem:
+        last_reviewed = row['last_reviewed']
+        return ReviewItem(
+            fingerprint=row['fingerprint'],
+            question_type=row['question_type'],
+            category=row['category'],
+            difficulty=row['difficulty'],
+            question_text=row['question_text'],
+            correct_answer=row['correct_answer'],
+            due_at=datetime.strptime(row['due_at'], cls._REVIEW_TS_FORMAT),
+            acceptable_answers=json.loads(row['acceptable_answers']),
+            metadata=json.loads(row['metadata']),
+            easiness=row['easiness'],
+            interval_days=row['interval_days'],
+            repetitions=row['repetitions'],
+            lapses=row['lapses'],
+            last_reviewed=(
+                datetime.strptime(last_reviewed, cls._REVIEW_TS_FORMAT)
+                if last_reviewed else None
+            ),
+        )
+
+    def get_due_reviews(
+        self,
+        due_before: datetime,
+        question_types: Optional[Sequence[str]] = None,
+        limit: int = 200,
+        difficulty: Optional[str] = None,
+    ) -> List[ReviewItem]:
+        """Review items due at or before ``due_before``, earliest first.
+
+        Served from the ``due_at`` index as a range scan, so the cost depends
+        on ``limit`` rather than on how many items are tracked.
+
+        Args:
+            due_before: Upper bound on ``due_at``.
+            question_types: Restrict to these question types (None = any).
+            limit: Maximum number of items to return.
+            difficulty: Restrict to this difficulty (None = any).
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        params: list = [due_before.strftime(self._REVIEW_TS_FORMAT)]
+        type_filter = ""
+        if question_types is not None:
+            if not question_types:
+                conn.close()
+                return []
+            type_filter = f"AND question_type IN ({', '.join('?' * len(question_types))})"
+            params.extend(question_types)
+        if difficulty is not None:
+            type_filter += " AND difficulty = ?"
+            params.append(difficulty)
+        params.append(limit)
+        cursor.execute(
+            f"""
+            SELECT * FROM review_items
+            WHERE due_at <= ? {type_filter}
+            ORDER BY due_at
+            LIMIT ?
+            """,
+            params,
+        )
+        items = [self._review_item_from_row(row) for row in cursor.fetchall()]
+        conn.close()
+        return items
+
+    def get_review_items(self, fingerprints: Iterable[str]) -> Dict[str, ReviewItem]:
+        """Tracked review items for the given fingerprints, keyed by fingerprint."""
+        keys = list(dict.fromkeys(fingerprints))
+        if not keys:
+            return {}
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        items: Dict[str, ReviewItem] = {}
+        # Stay well under SQLite's host-parameter limit.
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            cursor.execute(
+                f"SELECT * FROM review_items WHERE fingerprint IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for row in cursor.fetchall():
+                items[row['fingerprint']] = self._review_item_from_row(row)
+        conn.close()
+        return items
+
+    def save_review_items(self, items: Iterable[ReviewItem]):
+        """Insert or update review items (upsert on fingerprint)."""
+        fmt = self._REVIEW_TS_FORMAT
+        rows = [
+            (
+                item.fingerprint,
+                item.question_type,
+                item.category,
+                item.difficulty,
+                item.question_text,
+                item.correct_answer,
+                json.dumps(item.acceptable_answers),
+                json.dumps(item.metadata, default=str),
+                item.easiness,
+                item.interval_days,
+                item.repetitions,
+                item.lapses,
+                item.due_at.strftime(fmt),
+                item.last_reviewed.strftime(fmt) if item.last_reviewed else None,
+            )
+            for item in items
+        ]
+        if not rows:
+            return
+        conn = self.get_connection()
+        conn.executemany(
+            """
+            INSERT INTO review_items (
+                fingerprint, question_type, category, difficulty, question_text,
+                correct_answer, acceptable_answers, metadata, easiness,
+                interval_days, repetitions, lapses, due_at, last_reviewed
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(fingerprint) DO UPDATE SET
+                easiness = excluded.easiness,
+                interval_days = excluded.interval_days,
+                repetitions = excluded.repetitions,
+                lapses = excluded.lapses,
+                due_at = excluded.due_at,
+                last_reviewed = excluded.last_reviewed
+            """,
+            rows,
+        )
         conn.commit()
         conn.close()
 
@@ -0,0 +1,74 @@
+"""Tables derived incrementally from the history tables.
+
+Latency sketches, badge counters and the activity bitmap are each kept
+current from new rows of ``sessions``, ``questions_answered`` or
+``daily_streaks``. What they compute lives with the code that owns them
+(``src.analytics.latency``, ``src.gamification.counters`` and
+``src.gamification.activity``). Each defines a ``DerivedFold`` and
+registers it with ``DatabaseManager.register_fold`` when imported.
+
+``DatabaseManager`` only does the reading and bookkeeping. It reads each
+source table once, from the lowest watermark among the folds that need
+it, and hands every fold the rows past its own ``derived_watermarks``
+entry:
+
+- ``save_session`` runs every registered fold inside its transaction, so
+  the rows it has just written are read once for all of them;
+- ``DatabaseManager.catch_up`` folds rows written any other way, or
+  before a fold was registered, when its table is next read;
+- ``DatabaseManager.rebuild`` recomputes a derived table from scratch.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, Sequence, Tuple
+
+# How each source table is read for folding, in id order from a
+# watermark. Folds look columns up by name.
+SOURCE_QUERIES: Dict[str, str] = {
+    "sessions": """
+        SELECT id, difficulty, completed, category
+        FROM sessions
+        WHERE id > ?
+        ORDER BY id
+    """,
+    "questions_answered": """
+        SELECT qa.id AS id, DATE(qa.timestamp) AS day, qa.question_type, qa.difficulty,
+               qa.is_correct, qa.was_skipped, qa.time_taken_seconds,
+               s.category = 'mixed' AS in_mixed
+        FROM questions_answered qa
+        LEFT JOIN sessions s ON s.id = qa.session_id
+        WHERE qa.id > ?
+        ORDER BY qa.id
+    """,
+    "daily_streaks": """
+        SELECT id, date
+        FROM daily_streaks
+        WHERE id > ?
+        ORDER BY id
+    """,
+}
+
+
+class DerivedFold:
+    """One pass of folding new source rows into a derived table.
+
+    Subclasses set ``SOURCES`` (source table -> ``derived_watermarks``
+    name) and ``TABLES`` (the derived tables ``rebuild`` clears). An
+    instance is created with the write transaction's cursor, receives new
+    rows through ``add`` in id order, one chunk at a time, and persists
+    its result in ``finish``. ``add`` must not use the cursor: the rows
+    are still being read.
+    """
+
+    SOURCES: Dict[str, str] = {}
+    TABLES: Tuple[str, ...] = ()
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        pass
+
+    def add(self, source: str, rows: Sequence[sqlite3.Row]):
+        raise NotImplementedError
+
+    def finish(self, cursor: sqlite3.Cursor):
+        raise NotImplementedError
@@ -0,0 +1,231 @@
+"""Chunked, typed reads of the answer and session history.
+
+``pd.read_sql_query`` materializes a whole result set as object and
+int64/float64 columns. That is fine for the LIMITed dashboard reads, but
+not for heavy-history analytics. ``ChunkedReader`` streams fixed-size
+DataFrames from a cursor instead, with explicit compact dtypes:
+
+- ids and counts as ``int32``, flags as ``bool``;
+- times as ``float32``, timestamps as ``datetime64``;
+- low-cardinality labels (question type, difficulty, mode, category) as
+  categoricals.
+
+Each category vocabulary grows as new labels arrive and never reorders.
+A chunk's categories therefore extend the previous chunk's, codes stay
+stable, and no extra DISTINCT scan is needed up front. ``concat`` aligns
+the vocabularies when chunks do need to be joined.
+
+``aggregate_answers`` combines per-chunk group sums, so peak memory
+depends on the chunk size, not on the length of the history.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Column kinds understood by ``_build_chunk``.
+ANSWER_COLUMNS = {
+    "id": "int32",
+    "session_id": "int32",
+    "question_type": "category",
+    "difficulty": "category",
+    "question_text": "text",
+    "correct_answer": "text",
+    "user_answer": "text",
+    "is_correct": "bool",
+    "was_skipped": "bool",
+    "time_taken_seconds": "float32",
+    "timestamp": "datetime",
+}
+SESSION_COLUMNS = {
+    "id": "int32",
+    "timestamp": "datetime",
+    "mode_type": "category",
+    "category": "category",
+    "difficulty": "category",
+    "duration_seconds": "int32",
+    "total_questions": "int32",
+    "correct_answers": "int32",
+    "total_score": "int32",
+    "avg_time_per_question": "float32",
+    "completed": "bool",
+}
+# Text columns are only read when asked for.
+DEFAULT_ANSWER_COLUMNS = tuple(name for name, kind in ANSWER_COLUMNS.items() if kind != "text")
+
+_AGGREGATE_SUMS = ["questions", "attempts", "correct", "time_sum"]
+
+
+class _Vocabulary:
+    """Append-only category list shared by every chunk of a read."""
+
+    def __init__(self):
+        self.categories: list[str] = []
+        self._known: set[str] = set()
+
+    def encode(self, values: Sequence) -> pd.Categorical:
+        for value in pd.unique(np.asarray(values, dtype=object)):
+            if value is not None and value not in self._known:
+                self._known.add(value)
+                self.categories.append(value)
+        return pd.Categorical(values, categories=self.categories)
+
+
+def _build_chunk(rows: list[tuple], columns: Sequence[str], kinds: dict[str, str],
+                 vocabularies: dict[str, _Vocabulary]) -> pd.DataFrame:
+    data = {}
+    for name, values in zip(columns, zip(*rows)):
+        kind = kinds[name]
+        if kind == "category":
+            data[name] = vocabularies[name].encode(values)
+        elif kind == "int32":
+            # The one nullable int (duration_seconds) reads NULL as 0 to stay int32.
+            data[name] = np.fromiter((v or 0 for v in values), dtype=np.int32, count=len(values))
+        elif kind == "bool":
+            data[name] = np.fromiter((bool(v) for v in values), dtype=bool, count=len(values))
+        elif kind == "float32":
+            data[name] = np.fromiter(
+                (np.nan if v is None else v for v in values), dtype=np.float32, count=len(values)
+            )
+        elif kind == "datetime":
+            data[name] = pd.to_datetime(pd.Series(values, dtype=object), format="ISO8601")
+        else:
+            data[name] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data, columns=list(columns))
+
+
+class ChunkedReader:
+    """Streams answers and sessions as compact DataFrames of ``chunk_size`` rows."""
+
+    def __init__(self, db_manager, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.db = db_manager
+        self.chunk_size = chunk_size
+
+    def _stream(self, table: str, kinds: dict[str, str], columns: Sequence[str],
+                where: list[str], params: list, order: str) -> Iterator[pd.DataFrame]:
+        unknown = [name for name in columns if name not in kinds]
+        if unknown:
+            raise ValueError(f"Unknown {table} columns: {unknown}")
+        query = f"SELECT {', '.join(columns)} FROM {table}"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {order}"
+
+        vocabularies = {name: _Vocabulary() for name in columns if kinds[name] == "category"}
+        conn = self.db.get_connection()
+        conn.row_factory = None  # plain tuples; Row objects cost more per row
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                yield _build_chunk(rows, columns, kinds, vocabularies)
+        finally:
+            conn.close()
+
+    def answers(
+        self,
+        columns: Sequence[str] = DEFAULT_ANSWER_COLUMNS,
+        *,
+        question_type: str | None = None,
+        session_id: int | None = None,
+        since: datetime | None = None,
+        include_skipped: bool = True,
+    ) -> Iterator[pd.DataFrame]:
+        """Chunks of ``questions_answered`` in insertion order."""
+        where, params = [], []
+        if question_type is not None:
+            where.append("question_type = ?")
+            params.append(question_type)
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since.strftime("%Y-%m-%d %H:%M:%S"))
+        if not include_skipped:
+            where.append("was_skipped = 0")
+        return self._stream("questions_answered", ANSWER_COLUMNS, columns, where, params, "id")
+
+    def sessions(
+        self,
+        columns: Sequence[str] = tuple(SESSION_COLUMNS),
+        *,
+        since: datetime | None = None,
+        completed_only: bool = True,
+    ) -> Iterator[pd.DataFrame]:
+        """Chunks of ``sessions``, oldest first."""
+        where, params = [], []
+        if completed_only:
+            where.append("completed = 1")
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since.strftime("%Y-%m-%d %H:%M:%S"))
+        return self._stream("sessions", SESSION_COLUMNS, columns, where, params, "timestamp, id")
+
+    def aggregate_answers(self, by: Sequence[str] = ("question_type",), **filters) -> pd.DataFrame:
+        """Per-group ``questions``, ``attempts``, ``correct``, ``accuracy`` and ``avg_time``.
+
+        ``questions`` counts skips. ``accuracy`` (percent) and ``avg_time``
+        cover non-skipped attempts, like the SQL analytics. ``filters`` go
+        to ``answers``.
+        """
+        by = list(by)
+        columns = list(dict.fromkeys([*by, "is_correct", "was_skipped", "time_taken_seconds"]))
+        categories: dict[str, pd.Index] = {}
+        total: pd.DataFrame | None = None
+        for chunk in self.answers(columns, **filters):
+            keys = {}
+            for name in by:
+                if isinstance(chunk[name].dtype, pd.CategoricalDtype):
+                    # Codes are stable across chunks (the vocabulary only grows).
+                    keys[name] = chunk[name].cat.codes
+                    categories[name] = chunk[name].cat.categories
+                else:
+                    keys[name] = chunk[name]
+            attempted = ~chunk["was_skipped"]
+            partial = pd.DataFrame({
+                **keys,
+                "questions": 1,
+                "attempts": attempted.astype(np.int64),
+                "correct": (chunk["is_correct"] & attempted).astype(np.int64),
+                "time_sum": chunk["time_taken_seconds"].astype(np.float64).where(attempted, 0.0),
+            }).groupby(by)[_AGGREGATE_SUMS].sum()
+            total = partial if total is None else total.add(partial, fill_value=0)
+
+        if total is None:
+            return pd.DataFrame(columns=[*by, "questions", "attempts", "correct", "accuracy", "avg_time"])
+        total = total.reset_index()
+        for name, labels in categories.items():
+            total[name] = pd.Categorical.from_codes(total[name], categories=labels)
+            total[name] = total[name].cat.reorder_categories(sorted(labels))
+        total = total.sort_values(by, ignore_index=True)
+        total[["questions", "attempts", "correct"]] = total[["questions", "attempts", "correct"]].astype(np.int64)
+        attempts = total["attempts"].where(total["attempts"] > 0)
+        total["accuracy"] = (total["correct"] / attempts * 100).fillna(0.0)
+        total["avg_time"] = (total["time_sum"] / attempts).fillna(0.0)
+        return total.drop(columns="time_sum")
+
+    @staticmethod
+    def concat(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """Join chunks into one frame with one vocabulary per categorical column."""
+        chunks = list(chunks)
+        if not chunks:
+            return pd.DataFrame()
+        last = chunks[-1]
+        aligned = []
+        for chunk in chunks:
+            chunk = chunk.copy()
+            for name in chunk.columns:
+                if isinstance(chunk[name].dtype, pd.CategoricalDtype):
+                    chunk[name] = chunk[name].cat.set_categories(last[name].cat.categories)
+            aligned.append(chunk)
+        return pd.concat(aligned, ignore_index=True)
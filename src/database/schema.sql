@@ -62,6 +62,98 @@ CREATE TABLE IF NOT EXISTS user_preferences (
     value TEXT NOT NULL
 );
 
+-- Review items: spaced-repetition (SM-2) state per question fingerprint
+CREATE TABLE IF NOT EXISTS review_items (
+    fingerprint TEXT PRIMARY KEY,
+    question_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_text TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    acceptable_answers TEXT NOT NULL DEFAULT '[]',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    easiness REAL NOT NULL DEFAULT 2.5,
+    interval_days REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    lapses INTEGER NOT NULL DEFAULT 0,
+    due_at DATETIME NOT NULL,
+    last_reviewed DATETIME
+);
+
+-- Session journal: answers of in-progress sessions, written as they come in
+-- so a restart loses nothing. save_session folds a session's journal into
+-- sessions/questions_answered and deletes it. owner is the process that last
+-- wrote the journal, at heartbeat_at (see SessionJournal.orphaned).
+CREATE TABLE IF NOT EXISTS journal_sessions (
+    session_key TEXT PRIMARY KEY,
+    mode_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    duration_seconds INTEGER,
+    question_count INTEGER,
+    start_time DATETIME NOT NULL,
+    owner TEXT,
+    heartbeat_at DATETIME
+);
+
+CREATE TABLE IF NOT EXISTS journal_answers (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    question_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_text TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    acceptable_answers TEXT NOT NULL DEFAULT '[]',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    user_answer TEXT,
+    is_correct BOOLEAN NOT NULL,
+    was_skipped BOOLEAN NOT NULL DEFAULT 0,
+    time_taken_seconds REAL NOT NULL,
+    timestamp DATETIME NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+
+-- Latency sketches: DDSketch (src/analytics/sketch.py) of the non-skipped
+-- response times per day, question type and difficulty. Merging them
+-- answers percentile queries without sorting questions_answered.
+CREATE TABLE IF NOT EXISTS latency_sketches (
+    day DATE NOT NULL,
+    question_type TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (day, question_type, difficulty)
+) WITHOUT ROWID;
+
+-- Badge counters: running totals the badge conditions read
+-- (src/gamification/counters.py), one row per counter.
+CREATE TABLE IF NOT EXISTS badge_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Activity bitmap: one bit per practice day since 1970-01-01
+-- (src/gamification/activity.py), folded from daily_streaks.
+CREATE TABLE IF NOT EXISTS activity_bitmap (
+    name TEXT PRIMARY KEY,
+    bits BLOB NOT NULL
+) WITHOUT ROWID;
+
+-- Data version: bumped in the same transaction as every write the analytics
+-- read, so caches in any process see it move (DatabaseManager.data_version).
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+
+-- Watermarks: highest source-row id folded into a derived table, so rows
+-- written by any path are caught up exactly once.
+CREATE TABLE IF NOT EXISTS derived_watermarks (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp);
 CREATE INDEX IF NOT EXISTS idx_sessions_category ON sessions(category);
@@ -69,3 +161,5 @@ CREATE INDEX IF NOT EXISTS idx_questions_session_id ON questions_answered(sessio
 CREATE INDEX IF NOT EXISTS idx_questions_type ON questions_answered(question_type);
 CREATE INDEX IF NOT EXISTS idx_questions_timestamp ON questions_answered(timestamp);
 CREATE INDEX IF NOT EXISTS idx_daily_streaks_date ON daily_streaks(date);
+CREATE INDEX IF NOT EXISTS idx_review_items_due ON review_items(due_at);
+CREATE INDEX IF NOT EXISTS idx_review_items_type_due ON review_items(question_type, due_at);
@@ -0,0 +1,252 @@
+"""Vectorized validation and scoring over whole sessions.
+
+The live path validates and scores one answer at a time
+(``AnswerValidator.validate`` then ``ScoreCalculator.calculate_question_score``).
+That is too slow for grading imported histories or re-scoring millions of
+stored rows after a rule change. This module does the same work on
+columnar NumPy arrays:
+
+- Each *distinct* answer string is parsed exactly once, using the same
+  parser as the compiled validator. The per-row comparisons then run as
+  array operations over a flattened (CSR-style) list of acceptable
+  answers.
+- Rows of the exact-rational question types (``EXACT_TYPES``) are routed
+  by their ``question_types`` entry to the question's ``ExactMatcher``,
+  one row at a time, as the live validator does. Those rows need the
+  source questions; without them ``validate_arrays`` raises.
+- Combo runs come from a running maximum of the last reset index. Combo
+  multipliers, speed bonuses and difficulty multipliers are applied with
+  ``np.select`` using the tier tables on ``ScoreCalculator``.
+
+Verdicts and scores match the scalar path question by question. The
+exact-type rows are the only ones not vectorized.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.game_logic import validation_spec as spec
+from src.game_logic.scoring import ScoreCalculator
+from src.game_logic.exact_validator import EXACT_TYPES, ExactMatcher
+from src.game_logic.validator import AnswerValidator, _Acceptable
+from src.models.question import Question
+from src.models.session import QuestionResult
+
+
+@dataclass
+class BatchEvaluation:
+    """Per-question verdicts, combo counts and scores for a batch."""
+    is_correct: np.ndarray  # bool
+    combo: np.ndarray  # int64, combo count after each answer
+    scores: np.ndarray  # int64
+
+    @property
+    def total_score(self) -> int:
+        return int(self.scores.sum())
+
+
+class _ParsedTable:
+    """Column-wise parse of a set of unique answer strings."""
+
+    def __init__(self, texts: Sequence[str], lower_codes: Dict[str, int]):
+        parsed = [_Acceptable(t) for t in texts]
+        self.lower = np.array([lower_codes.setdefault(p.lower, len(lower_codes)) for p in parsed], dtype=np.int64)
+        self.has_pct = np.array([p.pct is not None for p in parsed], dtype=bool)
+        self.pct = np.array([p.pct if p.pct is not None else 0.0 for p in parsed], dtype=np.float64)
+        self.has_frac = np.array([p.frac is not None for p in parsed], dtype=bool)
+        self.frac = np.array([p.frac if p.frac is not None else 0.0 for p in parsed], dtype=np.float64)
+        self.has_num = np.array([p.num is not None for p in parsed], dtype=bool)
+        self.num = np.array([p.num if p.num is not None else 0.0 for p in parsed], dtype=np.float64)
+
+
+def _factorize(texts: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """Unique strings (first-seen order) and each row's index into them."""
+    index: Dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(t, len(index)) for t in texts), dtype=np.int64, count=len(texts))
+    return list(index), codes
+
+
+def validate_arrays(
+    user_answers: Sequence[Optional[str]],
+    acceptable_answers: Sequence[Sequence[str]],
+    question_types: Sequence[str],
+    skipped: Optional[Sequence[bool]] = None,
+    questions: Optional[Sequence[Question]] = None,
+) -> np.ndarray:
+    """Bulk equivalent of ``AnswerValidator.validate`` (skips are never correct).
+
+    Args:
+        user_answers: One answer per question (None/blank is wrong).
+        acceptable_answers: The question's acceptable answers, one list per
+            question.
+        question_types: Question type per row. Rows of ``EXACT_TYPES`` are
+            decided by the exact rational engine, the rest by the float
+            cascade.
+        skipped: Optional per-question skip flags.
+        questions: Source questions. Required when any row has an exact
+            type, since the exact rules read the question's metadata.
+
+    Returns:
+        Boolean array of verdicts.
+
+    Raises:
+        ValueError: On length mismatch, or exact-type rows without
+            ``questions``.
+    """
+    n = len(user_answers)
+    if len(acceptable_answers) != n or len(question_types) != n:
+        raise ValueError("user_answers, acceptable_answers and question_types must have the same length")
+    if questions is not None and len(questions) != n:
+        raise ValueError("questions must have one entry per answer")
+    exact_rows = [i for i, t in enumerate(question_types) if t in EXACT_TYPES]
+    if exact_rows and questions is None:
+        raise ValueError("exact-type rows need their source questions")
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    stripped = [spec.normalize(a) if a else "" for a in user_answers]
+    answered = np.fromiter((bool(s) for s in stripped), dtype=bool, count=n)
+
+    # Flatten acceptable answers: owner[j] is the row of flat entry j.
+    lengths = np.fromiter((len(a) for a in acceptable_answers), dtype=np.int64, count=n)
+    owner = np.repeat(np.arange(n), lengths)
+    flat = [a for answers in acceptable_answers for a in answers]
+
+    lower_codes: Dict[str, int] = {}
+    user_unique, user_codes = _factorize(stripped)
+    acc_unique, acc_codes = _factorize(flat)
+    users = _ParsedTable(user_unique, lower_codes)
+    accs = _ParsedTable(acc_unique, lower_codes)
+
+    u = user_codes[owner]
+    a = acc_codes
+
+    exact = users.lower[u] == accs.lower[a]
+
+    both_pct = users.has_pct[u] & accs.has_pct[a]
+    both_frac = ~both_pct & users.has_frac[u] & accs.has_frac[a]
+    numeric = ~both_pct & ~both_frac & users.has_num[u] & accs.has_num[a]
+
+    with np.errstate(all="ignore"):
+        pct_ok = np.abs(users.pct[u] - accs.pct[a]) < spec.PCT_TOLERANCE
+        frac_ok = np.abs(users.frac[u] - accs.frac[a]) < spec.FRAC_TOLERANCE
+        user_num, acc_num = users.num[u], accs.num[a]
+        diff = np.abs(user_num - acc_num)
+        num_ok = np.where(
+            np.abs(acc_num) > spec.NUM_RELATIVE_ABOVE,
+            diff / np.abs(acc_num) < spec.NUM_RELATIVE_TOLERANCE,
+            diff < spec.NUM_ABSOLUTE_TOLERANCE,
+        )
+
+    match = exact | (both_pct & pct_ok) | (both_frac & frac_ok) | (numeric & num_ok)
+    correct = np.bincount(owner[match], minlength=n) > 0
+
+    for i in exact_rows:
+        matcher = AnswerValidator.compile(questions[i])
+        # build() gives up on questions missing their rule's metadata; the
+        # live validator then falls back to the float cascade too.
+        if isinstance(matcher, ExactMatcher):
+            correct[i] = bool(stripped[i]) and matcher.matches(stripped[i])
+
+    correct &= answered
+    if skipped is not None:
+        correct &= ~np.asarray(skipped, dtype=bool)
+    return correct
+
+
+def combo_counts(is_correct: np.ndarray, session_ids: Optional[Sequence] = None) -> np.ndarray:
+    """Combo count after each answer, as ``SessionManager.submit_answer`` tracks it.
+
+    A wrong answer resets to 0 and a correct one adds 1. With
+    ``session_ids`` the combo also restarts wherever the id changes, so
+    concatenated sessions can be scored in one call.
+    """
+    correct = np.asarray(is_correct, dtype=bool)
+    n = correct.size
+    idx = np.arange(n)
+    resets = np.where(correct, -1, idx)
+    if session_ids is not None and n:
+        ids = np.asarray(session_ids)
+        starts = np.ones(n, dtype=bool)
+        starts[1:] = ids[1:] != ids[:-1]
+        # A session's first answer counts from zero, like a reset just before it.
+        resets = np.where(starts, np.maximum(resets, idx - 1), resets)
+    last_reset = np.maximum.accumulate(resets)
+    return np.where(correct, idx - last_reset, 0).astype(np.int64)
+
+
+def score_arrays(
+    is_correct: np.ndarray,
+    times: Sequence[float],
+    difficulties: Sequence[str],
+    session_ids: Optional[Sequence] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bulk equivalent of ``ScoreCalculator.calculate_question_score``.
+
+    Args:
+        is_correct: Per-question verdicts.
+        times: Seconds taken per question.
+        difficulties: Served difficulty per question.
+        session_ids: Optional session key per row (combos reset between
+            sessions).
+
+    Returns:
+        (combo counts, per-question scores) as int64 arrays.
+    """
+    correct = np.asarray(is_correct, dtype=bool)
+    combo = combo_counts(correct, session_ids)
+    times = np.asarray(times, dtype=np.float64)
+
+    combo_mult = np.select(
+        [combo < limit for limit, _ in ScoreCalculator.COMBO_MULTIPLIER_TIERS],
+        [mult for _, mult in ScoreCalculator.COMBO_MULTIPLIER_TIERS],
+        ScoreCalculator.MAX_COMBO_MULTIPLIER,
+    )
+    speed_bonus = np.select(
+        [times < limit for limit, _ in ScoreCalculator.SPEED_BONUS_TIERS],
+        [float(bonus) for _, bonus in ScoreCalculator.SPEED_BONUS_TIERS],
+        0.0,
+    )
+    labels, inverse = _factorize(list(difficulties))
+    label_mult = np.array(
+        [ScoreCalculator.calculate_difficulty_multiplier(d) for d in labels], dtype=np.float64
+    )
+    diff_mult = label_mult[inverse] if labels else np.zeros(0)
+
+    # Same operation order as the scalar path, so the float results are
+    # bit-identical; int() truncation == trunc for these non-negative values.
+    raw = (ScoreCalculator.BASE_POINTS * combo_mult + speed_bonus) * diff_mult
+    scores = np.where(correct, np.trunc(raw), 0).astype(np.int64)
+    return combo, scores
+
+
+def evaluate_session(
+    user_answers: Sequence[Optional[str]],
+    acceptable_answers: Sequence[Sequence[str]],
+    times: Sequence[float],
+    difficulties: Sequence[str],
+    question_types: Sequence[str],
+    skipped: Optional[Sequence[bool]] = None,
+    session_ids: Optional[Sequence] = None,
+    questions: Optional[Sequence[Question]] = None,
+) -> BatchEvaluation:
+    """Validate and score a batch of answers in one pass."""
+    is_correct = validate_arrays(user_answers, acceptable_answers, question_types, skipped, questions)
+    combo, scores = score_arrays(is_correct, times, difficulties, session_ids)
+    return BatchEvaluation(is_correct=is_correct, combo=combo, scores=scores)
+
+
+def evaluate_results(results: Sequence[QuestionResult]) -> BatchEvaluation:
+    """Re-grade a session's ``QuestionResult`` list with the batch path."""
+    return evaluate_session(
+        [r.user_answer for r in results],
+        [r.question.acceptable_answers for r in results],
+        [r.time_taken for r in results],
+        [r.question.difficulty for r in results],
+        [r.question.question_type for r in results],
+        skipped=[r.was_skipped for r in results],
+        questions=[r.question for r in results],
+    )
@@ -0,0 +1,121 @@
+"""Duplicate-question suppression.
+
+A session keeps a "seen" filter of ``Question.fingerprint`` values.
+Generators are asked to retry when they produce one that is already in it
+(see ``QuestionGenerator.generate_unique``). There are two filter kinds:
+
+- ``SeenSet``: an exact set. Used for ordinary sessions, where it is
+  small.
+- ``BloomFilter``: fixed memory whatever the size. Used for long
+  marathons or when seeded with a cross-session history window. A false
+  positive only costs one extra retry.
+
+Both record how much retrying they caused in ``DedupStats``, so the cost
+of deduplication can be seen.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import Iterable, Union
+
+
+@dataclass
+class DedupStats:
+    """Counters for how much work deduplication caused."""
+    generated: int = 0  # questions handed out via generate_unique
+    retries: int = 0  # extra generate() calls caused by a duplicate
+    exhausted: int = 0  # times max_attempts ran out and a duplicate was accepted
+    retry_seconds: float = 0.0  # wall time spent on those extra calls
+
+    @property
+    def retry_rate(self) -> float:
+        return self.retries / self.generated if self.generated else 0.0
+
+
+class SeenSet:
+    """Exact membership over fingerprints."""
+
+    def __init__(self, items: Iterable[str] = ()):
+        self._items = set(items)
+        self.stats = DedupStats()
+
+    def add(self, fingerprint: str):
+        self._items.add(fingerprint)
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class BloomFilter:
+    """Fixed-size probabilistic membership (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, items: Iterable[str] = ()):
+        """Size the bit array for ``capacity`` items at ``error_rate``.
+
+        Args:
+            capacity: Expected number of distinct items.
+            error_rate: Target false-positive rate once ``capacity`` items
+                have been added.
+            items: Initial contents.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+        self.stats = DedupStats()
+        for item in items:
+            self.add(item)
+
+    def _positions(self, fingerprint: str):
+        # Kirsch-Mitzenmacher double hashing: k positions from two 64-bit halves.
+        digest = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, fingerprint: str):
+        new = False
+        for pos in self._positions(fingerprint):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                self._bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self._count += 1
+
+    def __contains__(self, fingerprint: str) -> bool:
+        for pos in self._positions(fingerprint):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Approximate number of distinct items added."""
+        return self._count
+
+
+SeenFilter = Union[SeenSet, BloomFilter]
+
+# Above this many expected fingerprints, switch from an exact set to a Bloom
+# filter.
+EXACT_LIMIT = 1000
+
+
+def make_seen_filter(expected_items: int, items: Iterable[str] = (), error_rate: float = 0.01) -> SeenFilter:
+    """Pick the right filter for ``expected_items`` and seed it with ``items``."""
+    if expected_items <= EXACT_LIMIT:
+        return SeenSet(items)
+    return BloomFilter(expected_items, error_rate, items)
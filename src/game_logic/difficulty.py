@@ -1,5 +1,6 @@
 """Difficulty adjustment logic for adaptive mode."""
-from typing import List, Tuple
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Tuple
 from src.models.session import QuestionResult
 
 
@@ -106,3 +107,110 @@ class DifficultyAdjuster:
     def get_initial_difficulty() -> str:
         """Get initial difficulty for adaptive mode."""
         return 'medium'
+
+
+class IncrementalDifficultyAdjuster:
+    """Stateful, O(1)-per-answer twin of ``DifficultyAdjuster.analyze_performance``.
+
+    ``analyze_performance`` re-slices and re-sums both windows on every call.
+    This keeps the two windows in ring buffers with running sums instead:
+    each answer shifts the oldest recent entry into the prior window and
+    drops the oldest prior entry, so ``record`` and ``suggest`` are constant
+    time. Decisions are identical to ``analyze_performance`` (see
+    ``tests/test_difficulty_window.py``):
+
+    - accuracy uses integer correct counts, so it is exact;
+    - running float time sums drift from the reference's left-to-right
+      ``sum()``, so when an average lands within ``TIME_GUARD`` of the
+      threshold we re-sum that window (at most WINDOW_SIZE items) in the
+      reference order before comparing;
+    - sums are rebuilt from the buffers every ``RESYNC_EVERY`` answers so
+      drift never accumulates over long marathons.
+    """
+
+    TIME_GUARD = 1e-6
+    RESYNC_EVERY = 512
+
+    def __init__(self, window_size: int = DifficultyAdjuster.WINDOW_SIZE):
+        self.window_size = window_size
+        self._recent: Deque[Tuple[int, float]] = deque()
+        self._prior: Deque[Tuple[int, float]] = deque()
+        self._recent_correct = 0
+        self._recent_time = 0.0
+        self._prior_correct = 0
+        self._prior_time = 0.0
+        self._last: Optional[QuestionResult] = None
+        self.count = 0
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.__init__(self.window_size)
+
+    def record(self, result: QuestionResult):
+        """Fold one answered question into both windows."""
+        entry = (1 if result.is_correct else 0, result.time_taken)
+        if len(self._recent) == self.window_size:
+            shifted = self._recent.popleft()
+            self._recent_correct -= shifted[0]
+            self._recent_time -= shifted[1]
+            if len(self._prior) == self.window_size:
+                dropped = self._prior.popleft()
+                self._prior_correct -= dropped[0]
+                self._prior_time -= dropped[1]
+            self._prior.append(shifted)
+            self._prior_correct += shifted[0]
+            self._prior_time += shifted[1]
+        self._recent.append(entry)
+        self._recent_correct += entry[0]
+        self._recent_time += entry[1]
+        self._last = result
+        self.count += 1
+        if self.count % self.RESYNC_EVERY == 0:
+            self._recent_time = sum(t for _, t in self._recent)
+            self._prior_time = sum(t for _, t in self._prior)
+
+    def sync(self, results: Sequence[QuestionResult]):
+        """Catch up with ``results`` (normally ``state.questions_answered``).
+
+        Only the unseen tail is folded in. If the list was replaced or
+        truncated behind our back we rebuild from scratch.
+        """
+        if self.count > len(results) or (self.count and results[self.count - 1] is not self._last):
+            self.reset()
+        for result in results[self.count:]:
+            self.record(result)
+
+    def _says_up(self, correct: int, time_sum: float, window: Deque[Tuple[int, float]]) -> bool:
+        n = len(window)
+        if correct / n < DifficultyAdjuster.UP_ACCURACY:
+            return False
+        avg_time = time_sum / n
+        if abs(avg_time - DifficultyAdjuster.UP_AVG_TIME) < self.TIME_GUARD:
+            avg_time = sum(t for _, t in window) / n
+        return avg_time < DifficultyAdjuster.UP_AVG_TIME
+
+    def suggest(self) -> str:
+        """Same contract as ``DifficultyAdjuster.analyze_performance``."""
+        if self.count < 3:
+            return 'medium'
+
+        current_difficulty = self._last.question.difficulty
+        recent_n = len(self._recent)
+        recent_up = self._says_up(self._recent_correct, self._recent_time, self._recent)
+        recent_down = self._recent_correct / recent_n < DifficultyAdjuster.DOWN_ACCURACY
+
+        if len(self._prior) == self.window_size:
+            prior_up = self._says_up(self._prior_correct, self._prior_time, self._prior)
+            prior_down = self._prior_correct / len(self._prior) < DifficultyAdjuster.DOWN_ACCURACY
+            if recent_up and prior_up:
+                return DifficultyAdjuster._increase_difficulty(current_difficulty)
+            if recent_down and prior_down:
+                return DifficultyAdjuster._decrease_difficulty(current_difficulty)
+            return current_difficulty
+
+        if recent_up:
+            return DifficultyAdjuster._increase_difficulty(current_difficulty)
+        elif recent_down:
+            return DifficultyAdjuster._decrease_difficulty(current_difficulty)
+        else:
+            return current_difficulty
@@ -0,0 +1,244 @@
+"""Exact rational answer checking for fraction, ratio, compound and
+estimation questions.
+
+The general validator compares through floats: it parses every answer as a
+percentage, then as a fraction, then as a number, and accepts a blanket
+0.001 / 1% band. For these question types this module parses the user's
+input once into an exact (numerator, denominator) integer pair and decides
+with exact arithmetic, dispatching on ``question_type``:
+
+- ``fractions``: the answer must equal one of the acceptable answers as a
+  rational, so "2/4" matches "1/2" but "0.33" no longer matches
+  "333/1000". For fraction-to-decimal questions, any decimal of at least
+  two places that is a correct rounding of numerator/denominator is also
+  accepted.
+- ``estimation``: the answer must lie in the generator's
+  ``[min_acceptable, max_acceptable]`` band. The bounds are converted
+  exactly from their float values, so the check agrees with the metadata
+  to the last bit.
+- ``ratios`` / ``compound``: the legacy numeric tolerance (0.1 absolute up
+  to 10, 1% relative above), evaluated without rounding error.
+
+In every case an exact (case-insensitive) match with an acceptable answer
+string is accepted. Input normalization and the number grammar come from
+``validation_spec``, and ``ExactMatcher.to_spec`` exports the rule so
+that the practice_loop frontend can apply it too. Questions missing what their rule needs (for example,
+an estimation without bounds) return None from ``ExactMatcher.build``, and
+the caller falls back to the general validator.
+"""
+from __future__ import annotations
+
+from math import gcd
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from src.game_logic import validation_spec as spec
+from src.models.question import Question
+
+EXACT_TYPES = frozenset({"fractions", "ratios", "compound", "estimation"})
+
+# Reject absurd exponents ("1e999999999") and digit strings before they
+# expand into huge ints.
+MAX_EXPONENT = spec.MAX_EXPONENT
+MAX_DIGITS = spec.MAX_DIGITS
+
+# A rational as a reduced (numerator, denominator) pair with denominator > 0.
+# Plain integer pairs are several times cheaper to build and compare than
+# fractions.Fraction, and every comparison below is cross-multiplied so no
+# division (or rounding) ever happens.
+Rational = Tuple[int, int]
+# (value, decimal places as typed). Places is None for a/b input.
+Parsed = Tuple[Rational, Optional[int]]
+
+
+def _reduce(num: int, den: int) -> Rational:
+    if den < 0:
+        num, den = -num, -den
+    g = gcd(num, den)
+    return (num // g, den // g) if g > 1 else (num, den)
+
+
+def _parse_decimal(text: str) -> Optional[Tuple[int, int, int]]:
+    """(numerator, denominator, places typed) for a decimal literal."""
+    m = spec.NUMBER_RE.fullmatch(text)
+    if not m:
+        return None
+    sign, whole, frac, bare_frac, exp = m.groups()
+    if whole is None:
+        whole, frac = "0", bare_frac
+    frac = frac or ""
+    if len(whole) + len(frac) > MAX_DIGITS or (exp and len(exp) > MAX_DIGITS):
+        return None
+    exponent = int(exp) if exp else 0
+    if abs(exponent) > MAX_EXPONENT:
+        return None
+    num = int(whole + frac)
+    if sign == "-":
+        num = -num
+    places = len(frac) - exponent
+    if places >= 0:
+        return num, 10 ** places, places
+    return num * 10 ** -places, 1, places
+
+
+def _spec_rational(value: float) -> Rational:
+    """Exact decimal value of a spec tolerance (0.01 -> 1/100, not the float)."""
+    num, den, _ = _parse_decimal(repr(value))
+    return _reduce(num, den)
+
+
+# Numeric tolerance for ratios / compound, as exact rationals.
+REL_ABOVE = _spec_rational(spec.NUM_RELATIVE_ABOVE)
+REL_TOLERANCE = _spec_rational(spec.NUM_RELATIVE_TOLERANCE)
+ABS_TOLERANCE = _spec_rational(spec.NUM_ABSOLUTE_TOLERANCE)
+
+
+def parse_rational(text: str) -> Optional[Parsed]:
+    """Parse a user-style answer into an exact rational.
+
+    Accepts integers, decimals (with exponent), ``a/b`` with decimal parts,
+    a leading '+', a trailing '%' (divides by 100), thousands commas, and
+    the same comma-as-decimal heuristic as the general validator ("12,3").
+
+    Returns:
+        ((numerator, denominator), decimal places typed) or None if
+        unparseable.
+    """
+    s = spec.strip(text)
+    if not s:
+        return None
+    percent = s.endswith('%')
+    if percent:
+        s = spec.strip(s[:-1])
+    if s.startswith('+'):
+        s = s[1:]
+
+    if '/' in s:
+        parts = s.split('/')
+        if len(parts) != 2:
+            return None
+        top = _parse_decimal(spec.strip(parts[0]))
+        bottom = _parse_decimal(spec.strip(parts[1]))
+        if top is None or bottom is None or bottom[0] == 0:
+            return None
+        num, den, places = top[0] * bottom[1], top[1] * bottom[0], None
+    else:
+        decimal = spec.comma_decimal(s)
+        parsed = _parse_decimal(decimal if decimal is not None else s.replace(',', ''))
+        if parsed is None:
+            return None
+        num, den, places = parsed
+
+    if percent:
+        den *= 100
+        if places is not None:
+            places += 2
+    return _reduce(num, den), places
+
+
+def _bound(value) -> Optional[Rational]:
+    """Exact rational of a metadata bound (floats convert without loss)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    try:
+        return value.as_integer_ratio()
+    except (OverflowError, ValueError):  # inf / nan
+        return None
+
+
+class ExactMatcher:
+    """Per-question exact rule, built once and reused for every input."""
+
+    __slots__ = ("key", "exact", "values", "low", "high", "rounding_ref", "min_places", "tolerant")
+
+    def __init__(self, key: Tuple[str, ...]):
+        self.key = key
+        self.exact: FrozenSet[str] = frozenset()
+        self.values: FrozenSet[Rational] = frozenset()
+        self.low: Optional[Rational] = None
+        self.high: Optional[Rational] = None
+        self.rounding_ref: Optional[Rational] = None
+        self.min_places = 0
+        self.tolerant = False
+
+    @classmethod
+    def build(cls, question: Question) -> Optional["ExactMatcher"]:
+        """Exact rule for ``question``, or None to use the general validator."""
+        if question.question_type not in EXACT_TYPES:
+            return None
+        matcher = cls(tuple(question.acceptable_answers))
+        matcher.exact = frozenset(spec.ascii_lower(spec.normalize(a)) for a in question.acceptable_answers)
+        parsed = (parse_rational(spec.normalize(a)) for a in question.acceptable_answers)
+        matcher.values = frozenset(p[0] for p in parsed if p is not None)
+        meta = question.metadata or {}
+
+        if question.question_type == "estimation":
+            matcher.low = _bound(meta.get("min_acceptable"))
+            matcher.high = _bound(meta.get("max_acceptable"))
+            if matcher.low is None or matcher.high is None:
+                return None
+        elif question.question_type == "fractions":
+            if meta.get("type") == "fraction_to_decimal":
+                num, den = meta.get("numerator"), meta.get("denominator")
+                if isinstance(num, int) and isinstance(den, int) and den:
+                    matcher.rounding_ref = _reduce(num, den)
+                    matcher.min_places = 2
+        else:  # ratios, compound
+            matcher.tolerant = True
+
+        if not matcher.values and matcher.low is None:
+            return None
+        return matcher
+
+    def matches(self, user_answer: str) -> bool:
+        """Check a normalized, non-empty user answer (``validation_spec.normalize``)."""
+        if spec.ascii_lower(user_answer) in self.exact:
+            return True
+        parsed = parse_rational(user_answer)
+        if parsed is None:
+            return False
+        value, places = parsed
+        if value in self.values:
+            return True
+
+        # All comparisons below are cross-multiplied; denominators are > 0.
+        num, den = value
+        if self.low is not None:
+            (lo_n, lo_d), (hi_n, hi_d) = self.low, self.high
+            if num * lo_d >= lo_n * den and num * hi_d <= hi_n * den:
+                return True
+        if self.rounding_ref is not None and places is not None and places >= self.min_places:
+            ref_n, ref_d = self.rounding_ref
+            # |value - ref| <= half a unit in the last typed place.
+            if abs(num * ref_d - ref_n * den) * 2 * 10 ** places <= den * ref_d:
+                return True
+        if self.tolerant:
+            (above_n, above_d), (rel_n, rel_d), (tol_n, tol_d) = REL_ABOVE, REL_TOLERANCE, ABS_TOLERANCE
+            for t_n, t_d in self.values:
+                diff = abs(num * t_d - t_n * den)  # |value - target| * den * t_d
+                if abs(t_n) * above_d > above_n * t_d:
+                    if diff * rel_d < rel_n * abs(t_n) * den:
+                        return True
+                elif diff * tol_d < tol_n * den * t_d:
+                    return True
+        return False
+
+    def to_spec(self) -> Dict[str, Any]:
+        """Rule descriptor for the frontend validator (see ``validator.js``).
+
+        Rationals are sent as [numerator, denominator] decimal strings, since
+        they can exceed the range JSON numbers survive in JavaScript.
+        """
+        def pair(value: Optional[Rational]):
+            return None if value is None else [str(value[0]), str(value[1])]
+
+        return {
+            "kind": "exact",
+            "exact": sorted(self.exact),
+            "values": sorted(pair(v) for v in self.values),
+            "low": pair(self.low),
+            "high": pair(self.high),
+            "rounding_ref": pair(self.rounding_ref),
+            "min_places": self.min_places,
+            "tolerant": self.tolerant,
+            "tolerance": [pair(REL_ABOVE), pair(REL_TOLERANCE), pair(ABS_TOLERANCE)],
+        }
@@ -0,0 +1,327 @@
+"""Session finalize with trusted client verdicts and a sampled audit.
+
+The practice_loop component validates every answer in the browser with the
+same spec-driven rules as the server (see ``validation_spec``), and returns
+its ``is_correct`` verdict with each result. Re-validating every answer at
+finalize makes finalize cost grow with session length, so
+``SessionFinalizer`` trusts those verdicts and re-checks only a sample:
+
+1. A provisional summary is built from the client verdicts. If it would
+   earn a verdict-dependent badge (``BadgeManager.preview_verdict_badges``),
+   every answer is validated on the server.
+2. Otherwise a random ``audit_rate`` share of the attempts (at least one)
+   is validated on the server and compared with the client.
+3. Any mismatch is logged and the whole session is escalated to full
+   validation.
+
+Results without a client verdict are always validated on the server.
+``audit_rate=1.0`` gives the old behaviour of validating everything.
+
+``checkpoint`` journals client-graded results while the session is still
+running (see ``SessionJournal``). ``replay`` overwrites them with the final
+results in one transaction. If the session never got that far, ``recover``
+rebuilds it from the journal, putting the journaled verdicts through the
+same checks first.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.game_logic.session_manager import SessionManager
+from src.game_logic.validator import AnswerValidator
+from src.gamification.badge_manager import BadgeManager
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionState, SessionSummary
+
+MODE_TRUSTED = "trusted"
+MODE_FULL = "full"
+
+
+def question_payloads(questions: Sequence[Question], start: int = 0) -> List[Dict[str, Any]]:
+    """JSON-safe questions for a client that validates answers itself.
+
+    ``id`` is the question's index among those served to the client (from
+    ``start``), which is the ``question_id`` its results refer back to.
+    """
+    out = []
+    for idx, q in enumerate(questions, start):
+        acceptable = [str(a) for a in (q.acceptable_answers or [q.correct_answer])]
+        out.append({
+            "id": idx,
+            "text": q.question_text,
+            "acceptable_answers": acceptable,
+            "correct_answer": str(q.correct_answer),
+            "needs_fraction_keyboard": any("/" in a for a in acceptable),
+            "rule": AnswerValidator.compile(q).to_spec(),
+        })
+    return out
+
+
+@dataclass
+class AuditMismatch:
+    """One answer where the client and server verdicts differ."""
+    index: int
+    question_id: int
+    user_answer: str
+    client_verdict: bool
+    server_verdict: bool
+
+
+@dataclass
+class FinalizeReport:
+    """How a session's verdicts were checked at finalize."""
+    mode: str  # MODE_TRUSTED or MODE_FULL
+    answers: int = 0
+    validated: int = 0  # answers validated on the server
+    escalation: Optional[str] = None  # "badge", "mismatch" or None
+    mismatches: List[AuditMismatch] = field(default_factory=list)
+    badges: List[str] = field(default_factory=list)  # previewed badge names
+
+
+@dataclass
+class _Row:
+    question_id: int
+    question: Question
+    user_answer: str
+    was_skipped: bool
+    time_taken: float
+    client_verdict: Optional[bool]
+    server_verdict: Optional[bool] = None
+
+    @property
+    def verdict(self) -> bool:
+        """Server verdict when there is one, else the client's."""
+        if self.server_verdict is not None:
+            return self.server_verdict
+        return bool(self.client_verdict)
+
+
+class SessionFinalizer:
+    """Replays component results into a session, auditing client verdicts."""
+
+    DEFAULT_AUDIT_RATE = 0.1
+
+    def __init__(
+        self,
+        session_manager: SessionManager,
+        badge_manager: Optional[BadgeManager] = None,
+        audit_rate: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        """Initialize the finalizer.
+
+        Args:
+            session_manager: Manager whose ``submit_answer`` records results
+            badge_manager: Used to preview badges; defaults to one on the
+                session manager's database
+            audit_rate: Share of attempts re-validated on the server
+                (0..1). Defaults to ``DEFAULT_AUDIT_RATE``.
+            rng: Random source for the audit sample
+        """
+        rate = self.DEFAULT_AUDIT_RATE if audit_rate is None else audit_rate
+        if not 0 <= rate <= 1:
+            raise ValueError("audit_rate must be between 0 and 1")
+        self.sm = session_manager
+        self.badges = badge_manager or BadgeManager(session_manager.db)
+        self.audit_rate = rate
+        self.rng = rng or random.Random()
+
+    def replay(
+        self,
+        state: SessionState,
+        questions: Sequence[Question],
+        results: Sequence[Dict[str, Any]],
+    ) -> FinalizeReport:
+        """Walk component results through ``submit_answer`` and mark the
+        session complete.
+
+        Args:
+            state: Session being finalized
+            questions: Questions served to the component, indexed by
+                ``question_id``
+            results: Result dicts returned by the practice_loop component
+
+        Returns:
+            FinalizeReport describing what was validated and why
+        """
+        rows = self._rows(questions, results)
+        report = self._check(state, rows)
+
+        with self.sm.journal.buffered():
+            for row in rows:
+                state.current_question = row.question
+                state.question_started_at = datetime.now() - timedelta(seconds=row.time_taken)
+                self.sm.submit_answer(state, row.user_answer, was_skipped=row.was_skipped, client_verdict=row.verdict)
+        state.is_complete = True
+        return report
+
+    def recover(self, journal_key: str) -> Optional[Tuple[SessionState, FinalizeReport]]:
+        """Rebuild a journaled session (``SessionManager.recover_session``)
+        with its verdicts checked as ``replay`` checks them.
+
+        Journaled verdicts are the client's, unchecked (see ``checkpoint``),
+        so they get the same badge preview, audit sample and escalation
+        before the session is scored. Corrected verdicts are written back
+        to the journal.
+
+        Args:
+            journal_key: Key of the journal (see ``SessionJournal.orphaned``)
+
+        Returns:
+            (rebuilt state, FinalizeReport), or None if there is no such journal
+        """
+        reports: List[FinalizeReport] = []
+
+        def check(state: SessionState, results: List[QuestionResult]) -> List[QuestionResult]:
+            rows = [
+                _Row(
+                    question_id=i,
+                    question=r.question,
+                    user_answer=r.user_answer or "",
+                    was_skipped=r.was_skipped,
+                    time_taken=r.time_taken,
+                    client_verdict=r.is_correct,
+                )
+                for i, r in enumerate(results)
+            ]
+            reports.append(self._check(state, rows))
+            checked = [self._result(row, r.timestamp) for row, r in zip(rows, results)]
+            # end_session saves from the journal, so corrections go there too.
+            self.sm.journal.write(state, [
+                (i, result) for i, (result, old) in enumerate(zip(checked, results))
+                if result.is_correct != old.is_correct
+            ])
+            return checked
+
+        state = self.sm.recover_session(journal_key, check=check)
+        if state is None:
+            return None
+        return state, reports[0]
+
+    def _check(self, state: SessionState, rows: List[_Row]) -> FinalizeReport:
+        """Server-validate what the client verdicts can't be trusted for."""
+        report = FinalizeReport(mode=MODE_TRUSTED, answers=len(rows))
+
+        # Answers the client didn't grade are always checked here.
+        self._validate(report, (row for row in rows if row.client_verdict is None))
+
+        report.badges = [b.badge_name for b in self.badges.preview_verdict_badges(self._provisional(state, rows))]
+        if report.badges:
+            report.mode, report.escalation = MODE_FULL, "badge"
+        else:
+            self._validate(report, self._audit_sample(rows))
+            report.mismatches = [
+                AuditMismatch(i, row.question_id, row.user_answer, row.client_verdict, row.server_verdict)
+                for i, row in enumerate(rows)
+                if row.client_verdict is not None
+                and row.server_verdict is not None
+                and row.client_verdict != row.server_verdict
+            ]
+            if report.mismatches:
+                print(
+                    f"Client verdict mismatch on {len(report.mismatches)} audited answer(s), "
+                    f"validating the whole session: "
+                    f"{[(m.user_answer, m.client_verdict, m.server_verdict) for m in report.mismatches]}"
+                )
+                report.mode, report.escalation = MODE_FULL, "mismatch"
+        if report.mode == MODE_FULL:
+            self._validate(report, rows)
+        return report
+
+    def checkpoint(
+        self,
+        state: SessionState,
+        questions: Sequence[Question],
+        results: Sequence[Dict[str, Any]],
+        start: int = 0,
+    ) -> int:
+        """Journal component results that haven't been replayed yet.
+
+        Verdicts are the client's, unchecked. ``replay`` overwrites these
+        rows when the session ends, and ``recover`` picks them up (and
+        checks them) if it never does.
+
+        Args:
+            state: Session the results belong to
+            questions: Questions served to the component, indexed by
+                ``question_id``
+            results: Result dicts from the component, starting at
+                answer number ``start``
+            start: Index of ``results[0]`` among the session's answers
+
+        Returns:
+            Number of answers journaled so far (``start`` if the write failed)
+        """
+        rows = self._rows(questions, results)
+        now = datetime.now()
+        entries = [(start + i, self._result(row, now)) for i, row in enumerate(rows)]
+        if not self.sm.journal.write(state, entries):
+            return start
+        return start + len(entries)
+
+    def _validate(self, report: FinalizeReport, rows: Iterable[_Row]):
+        """Server-validate attempts that haven't been validated yet."""
+        for row in rows:
+            if row.was_skipped or row.server_verdict is not None:
+                continue
+            row.server_verdict = self.sm.validator.validate(row.user_answer, row.question)
+            report.validated += 1
+
+    @staticmethod
+    def _rows(questions: Sequence[Question], results: Sequence[Dict[str, Any]]) -> List[_Row]:
+        rows = []
+        for cr in results:
+            qid = cr.get("question_id")
+            if qid is None or qid >= len(questions):
+                continue
+            verdict = cr.get("is_correct")
+            rows.append(_Row(
+                question_id=qid,
+                question=questions[qid],
+                user_answer=cr.get("user_answer") or "",
+                was_skipped=bool(cr.get("was_skipped")),
+                time_taken=float(cr.get("time_taken") or 0),
+                client_verdict=None if verdict is None else bool(verdict),
+            ))
+        return rows
+
+    def _audit_sample(self, rows: List[_Row]) -> List[_Row]:
+        """Client-graded attempts to re-validate (at least one if any)."""
+        candidates = [row for row in rows if not row.was_skipped and row.client_verdict is not None]
+        sample = [row for row in candidates if self.rng.random() < self.audit_rate]
+        if not sample and candidates and self.audit_rate > 0:
+            sample = [self.rng.choice(candidates)]
+        return sample
+
+    @staticmethod
+    def _result(row: _Row, timestamp: datetime) -> QuestionResult:
+        """A row as graded by the client."""
+        return QuestionResult(
+            question=row.question,
+            user_answer=row.user_answer,
+            is_correct=row.verdict and not row.was_skipped,
+            time_taken=row.time_taken,
+            timestamp=timestamp,
+            was_skipped=row.was_skipped,
+        )
+
+    @staticmethod
+    def _provisional(state: SessionState, rows: List[_Row]) -> SessionSummary:
+        """Summary of the session as the client graded it (nothing is saved)."""
+        now = datetime.now()
+        results = [SessionFinalizer._result(row, now) for row in rows]
+        total = len(results)
+        return SessionSummary(
+            session_id=None,
+            config=state.config,
+            total_questions=total,
+            correct_answers=sum(1 for r in results if r.is_correct),
+            total_score=0,
+            avg_time_per_question=sum(r.time_taken for r in results) / total if total else 0.0,
+            duration_seconds=int((now - state.start_time).total_seconds()),
+            results=results,
+            timestamp=state.start_time,
+        )
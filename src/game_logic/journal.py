@@ -0,0 +1,143 @@
+"""Per-answer session journal.
+
+Nothing used to reach the database until ``end_session``. A restart in the
+middle of a marathon lost every answer, and ``save_session`` then wrote
+the whole session in one burst. ``SessionJournal`` appends answers to the
+``journal_answers`` table as they arrive, one small write each:
+
+- ``SessionManager.submit_answer`` journals every result it records.
+- The practice page journals the component's client-graded results
+  (``SessionFinalizer.checkpoint``) every time the component reports back
+  mid-session. The final replay then overwrites those rows with the
+  server's results.
+
+``DatabaseManager.save_session`` compacts the journal into the normal
+``sessions``/``questions_answered`` rows. After a restart,
+``SessionManager.recover_session`` rebuilds a session's state from its
+journal; ``SessionFinalizer.recover`` does so after checking the
+client-graded verdicts.
+
+Journals opened by this process are "live". Every write also stamps the
+journal with this process's ``PROCESS_ID`` and the time, so another
+process sharing the database (the API next to the Streamlit app) sees it
+as live too until it goes ``STALE_AFTER`` without a write. ``orphaned``
+lists the rest: sessions whose process closed them, or went away, before
+saving them.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.models.session import QuestionResult, SessionState
+
+# Journal keys opened by this process.
+_LIVE_KEYS: Set[str] = set()
+_LIVE_LOCK = threading.Lock()
+# Stamped on this process's journal writes.
+PROCESS_ID = uuid.uuid4().hex
+# A journal another process hasn't written for this long is orphaned.
+# Matches SessionStore's default idle TTL: a running session is touched,
+# and checkpointed, far more often than that.
+STALE_AFTER = timedelta(minutes=30)
+
+
+class SessionJournal:
+    """Append-only answer journal for in-progress sessions."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        # While a thread is inside ``buffered()``, its writes are held per
+        # session state and go out as one transaction when the outermost
+        # block exits. Per thread, so concurrent sessions sharing a
+        # SessionManager never flush each other's writes.
+        self._local = threading.local()
+
+    def _buffer(self) -> Dict[int, Tuple[SessionState, List[Tuple[int, QuestionResult]]]]:
+        if not hasattr(self._local, "buffer"):
+            self._local.buffer = {}
+            self._local.depth = 0
+        return self._local.buffer
+
+    @staticmethod
+    def open() -> str:
+        """A new journal key, marked live in this process."""
+        key = uuid.uuid4().hex
+        with _LIVE_LOCK:
+            _LIVE_KEYS.add(key)
+        return key
+
+    @staticmethod
+    def adopt(journal_key: str):
+        """Mark a recovered journal as live in this process."""
+        with _LIVE_LOCK:
+            _LIVE_KEYS.add(journal_key)
+
+    @staticmethod
+    def close(journal_key: str):
+        with _LIVE_LOCK:
+            _LIVE_KEYS.discard(journal_key)
+
+    def append(self, state: SessionState, seq: int, result: QuestionResult) -> bool:
+        """Journal ``result`` as the session's ``seq``-th answer."""
+        return self.write(state, [(seq, result)])
+
+    def write(self, state: SessionState, entries: Sequence[Tuple[int, QuestionResult]]) -> bool:
+        """Journal ``(seq, result)`` entries for ``state``.
+
+        Returns False if the write failed. The session carries on either
+        way; ``save_session`` falls back to writing results from memory
+        when the journal is incomplete.
+        """
+        if state.journal_key is None or not entries:
+            return True
+        buffer = self._buffer()
+        if self._local.depth:
+            buffer.setdefault(id(state), (state, []))[1].extend(entries)
+            return True
+        try:
+            self.db.append_journal(state.journal_key, state.config, state.start_time, entries, owner=PROCESS_ID)
+        except sqlite3.Error as e:
+            print(f"Failed to journal answers: {e}")
+            return False
+        return True
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """Hold writes and flush them as one transaction per session on exit."""
+        self._buffer()
+        self._local.depth += 1
+        try:
+            yield
+        finally:
+            self._local.depth -= 1
+            if not self._local.depth:
+                pending, self._local.buffer = self._local.buffer, {}
+                for state, entries in pending.values():
+                    self.write(state, entries)
+
+    def orphaned(self) -> List[Dict]:
+        """Journaled sessions no process is running (see
+        ``DatabaseManager.get_journal_sessions`` for the dict shape).
+
+        Live here means opened and not closed; live elsewhere means
+        written by another process within ``STALE_AFTER``.
+        """
+        with _LIVE_LOCK:
+            live = set(_LIVE_KEYS)
+        cutoff = datetime.now() - STALE_AFTER
+        return [
+            s for s in self.db.get_journal_sessions()
+            if s['session_key'] not in live
+            and (s['owner'] in (None, PROCESS_ID) or s['heartbeat_at'] is None or s['heartbeat_at'] < cutoff)
+        ]
+
+    def discard(self, journal_key: str):
+        """Delete a journal without saving it."""
+        self.db.delete_journal(journal_key)
+        self.close(journal_key)
@@ -0,0 +1,217 @@
+"""Background question prefetching for the practice loop.
+
+``show_practice_session`` used to materialise a fixed number of questions
+synchronously before mounting the ``practice_loop`` component. Short sessions
+paid for questions they never saw and long sprints could outrun the buffer.
+
+``QuestionPrefetcher`` is a small producer/consumer pipeline instead: a daemon
+thread keeps a bounded ring buffer of upcoming questions topped up, and the
+page drains it in batches whenever the component asks for a refill. The
+buffer is sized from the trainee's answer rate (historical average first,
+then the live rate reported by the component) so it always holds roughly
+``HORIZON_SECONDS`` worth of questions.
+
+Generation goes through ``SessionManager.get_next_question`` under the
+process-wide ``GENERATION_LOCK``, so the producer thread, any synchronous
+top-up and the daily challenge's seeded draws never interleave. If the
+producer fails, the error is kept and re-raised by the next ``take``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+from src.models.question import Question
+from src.models.session import SessionState
+from src.question_generator.base import GENERATION_LOCK
+
+
+class QuestionPrefetcher:
+    """Keeps a bounded buffer of upcoming questions for one session."""
+
+    # Seconds of practice the buffer should cover at the current answer rate.
+    HORIZON_SECONDS = 30.0
+    MIN_CAPACITY = 8
+    MAX_CAPACITY = 120
+    # Used until we know anything about the trainee's pace.
+    DEFAULT_AVG_TIME = 4.0
+    # Floor on the per-answer time so a burst of instant skips can't size
+    # the buffer to MAX_CAPACITY on its own.
+    MIN_AVG_TIME = 0.5
+    # Abandoned tabs: the producer exits if nobody drains it for this long.
+    IDLE_TIMEOUT_SECONDS = 600.0
+
+    def __init__(
+        self,
+        session_manager,
+        state: SessionState,
+        *,
+        limit: Optional[int] = None,
+        avg_time: Optional[float] = None,
+    ):
+        """Create a prefetcher (call ``start`` to launch the producer).
+
+        Args:
+            session_manager: ``SessionManager`` used to generate questions.
+            state: Session the questions are generated for.
+            limit: Total number of questions this session can ever need
+                (marathon / targeted). ``None`` means unbounded (sprint).
+            avg_time: Expected seconds per answer. Falls back to
+                ``DEFAULT_AVG_TIME``.
+        """
+        self.sm = session_manager
+        self.state = state
+        self.limit = limit
+        self._avg_time = max(avg_time or self.DEFAULT_AVG_TIME, self.MIN_AVG_TIME)
+        self._buffer: Deque[Question] = deque()
+        self._produced = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+        self._last_take = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Sizing
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def capacity_for(cls, avg_time: float, horizon: Optional[float] = None) -> int:
+        """Buffer size covering ``horizon`` seconds at ``avg_time`` per answer."""
+        horizon = cls.HORIZON_SECONDS if horizon is None else horizon
+        per_answer = max(float(avg_time or cls.DEFAULT_AVG_TIME), cls.MIN_AVG_TIME)
+        wanted = int(horizon / per_answer) + 1
+        return max(cls.MIN_CAPACITY, min(cls.MAX_CAPACITY, wanted))
+
+    @property
+    def capacity(self) -> int:
+        """Current target size of the ring buffer."""
+        return self.capacity_for(self._avg_time)
+
+    @property
+    def avg_time(self) -> float:
+        return self._avg_time
+
+    def observe_rate(self, answered: Optional[int], elapsed_seconds: Optional[float]):
+        """Fold the live answer rate reported by the component into sizing.
+
+        The live rate replaces the historical estimate once a handful of
+        answers are in; before that it would be too noisy to trust.
+        """
+        try:
+            answered = int(answered or 0)
+            elapsed = float(elapsed_seconds or 0.0)
+        except (TypeError, ValueError):
+            return
+        if answered < 3 or elapsed <= 0:
+            return
+        with self._cond:
+            self._avg_time = max(elapsed / answered, self.MIN_AVG_TIME)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Producer
+    # ------------------------------------------------------------------
+
+    @property
+    def exhausted(self) -> bool:
+        """True once ``limit`` questions were produced and the buffer is empty."""
+        with self._cond:
+            return self._limit_reached() and not self._buffer
+
+    def _limit_reached(self) -> bool:
+        return self.limit is not None and self._produced >= self.limit
+
+    def _generate(self) -> Question:
+        with GENERATION_LOCK:
+            return self.sm.get_next_question(self.state)
+
+    def start(self) -> "QuestionPrefetcher":
+        """Launch the background producer thread (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run,
+                name="question-prefetch",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 1.0) -> bool:
+        """Stop the producer and wait up to ``timeout`` seconds for it to exit.
+
+        ``timeout=None`` waits until the thread is gone; callers about to
+        touch the session state themselves must use it. Returns True once
+        no producer thread is running.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is None or thread is threading.current_thread():
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while (
+                    not self._stopped
+                    and not self._limit_reached()
+                    and len(self._buffer) >= self.capacity
+                ):
+                    self._cond.wait(timeout=1.0)
+                    if time.monotonic() - self._last_take > self.IDLE_TIMEOUT_SECONDS:
+                        self._stopped = True
+                if self._stopped or self._limit_reached():
+                    return
+                # Reserve the slot before releasing the lock so a concurrent
+                # synchronous top-up can't overshoot ``limit``.
+                self._produced += 1
+            try:
+                question = self._generate()
+            except Exception as exc:
+                # Nobody joins a daemon thread; hand the error to ``take``.
+                with self._cond:
+                    self._produced -= 1
+                    self._stopped = True
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._buffer.append(question)
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------
+
+    def take(self, count: int, minimum: int = 1) -> List[Question]:
+        """Drain up to ``count`` buffered questions.
+
+        Never returns fewer than ``minimum`` questions unless ``limit`` is
+        hit: if the producer is behind, the shortfall is generated
+        synchronously so the practice loop can't starve. Re-raises the
+        producer thread's error, if it failed.
+        """
+        taken: List[Question] = []
+        with self._cond:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+            self._last_take = time.monotonic()
+            while self._buffer and len(taken) < count:
+                taken.append(self._buffer.popleft())
+            self._cond.notify_all()
+
+        while len(taken) < min(minimum, count):
+            with self._cond:
+                if self._limit_reached():
+                    break
+                self._produced += 1
+            taken.append(self._generate())
+        return taken
@@ -0,0 +1,193 @@
+"""Spaced-repetition scheduling for missed questions (SM-2).
+
+Every missed question is tracked in the ``review_items`` table under its
+``Question.fingerprint`` with SM-2 state (easiness, interval, repetitions)
+and a ``due_at`` timestamp. Once tracked, each later sighting of the same
+question updates the schedule, whether it came back as a review or was
+generated again by chance.
+
+During a session, ``ReviewQueue`` holds the due items in a min-heap keyed
+on ``due_at``. It is loaded lazily on the first question from an indexed
+range scan capped at ``LOAD_LIMIT`` rows, so start-up cost does not grow
+with the number of tracked items. Each pop is O(log n). Reviews are
+interleaved into the normal question stream, up to ``MAX_SHARE`` of the
+questions served.
+"""
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.models.question import Question
+from src.models.review import ReviewItem
+from src.models.session import QuestionResult
+
+
+class SM2:
+    """SM-2 schedule updates on a ``ReviewItem``."""
+
+    MIN_EASINESS = 1.3
+    # A failed item comes back after this delay rather than a full day, so
+    # it can resurface in the next session.
+    RELEARN_DELAY = timedelta(minutes=10)
+
+    # Answer-time cut-offs for mapping a correct answer to a quality grade.
+    FAST_SECONDS = 5.0
+    SLOW_SECONDS = 15.0
+
+    @classmethod
+    def quality_for(cls, result: QuestionResult) -> int:
+        """Grade an attempt on SM-2's 0-5 scale.
+
+        Skips score 0, wrong answers 1. Correct answers score 5, 4 or 3
+        depending on how quickly they were given.
+        """
+        if result.was_skipped:
+            return 0
+        if not result.is_correct:
+            return 1
+        if result.time_taken <= cls.FAST_SECONDS:
+            return 5
+        if result.time_taken <= cls.SLOW_SECONDS:
+            return 4
+        return 3
+
+    @classmethod
+    def schedule(cls, item: ReviewItem, quality: int, now: datetime) -> ReviewItem:
+        """Apply one review of ``quality`` (0-5) to ``item`` in place."""
+        if quality < 3:
+            item.repetitions = 0
+            item.lapses += 1
+            item.interval_days = 0.0
+            item.due_at = now + cls.RELEARN_DELAY
+        else:
+            if item.repetitions == 0:
+                item.interval_days = 1.0
+            elif item.repetitions == 1:
+                item.interval_days = 6.0
+            else:
+                item.interval_days = round(item.interval_days * item.easiness, 2)
+            item.repetitions += 1
+            item.due_at = now + timedelta(days=item.interval_days)
+
+        penalty = 5 - quality
+        item.easiness = max(
+            cls.MIN_EASINESS,
+            item.easiness + 0.1 - penalty * (0.08 + penalty * 0.02),
+        )
+        item.last_reviewed = now
+        return item
+
+
+class ReviewQueue:
+    """Per-session min-heap of due review items."""
+
+    # Also pick up items that fall due during the session.
+    LOOKAHEAD = timedelta(minutes=30)
+    LOAD_LIMIT = 200
+    # At most this fraction of served questions are reviews.
+    MAX_SHARE = 0.25
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        question_types: Optional[Sequence[str]] = None,
+        difficulty: Optional[str] = None,
+    ):
+        """Create an unloaded queue.
+
+        Args:
+            db_manager: Source of due review items.
+            question_types: Only review these types (the session's pool).
+            difficulty: Only review items of this difficulty (None = any).
+        """
+        self.db = db_manager
+        self.question_types = list(question_types) if question_types is not None else None
+        self.difficulty = difficulty
+        self._heap: Optional[List[Tuple[datetime, int, ReviewItem]]] = None
+        self.generated = 0
+        self.served = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._heap is not None
+
+    def __len__(self) -> int:
+        return len(self._heap) if self._heap is not None else 0
+
+    def _load(self, now: datetime):
+        items = self.db.get_due_reviews(
+            now + self.LOOKAHEAD, self.question_types, limit=self.LOAD_LIMIT, difficulty=self.difficulty
+        )
+        # The index breaks due_at ties so ReviewItems are never compared.
+        self._heap = [(item.due_at, i, item) for i, item in enumerate(items)]
+        heapq.heapify(self._heap)
+
+    def next_question(self, now: Optional[datetime] = None) -> Optional[Question]:
+        """Called once per question served; returns a due review or None.
+
+        Returns None when no review is due yet or when serving one would push
+        reviews above ``MAX_SHARE`` of the session.
+        """
+        now = now or datetime.now()
+        self.generated += 1
+        if self.served >= self.MAX_SHARE * self.generated:
+            return None
+        if self._heap is None:
+            self._load(now)
+        if not self._heap or self._heap[0][0] > now:
+            return None
+        _, _, item = heapq.heappop(self._heap)
+        self.served += 1
+        return item.to_question()
+
+
+class ReviewScheduler:
+    """Creates session queues and folds finished sessions into the schedule."""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+
+    def queue_for(
+        self,
+        question_types: Optional[Sequence[str]] = None,
+        difficulty: Optional[str] = None,
+    ) -> ReviewQueue:
+        """Lazily loaded review queue limited to ``question_types`` and ``difficulty``."""
+        return ReviewQueue(self.db, question_types, difficulty)
+
+    def record_session(
+        self,
+        results: Iterable[QuestionResult],
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Update tracked items from a session's results and start tracking misses.
+
+        Results are applied in order, so a question seen twice in one session
+        gets two updates.
+
+        Returns:
+            Number of review items written.
+        """
+        results = list(results)
+        if not results:
+            return 0
+        now = now or datetime.now()
+        fingerprints = [r.question.fingerprint for r in results]
+        tracked: Dict[str, ReviewItem] = self.db.get_review_items(fingerprints)
+        changed: Dict[str, ReviewItem] = {}
+
+        for fingerprint, result in zip(fingerprints, results):
+            item = tracked.get(fingerprint)
+            if item is None:
+                if result.is_correct:
+                    continue
+                item = ReviewItem.from_question(result.question, due_at=now)
+                tracked[fingerprint] = item
+            SM2.schedule(item, SM2.quality_for(result), now)
+            changed[fingerprint] = item
+
+        self.db.save_review_items(changed.values())
+        return len(changed)
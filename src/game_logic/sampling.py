@@ -0,0 +1,78 @@
+"""Weighted sampling for generator selection.
+
+``AliasSampler`` implements Walker's alias method (Vose's variant): an O(n)
+table build, then O(1) weighted draws — one uniform index plus one biased
+coin flip. ``SessionManager`` builds one per session configuration and
+reuses it for every question until the underlying weights change.
+"""
+from __future__ import annotations
+
+import math
+import random
+from typing import Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AliasSampler(Generic[T]):
+    """O(1) weighted choice over a fixed set of items."""
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]):
+        """Build the alias table.
+
+        Args:
+            items: Items to draw from.
+            weights: Finite, non-negative weights, one per item. Zero-weight
+                items are never drawn.
+
+        Raises:
+            ValueError: On length mismatch, negative or non-finite weights,
+                or no positive weight at all.
+        """
+        if len(items) != len(weights):
+            raise ValueError("items and weights must have the same length")
+        if not all(math.isfinite(w) and w >= 0 for w in weights):
+            raise ValueError("weights must be finite and non-negative")
+
+        pairs = [(item, float(w)) for item, w in zip(items, weights) if w > 0]
+        if not pairs:
+            raise ValueError("at least one weight must be positive")
+
+        self.items: List[T] = [item for item, _ in pairs]
+        self.weights: Tuple[float, ...] = tuple(w for _, w in pairs)
+
+        n = len(pairs)
+        total = sum(self.weights)
+        scaled = [w * n / total for w in self.weights]
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] = (scaled[g] + scaled[s]) - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+        # Whatever is left is 1.0 up to rounding error.
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def sample(self, rng: random.Random | None = None) -> T:
+        """Draw one item using ``rng``, or the global ``random`` module.
+
+        Pass a seeded ``random.Random`` when the draws must be reproducible.
+        """
+        r = rng if rng is not None else random
+        i = r.randrange(len(self.items))
+        return self.items[i] if r.random() < self._prob[i] else self.items[self._alias[i]]
+
+    def probabilities(self) -> dict:
+        """Normalised draw probability per item (for tests and debugging)."""
+        total = sum(self.weights)
+        return {item: w / total for item, w in zip(self.items, self.weights)}
@@ -6,6 +6,25 @@ class ScoreCalculator:
     """Calculates scores and bonuses for questions."""
     
     BASE_POINTS = 100
+
+    # (exclusive upper bound on combo_count, multiplier); longer combos
+    # get MAX_COMBO_MULTIPLIER. Shared with the vectorized path in
+    # batch_eval so both always apply the same rules.
+    COMBO_MULTIPLIER_TIERS = ((3, 1.0), (5, 1.5), (10, 2.0), (15, 2.5))
+    MAX_COMBO_MULTIPLIER = 3.0
+
+    # (exclusive upper bound on seconds, bonus points); slower answers get 0.
+    SPEED_BONUS_TIERS = ((2.0, 100), (3.0, 50), (5.0, 25))
+
+    DIFFICULTY_MULTIPLIERS = {
+        'easy': 1.0,
+        'medium': 1.5,
+        'hard': 2.0,
+        # Defensive fallback only; see calculate_difficulty_multiplier.
+        # 1.0 (not 1.5) so a mis-labelled question never gets a free
+        # multiplier bump.
+        'adaptive': 1.0,
+    }
     
     @staticmethod
     def calculate_base_points(is_correct: bool) -> int:
@@ -29,16 +48,10 @@ class ScoreCalculator:
         Returns:
             Multiplier (1.0, 1.5, 2.0, 2.5, 3.0 max)
         """
-        if combo_count < 3:
-            return 1.0
-        elif combo_count < 5:
-            return 1.5
-        elif combo_count < 10:
-            return 2.0
-        elif combo_count < 15:
-            return 2.5
-        else:
-            return 3.0
+        for limit, multiplier in ScoreCalculator.COMBO_MULTIPLIER_TIERS:
+            if combo_count < limit:
+                return multiplier
+        return ScoreCalculator.MAX_COMBO_MULTIPLIER
     
     @staticmethod
     def calculate_speed_bonus(time_taken: float) -> int:
@@ -50,14 +63,10 @@ class ScoreCalculator:
         Returns:
             Bonus points
         """
-        if time_taken < 2.0:
-            return 100
-        elif time_taken < 3.0:
-            return 50
-        elif time_taken < 5.0:
-            return 25
-        else:
-            return 0
+        for limit, bonus in ScoreCalculator.SPEED_BONUS_TIERS:
+            if time_taken < limit:
+                return bonus
+        return 0
     
     @staticmethod
     def calculate_difficulty_multiplier(difficulty: str) -> float:
@@ -80,15 +89,7 @@ class ScoreCalculator:
             kept only as a 1.0 fallback so a stray label can't silently inflate
             scores.
         """
-        multipliers = {
-            'easy': 1.0,
-            'medium': 1.5,
-            'hard': 2.0,
-            # Defensive fallback only; see docstring. 1.0 (not 1.5) so a
-            # mis-labelled question never gets a free multiplier bump.
-            'adaptive': 1.0,
-        }
-        return multipliers.get(difficulty, 1.0)
+        return ScoreCalculator.DIFFICULTY_MULTIPLIERS.get(difficulty, 1.0)
     
     @staticmethod
     def calculate_question_score(result: QuestionResult, combo_count: int) -> int:
@@ -1,12 +1,16 @@
 """Session management for practice sessions."""
-import random
+import sqlite3
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 from src.models.session import SessionConfig, SessionState, SessionSummary, QuestionResult
 from src.models.question import Question
 from src.game_logic.validator import AnswerValidator
 from src.game_logic.scoring import ScoreCalculator
-from src.game_logic.difficulty import DifficultyAdjuster
+from src.game_logic.difficulty import DifficultyAdjuster, IncrementalDifficultyAdjuster
+from src.game_logic.sampling import AliasSampler
+from src.game_logic.review_scheduler import ReviewScheduler
+from src.game_logic.dedup import SeenFilter, make_seen_filter
+from src.game_logic.journal import SessionJournal
 from src.database.db_manager import DatabaseManager
 
 # Import all question generators
@@ -23,7 +27,15 @@ from src.question_generator.estimation import EstimationGenerator
 
 class SessionManager:
     """Manages practice session lifecycle."""
-    
+
+    # Mixed sessions draw weak question types this many times as often as
+    # the others.
+    MIXED_WEAK_BIAS = 3.0
+
+    # How many previously answered questions (across sessions) count as
+    # already seen when a session starts. 0 disables the history window.
+    DEDUP_HISTORY_WINDOW = 100
+
     def __init__(self, db_manager: DatabaseManager):
         """Initialize session manager.
         
@@ -58,6 +70,14 @@ class SessionManager:
             'estimation': ['estimation'],
             'mixed': list(self.generators.keys()),
         }
+
+        # Alias-table samplers keyed by session category, each stored with
+        # the (keys, weights) it was built from so it is only rebuilt when
+        # the weights read from the database actually change.
+        self._samplers: Dict[str, Tuple[Tuple, AliasSampler]] = {}
+
+        self.reviews = ReviewScheduler(db_manager)
+        self.journal = SessionJournal(db_manager)
     
     def start_session(self, config: SessionConfig) -> SessionState:
         """Initialize a new practice session.
@@ -75,9 +95,15 @@ class SessionManager:
             combo_count=0,
             total_score=0,
             start_time=datetime.now(),
-            is_complete=False
+            is_complete=False,
+            journal_key=self.journal.open(),
         )
 
+        # Weights can only change between sessions (answers are journaled
+        # mid-session, but nothing they depend on is), so this is the one
+        # place we re-read them.
+        self.refresh_sampler(config)
+
         # Generate first question
         state.current_question = self.get_next_question(state)
         state.question_started_at = datetime.now()
@@ -93,52 +119,131 @@ class SessionManager:
         Returns:
             Next question
         """
+        seen = self._seen_filter(state)
+
+        # Due spaced-repetition reviews take priority, up to their share cap.
+        review = self._next_review(state)
+        if review is not None:
+            seen.add(review.fingerprint)
+            return review
+
         # Determine difficulty
         if state.config.difficulty == 'adaptive':
             if len(state.questions_answered) >= 3:
-                difficulty = self.difficulty_adjuster.analyze_performance(state.questions_answered)
+                difficulty = self._adaptive_difficulty(state)
             else:
                 difficulty = self.difficulty_adjuster.get_initial_difficulty()
         else:
             difficulty = state.config.difficulty
         
-        # Select category and generator
-        if state.config.category == 'targeted':
-            # Focus on weak areas
-            weak_areas = self.db.get_weak_areas()
-            if weak_areas:
-                # Map question types to categories
-                available_generators = []
-                for weak_type in weak_areas:
-                    if weak_type in self.generators:
-                        available_generators.append(weak_type)
-                
-                if not available_generators:
-                    available_generators = self.category_generators['mixed']
-            else:
-                available_generators = self.category_generators['mixed']
-        else:
-            if state.config.category in self.category_generators:
-                available_generators = self.category_generators[state.config.category]
-            elif state.config.category in self.generators:
-                available_generators = [state.config.category]
-            else:
-                available_generators = self.category_generators['mixed']
-        
-        # Select random generator from available ones
-        generator_key = random.choice(available_generators)
+        # Select generator: O(1) weighted draw from the cached alias table.
+        generator_key = self._sampler_for(state.config).sample()
         generator = self.generators[generator_key]
         
-        # Generate question
-        question = generator.generate(difficulty)
-        
+        # Generate question, retrying (bounded) on repeats.
+        question = generator.generate_unique(difficulty, seen)
+        seen.add(question.fingerprint)
+
         return question
     
+    def _generator_weights(self, config: SessionConfig) -> Tuple[List[str], List[float]]:
+        """Candidate generator keys and their sampling weights for a config.
+
+        - ``targeted``: only the weak question types (uniform), falling back
+          to the full mixed pool when there are none.
+        - ``mixed`` (and unknown categories): every generator, with weak
+          types boosted by ``MIXED_WEAK_BIAS``.
+        - a category or single question type: its generators, uniform.
+
+        Weight overrides from user preferences multiply the base weights.
+        """
+        category = config.category
+        boosted: set = set()
+        if category == 'targeted':
+            keys = [t for t in self.db.get_weak_areas() if t in self.generators]
+            if not keys:
+                keys = self.category_generators['mixed']
+        elif category in self.category_generators and category != 'mixed':
+            keys = self.category_generators[category]
+        elif category in self.generators:
+            keys = [category]
+        else:
+            keys = self.category_generators['mixed']
+            boosted = set(self.db.get_weak_areas())
+
+        overrides = self.db.get_generator_weight_overrides()
+        weights = [
+            (self.MIXED_WEAK_BIAS if key in boosted else 1.0) * overrides.get(key, 1.0)
+            for key in keys
+        ]
+        if not any(w > 0 for w in weights):
+            # Every candidate overridden to zero: ignore the overrides.
+            weights = [1.0] * len(keys)
+        return list(keys), weights
+
+    def refresh_sampler(self, config: SessionConfig) -> AliasSampler:
+        """Re-read weights for ``config`` and rebuild its sampler if they changed."""
+        keys, weights = self._generator_weights(config)
+        signature = (tuple(keys), tuple(weights))
+        cached = self._samplers.get(config.category)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        sampler = AliasSampler(keys, weights)
+        self._samplers[config.category] = (signature, sampler)
+        return sampler
+
+    def _sampler_for(self, config: SessionConfig) -> AliasSampler:
+        cached = self._samplers.get(config.category)
+        if cached is None:
+            return self.refresh_sampler(config)
+        return cached[1]
+
+    @staticmethod
+    def _expected_question_count(config: SessionConfig) -> int:
+        """Generous upper bound on questions served, for sizing the seen filter."""
+        if config.mode_type == 'sprint':
+            # Nobody sustains more than one answer per second.
+            return int(config.duration_seconds or 0) or 60
+        return int(config.question_count or 25)
+
+    def _seen_filter(self, state: SessionState) -> SeenFilter:
+        """The session's seen-question filter, seeded from recent history on first use."""
+        if state.seen_questions is None:
+            history = (
+                self.db.get_recent_question_fingerprints(self.DEDUP_HISTORY_WINDOW)
+                if self.DEDUP_HISTORY_WINDOW > 0 else []
+            )
+            state.seen_questions = make_seen_filter(
+                self._expected_question_count(state.config) + len(history), history
+            )
+        return state.seen_questions
+
+    def _next_review(self, state: SessionState) -> Optional[Question]:
+        """Pop a due review from the session's queue, creating it on first use.
+
+        Fixed-difficulty sessions only get reviews of their own difficulty.
+        """
+        if state.review_queue is None:
+            pool = self._sampler_for(state.config).items
+            difficulty = state.config.difficulty
+            state.review_queue = self.reviews.queue_for(
+                pool, None if difficulty == 'adaptive' else difficulty
+            )
+        return state.review_queue.next_question()
+
+    def _adaptive_difficulty(self, state: SessionState) -> str:
+        """Adaptive pick via the session's incremental window (O(1) per answer)."""
+        if state.difficulty_window is None:
+            state.difficulty_window = IncrementalDifficultyAdjuster()
+        state.difficulty_window.sync(state.questions_answered)
+        return state.difficulty_window.suggest()
+
     def submit_answer(
         self,
         state: SessionState,
         answer: str,
         was_skipped: bool = False,
+        client_verdict: Optional[bool] = None,
     ) -> QuestionResult:
         """Process a submitted answer.
 
@@ -148,6 +253,9 @@ class SessionManager:
             was_skipped: True when the user explicitly skipped (not an attempt).
                 Skips don't count as correct, but downstream analytics filter
                 them out so they don't poison accuracy / weak-area routing.
+            client_verdict: Verdict already reached by the practice_loop
+                component. When given it is used as-is instead of
+                re-validating; see ``SessionFinalizer`` for how it is audited.
 
         Returns:
             QuestionResult object
@@ -156,10 +264,12 @@ class SessionManager:
             raise ValueError("No current question")
 
         # Skips are never correct; only validate real attempts.
-        is_correct = (
-            False if was_skipped
-            else self.validator.validate(answer, state.current_question)
-        )
+        if was_skipped:
+            is_correct = False
+        elif client_verdict is not None:
+            is_correct = bool(client_verdict)
+        else:
+            is_correct = self.validator.validate(answer, state.current_question)
 
         # Time the user spent on THIS question (excluding the previous answer's
         # submission overhead). Falls back to start_time for the very first
@@ -190,6 +300,7 @@ class SessionManager:
 
         # Add to answered questions
         state.questions_answered.append(result)
+        self.journal.append(state, len(state.questions_answered) - 1, result)
 
         # Check if session should end
         if self.check_session_end(state):
@@ -269,8 +380,9 @@ class SessionManager:
             )
             # Persist the abandon so it shows up in history; db_manager
             # already handles empty results (see save_session line ~136).
-            session_id = self.db.save_session(summary)
+            session_id = self.db.save_session(summary, journal_key=state.journal_key)
             summary.session_id = session_id
+            self._close_journal(state)
             return summary
 
         # Calculate statistics
@@ -291,8 +403,73 @@ class SessionManager:
             timestamp=state.start_time
         )
 
-        # Save to database
-        session_id = self.db.save_session(summary)
+        # Save to database, compacting the session's journal.
+        session_id = self.db.save_session(summary, journal_key=state.journal_key)
         summary.session_id = session_id
+        self._close_journal(state)
+
+        # Reschedule reviews seen this session and start tracking new misses.
+        # The session itself is already saved, so a failure here only costs
+        # review scheduling.
+        try:
+            self.reviews.record_session(state.questions_answered)
+        except sqlite3.Error as e:
+            print(f"Failed to update review schedule: {e}")
 
         return summary
+
+    def _close_journal(self, state: SessionState):
+        if state.journal_key is not None:
+            self.journal.close(state.journal_key)
+            state.journal_key = None
+
+    def recover_session(
+        self,
+        journal_key: str,
+        check: Optional[Callable[[SessionState, List[QuestionResult]], List[QuestionResult]]] = None,
+    ) -> Optional[SessionState]:
+        """Rebuild an unsaved session from its journal (e.g. after a restart).
+
+        Score and combo are recomputed from the journaled results, and the
+        answered questions count as already seen. If the session still has
+        questions to go, the next one is generated; otherwise the state is
+        marked complete, ready for ``end_session``.
+
+        Args:
+            journal_key: Key of the journal (see ``SessionJournal.orphaned``)
+            check: Optional pass over the journaled results before they are
+                scored. It may return them with corrected verdicts (see
+                ``SessionFinalizer.recover``).
+
+        Returns:
+            The rebuilt session state, or None if there is no such journal
+        """
+        header = next(
+            (s for s in self.db.get_journal_sessions() if s['session_key'] == journal_key),
+            None,
+        )
+        if header is None:
+            return None
+
+        state = SessionState(
+            config=header['config'],
+            start_time=header['start_time'],
+            journal_key=journal_key,
+        )
+        self.journal.adopt(journal_key)
+        seen = self._seen_filter(state)
+        results = self.db.get_journal_answers(journal_key)
+        if check is not None:
+            results = check(state, results)
+        for result in results:
+            state.combo_count = state.combo_count + 1 if result.is_correct else 0
+            state.total_score += self.scorer.calculate_question_score(result, state.combo_count)
+            state.questions_answered.append(result)
+            seen.add(result.question.fingerprint)
+
+        if self.check_session_end(state):
+            state.is_complete = True
+        else:
+            state.current_question = self.get_next_question(state)
+            state.question_started_at = datetime.now()
+        return state
@@ -0,0 +1,356 @@
+"""Process-wide store for running practice sessions.
+
+The practice page used to keep each running session (its ``SessionState``,
+every question served, the prefetcher) in ``st.session_state``. That lives
+as long as the browser tab does, so abandoned tabs pinned their sessions
+in memory for good. ``SessionStore`` holds them instead, keyed by session
+ID, and bounds what it keeps:
+
+- **Idle TTL**: a session not touched for ``idle_ttl`` seconds is evicted
+  by the next ``sweep``.
+- **LRU**: past ``max_sessions`` entries, or ``memory_budget`` bytes, the
+  least recently used sessions are evicted.
+
+Eviction stops the session's prefetcher. With a ``spill_dir`` the session
+is then pickled to disk, and ``get`` loads it back transparently when its
+tab returns. Spill files older than ``spill_ttl`` are deleted by ``sweep``,
+which scans the spill directory at most once per ``purge_interval``.
+Without a spill directory, or if the spill fails, the session's journal is
+released so it shows up as an unfinished session (see ``SessionJournal``).
+
+Sizes are estimated from the pickled entry when it is first stored. The
+page calls ``put`` again after each refill and checkpoint; those calls
+only add the pickled size of the questions and answers appended since,
+so the estimate follows the growing session without re-pickling all of
+it on every update.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from src.game_logic.journal import SessionJournal
+from src.game_logic.prefetch import QuestionPrefetcher
+from src.models.question import Question
+from src.models.session import SessionState
+
+
+@dataclass
+class StoredSession:
+    """Everything the practice page keeps for one running session."""
+    state: SessionState
+    questions: List[Question] = field(default_factory=list)
+    component_key: str = ""
+    refill_seq: int = 0  # last component update handled
+    journaled: int = 0  # component results journaled so far
+    # Live producer thread; never spilled. Restarted after a restore.
+    prefetcher: Optional[QuestionPrefetcher] = field(default=None, repr=False, compare=False)
+
+    def __getstate__(self) -> Dict:
+        state = dict(self.__dict__)
+        state["prefetcher"] = None
+        return state
+
+    def release(self, spilled: bool):
+        """Free the session's live resources on eviction."""
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+            self.prefetcher = None
+        if not spilled and self.state.journal_key is not None:
+            SessionJournal.close(self.state.journal_key)
+
+
+@dataclass
+class StoreStats:
+    sessions: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0  # by LRU (count or memory budget)
+    expired: int = 0  # by idle TTL
+    spilled: int = 0
+    restored: int = 0
+
+
+@dataclass
+class _Slot:
+    entry: StoredSession
+    size: int
+    last_access: float
+    # Questions and answers covered by ``size``.
+    questions: int = 0
+    answers: int = 0
+
+
+def _pickled_size(entry: Union[StoredSession, List]) -> int:
+    try:
+        return len(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return 0
+
+
+class SessionStore:
+    """LRU + idle-TTL cache of running sessions with optional disk spill."""
+
+    DEFAULT_MAX_SESSIONS = 64
+    DEFAULT_IDLE_TTL = 30 * 60.0
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+    DEFAULT_SPILL_TTL = 24 * 60 * 60.0
+    DEFAULT_PURGE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: Optional[Union[str, Path]] = None,
+        spill_ttl: float = DEFAULT_SPILL_TTL,
+        purge_interval: float = DEFAULT_PURGE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        sizer: Callable[[StoredSession], int] = _pickled_size,
+        item_sizer: Callable[[List], int] = _pickled_size,
+    ):
+        """Create an empty store.
+
+        Args:
+            max_sessions: Most sessions kept in memory
+            idle_ttl: Seconds a session may go untouched before eviction
+            memory_budget: Upper bound on the summed size estimates (bytes)
+            spill_dir: Directory for evicted sessions; None disables spill
+            spill_ttl: Seconds a spilled session is kept on disk
+            purge_interval: Least seconds between scans for stale spill files
+            clock: Monotonic time source (injectable for tests)
+            sizer: Size estimate for an entry, in bytes
+            item_sizer: Size estimate for questions and answers added to a
+                stored entry, in bytes
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.memory_budget = memory_budget
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.spill_ttl = spill_ttl
+        self.purge_interval = purge_interval
+        self.clock = clock
+        self.sizer = sizer
+        self.item_sizer = item_sizer
+        self._last_purge: Optional[float] = None
+        self._slots: "OrderedDict[str, _Slot]" = OrderedDict()  # oldest access first
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.stats = StoreStats()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._slots
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def put(self, session_id: str, entry: StoredSession):
+        """Store (or re-store) a session as most recently used.
+
+        Re-storing the same entry adds the size of the questions and
+        answers appended since instead of measuring it again.
+        """
+        questions, answers = entry.questions, entry.state.questions_answered
+        with self._lock:
+            old = self._slots.get(session_id)
+        if (
+            old is not None
+            and old.entry is entry
+            and len(questions) >= old.questions
+            and len(answers) >= old.answers
+        ):
+            added = questions[old.questions:] + answers[old.answers:]
+            size = old.size + (self.item_sizer(added) if added else 0)
+        else:
+            size = self.sizer(entry)
+        with self._lock:
+            previous = self._slots.pop(session_id, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._slots[session_id] = _Slot(entry, size, self.clock(), len(questions), len(answers))
+            self._bytes += size
+            self._enforce(keep=session_id)
+            self._update_stats()
+
+    def get(self, session_id: Optional[str]) -> Optional[StoredSession]:
+        """The session for ``session_id``, restoring it from disk if spilled.
+
+        Returns None for unknown, expired or unreadable sessions.
+        """
+        if not session_id:
+            return None
+        with self._lock:
+            slot = self._slots.get(session_id)
+            if slot is not None:
+                if self.clock() - slot.last_access > self.idle_ttl:
+                    self._evict(session_id, expired=True)
+                    slot = None
+                else:
+                    slot.last_access = self.clock()
+                    self._slots.move_to_end(session_id)
+                    self.stats.hits += 1
+                    return slot.entry
+            entry = self._restore(session_id)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.restored += 1
+        self.put(session_id, entry)
+        return entry
+
+    def pop(self, session_id: Optional[str]) -> Optional[StoredSession]:
+        """Remove a finished session (and any spill file) without evicting it."""
+        if not session_id:
+            return None
+        with self._lock:
+            slot = self._slots.pop(session_id, None)
+            if slot is not None:
+                self._bytes -= slot.size
+            self._delete_spill(session_id)
+            self._update_stats()
+            return slot.entry if slot is not None else None
+
+    def sweep(self) -> int:
+        """Evict idle sessions and delete stale spill files. Returns evictions."""
+        evicted = 0
+        with self._lock:
+            now = self.clock()
+            # Access order means the idle sessions are all at the front.
+            while self._slots:
+                session_id, slot = next(iter(self._slots.items()))
+                if now - slot.last_access <= self.idle_ttl:
+                    break
+                self._evict(session_id, expired=True)
+                evicted += 1
+            self._update_stats()
+            purge = self._last_purge is None or now - self._last_purge >= self.purge_interval
+            if purge:
+                self._last_purge = now
+        if purge:
+            self._purge_spill()
+        return evicted
+
+    # ------------------------------------------------------------------
+    # Eviction and spill
+    # ------------------------------------------------------------------
+
+    def _enforce(self, keep: Optional[str] = None):
+        """Evict least recently used sessions until within both limits."""
+        while len(self._slots) > self.max_sessions or (
+            self._bytes > self.memory_budget and len(self._slots) > 1
+        ):
+            victim = next(iter(self._slots))
+            if victim == keep:
+                # Only the session being stored is left over budget.
+                break
+            self._evict(victim, expired=False)
+
+    def _evict(self, session_id: str, expired: bool):
+        slot = self._slots.pop(session_id)
+        self._bytes -= slot.size
+        if expired:
+            self.stats.expired += 1
+        else:
+            self.stats.evicted += 1
+        spilled = self._spill(session_id, slot.entry)
+        slot.entry.release(spilled)
+
+    def _spill_path(self, session_id: str) -> Optional[Path]:
+        if self.spill_dir is None:
+            return None
+        safe = "".join(ch for ch in session_id if ch.isalnum() or ch in "-_")
+        return self.spill_dir / f"{safe}.pkl"
+
+    def _spill(self, session_id: str, entry: StoredSession) -> bool:
+        path = self._spill_path(session_id)
+        if path is None:
+            return False
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"Failed to spill session {session_id}: {e}")
+            return False
+        self.stats.spilled += 1
+        return True
+
+    def _restore(self, session_id: str) -> Optional[StoredSession]:
+        path = self._spill_path(session_id)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            print(f"Failed to restore session {session_id}: {e}")
+            entry = None
+        self._delete_spill(session_id)
+        if not isinstance(entry, StoredSession):
+            return None
+        if entry.state.journal_key is not None:
+            SessionJournal.adopt(entry.state.journal_key)
+        return entry
+
+    def _delete_spill(self, session_id: str):
+        path = self._spill_path(session_id)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Failed to delete spilled session {session_id}: {e}")
+
+    def _purge_spill(self):
+        """Drop spill files older than ``spill_ttl`` (wall-clock mtime),
+        releasing their sessions' journals."""
+        if self.spill_dir is None or not self.spill_dir.is_dir():
+            return
+        cutoff = time.time() - self.spill_ttl
+        for path in self.spill_dir.glob("*.pkl"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            with self._lock:
+                entry = self._restore(path.stem)
+            if entry is not None:
+                entry.release(spilled=False)
+
+    def _update_stats(self):
+        self.stats.sessions = len(self._slots)
+        self.stats.bytes = self._bytes
+
+
+_DEFAULT_STORE: Optional[SessionStore] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_store(spill_dir: Optional[Union[str, Path]] = None) -> SessionStore:
+    """The process-wide store, created on first use.
+
+    ``spill_dir`` only takes effect on the call that creates it.
+    """
+    global _DEFAULT_STORE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_STORE is None:
+            _DEFAULT_STORE = SessionStore(spill_dir=spill_dir)
+        return _DEFAULT_STORE
@@ -0,0 +1,94 @@
+"""Shared answer-normalization and tolerance rules.
+
+``validation_spec.json`` is the single description of how a typed answer
+is cleaned up and read as a number. It covers which characters are
+trimmed, which look-alike characters are mapped to ASCII, the number
+grammar, the comma-as-decimal heuristic, and the percent, fraction and
+numeric tolerances. The Python validator reads it through this module, and
+the practice_loop frontend gets the same JSON as a component argument
+(``frontend/validator.js``). That way the client's verdict and the
+server's agree. ``src.tools.validator_fuzz`` checks the two implementations
+against each other.
+
+Only ASCII letters are case-folded and only ASCII digits are accepted.
+``str.lower()`` / ``float()`` and their JavaScript counterparts disagree on
+the rest of Unicode ("İ", "١٢", "inf", "0x10"), so those inputs are
+treated as text on both sides.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SPEC_PATH = Path(__file__).with_name("validation_spec.json")
+
+with SPEC_PATH.open(encoding="utf-8") as _fh:
+    SPEC: Dict[str, Any] = json.load(_fh)
+
+STRIP_CHARS: str = SPEC["strip_chars"]
+NUMBER_RE = re.compile(SPEC["number_pattern"])
+COMMA_DECIMAL_MAX_DIGITS: int = SPEC["comma_decimal_max_digits"]
+MAX_EXPONENT: int = SPEC["max_exponent"]
+MAX_DIGITS: int = SPEC["max_digits"]
+
+PCT_TOLERANCE: float = SPEC["percent"]["tolerance"]
+PCT_RATIO_RANGE = tuple(SPEC["percent"]["ratio_range"])
+PCT_PLAIN_RANGE = tuple(SPEC["percent"]["plain_range"])
+FRAC_TOLERANCE: float = SPEC["fraction"]["tolerance"]
+NUM_RELATIVE_ABOVE: float = SPEC["numeric"]["relative_above"]
+NUM_RELATIVE_TOLERANCE: float = SPEC["numeric"]["relative_tolerance"]
+NUM_ABSOLUTE_TOLERANCE: float = SPEC["numeric"]["absolute_tolerance"]
+
+_CHAR_MAP = str.maketrans(SPEC["char_map"])
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_DIGITS_RE = re.compile(r"[0-9]+")
+_SIGNED_DIGITS_RE = re.compile(r"-*[0-9]+")
+
+
+def strip(text: str) -> str:
+    return text.strip(STRIP_CHARS)
+
+
+def normalize(text: str) -> str:
+    """Trim, then map look-alike separators (fullwidth/Arabic commas) to ASCII."""
+    return strip(text).translate(_CHAR_MAP)
+
+
+def ascii_lower(text: str) -> str:
+    return text.translate(_ASCII_LOWER)
+
+
+def parse_number(text: str) -> Optional[float]:
+    """``float(text)`` restricted to the spec's decimal grammar."""
+    if NUMBER_RE.fullmatch(text) is None:
+        return None
+    return float(text)
+
+
+def comma_decimal(text: str) -> Optional[str]:
+    """Read a locale decimal comma ("12,3" -> "12.3").
+
+    Only applies with exactly one comma, no dot and 1-2 digits after the
+    comma, so "1,000" is still a thousands separator. Returns None when the
+    heuristic does not apply.
+    """
+    if text.count(',') != 1 or '.' in text:
+        return None
+    left, right = text.split(',', 1)
+    if (
+        _SIGNED_DIGITS_RE.fullmatch(left)
+        and _DIGITS_RE.fullmatch(right)
+        and len(right) <= COMMA_DECIMAL_MAX_DIGITS
+    ):
+        return f"{left}.{right}"
+    return None
+
+
+def canonicalize(text: str) -> str:
+    """The form the frontend records an answer in: normalized, with a locale
+    decimal comma rewritten ("12,5" -> "12.5")."""
+    s = normalize(text)
+    decimal = comma_decimal(s)
+    return s if decimal is None else decimal
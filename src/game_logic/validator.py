@@ -1,6 +1,72 @@
-"""Answer validation logic."""
-import re
+"""Answer validation logic.
+
+Normalization, the number grammar and every tolerance come from the shared
+spec in ``validation_spec`` so the practice_loop frontend reaches the same
+verdicts.
+"""
+from typing import Any, Dict, Optional, Tuple, Union
 from src.models.question import Question
+from src.game_logic import validation_spec as spec
+from src.game_logic.exact_validator import EXACT_TYPES, ExactMatcher
+
+
+class _Acceptable:
+    """One acceptable answer with every parse ``_compare_answers`` needs, done once."""
+
+    __slots__ = ("lower", "pct", "has_slash", "frac", "num")
+
+    def __init__(self, text: str):
+        text = spec.normalize(text)
+        self.lower = spec.ascii_lower(text)
+        self.pct = AnswerValidator._extract_percentage(text)
+        self.has_slash = '/' in text
+        self.frac = AnswerValidator._parse_fraction(text) if self.has_slash else None
+        self.num = AnswerValidator._parse_numeric(text)
+
+
+class CompiledMatcher:
+    """Pre-parsed acceptable answers for one question.
+
+    ``matches`` gives exactly the same verdict as running
+    ``AnswerValidator._compare_answers`` against each acceptable answer, but
+    parses the user's input once and the acceptable answers never.
+    """
+
+    __slots__ = ("key", "exact", "answers")
+
+    def __init__(self, acceptable_answers: Tuple[str, ...]):
+        self.key = acceptable_answers
+        self.answers = tuple(_Acceptable(a) for a in acceptable_answers)
+        self.exact = frozenset(a.lower for a in self.answers)
+
+    def matches(self, user_answer: str) -> bool:
+        """Check a normalized, non-empty user answer (``validation_spec.normalize``)."""
+        if spec.ascii_lower(user_answer) in self.exact:
+            return True
+
+        user_pct = AnswerValidator._extract_percentage(user_answer)
+        user_has_slash = '/' in user_answer
+        user_frac = AnswerValidator._parse_fraction(user_answer) if user_has_slash else None
+        user_num = AnswerValidator._parse_numeric(user_answer)
+
+        for acc in self.answers:
+            if user_pct is not None and acc.pct is not None:
+                if abs(user_pct - acc.pct) < spec.PCT_TOLERANCE:
+                    return True
+                continue
+            if user_frac is not None and acc.frac is not None:
+                if abs(user_frac - acc.frac) < spec.FRAC_TOLERANCE:
+                    return True
+                continue
+            if user_num is None or acc.num is None:
+                continue
+            if AnswerValidator._numeric_close(user_num, acc.num):
+                return True
+        return False
+
+    def to_spec(self) -> Dict[str, Any]:
+        """Rule descriptor for the frontend validator (see ``validator.js``)."""
+        return {"kind": "cascade"}
 
 
 class AnswerValidator:
@@ -17,67 +83,76 @@ class AnswerValidator:
         Returns:
             True if answer is correct
         """
-        if not user_answer or not user_answer.strip():
+        if not user_answer:
             return False
-        
-        user_answer = user_answer.strip()
-        
-        # Check against all acceptable answers
-        for acceptable in question.acceptable_answers:
-            if AnswerValidator._compare_answers(user_answer, acceptable):
-                return True
-        
-        return False
+        user_answer = spec.normalize(user_answer)
+        if not user_answer:
+            return False
+
+        return AnswerValidator.compile(question).matches(user_answer)
+
+    @staticmethod
+    def compile(question: Question) -> Union[CompiledMatcher, ExactMatcher]:
+        """Return the question's cached matcher, rebuilding it if
+        ``acceptable_answers`` has changed since it was built.
+
+        Fraction, ratio, compound and estimation questions get an exact
+        rational matcher (see exact_validator); everything else, and any of
+        those missing the metadata their rule needs, uses the float cascade.
+        """
+        key = tuple(question.acceptable_answers)
+        matcher = question._matcher
+        if matcher is None or matcher.key != key:
+            matcher = None
+            if question.question_type in EXACT_TYPES:
+                matcher = ExactMatcher.build(question)
+            if matcher is None:
+                matcher = CompiledMatcher(key)
+            question._matcher = matcher
+        return matcher
     
     @staticmethod
     def _compare_answers(user_answer: str, correct_answer: str) -> bool:
         """Compare two answers with various tolerance methods."""
-        # Remove whitespace
-        user_answer = user_answer.strip()
-        correct_answer = correct_answer.strip()
+        # Remove whitespace and map look-alike separators
+        user_answer = spec.normalize(user_answer)
+        correct_answer = spec.normalize(correct_answer)
 
         # Exact string match
-        if user_answer.lower() == correct_answer.lower():
+        if spec.ascii_lower(user_answer) == spec.ascii_lower(correct_answer):
             return True
 
         # Handle percentage formats (15%, 15, 0.15)
         user_pct = AnswerValidator._extract_percentage(user_answer)
         correct_pct = AnswerValidator._extract_percentage(correct_answer)
         if user_pct is not None and correct_pct is not None:
-            return abs(user_pct - correct_pct) < 0.1
+            return abs(user_pct - correct_pct) < spec.PCT_TOLERANCE
 
         # Handle fraction formats
         if '/' in user_answer and '/' in correct_answer:
             user_frac = AnswerValidator._parse_fraction(user_answer)
             correct_frac = AnswerValidator._parse_fraction(correct_answer)
             if user_frac is not None and correct_frac is not None:
-                return abs(user_frac - correct_frac) < 0.001
-
-        # Numeric comparison with tolerance.
-        # Normalize both sides for the numeric path:
-        #  - strip a single trailing '%' so "5%" matches numeric "5"
-        #  - strip a leading '+' so "+10" matches "10"
-        #  - locale comma-as-decimal (e.g. "12,3" -> "12.3") only when there's
-        #    exactly one comma and no dot AND the right side is 1-2 digits
-        #    (mirrors the JS heuristic in practice_session.py to avoid
-        #    misreading thousands separators like "1,000").
-        try:
-            user_num = float(AnswerValidator._normalize_numeric(user_answer))
-            correct_num = float(AnswerValidator._normalize_numeric(correct_answer))
-
-            # Use relative tolerance for large numbers, absolute for small
-            if abs(correct_num) > 10:
-                return abs(user_num - correct_num) / abs(correct_num) < 0.01
-            else:
-                return abs(user_num - correct_num) < 0.1
-        except ValueError:
-            pass
+                return abs(user_frac - correct_frac) < spec.FRAC_TOLERANCE
+
+        # Numeric comparison with tolerance (see ``_normalize_numeric``).
+        user_num = AnswerValidator._parse_numeric(user_answer)
+        correct_num = AnswerValidator._parse_numeric(correct_answer)
+        if user_num is not None and correct_num is not None:
+            return AnswerValidator._numeric_close(user_num, correct_num)
 
         return False
 
+    @staticmethod
+    def _numeric_close(user_num: float, correct_num: float) -> bool:
+        # Use relative tolerance for large numbers, absolute for small
+        if abs(correct_num) > spec.NUM_RELATIVE_ABOVE:
+            return abs(user_num - correct_num) / abs(correct_num) < spec.NUM_RELATIVE_TOLERANCE
+        return abs(user_num - correct_num) < spec.NUM_ABSOLUTE_TOLERANCE
+
     @staticmethod
     def _normalize_numeric(text: str) -> str:
-        """Normalize a numeric-looking string for ``float()`` parsing.
+        """Normalize a numeric-looking string for number parsing.
 
         Handles, in order:
           1. trailing '%' (so percentage-formatted input matches plain numeric)
@@ -86,64 +161,55 @@ class AnswerValidator:
              trailing digits, treat as decimal separator ("12,3" -> "12.3").
              Otherwise fall back to stripping commas as thousands separators.
         """
-        s = text.strip()
+        s = spec.strip(text)
         if s.endswith('%'):
-            s = s[:-1].rstrip()
+            s = spec.strip(s[:-1])
         if s.startswith('+'):
             s = s[1:]
-        # Locale heuristic: "12,3" / "12,34" -> decimal.
-        if s.count(',') == 1 and '.' not in s:
-            left, right = s.split(',', 1)
-            if left.lstrip('-').isdigit() and right.isdigit() and 1 <= len(right) <= 2:
-                return f"{left}.{right}"
+        decimal = spec.comma_decimal(s)
+        if decimal is not None:
+            return decimal
         # Fall back: drop commas (thousands separator).
         return s.replace(',', '')
-    
+
+    @staticmethod
+    def _parse_numeric(text: str) -> Optional[float]:
+        """Value of ``text`` after ``_normalize_numeric``, or None."""
+        return spec.parse_number(AnswerValidator._normalize_numeric(text))
+
     @staticmethod
-    def _extract_percentage(text: str) -> float:
+    def _extract_percentage(text: str) -> Optional[float]:
         """Extract percentage value from text."""
-        text = text.strip()
+        text = spec.strip(text)
         # Strip a leading '+' sign so "+15%" / "+15" parse the same as "15%" / "15".
         if text.startswith('+'):
             text = text[1:]
 
         # Remove % sign if present
         if text.endswith('%'):
-            try:
-                return float(text[:-1].replace(',', '.') if (text[:-1].count(',') == 1 and '.' not in text[:-1]) else text[:-1])
-            except ValueError:
-                return None
-
-        # Try as decimal (0.15 = 15%)
-        try:
-            # Apply the same comma-as-decimal heuristic for percentage parsing.
-            normalized = text
-            if normalized.count(',') == 1 and '.' not in normalized:
-                left, right = normalized.split(',', 1)
-                if left.lstrip('-').isdigit() and right.isdigit() and 1 <= len(right) <= 2:
-                    normalized = f"{left}.{right}"
-            val = float(normalized)
-            if 0 <= val <= 1:
-                return val * 100
-            elif -100 <= val <= 100:
-                return val
-        except ValueError:
-            pass
+            body = spec.strip(text[:-1])
+            return spec.parse_number(spec.comma_decimal(body) or body)
 
+        # Try as decimal (0.15 = 15%), with the same comma-as-decimal heuristic.
+        val = spec.parse_number(spec.comma_decimal(text) or text)
+        if val is None:
+            return None
+        low, high = spec.PCT_RATIO_RANGE
+        if low <= val <= high:
+            return val * 100
+        low, high = spec.PCT_PLAIN_RANGE
+        if low <= val <= high:
+            return val
         return None
-    
+
     @staticmethod
-    def _parse_fraction(text: str) -> float:
+    def _parse_fraction(text: str) -> Optional[float]:
         """Parse fraction string to decimal."""
-        try:
-            if '/' in text:
-                parts = text.split('/')
-                if len(parts) == 2:
-                    numerator = float(parts[0].strip())
-                    denominator = float(parts[1].strip())
-                    if denominator != 0:
-                        return numerator / denominator
-        except (ValueError, ZeroDivisionError):
-            pass
-        
-        return None
+        parts = text.split('/')
+        if len(parts) != 2:
+            return None
+        numerator = spec.parse_number(spec.strip(parts[0]))
+        denominator = spec.parse_number(spec.strip(parts[1]))
+        if numerator is None or denominator is None or denominator == 0:
+            return None
+        return numerator / denominator
@@ -0,0 +1,180 @@
+"""Practice days as a bitmap.
+
+``ActivityBitmap`` holds one bit per day since ``EPOCH``, with bit ``i``
+set when the user practiced on ``EPOCH + i`` days. Fifty years of history
+fit in about 2.3 KB. The streak questions the home page asks on every
+render become bit operations on one integer:
+
+- practiced on a day: a single bit test;
+- current streak: the highest pair of idle days at or below today ends
+  it, and the days after that pair are counted with a popcount;
+- longest streak: ``bits &= bits << 1`` until nothing is left, one round
+  per day of the longest run;
+- calendar windows: a shift and a mask.
+
+The current streak keeps the rules of the date scan it replaces. One
+missed day does not break the streak, though it is not counted; two in a
+row do. A day recorded after today yields 0.
+
+``ActivityFold`` persists the bitmap in ``activity_bitmap`` as
+``DatabaseManager.save_session`` records each day, and
+``get_activity_bitmap`` keeps the current copy in memory.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.database.db_manager import DatabaseManager
+from src.database.derived import DerivedFold
+
+EPOCH = date(1970, 1, 1)
+
+DayLike = Union[date, datetime, str]
+
+# ``activity_bitmap`` row and ``derived_watermarks`` name.
+ACTIVITY_KEY = "activity_bitmap"
+# Bitmap per database file, with the data version it was read at.
+_CACHE: Dict[str, Tuple[int, "ActivityBitmap"]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def day_index(day: DayLike) -> int:
+    """Bit position of ``day`` (a date, datetime or ``YYYY-MM-DD...`` string)."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    elif isinstance(day, datetime):
+        day = day.date()
+    return (day - EPOCH).days
+
+
+def _mask(width: int) -> int:
+    return (1 << width) - 1 if width > 0 else 0
+
+
+@dataclass(frozen=True)
+class ActivityBitmap:
+    """Immutable set of active days."""
+
+    bits: int = 0
+
+    @classmethod
+    def from_dates(cls, days: Iterable[DayLike]) -> "ActivityBitmap":
+        return cls().with_days(days)
+
+    def with_days(self, days: Iterable[DayLike]) -> "ActivityBitmap":
+        """A copy with ``days`` marked active."""
+        bits = self.bits
+        for day in days:
+            bits |= 1 << day_index(day)
+        return ActivityBitmap(bits) if bits != self.bits else self
+
+    def __contains__(self, day: DayLike) -> bool:
+        return bool(self.bits >> day_index(day) & 1)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def current_streak(self, today: Optional[date] = None) -> int:
+        """Active days in the run reaching today or yesterday (see module docstring)."""
+        t = day_index(today or date.today())
+        if self.bits >> (t + 1):
+            return 0
+        idle = ~self.bits & _mask(t + 1)
+        # Bit p set: days p and p - 1 were both idle.
+        pairs = idle & (idle << 1) & _mask(t + 1)
+        start = pairs.bit_length()  # first day after the highest idle pair
+        return (self.bits >> start).bit_count()
+
+    def longest_streak(self) -> int:
+        """Length of the longest run of consecutive active days."""
+        bits, length = self.bits, 0
+        while bits:
+            bits &= bits << 1
+            length += 1
+        return length
+
+    def window(self, start: date, end: date) -> List[date]:
+        """Active days from ``start`` to ``end`` inclusive, oldest first."""
+        first = day_index(start)
+        chunk = (self.bits >> max(first, 0)) & _mask(day_index(end) - first + 1)
+        days = []
+        while chunk:
+            low = chunk & -chunk
+            days.append(start + timedelta(days=low.bit_length() - 1))
+            chunk ^= low
+        return days
+
+    def count(self, start: date, end: date) -> int:
+        """Number of active days from ``start`` to ``end`` inclusive."""
+        first = day_index(start)
+        return ((self.bits >> max(first, 0)) & _mask(day_index(end) - first + 1)).bit_count()
+
+    def to_bytes(self) -> bytes:
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ActivityBitmap":
+        return cls(int.from_bytes(data, "little"))
+
+
+def _persisted(cursor) -> ActivityBitmap:
+    cursor.execute("SELECT bits FROM activity_bitmap WHERE name = ?", (ACTIVITY_KEY,))
+    row = cursor.fetchone()
+    return ActivityBitmap.from_bytes(row[0]) if row else ActivityBitmap()
+
+
+@DatabaseManager.register_fold
+class ActivityFold(DerivedFold):
+    """Folds new ``daily_streaks`` days into ``activity_bitmap``."""
+
+    SOURCES = {"daily_streaks": ACTIVITY_KEY}
+    TABLES = ("activity_bitmap",)
+
+    def __init__(self, cursor):
+        self.bitmap = self._saved = _persisted(cursor)
+
+    def add(self, source, rows):
+        self.bitmap = self.bitmap.with_days(row["date"] for row in rows)
+
+    def finish(self, cursor):
+        if self.bitmap is not self._saved:
+            cursor.execute(
+                "INSERT OR REPLACE INTO activity_bitmap (name, bits) VALUES (?, ?)",
+                (ACTIVITY_KEY, self.bitmap.to_bytes()),
+            )
+
+
+def load_activity_bitmap(cursor) -> ActivityBitmap:
+    """Bitmap read through ``cursor`` (e.g. inside a snapshot's transaction).
+
+    Days recorded since the last fold are included.
+    """
+    bitmap = _persisted(cursor)
+    cursor.execute(
+        "SELECT date FROM daily_streaks WHERE id > ?", (DatabaseManager.watermark(cursor, ACTIVITY_KEY),)
+    )
+    return bitmap.with_days(row[0] for row in cursor.fetchall())
+
+
+def get_activity_bitmap(db: DatabaseManager) -> ActivityBitmap:
+    """Days with practice activity in ``db``.
+
+    Kept in memory per database file until ``data_version`` moves, so
+    repeated streak lookups between writes don't touch the database.
+    """
+    key, version = db.db_path, db.data_version
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    conn = db.get_connection()
+    try:
+        bitmap = load_activity_bitmap(conn.cursor())
+    finally:
+        conn.close()
+    with _CACHE_LOCK:
+        _CACHE[key] = (version, bitmap)
+    return bitmap
@@ -1,8 +1,17 @@
-"""Badge management and checking."""
-from typing import List, Dict
-from src.models.user_stats import Badge
+"""Badge management and checking.
+
+Badge conditions are the declarative ``BadgeRule``s in
+``src/gamification/rules.py``. A pass over the unearned badges compiles
+their rules into one plan, which costs one ``badge_counters`` read and at
+most one streak read however many badges there are.
+"""
+from typing import Iterable, List, Dict, Optional
+from src.models.user_stats import Badge, BadgeSnapshot
 from src.models.session import SessionSummary
 from src.database.db_manager import DatabaseManager
+from src.gamification.counters import BadgeCounters, get_badge_counters
+from src.gamification.activity import get_activity_bitmap
+from src.gamification.rules import DEFAULT_RULES, RuleContext, RulePlan, compile_rules, longest_correct_run
 
 
 class BadgeManager:
@@ -27,6 +36,14 @@ class BadgeManager:
         ),
     ]
 
+    # Condition for each badge, by name.
+    BADGE_RULES = {rule.badge_name: rule for rule in DEFAULT_RULES}
+
+    # Badges whose condition depends on answer verdicts. The rest (milestones,
+    # day streaks, hard-mode sessions) are decided by counts and dates alone,
+    # so re-validating answers can't change whether they are earned.
+    VERDICT_BADGES = frozenset(rule.badge_name for rule in DEFAULT_RULES if rule.verdicts)
+
     def __init__(self, db_manager: DatabaseManager):
         """Initialize badge manager.
 
@@ -60,135 +77,108 @@ class BadgeManager:
         Returns:
             List of newly earned badges
         """
+        return self.evaluate_session(summary).earned
+
+    def evaluate_session(self, summary: SessionSummary) -> BadgeSnapshot:
+        """Award this session's badges and measure progress toward the rest.
+
+        Both come from one plan over the unearned badges, so one counters
+        read and at most one streak read. The snapshot is also stored as
+        ``summary.badges`` for the results page.
+
+        Args:
+            summary: Summary of the saved session
+
+        Returns:
+            Newly earned badges and progress toward the others
+        """
+        unearned = [b for b in self.get_all_badges() if not b.earned]
+        plan = self._compile(unearned)
+        context = self._context(plan, summary)
+
+        newly_earned = []
         # A 0-question summary (e.g. a quit-on-empty session) has no work
         # for any condition to evaluate against; several conditions divide
         # by total_questions.
+        if summary.total_questions > 0:
+            met = plan.evaluate(context)
+            for badge in unearned:
+                if met.get(badge.badge_name):
+                    # Award the badge
+                    if self.db.award_badge(badge.badge_name):
+                        badge.earned = True
+                        newly_earned.append(badge)
+
+        snapshot = BadgeSnapshot(
+            earned=newly_earned,
+            progress=self._progress(plan, context, [b for b in unearned if not b.earned]),
+        )
+        summary.badges = snapshot
+        return snapshot
+
+    def preview_verdict_badges(self, summary: SessionSummary) -> List[Badge]:
+        """Verdict-dependent badges this not-yet-saved session would earn.
+
+        Evaluates the ``VERDICT_BADGES`` conditions as if ``summary`` had
+        already been saved, without writing anything. Used at finalize to
+        decide whether a session's verdicts need full server validation.
+
+        Args:
+            summary: Provisional summary of the session being finalized
+
+        Returns:
+            Unearned badges whose condition would be met
+        """
         if summary.total_questions == 0:
             return []
-
-        newly_earned = []
-        all_badges = self.get_all_badges()
-        stats = self.db.get_performance_stats()
-        
-        for badge in all_badges:
-            if badge.earned:
-                continue  # Already has this badge
-            
-            if self._check_badge_condition(badge, summary, stats):
-                # Award the badge
-                if self.db.award_badge(badge.badge_name):
-                    badge.earned = True
-                    newly_earned.append(badge)
-        
-        return newly_earned
-    
-    def _check_badge_condition(self, badge: Badge, summary: SessionSummary, stats: Dict) -> bool:
+        candidates = [
+            b for b in self.get_all_badges()
+            if not b.earned and b.badge_name in self.VERDICT_BADGES
+        ]
+        plan = self._compile(candidates)
+        met = plan.evaluate(self._context(plan, summary, stats={}, pending=True))
+        return [b for b in candidates if met.get(b.badge_name)]
+
+    def _check_badge_condition(self, badge: Badge, summary: SessionSummary, stats: Dict, pending: bool = False) -> bool:
         """Check if badge condition is met.
         
         Args:
             badge: Badge to check
             summary: Session summary
             stats: Overall user stats
+            pending: True if ``summary`` isn't saved yet; history checks
+                then count its results on top of the database.
             
         Returns:
             True if badge should be awarded
         """
-        name = badge.badge_name
-        
-        # Milestone Badges
-        if name == "First Steps":
-            return stats['total_sessions'] >= 1
-        
-        elif name == "Century Club":
-            return stats['total_questions'] >= 100
-        
-        elif name == "Veteran":
-            return stats['total_questions'] >= 1000
-        
-        elif name == "Marathon Finisher":
-            return summary.config.mode_type == "marathon"
-        
-        # Performance Badges
-        elif name == "Perfectionist":
-            accuracy = summary.correct_answers / summary.total_questions
-            return accuracy == 1.0 and summary.total_questions >= 10
-        
-        elif name == "Speed Demon":
-            fast_answers = sum(1 for r in summary.results if r.is_correct and r.time_taken < 3.0)
-            return fast_answers >= 10
-        
-        elif name == "Lightning Round":
-            return summary.avg_time_per_question < 3.0 and summary.total_questions >= 10
-        
-        elif name == "No Miss":
-            # Check for 50 consecutive correct answers across sessions
-            return self._check_consecutive_correct(50)
-        
-        # Streak Badges
-        elif name == "Consistent":
-            return self.db.get_current_streak() >= 3
-        
-        elif name == "Week Warrior":
-            return self.db.get_current_streak() >= 7
-        
-        elif name == "Month Master":
-            return self.db.get_current_streak() >= 30
-        
-        # Category Mastery Badges
-        elif name == "Arithmetic Ace":
-            return self._check_category_mastery("arithmetic", 50, 0.95)
-        
-        elif name == "Percentage Pro":
-            return self._check_category_mastery("percentage", 50, 0.95)
-        
-        elif name == "Fraction Master":
-            return self._check_category_mastery("fractions", 50, 0.95)
-        
-        elif name == "Ratio Expert":
-            return self._check_category_mastery("ratios", 50, 0.95)
-        
-        elif name == "Compound Champion":
-            return self._check_category_mastery("compound", 50, 0.95)
-        
-        elif name == "Estimation Guru":
-            return self._check_category_mastery("estimation", 50, 0.95)
-        
-        # Challenge Badges
-        elif name == "Hard Mode Hero":
-            return self._count_hard_mode_sessions() >= 10
-        
-        elif name == "Mixed Master":
-            return self._check_mixed_mode_mastery(50, 0.90)
-
-        # Recent-form badges
-        elif name == "In Form":
-            return self._check_recent_form(window=50, min_accuracy=0.90)
-
-        elif name == "Hot Streak":
-            return self._check_in_session_streak(summary, required=10)
-
-        return False
-
-    def _check_recent_form(self, window: int, min_accuracy: float) -> bool:
-        """True if last ``window`` non-skipped answers have >=min_accuracy."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT is_correct
-            FROM questions_answered
-            WHERE was_skipped = 0
-            ORDER BY timestamp DESC
-            LIMIT ?
-            """,
-            (window,),
+        plan = self._compile([badge])
+        return plan.evaluate(self._context(plan, summary, stats, pending)).get(badge.badge_name, False)
+
+    def _compile(self, badges: Iterable[Badge]) -> RulePlan:
+        return compile_rules(self.BADGE_RULES[b.badge_name] for b in badges if b.badge_name in self.BADGE_RULES)
+
+    def _context(
+        self,
+        plan: RulePlan,
+        summary: Optional[SessionSummary],
+        stats: Optional[Dict] = None,
+        pending: bool = False,
+    ) -> RuleContext:
+        """Fetch what ``plan`` reads: one counters query, and the streak if needed.
+
+        ``stats`` defaults to the counters' own totals. With ``pending``,
+        ``summary``'s answers are added to the history counters.
+        """
+        counters = get_badge_counters(self.db, plan.counter_names) if plan.counter_names else BadgeCounters()
+        if pending:
+            counters = counters.with_pending(summary)
+        return RuleContext(
+            counters=counters,
+            stats=counters.stats() if stats is None else stats,
+            streak=get_activity_bitmap(self.db).current_streak() if plan.needs_streak else 0,
+            summary=summary,
         )
-        rows = cursor.fetchall()
-        conn.close()
-        if len(rows) < window:
-            return False
-        correct = sum(1 for r in rows if r["is_correct"] == 1)
-        return (correct / window) >= min_accuracy
 
     @staticmethod
     def _check_in_session_streak(summary: SessionSummary, required: int) -> bool:
@@ -197,119 +187,7 @@ class BadgeManager:
         Checked against ``summary.results`` only (current session) - not
         across sessions. Skips break the streak.
         """
-        run = 0
-        for result in summary.results:
-            if getattr(result, "was_skipped", False):
-                run = 0
-                continue
-            if result.is_correct:
-                run += 1
-                if run >= required:
-                    return True
-            else:
-                run = 0
-        return False
-    
-    def _check_consecutive_correct(self, required: int) -> bool:
-        """Check for consecutive correct answers."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT is_correct FROM questions_answered
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (required,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        if len(results) < required:
-            return False
-        
-        return all(r['is_correct'] == 1 for r in results)
-    
-    def _check_category_mastery(self, category: str, min_questions: int, min_accuracy: float) -> bool:
-        """Check if user has mastered a category."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Map category to question types
-        category_types = {
-            'arithmetic': ['addition', 'subtraction', 'multiplication', 'division'],
-            'percentage': ['percentage'],
-            'fractions': ['fractions'],
-            'ratios': ['ratios'],
-            'compound': ['compound'],
-            'estimation': ['estimation']
-        }
-        
-        types = category_types.get(category, [category])
-        placeholders = ','.join('?' * len(types))
-        
-        cursor.execute(f"""
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct
-            FROM questions_answered
-            WHERE question_type IN ({placeholders})
-        """, types)
-        
-        row = cursor.fetchone()
-        conn.close()
-
-        if row['total'] < min_questions:
-            return False
-        # Defensive: COUNT(*) returns 0 (not NULL) so the min_questions
-        # guard above already covers the empty case, but a 0-total here
-        # would crash. Belt-and-suspenders.
-        if row['total'] == 0:
-            return False
-
-        accuracy = row['correct'] / row['total']
-        return accuracy >= min_accuracy
-
-    def _count_hard_mode_sessions(self) -> int:
-        """Count number of hard mode sessions completed."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM sessions
-            WHERE difficulty = 'hard' AND completed = 1
-        """)
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        return row['count']
-    
-    def _check_mixed_mode_mastery(self, min_questions: int, min_accuracy: float) -> bool:
-        """Check mixed mode mastery."""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct
-            FROM questions_answered qa
-            JOIN sessions s ON qa.session_id = s.id
-            WHERE s.category = 'mixed'
-        """)
-        
-        row = cursor.fetchone()
-        conn.close()
-
-        if row['total'] < min_questions:
-            return False
-        # Defensive guard - same rationale as _check_category_mastery.
-        if row['total'] == 0:
-            return False
-
-        accuracy = row['correct'] / row['total']
-        return accuracy >= min_accuracy
+        return longest_correct_run(summary.results) >= required
 
     def get_all_badges(self) -> List[Badge]:
         """Get all badges with earned status.
@@ -334,43 +212,18 @@ class BadgeManager:
         Returns:
             Dictionary mapping badge names to progress info
         """
+        unearned = [b for b in self.get_all_badges() if not b.earned]
+        plan = compile_rules(
+            self.BADGE_RULES[b.badge_name] for b in unearned
+            if b.badge_name in self.BADGE_RULES and self.BADGE_RULES[b.badge_name].progress is not None
+        )
+        return self._progress(plan, self._context(plan, None), unearned)
+
+    @staticmethod
+    def _progress(plan: RulePlan, context: RuleContext, badges: List[Badge]) -> Dict[str, Dict]:
+        by_name = {b.badge_name: b for b in badges}
         progress = {}
-        all_badges = self.get_all_badges()
-        stats = self.db.get_performance_stats()
-        
-        for badge in all_badges:
-            if badge.earned:
-                continue
-            
-            name = badge.badge_name
-            prog_info = {'badge': badge, 'progress': 0, 'target': 100, 'description': ''}
-            
-            # Calculate progress for each badge type
-            if name == "Century Club":
-                prog_info['progress'] = stats['total_questions']
-                prog_info['target'] = 100
-                prog_info['description'] = f"{stats['total_questions']}/100 questions answered"
-            
-            elif name == "Veteran":
-                prog_info['progress'] = stats['total_questions']
-                prog_info['target'] = 1000
-                prog_info['description'] = f"{stats['total_questions']}/1000 questions answered"
-            
-            elif name == "Week Warrior":
-                streak = self.db.get_current_streak()
-                prog_info['progress'] = streak
-                prog_info['target'] = 7
-                prog_info['description'] = f"{streak}/7 day streak"
-            
-            elif name == "Month Master":
-                streak = self.db.get_current_streak()
-                prog_info['progress'] = streak
-                prog_info['target'] = 30
-                prog_info['description'] = f"{streak}/30 day streak"
-            
-            # Add more progress calculations as needed
-            
-            if prog_info['description']:
-                progress[name] = prog_info
-        
+        for name, (value, target, description) in plan.progress(context).items():
+            if name in by_name:
+                progress[name] = {'badge': by_name[name], 'progress': value, 'target': target, 'description': description}
         return progress
@@ -0,0 +1,210 @@
+"""Running totals that badge conditions are evaluated from.
+
+Badge checks used to query the history once per badge: per-category
+mastery, mixed-mode mastery, the hard-session count and the recent-answer
+windows. ``BadgeCounters`` keeps the few numbers those conditions need up
+to date instead. ``BadgeCounterFold`` folds each new answer and session
+into them as ``DatabaseManager.save_session`` writes it, and every
+condition then reads O(1) values:
+
+- session totals: all sessions, and completed hard ones;
+- non-skipped answers;
+- answered and correct counts per question type, and in mixed sessions.
+  Skipped rows count here, as they always did for mastery;
+- ``correct_run``: consecutive correct answers at the end of the history;
+- ``form_bits``: the verdicts of the last ``FORM_BITS`` non-skipped
+  answers, newest in bit 0, with ``form_count`` of them valid.
+
+Answers are folded in insertion (id) order. The old queries ordered the
+recent-answer windows by timestamp, which gives the same order whenever
+sessions are saved in the order they were played.
+
+Counters persist in ``badge_counters`` as ``(name, value)`` rows. Rows
+past the ``derived_watermarks`` ids are caught up on the next read
+(``get_badge_counters``), so history written before this table existed,
+or by other paths, counts exactly once.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from src.database.db_manager import DatabaseManager
+from src.database.derived import DerivedFold
+from src.models.session import SessionSummary
+
+# Verdict window kept for recent-form badges (SQLite integers are signed
+# 64-bit).
+FORM_BITS = 62
+_FORM_MASK = (1 << FORM_BITS) - 1
+
+_SCALARS = (
+    "sessions", "hard_sessions", "attempts", "mixed_total", "mixed_correct",
+    "correct_run", "form_bits", "form_count",
+)
+_TYPE_TOTAL = "type_total:"
+_TYPE_CORRECT = "type_correct:"
+
+
+def type_counter_names(question_types: Iterable[str]) -> Tuple[str, ...]:
+    """``badge_counters`` rows behind ``accuracy_over(question_types)``."""
+    return tuple(prefix + t for t in question_types for prefix in (_TYPE_TOTAL, _TYPE_CORRECT))
+
+
+@dataclass
+class BadgeCounters:
+    """Badge-relevant totals over the saved history."""
+
+    sessions: int = 0
+    hard_sessions: int = 0
+    attempts: int = 0
+    type_total: Dict[str, int] = field(default_factory=dict)
+    type_correct: Dict[str, int] = field(default_factory=dict)
+    mixed_total: int = 0
+    mixed_correct: int = 0
+    correct_run: int = 0
+    form_bits: int = 0
+    form_count: int = 0
+
+    # -- Folding ------------------------------------------------------------
+
+    def add_session(self, difficulty: str, completed: bool):
+        self.sessions += 1
+        if difficulty == "hard" and completed:
+            self.hard_sessions += 1
+
+    def add_answer(self, question_type: str, is_correct: bool, was_skipped: bool, in_mixed: bool):
+        is_correct = bool(is_correct)
+        self.type_total[question_type] = self.type_total.get(question_type, 0) + 1
+        if is_correct:
+            self.type_correct[question_type] = self.type_correct.get(question_type, 0) + 1
+        if in_mixed:
+            self.mixed_total += 1
+            self.mixed_correct += is_correct
+        self.correct_run = self.correct_run + 1 if is_correct else 0
+        if not was_skipped:
+            self.attempts += 1
+            self.form_bits = ((self.form_bits << 1) | is_correct) & _FORM_MASK
+            self.form_count = min(self.form_count + 1, FORM_BITS)
+
+    def with_pending(self, summary: Optional[SessionSummary]) -> "BadgeCounters":
+        """Counters as if ``summary``'s answers were saved.
+
+        Only the answer history moves; session totals stay as saved, as
+        the unsaved-session checks always treated them.
+        """
+        if summary is None:
+            return self
+        pending = BadgeCounters(**{**self.__dict__,
+                                   "type_total": dict(self.type_total),
+                                   "type_correct": dict(self.type_correct)})
+        in_mixed = summary.config.category == "mixed"
+        for result in summary.results:
+            pending.add_answer(
+                result.question.question_type,
+                result.is_correct,
+                getattr(result, "was_skipped", False),
+                in_mixed,
+            )
+        return pending
+
+    # -- Conditions ---------------------------------------------------------
+
+    def accuracy_over(self, question_types: Iterable[str]) -> Tuple[int, int]:
+        """(answered, correct) over ``question_types``, skips included."""
+        types = list(question_types)
+        return (
+            sum(self.type_total.get(t, 0) for t in types),
+            sum(self.type_correct.get(t, 0) for t in types),
+        )
+
+    def recent_form(self, window: int) -> Optional[int]:
+        """Correct answers among the last ``window`` attempts, or None if fewer."""
+        if window > FORM_BITS:
+            raise ValueError(f"recent-form window is limited to {FORM_BITS} answers")
+        if self.form_count < window:
+            return None
+        return bin(self.form_bits & ((1 << window) - 1)).count("1")
+
+    def stats(self) -> Dict[str, int]:
+        """The ``get_performance_stats`` keys the milestone badges read."""
+        return {"total_sessions": self.sessions, "total_questions": self.attempts}
+
+    # -- Persistence --------------------------------------------------------
+
+    def to_rows(self) -> Dict[str, int]:
+        rows = {name: getattr(self, name) for name in _SCALARS}
+        rows.update({_TYPE_TOTAL + t: n for t, n in self.type_total.items()})
+        rows.update({_TYPE_CORRECT + t: n for t, n in self.type_correct.items()})
+        return rows
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, int]]) -> "BadgeCounters":
+        counters = cls()
+        for name, value in rows:
+            if name.startswith(_TYPE_TOTAL):
+                counters.type_total[name[len(_TYPE_TOTAL):]] = value
+            elif name.startswith(_TYPE_CORRECT):
+                counters.type_correct[name[len(_TYPE_CORRECT):]] = value
+            elif name in _SCALARS:
+                setattr(counters, name, value)
+        return counters
+
+
+def load_badge_counters(cursor, names: Optional[Sequence[str]] = None) -> BadgeCounters:
+    """Persisted counters read through ``cursor``; ``names`` limits the rows read."""
+    if names is None:
+        cursor.execute("SELECT name, value FROM badge_counters")
+    else:
+        cursor.execute(
+            f"SELECT name, value FROM badge_counters WHERE name IN ({','.join('?' * len(names))})",
+            list(names),
+        )
+    return BadgeCounters.from_rows((row[0], row[1]) for row in cursor.fetchall())
+
+
+@DatabaseManager.register_fold
+class BadgeCounterFold(DerivedFold):
+    """Folds new sessions and answers into ``badge_counters``."""
+
+    SOURCES = {
+        "sessions": "badge_counters.sessions",
+        "questions_answered": "badge_counters.answers",
+    }
+    TABLES = ("badge_counters",)
+
+    def __init__(self, cursor):
+        self.counters = load_badge_counters(cursor)
+        self._before = self.counters.to_rows()
+
+    def add(self, source, rows):
+        if source == "sessions":
+            for row in rows:
+                self.counters.add_session(row["difficulty"], bool(row["completed"]))
+        else:
+            for row in rows:
+                self.counters.add_answer(
+                    row["question_type"], row["is_correct"] == 1, bool(row["was_skipped"]), bool(row["in_mixed"])
+                )
+
+    def finish(self, cursor):
+        changed = [
+            (name, value) for name, value in self.counters.to_rows().items() if self._before.get(name) != value
+        ]
+        if changed:
+            cursor.executemany("INSERT OR REPLACE INTO badge_counters (name, value) VALUES (?, ?)", changed)
+
+
+def get_badge_counters(db: DatabaseManager, names: Optional[Sequence[str]] = None) -> BadgeCounters:
+    """Current badge counters.
+
+    ``save_session`` keeps them current; rows written another way are
+    folded in here first. ``names`` limits the read to those rows; the
+    rest stay zero.
+    """
+    conn = db.get_connection()
+    try:
+        db.catch_up(BadgeCounterFold, conn)
+        return load_badge_counters(conn.cursor(), names)
+    finally:
+        conn.close()
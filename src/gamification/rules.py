@@ -0,0 +1,248 @@
+"""Declarative badge rules.
+
+Each badge condition is a ``BadgeRule``: a metric, an optional window or
+filter, a minimum sample and a threshold. ``compile_rules`` fuses the
+rules still to be checked into a ``RulePlan``. The plan lists the
+``badge_counters`` rows those rules read, fetched together in one query,
+and whether any rule needs the day streak. Every award check and
+progress bar is then served from that single fetch, so adding a badge
+adds a rule, not a query.
+
+Metrics come from one of three sources:
+
+- ``session``: the summary being checked;
+- ``history``: ``BadgeCounters``, plus the unsaved session when previewing;
+- ``streak``: the current day streak.
+"""
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.gamification.counters import BadgeCounters, type_counter_names
+from src.models.session import SessionSummary
+
+CATEGORY_TYPES = {
+    'arithmetic': ['addition', 'subtraction', 'multiplication', 'division'],
+    'percentage': ['percentage'],
+    'fractions': ['fractions'],
+    'ratios': ['ratios'],
+    'compound': ['compound'],
+    'estimation': ['estimation']
+}
+
+_OPERATORS = {">=": operator.ge, "<": operator.lt}
+
+
+@dataclass(frozen=True)
+class BadgeRule:
+    """When ``badge_name`` is earned: ``metric <op> threshold``.
+
+    ``filter`` narrows the metric (question types, session modes) and
+    ``window`` / ``max_seconds`` parameterize it. Ratio metrics also need
+    at least ``min_count`` answers behind them. ``progress`` is a
+    description template (``{progress}``, ``{target}``) for rules shown as
+    progress bars.
+    """
+
+    badge_name: str
+    metric: str
+    threshold: float
+    op: str = ">="
+    filter: Tuple[str, ...] = ()
+    window: Optional[int] = None
+    max_seconds: Optional[float] = None
+    min_count: int = 0
+    progress: Optional[str] = None
+
+    def __post_init__(self):
+        if self.metric not in METRICS:
+            raise ValueError(f"Unknown badge metric: {self.metric!r}")
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown badge comparison: {self.op!r}")
+
+    @property
+    def verdicts(self) -> bool:
+        """Whether the rule depends on answer verdicts."""
+        return METRICS[self.metric].verdicts
+
+
+@dataclass
+class RuleContext:
+    """Everything a plan's rules read, fetched once."""
+
+    counters: BadgeCounters
+    stats: Dict[str, int]
+    streak: int = 0
+    summary: Optional[SessionSummary] = None
+
+
+# (value, sample size) of a metric for one rule.
+Measurement = Tuple[float, int]
+
+
+@dataclass(frozen=True)
+class Metric:
+    source: str  # "session", "history" or "streak"
+    verdicts: bool
+    measure: Callable[[BadgeRule, RuleContext], Measurement]
+    counters: Callable[[BadgeRule], Iterable[str]] = lambda rule: ()
+
+
+def _ratio(numerator: int, denominator: int) -> Measurement:
+    return (numerator / denominator if denominator else 0.0), denominator
+
+
+def _session_accuracy(rule: BadgeRule, ctx: RuleContext) -> Measurement:
+    return _ratio(ctx.summary.correct_answers, ctx.summary.total_questions)
+
+
+def _fast_correct(rule: BadgeRule, ctx: RuleContext) -> Measurement:
+    fast = sum(1 for r in ctx.summary.results if r.is_correct and r.time_taken < rule.max_seconds)
+    return fast, fast
+
+
+def longest_correct_run(results: Iterable) -> int:
+    """Longest run of consecutive correct answers; skips break it."""
+    best = run = 0
+    for result in results:
+        run = run + 1 if result.is_correct and not getattr(result, "was_skipped", False) else 0
+        best = max(best, run)
+    return best
+
+
+def _session_run(rule: BadgeRule, ctx: RuleContext) -> Measurement:
+    best = longest_correct_run(ctx.summary.results)
+    return best, best
+
+
+def _type_accuracy(rule: BadgeRule, ctx: RuleContext) -> Measurement:
+    total, correct = ctx.counters.accuracy_over(rule.filter)
+    return _ratio(correct, total)
+
+
+def _recent_accuracy(rule: BadgeRule, ctx: RuleContext) -> Measurement:
+    correct = ctx.counters.recent_form(rule.window)
+    if correct is None:
+        return 0.0, ctx.counters.form_count
+    return correct / rule.window, rule.window
+
+
+METRICS: Dict[str, Metric] = {
+    # The session being checked.
+    "session_accuracy": Metric("session", True, _session_accuracy),
+    "fast_correct": Metric("session", True, _fast_correct),
+    "session_avg_time": Metric(
+        "session", False, lambda rule, ctx: (ctx.summary.avg_time_per_question, ctx.summary.total_questions)
+    ),
+    "session_mode": Metric(
+        "session", False, lambda rule, ctx: (int(ctx.summary.config.mode_type in rule.filter), 1)
+    ),
+    "session_run": Metric("session", True, _session_run),
+    # Saved history.
+    "sessions": Metric(
+        "history", False, lambda rule, ctx: (ctx.stats.get("total_sessions", 0),) * 2,
+        lambda rule: ("sessions",),
+    ),
+    "questions": Metric(
+        "history", False, lambda rule, ctx: (ctx.stats.get("total_questions", 0),) * 2,
+        lambda rule: ("attempts",),
+    ),
+    "hard_sessions": Metric(
+        "history", False, lambda rule, ctx: (ctx.counters.hard_sessions,) * 2,
+        lambda rule: ("hard_sessions",),
+    ),
+    "correct_run": Metric(
+        "history", True, lambda rule, ctx: (ctx.counters.correct_run,) * 2,
+        lambda rule: ("correct_run",),
+    ),
+    "accuracy": Metric(
+        "history", True, _type_accuracy, lambda rule: type_counter_names(rule.filter),
+    ),
+    "mixed_accuracy": Metric(
+        "history", True, lambda rule, ctx: _ratio(ctx.counters.mixed_correct, ctx.counters.mixed_total),
+        lambda rule: ("mixed_total", "mixed_correct"),
+    ),
+    "recent_accuracy": Metric(
+        "history", True, _recent_accuracy, lambda rule: ("form_bits", "form_count"),
+    ),
+    # Day streak.
+    "streak": Metric("streak", False, lambda rule, ctx: (ctx.streak,) * 2),
+}
+
+
+def _mastery(badge_name: str, category: str, min_accuracy: float = 0.95) -> BadgeRule:
+    return BadgeRule(badge_name, "accuracy", min_accuracy, filter=tuple(CATEGORY_TYPES[category]), min_count=50)
+
+
+DEFAULT_RULES: Tuple[BadgeRule, ...] = (
+    # Milestones
+    BadgeRule("First Steps", "sessions", 1),
+    BadgeRule("Century Club", "questions", 100, progress="{progress}/{target} questions answered"),
+    BadgeRule("Veteran", "questions", 1000, progress="{progress}/{target} questions answered"),
+    BadgeRule("Marathon Finisher", "session_mode", 1, filter=("marathon",)),
+    # Performance
+    BadgeRule("Perfectionist", "session_accuracy", 1.0, min_count=10),
+    BadgeRule("Speed Demon", "fast_correct", 10, max_seconds=3.0),
+    BadgeRule("Lightning Round", "session_avg_time", 3.0, op="<", min_count=10),
+    BadgeRule("No Miss", "correct_run", 50, progress="{progress}/{target} correct in a row"),
+    # Streaks
+    BadgeRule("Consistent", "streak", 3, progress="{progress}/{target} day streak"),
+    BadgeRule("Week Warrior", "streak", 7, progress="{progress}/{target} day streak"),
+    BadgeRule("Month Master", "streak", 30, progress="{progress}/{target} day streak"),
+    # Category mastery
+    _mastery("Arithmetic Ace", "arithmetic"),
+    _mastery("Percentage Pro", "percentage"),
+    _mastery("Fraction Master", "fractions"),
+    _mastery("Ratio Expert", "ratios"),
+    _mastery("Compound Champion", "compound"),
+    _mastery("Estimation Guru", "estimation"),
+    # Challenges
+    BadgeRule("Hard Mode Hero", "hard_sessions", 10, progress="{progress}/{target} hard sessions completed"),
+    BadgeRule("Mixed Master", "mixed_accuracy", 0.90, min_count=50),
+    # Recent form
+    BadgeRule("In Form", "recent_accuracy", 0.90, window=50, min_count=50),
+    BadgeRule("Hot Streak", "session_run", 10),
+)
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """Rules to evaluate together, and the reads they share."""
+
+    rules: Tuple[BadgeRule, ...]
+    counter_names: Tuple[str, ...]
+    needs_streak: bool
+
+    def evaluate(self, ctx: RuleContext) -> Dict[str, bool]:
+        """Badge name -> whether its rule is met."""
+        met = {}
+        for rule in self.rules:
+            value, sample = METRICS[rule.metric].measure(rule, ctx)
+            met[rule.badge_name] = sample >= rule.min_count and _OPERATORS[rule.op](value, rule.threshold)
+        return met
+
+    def progress(self, ctx: RuleContext) -> Dict[str, Tuple[int, int, str]]:
+        """Badge name -> (progress, target, description) for rules with a template."""
+        result = {}
+        for rule in self.rules:
+            if rule.progress is None:
+                continue
+            value, _ = METRICS[rule.metric].measure(rule, ctx)
+            progress, target = int(value), int(rule.threshold)
+            result[rule.badge_name] = (progress, target, rule.progress.format(progress=progress, target=target))
+        return result
+
+
+def compile_rules(rules: Iterable[BadgeRule]) -> RulePlan:
+    """Fuse ``rules`` into one plan with a single counters read."""
+    rules = tuple(rules)
+    names: List[str] = []
+    for rule in rules:
+        names.extend(METRICS[rule.metric].counters(rule))
+    return RulePlan(
+        rules=rules,
+        counter_names=tuple(dict.fromkeys(names)),
+        needs_streak=any(METRICS[rule.metric].source == "streak" for rule in rules),
+    )
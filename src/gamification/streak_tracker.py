@@ -1,8 +1,9 @@
 """Streak tracking functionality."""
 from datetime import date, timedelta
-from typing import Dict
+from typing import Dict, List
 import pandas as pd
 from src.database.db_manager import DatabaseManager
+from src.gamification.activity import ActivityBitmap, get_activity_bitmap
 
 
 class StreakTracker:
@@ -27,15 +28,10 @@ class StreakTracker:
         
         conn = self.db.get_connection()
         cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO daily_streaks (date, sessions_completed)
-            VALUES (?, 1)
-            ON CONFLICT(date) DO UPDATE SET sessions_completed = sessions_completed + 1
-        """, (activity_date,))
-        
+        self.db.update_streak(cursor, activity_date)
         conn.commit()
         conn.close()
+        self.db.bump_data_version()
     
     def get_current_streak(self) -> int:
         """Calculate current consecutive day streak.
@@ -43,7 +39,7 @@ class StreakTracker:
         Returns:
             Number of consecutive days
         """
-        return self.db.get_current_streak()
+        return get_activity_bitmap(self.db).current_streak()
     
     def get_longest_streak(self) -> int:
         """Get the longest streak ever achieved.
@@ -51,7 +47,7 @@ class StreakTracker:
         Returns:
             Longest streak count
         """
-        return self.db.get_longest_streak()
+        return get_activity_bitmap(self.db).longest_streak()
     
     def is_streak_at_risk(self) -> bool:
         """Check if streak is about to break.
@@ -59,25 +55,11 @@ class StreakTracker:
         Returns:
             True if no activity today and streak > 0
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        # Check if practiced today
-        today = date.today()
-        cursor.execute("""
-            SELECT sessions_completed FROM daily_streaks
-            WHERE date = ?
-        """, (today,))
-        
-        today_record = cursor.fetchone()
-        conn.close()
-        
-        if today_record:
-            return False  # Already practiced today
-        
-        # Check if had a streak going
-        current_streak = self.get_current_streak()
-        return current_streak > 0
+        return self._at_risk(get_activity_bitmap(self.db))
+
+    @staticmethod
+    def _at_risk(active_days: ActivityBitmap) -> bool:
+        return date.today() not in active_days and active_days.current_streak() > 0
     
     def get_streak_calendar(self, weeks: int = 8) -> pd.DataFrame:
         """Get calendar view of activity.
@@ -88,9 +70,12 @@ class StreakTracker:
         Returns:
             DataFrame with date and sessions_completed
         """
-        conn = self.db.get_connection()
-        
         start_date = date.today() - timedelta(weeks=weeks)
+        # The bitmap has no session counts, but an idle window needs no query.
+        if not get_activity_bitmap(self.db).count(start_date, date.today()):
+            return pd.DataFrame(columns=["date", "sessions_completed"])
+
+        conn = self.db.get_connection()
         
         query = """
             SELECT date, sessions_completed
@@ -103,18 +88,15 @@ class StreakTracker:
         conn.close()
         
         return df
+
+    def get_active_days(self, weeks: int = 8) -> List[date]:
+        """Days practiced in the last ``weeks`` weeks, oldest first."""
+        today = date.today()
+        return get_activity_bitmap(self.db).window(today - timedelta(weeks=weeks), today)
     
     def practiced_today(self) -> bool:
-        """Direct DB check: is there a daily_streaks row for today?"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT 1 FROM daily_streaks WHERE date = ? LIMIT 1",
-            (date.today(),),
-        )
-        row = cursor.fetchone()
-        conn.close()
-        return row is not None
+        """Whether today is marked in the activity bitmap."""
+        return date.today() in get_activity_bitmap(self.db)
 
     def get_streak_stats(self) -> Dict:
         """Get comprehensive streak statistics.
@@ -122,9 +104,10 @@ class StreakTracker:
         Returns:
             Dictionary with streak stats
         """
+        active_days = get_activity_bitmap(self.db)
         return {
-            'current_streak': self.get_current_streak(),
-            'longest_streak': self.get_longest_streak(),
-            'at_risk': self.is_streak_at_risk(),
-            'practiced_today': self.practiced_today(),
+            'current_streak': active_days.current_streak(),
+            'longest_streak': active_days.longest_streak(),
+            'at_risk': self._at_risk(active_days),
+            'practiced_today': date.today() in active_days,
         }
@@ -0,0 +1,215 @@
+"""Compact, read-only form of a finished session's results.
+
+The live models (``Question``, ``QuestionResult``) stay mutable while a
+session runs. ``AnswerValidator`` caches its matcher on the ``Question``,
+and the session's difficulty window tracks results by identity. Once
+``end_session`` has saved a session its results are only read (by the
+results page), so they can be stored far more tightly:
+
+``ResultBatch`` keeps them as parallel typed columns (label codes, packed
+UTF-8 strings, flag bytes, 8-byte times) instead of a ``QuestionResult``,
+``Question``, metadata dict, ``datetime`` and half a dozen ``str``
+objects per answer.
+
+``python -m src.tools.bench_memory`` measures the difference.
+"""
+from __future__ import annotations
+
+import json
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Union, overload
+
+from src.models.question import Question
+from src.models.session import QuestionResult
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_CORRECT = 1
+_SKIPPED = 2
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class _StringColumn:
+    """Append-only strings packed into one UTF-8 buffer plus end offsets.
+
+    A separate ``str`` costs ~50 bytes of header before its first
+    character; here each costs 8 bytes of offset.
+    """
+
+    __slots__ = ("data", "ends")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.ends = array("Q")
+
+    def append(self, text: str):
+        self.data += text.encode("utf-8", "surrogatepass")
+        self.ends.append(len(self.data))
+
+    def __getitem__(self, i: int) -> str:
+        start = self.ends[i - 1] if i else 0
+        return self.data[start:self.ends[i]].decode("utf-8", "surrogatepass")
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+
+class _LabelColumn:
+    """Low-cardinality strings (type, category, difficulty) as 2-byte codes."""
+
+    __slots__ = ("labels", "codes", "_index")
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.codes = array("H")
+        self._index: Dict[str, int] = {}
+
+    def append(self, label: str):
+        code = self._index.get(label)
+        if code is None:
+            code = self._index[label] = len(self.labels)
+            self.labels.append(label)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> str:
+        return self.labels[self.codes[i]]
+
+
+class ResultBatch:
+    """Column-oriented, append-only sequence of question results.
+
+    Every field of every result lives in a typed column: labels as 2-byte
+    codes, strings packed into UTF-8 buffers, metadata as a shared key-set
+    code plus a compact JSON value list, flags as one byte, and times as
+    8-byte numbers. Metadata that JSON can't round-trip is kept as a dict in
+    a side table.
+
+    Indexing and iteration build ``QuestionResult`` objects on the fly (with
+    a fresh ``Question`` each), so a batch can stand in for a results list
+    wherever results are only read.
+    """
+
+    __slots__ = (
+        "question_type", "category", "difficulty", "question_text", "correct_answer",
+        "acceptable_json", "metadata_keys", "metadata_values", "user_answer",
+        "flags", "time_taken", "timestamps_us", "_extra_metadata",
+    )
+
+    def __init__(self, results: Iterable[QuestionResult] = ()):
+        self.question_type = _LabelColumn()
+        self.category = _LabelColumn()
+        self.difficulty = _LabelColumn()
+        self.question_text = _StringColumn()
+        self.correct_answer = _StringColumn()
+        self.acceptable_json = _StringColumn()  # "" when it is just correct_answer
+        self.metadata_keys = _LabelColumn()  # JSON key list, shared per key set
+        self.metadata_values = _StringColumn()  # JSON value list
+        self.user_answer = _StringColumn()
+        self.flags = bytearray()
+        self.time_taken = array("d")
+        self.timestamps_us = array("q")  # microseconds since 1970-01-01, naive
+        self._extra_metadata: Dict[int, Dict[str, Any]] = {}
+        self.extend(results)
+
+    @classmethod
+    def from_results(cls, results: Iterable[QuestionResult]) -> "ResultBatch":
+        return cls(results)
+
+    def append(self, result: QuestionResult):
+        row = len(self)
+        question = result.question
+        self.question_type.append(question.question_type)
+        self.category.append(question.category)
+        self.difficulty.append(question.difficulty)
+        self.question_text.append(question.question_text)
+        self.correct_answer.append(question.correct_answer)
+        answers = list(question.acceptable_answers)
+        self.acceptable_json.append("" if answers == [question.correct_answer] else _dumps(answers))
+
+        metadata = question.metadata or {}
+        keys, values = "[]", "[]"
+        try:
+            keys, values = _dumps(list(metadata)), _dumps(list(metadata.values()))
+            if json.loads(values) != list(metadata.values()) or not all(isinstance(k, str) for k in metadata):
+                raise ValueError("metadata does not survive JSON")
+        except (TypeError, ValueError):
+            keys, values = "[]", "[]"
+            self._extra_metadata[row] = dict(metadata)
+        self.metadata_keys.append(keys)
+        self.metadata_values.append(values)
+
+        self.user_answer.append(result.user_answer or "")
+        self.flags.append((_CORRECT if result.is_correct else 0) | (_SKIPPED if result.was_skipped else 0))
+        self.time_taken.append(result.time_taken)
+        self.timestamps_us.append((result.timestamp - _EPOCH) // _MICROSECOND)
+
+    def extend(self, results: Iterable[QuestionResult]):
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def question(self, i: int) -> Question:
+        """A fresh ``Question`` for row ``i``."""
+        correct = self.correct_answer[i]
+        acceptable = self.acceptable_json[i]
+        if i in self._extra_metadata:
+            metadata = dict(self._extra_metadata[i])
+        else:
+            metadata = dict(zip(json.loads(self.metadata_keys[i]), json.loads(self.metadata_values[i])))
+        return Question(
+            question_type=self.question_type[i],
+            category=self.category[i],
+            difficulty=self.difficulty[i],
+            question_text=self.question_text[i],
+            correct_answer=correct,
+            acceptable_answers=json.loads(acceptable) if acceptable else [correct],
+            metadata=metadata,
+        )
+
+    def _row(self, i: int) -> QuestionResult:
+        flags = self.flags[i]
+        return QuestionResult(
+            question=self.question(i),
+            user_answer=self.user_answer[i],
+            is_correct=bool(flags & _CORRECT),
+            time_taken=self.time_taken[i],
+            timestamp=_EPOCH + self.timestamps_us[i] * _MICROSECOND,
+            was_skipped=bool(flags & _SKIPPED),
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> QuestionResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[QuestionResult]: ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ResultBatch index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[QuestionResult]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def to_results(self) -> List[QuestionResult]:
+        return list(self)
+
+    @property
+    def correct_count(self) -> int:
+        return sum(flag & _CORRECT for flag in self.flags)
+
+    @property
+    def skipped_count(self) -> int:
+        return sum(1 for flag in self.flags if flag & _SKIPPED)
@@ -1,9 +1,21 @@
 """Question data models."""
+import hashlib
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from src.game_logic.exact_validator import ExactMatcher
+    from src.game_logic.validator import CompiledMatcher
 
-@dataclass
+
+def question_fingerprint(question_type: str, question_text: str) -> str:
+    """Fingerprint for a (type, text) pair; see ``Question.fingerprint``."""
+    text = " ".join(question_text.lower().split())
+    key = f"{question_type}|{text}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
 class Question:
     """Represents a single math question."""
     question_type: str  # 'addition', 'percentage', etc.
@@ -13,6 +25,8 @@ class Question:
     correct_answer: str
     acceptable_answers: List[str] = field(default_factory=list)  # For estimation or rounding
     metadata: Dict[str, Any] = field(default_factory=dict)  # Additional info for analytics
+    # Parsed acceptable answers, built on first validation by AnswerValidator.
+    _matcher: Optional[Union["CompiledMatcher", "ExactMatcher"]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Ensure correct_answer is in acceptable_answers."""
@@ -20,3 +34,12 @@ class Question:
             self.acceptable_answers = [self.correct_answer]
         elif self.correct_answer not in self.acceptable_answers:
             self.acceptable_answers.append(self.correct_answer)
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable identity for spaced-repetition tracking.
+
+        Hash of the question type and whitespace/case-normalised text, so the
+        same prompt maps to the same review item however it was generated.
+        """
+        return question_fingerprint(self.question_type, self.question_text)
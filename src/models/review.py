@@ -0,0 +1,52 @@
+"""Spaced-repetition review models."""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List
+
+from src.models.question import Question
+
+
+@dataclass(slots=True)
+class ReviewItem:
+    """A tracked question with its SM-2 scheduling state."""
+    fingerprint: str
+    question_type: str
+    category: str
+    difficulty: str
+    question_text: str
+    correct_answer: str
+    due_at: datetime
+    acceptable_answers: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    easiness: float = 2.5
+    interval_days: float = 0.0
+    repetitions: int = 0
+    lapses: int = 0
+    last_reviewed: datetime = None
+
+    @classmethod
+    def from_question(cls, question: Question, due_at: datetime) -> "ReviewItem":
+        """Start tracking ``question`` with fresh SM-2 state."""
+        return cls(
+            fingerprint=question.fingerprint,
+            question_type=question.question_type,
+            category=question.category,
+            difficulty=question.difficulty,
+            question_text=question.question_text,
+            correct_answer=question.correct_answer,
+            due_at=due_at,
+            acceptable_answers=list(question.acceptable_answers),
+            metadata=dict(question.metadata),
+        )
+
+    def to_question(self) -> Question:
+        """Rebuild a servable Question from the stored fields."""
+        return Question(
+            question_type=self.question_type,
+            category=self.category,
+            difficulty=self.difficulty,
+            question_text=self.question_text,
+            correct_answer=self.correct_answer,
+            acceptable_answers=list(self.acceptable_answers),
+            metadata=dict(self.metadata),
+        )
@@ -1,11 +1,17 @@
 """Session tracking models."""
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
 from src.models.question import Question
+from src.models.user_stats import BadgeSnapshot
 
+if TYPE_CHECKING:
+    from src.game_logic.difficulty import IncrementalDifficultyAdjuster
+    from src.game_logic.review_scheduler import ReviewQueue
+    from src.game_logic.dedup import SeenFilter
 
-@dataclass
+
+@dataclass(slots=True)
 class SessionConfig:
     """Configuration for a practice session."""
     mode_type: str  # 'sprint', 'marathon', 'targeted'
@@ -15,7 +21,7 @@ class SessionConfig:
     question_count: Optional[int] = None  # For marathon mode
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestionResult:
     """Result of a single question attempt."""
     question: Question
@@ -26,7 +32,7 @@ class QuestionResult:
     was_skipped: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     """State of an active practice session."""
     config: SessionConfig
@@ -40,9 +46,27 @@ class SessionState:
     # the previous answer's submission overhead. Falls back to start_time on the
     # first question.
     question_started_at: Optional[datetime] = None
+    # Running two-window stats for adaptive difficulty. Created lazily by
+    # SessionManager and kept in step with questions_answered.
+    difficulty_window: Optional["IncrementalDifficultyAdjuster"] = field(
+        default=None, repr=False, compare=False
+    )
+    # Due spaced-repetition reviews for this session, loaded on the first
+    # question by SessionManager.
+    review_queue: Optional["ReviewQueue"] = field(
+        default=None, repr=False, compare=False
+    )
+    # Fingerprints of questions already served (plus a recent-history
+    # window), used to suppress repeats. Created lazily by SessionManager.
+    seen_questions: Optional["SeenFilter"] = field(
+        default=None, repr=False, compare=False
+    )
+    # Key of this session's answer journal (see SessionJournal). Set by
+    # SessionManager.start_session; None means the session isn't journaled.
+    journal_key: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionSummary:
     """Summary of a completed session."""
     session_id: Optional[int]
@@ -54,3 +78,5 @@ class SessionSummary:
     duration_seconds: int
     results: List[QuestionResult]
     timestamp: datetime
+    # Set at finalize by BadgeManager.evaluate_session.
+    badges: Optional[BadgeSnapshot] = field(default=None, repr=False, compare=False)
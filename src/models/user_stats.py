@@ -1,9 +1,9 @@
 """User statistics models."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStats:
     """Overall user performance statistics."""
     total_questions: int
@@ -16,7 +16,7 @@ class UserStats:
     total_score: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryStats:
     """Performance statistics for a specific category."""
     category: str
@@ -26,7 +26,7 @@ class CategoryStats:
     avg_time: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Badge:
     """Represents an achievement badge."""
     id: int
@@ -36,3 +36,16 @@ class Badge:
     icon: str
     earned: bool = False
     earned_timestamp: str = None
+
+
+@dataclass(slots=True)
+class BadgeSnapshot:
+    """Badge outcome of one finished session.
+
+    Computed once when the session is finalized
+    (``BadgeManager.evaluate_session``) and kept on its summary, so the
+    results page shows the awards and near-misses without re-evaluating.
+    """
+    earned: List[Badge] = field(default_factory=list)  # newly earned this session
+    # Same shape as BadgeManager.get_progress_to_badges.
+    progress: Dict[str, Dict] = field(default_factory=dict)
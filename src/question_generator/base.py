@@ -1,7 +1,15 @@
 """Base question generator class."""
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import Container
 from src.models.question import Question
 
+# Generators draw from the global ``random`` module. Anything that reseeds
+# it (the daily challenge) or generates off the request thread (the
+# prefetcher) holds this lock so the two never interleave.
+GENERATION_LOCK = threading.RLock()
+
 
 class QuestionGenerator(ABC):
     """Abstract base class for question generators."""
@@ -30,6 +38,51 @@ class QuestionGenerator(ABC):
         """
         pass
     
+    # Upper bound on generate() calls per generate_unique(); small pools
+    # (e.g. easy fractions) run out quickly, and a repeat beats a stall.
+    MAX_UNIQUE_ATTEMPTS = 8
+
+    def generate_unique(self, difficulty: str, seen: Container[str], max_attempts: int = None) -> Question:
+        """Generate a question whose fingerprint isn't in ``seen``.
+
+        Retries at most ``max_attempts`` times in total. If every attempt is
+        a duplicate, the last one is returned anyway. If ``seen`` has a
+        ``stats`` attribute (the session filters in ``game_logic.dedup``
+        do), retries, exhaustion and the time spent retrying are counted on
+        it. The caller is responsible for adding the returned question to
+        ``seen``.
+
+        Args:
+            difficulty: 'easy', 'medium', or 'hard'
+            seen: Fingerprints already served (anything supporting ``in``)
+            max_attempts: Override for MAX_UNIQUE_ATTEMPTS
+
+        Returns:
+            Question object
+        """
+        attempts = max(1, max_attempts or self.MAX_UNIQUE_ATTEMPTS)
+        stats = getattr(seen, "stats", None)
+        if stats is not None:
+            stats.generated += 1
+        question = self.generate(difficulty)
+        if question.fingerprint not in seen:
+            return question
+
+        started = time.perf_counter()
+        retries, exhausted = 0, False
+        for _ in range(attempts - 1):
+            retries += 1
+            question = self.generate(difficulty)
+            if question.fingerprint not in seen:
+                break
+        else:
+            exhausted = True
+        if stats is not None:
+            stats.retries += retries
+            stats.exhausted += exhausted
+            stats.retry_seconds += time.perf_counter() - started
+        return question
+
     def validate_answer(self, user_answer: str, correct_answer: str) -> bool:
         """Basic answer validation.
         
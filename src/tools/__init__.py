@@ -0,0 +1 @@
+"""Developer tools: benchmarks and test harnesses run from the command line."""
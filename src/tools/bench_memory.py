@@ -0,0 +1,136 @@
+"""Memory benchmark for per-session question/result storage.
+
+Measures the retained heap size (via ``tracemalloc``) of one session's
+results stored two ways:
+
+- ``list``: live ``QuestionResult`` objects, each with its ``Question``
+  (what ``SessionState.questions_answered`` holds during the session).
+- ``batch``: a columnar ``ResultBatch`` (what the results page keeps once
+  the session is saved).
+
+Questions come from the real generators (mixed categories) with a fixed
+seed, so runs are comparable.
+
+Usage::
+
+    python -m src.tools.bench_memory --answers 300 --sessions 20
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.models.compact import ResultBatch
+from src.models.session import QuestionResult
+from src.question_generator.arithmetic import (
+    AdditionGenerator, SubtractionGenerator,
+    MultiplicationGenerator, DivisionGenerator
+)
+from src.question_generator.compound import CompoundGenerator
+from src.question_generator.estimation import EstimationGenerator
+from src.question_generator.fractions import FractionsGenerator
+from src.question_generator.percentage import PercentageGenerator
+from src.question_generator.ratios import RatiosGenerator
+
+GENERATORS = (
+    AdditionGenerator, SubtractionGenerator, MultiplicationGenerator, DivisionGenerator,
+    PercentageGenerator, FractionsGenerator, RatiosGenerator, CompoundGenerator, EstimationGenerator,
+)
+
+
+@dataclass
+class MemoryResult:
+    representation: str
+    total_bytes: int
+    answers: int
+
+    @property
+    def bytes_per_answer(self) -> float:
+        return self.total_bytes / self.answers if self.answers else 0.0
+
+
+def make_session(answers: int, rng: random.Random) -> List[QuestionResult]:
+    """A session's worth of generated questions and plausible answers."""
+    generators = [cls() for cls in GENERATORS]
+    started = datetime(2026, 1, 1, 9, 0)
+    results = []
+    for i in range(answers):
+        question = rng.choice(generators).generate(rng.choice(("easy", "medium", "hard")))
+        skipped = rng.random() < 0.05
+        correct = not skipped and rng.random() < 0.75
+        results.append(QuestionResult(
+            question=question,
+            user_answer="" if skipped else (question.correct_answer if correct else str(rng.randint(0, 999))),
+            is_correct=correct,
+            time_taken=rng.uniform(1.0, 15.0),
+            timestamp=started + timedelta(seconds=8 * i + rng.random()),
+            was_skipped=skipped,
+        ))
+    return results
+
+
+def _retained(build: Callable[[], object]) -> int:
+    """Bytes still allocated after ``build()`` returns, with its result kept."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def measure(answers: int = 300, sessions: int = 10, seed: int = 0) -> Dict[str, MemoryResult]:
+    """Retained bytes for ``sessions`` sessions of ``answers`` results each.
+
+    Generation happens inside each measurement (same seed every time), so
+    every representation pays for its own strings.
+    """
+    def live():
+        rng = random.Random(seed)
+        random.seed(seed)
+        return [make_session(answers, rng) for _ in range(sessions)]
+
+    def batch():
+        return [ResultBatch(session) for session in live()]
+
+    state = random.getstate()
+    try:
+        total = answers * sessions
+        return {
+            name: MemoryResult(name, _retained(build), total)
+            for name, build in (("list", live), ("batch", batch))
+        }
+    finally:
+        random.setstate(state)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--answers", type=int, default=300, help="answers per session")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = measure(args.answers, args.sessions, args.seed)
+    baseline = results["list"].total_bytes
+    print(f"{args.sessions} sessions x {args.answers} answers (Python {sys.version.split()[0]})")
+    print(f"{'representation':<16}{'KiB':>10}{'B/answer':>11}{'vs list':>9}")
+    for r in results.values():
+        ratio = baseline / r.total_bytes if r.total_bytes else float("inf")
+        print(f"{r.representation:<16}{r.total_bytes / 1024:>10.1f}{r.bytes_per_answer:>11.0f}{ratio:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
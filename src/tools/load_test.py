@@ -0,0 +1,443 @@
+"""Load test: many simulated trainees sharing one SQLite database.
+
+Each simulated user is a thread with its own ``SessionManager`` (as every
+Streamlit browser session has), all on one database file. A user runs
+sessions the way the practice page does:
+
+1. ``start_session``, plus pregenerating the first question batch;
+2. answering with lognormal think times (median ``--think-median``
+   seconds), posting a journal checkpoint every ``--checkpoint-every``
+   answers and taking another question batch when the buffer runs low;
+3. finalize: audited replay through ``submit_answer``, then
+   ``end_session``;
+4. ``BadgeManager.check_earned_badges``;
+5. a home dashboard load (a ``DashboardSnapshot`` read and the widgets
+   served from it).
+
+Think times are multiplied by ``--time-scale`` before sleeping, so a run
+compresses minutes of practice into seconds while the recorded
+``time_taken`` values stay realistic.
+
+The database connections use a zero busy timeout, and a retry loop that
+stands in for SQLite's busy handler. This lets the harness count how
+often, and for how long, statements waited on another writer's lock.
+
+Everything runs offline against a temporary database file unless
+``--db`` is given.
+
+Usage::
+
+    python -m src.tools.load_test --users 200 --sessions 2 --questions 25
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.analytics.dashboard_snapshot import SnapshotPerformanceTracker
+from src.database.db_manager import DatabaseManager
+from src.game_logic.finalize import SessionFinalizer
+from src.game_logic.session_manager import SessionManager
+from src.gamification.badge_manager import BadgeManager
+from src.models.session import SessionConfig
+
+OPERATIONS = (
+    "start_session", "pregenerate", "checkpoint", "refill",
+    "replay", "end_session", "check_badges", "dashboard",
+)
+
+
+# ---------------------------------------------------------------------------
+# Lock-wait accounting
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LockStats:
+    """SQLite lock contention seen across all connections."""
+    waits: int = 0  # statements that found the database locked at least once
+    retries: int = 0
+    wait_seconds: float = 0.0
+    failures: int = 0  # statements still locked after the busy timeout
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, retries: int, waited: float, failed: bool):
+        with self._lock:
+            self.waits += 1
+            self.retries += retries
+            self.wait_seconds += waited
+            self.failures += int(failed)
+
+
+def _is_locked(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _with_retry(stats: LockStats, timeout: float, call, *args):
+    """Run ``call``, retrying while the database is locked (a busy handler)."""
+    started = None
+    retries = 0
+    delay = 0.001
+    while True:
+        try:
+            result = call(*args)
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e):
+                raise
+            now = time.perf_counter()
+            started = started or now
+            if now - started >= timeout:
+                stats.record(retries, now - started, failed=True)
+                raise
+            retries += 1
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+            continue
+        if started is not None:
+            stats.record(retries, time.perf_counter() - started, failed=False)
+        return result
+
+
+class LockCountingCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        return _with_retry(self.connection.lock_stats, self.connection.busy_timeout, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return _with_retry(self.connection.lock_stats, self.connection.busy_timeout, super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return _with_retry(self.connection.lock_stats, self.connection.busy_timeout, super().executescript, sql_script)
+
+
+class LockCountingConnection(sqlite3.Connection):
+    lock_stats: LockStats
+    busy_timeout: float
+
+    def cursor(self, factory=LockCountingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        return _with_retry(self.lock_stats, self.busy_timeout, super().commit)
+
+
+class InstrumentedDatabaseManager(DatabaseManager):
+    """``DatabaseManager`` whose connections count lock waits."""
+
+    # sqlite3.connect's default busy timeout, enforced by the retry loop.
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, db_path: str, lock_stats: Optional[LockStats] = None):
+        self.lock_stats = lock_stats or LockStats()
+        super().__init__(db_path)
+
+    def get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=0, factory=LockCountingConnection)
+        conn.lock_stats = self.lock_stats
+        conn.busy_timeout = self.BUSY_TIMEOUT
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+# ---------------------------------------------------------------------------
+# Latency accounting
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class OperationStats:
+    name: str
+    count: int
+    throughput: float  # operations per second of wall time
+    p50: float  # seconds
+    p95: float
+    p99: float
+    max: float
+
+
+class LatencyRecorder:
+    """Thread-safe per-operation latency samples."""
+
+    def __init__(self):
+        self._samples: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def time(self, name: str, call, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._samples.setdefault(name, []).append(elapsed)
+
+    @property
+    def errors(self) -> Dict[str, int]:
+        return dict(self._errors)
+
+    def summarize(self, wall_seconds: float) -> List[OperationStats]:
+        out = []
+        with self._lock:
+            names = [n for n in OPERATIONS if n in self._samples]
+            names += sorted(set(self._samples) - set(names))
+            for name in names:
+                values = sorted(self._samples[name])
+                out.append(OperationStats(
+                    name=name,
+                    count=len(values),
+                    throughput=len(values) / wall_seconds if wall_seconds > 0 else 0.0,
+                    p50=percentile(values, 50),
+                    p95=percentile(values, 95),
+                    p99=percentile(values, 99),
+                    max=values[-1],
+                ))
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Simulated users
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LoadConfig:
+    users: int = 50
+    sessions_per_user: int = 2
+    questions: int = 25
+    batch: int = 10
+    refill_at: int = 6
+    checkpoint_every: int = 10
+    think_median: float = 4.0  # seconds
+    think_sigma: float = 0.6  # lognormal shape
+    time_scale: float = 0.01  # multiplier applied to think times before sleeping
+    ramp_up: float = 1.0  # seconds over which users start
+    seed: int = 0
+
+
+@dataclass
+class LoadReport:
+    config: LoadConfig
+    wall_seconds: float
+    sessions: int
+    answers: int
+    operations: List[OperationStats]
+    locks: LockStats
+    errors: Dict[str, int]
+
+    @property
+    def sessions_per_second(self) -> float:
+        return self.sessions / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def answers_per_second(self) -> float:
+        return self.answers / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+
+class SimulatedUser:
+    """One trainee running sessions back to back."""
+
+    def __init__(self, index: int, db: DatabaseManager, config: LoadConfig, latencies: LatencyRecorder):
+        self.index = index
+        self.db = db
+        self.config = config
+        self.latencies = latencies
+        self.rng = random.Random(config.seed * 100_003 + index)
+        self.skill = self.rng.uniform(0.6, 0.95)
+        self.sm = SessionManager(db)
+        self.badges = BadgeManager(db)
+        self.sessions = 0
+        self.answers = 0
+
+    def think_time(self) -> float:
+        c = self.config
+        return self.rng.lognormvariate(math.log(c.think_median), c.think_sigma)
+
+    def run(self):
+        for _ in range(self.config.sessions_per_user):
+            self.run_session()
+
+    def _take(self, state, count: int) -> list:
+        return [self.sm.get_next_question(state) for _ in range(count)]
+
+    def run_session(self):
+        c = self.config
+        t = self.latencies.time
+        config = SessionConfig(
+            mode_type="marathon",
+            category=self.rng.choice(("mixed", "arithmetic", "percentage", "fractions")),
+            difficulty=self.rng.choice(("easy", "medium", "hard", "adaptive")),
+            question_count=c.questions,
+        )
+        state = t("start_session", self.sm.start_session, config)
+        questions = [state.current_question] + t("pregenerate", self._take, state, c.batch - 1)
+        finalizer = SessionFinalizer(self.sm, badge_manager=self.badges, rng=self.rng)
+
+        results = []
+        journaled = 0
+        for i in range(c.questions):
+            if len(questions) - i <= c.refill_at and len(questions) < c.questions:
+                questions += t("refill", self._take, state, min(c.batch, c.questions - len(questions)))
+            think = self.think_time()
+            time.sleep(think * c.time_scale)
+            skipped = self.rng.random() < 0.03
+            correct = not skipped and self.rng.random() < self.skill
+            q = questions[i]
+            results.append({
+                "question_id": i,
+                "user_answer": "" if skipped else (q.correct_answer if correct else "0.123"),
+                "is_correct": correct,
+                "was_skipped": skipped,
+                "time_taken": round(think, 3),
+            })
+            if len(results) - journaled >= c.checkpoint_every:
+                journaled = t("checkpoint", finalizer.checkpoint, state, questions, results[journaled:], journaled)
+
+        t("replay", finalizer.replay, state, questions, results)
+        summary = t("end_session", self.sm.end_session, state)
+        t("check_badges", self.badges.check_earned_badges, summary)
+        t("dashboard", self.load_dashboard)
+        self.sessions += 1
+        self.answers += len(results)
+
+    def load_dashboard(self):
+        tracker = SnapshotPerformanceTracker.build(self.db, recent_limit=6)
+        tracker.get_overall_stats()
+        tracker.get_overall_stats(days=7)
+        tracker.get_historical_trend(days=14)
+        tracker.get_recent_sessions(limit=6)
+        tracker.get_goal_progress(lookback_days=7)
+        tracker.get_training_recommendations()
+
+
+def run(config: LoadConfig, db_path: Optional[str] = None) -> LoadReport:
+    """Run the simulation and collect latency and lock statistics."""
+    with tempfile.TemporaryDirectory(prefix="mentalmath-load-") as tmp:
+        path = db_path or str(Path(tmp) / "load.db")
+        locks = LockStats()
+        db = InstrumentedDatabaseManager(path, locks)
+        latencies = LatencyRecorder()
+        users = [SimulatedUser(i, db, config, latencies) for i in range(config.users)]
+        failures: List[BaseException] = []
+
+        def worker(user: SimulatedUser, delay: float):
+            time.sleep(delay)
+            try:
+                user.run()
+            except Exception as e:  # keep the other users going; report at the end
+                failures.append(e)
+                print(f"User {user.index} failed: {e}")
+
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(user, config.ramp_up * i / max(config.users, 1)),
+                name=f"trainee-{i}",
+                daemon=True,
+            )
+            for i, user in enumerate(users)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        errors = latencies.errors
+        if failures:
+            errors["user"] = len(failures)
+        return LoadReport(
+            config=config,
+            wall_seconds=wall,
+            sessions=sum(u.sessions for u in users),
+            answers=sum(u.answers for u in users),
+            operations=latencies.summarize(wall),
+            locks=locks,
+            errors=errors,
+        )
+
+
+def format_report(report: LoadReport) -> str:
+    c = report.config
+    lines = [
+        f"{c.users} users x {c.sessions_per_user} sessions x {c.questions} questions "
+        f"(think median {c.think_median}s, time scale {c.time_scale})",
+        f"wall {report.wall_seconds:.1f}s  sessions {report.sessions} ({report.sessions_per_second:.1f}/s)  "
+        f"answers {report.answers} ({report.answers_per_second:.0f}/s)",
+        "",
+        f"{'operation':<15}{'count':>7}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+    ]
+    for op in report.operations:
+        lines.append(
+            f"{op.name:<15}{op.count:>7}{op.throughput:>9.1f}{op.p50 * 1000:>9.1f}"
+            f"{op.p95 * 1000:>9.1f}{op.p99 * 1000:>9.1f}{op.max * 1000:>9.1f}"
+        )
+    locks = report.locks
+    lines += [
+        "",
+        f"SQLite lock waits: {locks.waits} statements, {locks.retries} retries, "
+        f"{locks.wait_seconds:.2f}s waiting, {locks.failures} timed out",
+    ]
+    if report.errors:
+        lines.append(f"errors: {report.errors}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=2, help="sessions per user")
+    parser.add_argument("--questions", type=int, default=25, help="questions per session")
+    parser.add_argument("--think-median", type=float, default=4.0, help="median think time (s)")
+    parser.add_argument("--think-sigma", type=float, default=0.6, help="lognormal sigma")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="sleep = think time x scale")
+    parser.add_argument("--ramp-up", type=float, default=1.0, help="seconds to start all users")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default=None, help="database file (default: a temp file)")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        users=args.users,
+        sessions_per_user=args.sessions,
+        questions=args.questions,
+        think_median=args.think_median,
+        think_sigma=args.think_sigma,
+        time_scale=args.time_scale,
+        ramp_up=args.ramp_up,
+        seed=args.seed,
+    )
+    report = run(config, args.db)
+    print(format_report(report))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
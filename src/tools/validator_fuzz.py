@@ -0,0 +1,278 @@
+"""Differential fuzzing of the Python and JavaScript answer validators.
+
+The practice_loop frontend validates answers in the browser
+(``frontend/validator.js``), and the server validates them again with
+``AnswerValidator``. Both are driven by ``validation_spec.json``, but they
+are still two implementations. This harness runs the same generated inputs
+through both and reports every case where they disagree:
+
+- the verdict on the raw input,
+- the canonical form the client records (``canonicalize``),
+- the verdict on that canonical form, which is what the server re-checks.
+
+Questions come from the real generators. Inputs are their acceptable
+answers, mutated (whitespace, case, separators, signs, percent and
+fraction forms, nudged digits), plus random strings built from tricky
+atoms (Unicode digits and spaces, "inf", exponents, very long numbers).
+The JavaScript side runs headlessly in a ``node`` subprocess, in batches.
+
+Usage::
+
+    python -m src.tools.validator_fuzz --cases 1000000 --seed 7
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from src.game_logic import validation_spec
+from src.game_logic.validator import AnswerValidator
+from src.models.question import Question
+from src.question_generator.arithmetic import (
+    AdditionGenerator, SubtractionGenerator,
+    MultiplicationGenerator, DivisionGenerator
+)
+from src.question_generator.compound import CompoundGenerator
+from src.question_generator.estimation import EstimationGenerator
+from src.question_generator.fractions import FractionsGenerator
+from src.question_generator.percentage import PercentageGenerator
+from src.question_generator.ratios import RatiosGenerator
+
+VALIDATOR_JS = (
+    Path(__file__).resolve().parents[1] / "components" / "practice_loop" / "frontend" / "validator.js"
+)
+
+# Reads the spec line, the question table line, then one [question index,
+# input] pair per line; writes [raw verdict, canonical, canonical verdict].
+_NODE_DRIVER = r"""
+const v = require(process.argv[1]);
+const chunks = [];
+process.stdin.on("data", (c) => chunks.push(c));
+process.stdin.on("end", () => {
+  const lines = Buffer.concat(chunks).toString("utf8").split("\n");
+  v.configure(JSON.parse(lines[0]));
+  const questions = JSON.parse(lines[1]);
+  const out = [];
+  for (let i = 2; i < lines.length; i++) {
+    if (!lines[i]) continue;
+    const [qi, user] = JSON.parse(lines[i]);
+    const [acceptable, rule] = questions[qi];
+    const canonical = v.canonicalize(user);
+    out.push(JSON.stringify([
+      v.isCorrect(user, acceptable, rule), canonical, v.isCorrect(canonical, acceptable, rule),
+    ]));
+  }
+  process.stdout.write(out.join("\n"));
+});
+"""
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Pieces for random inputs, weighted towards what the parsers treat specially.
+_ATOMS = [
+    "0", "1", "2", "5", "9", "10", "12", "100", "1000", "0.5", ".5", "5.", "0.15",
+    "3/4", "/", "%", "+", "-", ",", ".", "e", "E", "e3", "e-2", "e400", " ",
+    "\t", " ", " ", "　", "﻿", "​", "\u0085", "，",
+    "،", "٫", "٬", "٣", "١٢", "５", "²",
+    "inf", "Infinity", "nan", "NaN", "0x10", "0b1", "1_000", "I", "İ",
+    "ß", "K", "K", "abc", "\U0001d7d9", "1" * 40, "9" * 400,
+]
+
+# Extra whitespace-like characters to pad answers with: some are in the
+# spec's strip set and some (zero-width space, NEL) deliberately are not.
+_PADDING = [" ", "\t", "\n", " ", " ", "　", "﻿", "​", "\u0085", "᠎"]
+
+
+def _generators():
+    return [
+        AdditionGenerator(), SubtractionGenerator(), MultiplicationGenerator(), DivisionGenerator(),
+        PercentageGenerator(), FractionsGenerator(), RatiosGenerator(), CompoundGenerator(),
+        EstimationGenerator(),
+    ]
+
+
+def _nudge(text: str, rng: random.Random) -> str:
+    """Change one digit by one, to probe the tolerance boundaries."""
+    digits = [i for i, ch in enumerate(text) if ch in "0123456789"]
+    if not digits:
+        return text
+    i = rng.choice(digits)
+    return text[:i] + str((int(text[i]) + rng.choice((1, 9))) % 10) + text[i + 1:]
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """Apply one to three random edits to an answer string."""
+    for _ in range(rng.randint(1, 3)):
+        op = rng.randrange(12)
+        if op == 0:
+            text = rng.choice(_PADDING) + text + rng.choice(_PADDING)
+        elif op == 1:
+            text = text.upper() if rng.random() < 0.5 else text.swapcase()
+        elif op == 2:
+            text = text.replace(".", rng.choice((",", "٫", "，")))
+        elif op == 3:
+            text = text + "%"
+        elif op == 4:
+            text = rng.choice(("+", "-", "--", "+-")) + text
+        elif op == 5:
+            text = _nudge(text, rng)
+        elif op == 6:
+            text = f"{text}/{rng.choice(('1', '2', '100', '0', '1.0'))}"
+        elif op == 7:
+            text = text + rng.choice(("0", "00", "5", "49", "51", "e0", "e1", "e-1"))
+        elif op == 8 and text:
+            i = rng.randrange(len(text))
+            text = text[:i] + rng.choice(_ATOMS) + text[i:]
+        elif op == 9 and text:
+            i = rng.randrange(len(text))
+            text = text[:i] + text[i + 1:]
+        elif op == 10:
+            text = text.replace("/", rng.choice((" / ", "//", "⁄")))
+        else:
+            text = text.replace(",", "")
+    return text
+
+
+def random_input(rng: random.Random) -> str:
+    return "".join(rng.choice(_ATOMS) for _ in range(rng.randint(1, 4)))
+
+
+def generate_cases(count: int, seed: int = 0) -> Tuple[List[Question], List[Tuple[int, str]]]:
+    """A pool of generated questions and ``count`` (question index, input) cases."""
+    rng = random.Random(seed)
+    state = random.getstate()
+    random.seed(seed)  # the generators draw from the module-level RNG
+    try:
+        generators = _generators()
+        pool = max(1, min(count // 20, 5000))
+        questions = [rng.choice(generators).generate(rng.choice(DIFFICULTIES)) for _ in range(pool)]
+    finally:
+        random.setstate(state)
+
+    cases = []
+    for _ in range(count):
+        qi = rng.randrange(pool)
+        answers = questions[qi].acceptable_answers
+        roll = rng.random()
+        if roll < 0.15:
+            user = rng.choice(answers)
+        elif roll < 0.8:
+            user = mutate(rng.choice(answers), rng)
+        else:
+            user = random_input(rng)
+        cases.append((qi, user))
+    return questions, cases
+
+
+@dataclass
+class Divergence:
+    """One input the two validators disagree on."""
+    check: str  # "verdict", "canonical" or "canonical_verdict"
+    user_answer: str
+    question_type: str
+    acceptable_answers: List[str]
+    python: object
+    javascript: object
+
+
+@dataclass
+class FuzzReport:
+    cases: int = 0
+    seconds: float = 0.0
+    divergences: List[Divergence] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.divergences
+
+
+def node_available(node: str = "node") -> bool:
+    return shutil.which(node) is not None
+
+
+def _run_node(questions_json: str, cases: Sequence[Tuple[int, str]], node: str) -> List[list]:
+    payload = "\n".join(
+        [json.dumps(validation_spec.SPEC), questions_json]
+        + [json.dumps(case) for case in cases]
+    )
+    proc = subprocess.run(
+        [node, "-e", _NODE_DRIVER, str(VALIDATOR_JS)],
+        input=payload.encode("utf-8"),
+        capture_output=True,
+        check=True,
+    )
+    lines = proc.stdout.decode("utf-8").split("\n") if proc.stdout else []
+    if len(lines) != len(cases):
+        raise RuntimeError(f"node returned {len(lines)} results for {len(cases)} cases")
+    return [json.loads(line) for line in lines]
+
+
+def run(
+    count: int = 100_000,
+    seed: int = 0,
+    batch_size: int = 20_000,
+    node: str = "node",
+    max_divergences: int = 100,
+) -> FuzzReport:
+    """Fuzz ``count`` inputs through both validators and collect divergences."""
+    started = time.perf_counter()
+    questions, cases = generate_cases(count, seed)
+    questions_json = json.dumps([
+        [[str(a) for a in q.acceptable_answers], AnswerValidator.compile(q).to_spec()]
+        for q in questions
+    ])
+    report = FuzzReport(cases=len(cases))
+
+    for start in range(0, len(cases), batch_size):
+        batch = cases[start:start + batch_size]
+        for (qi, user), js in zip(batch, _run_node(questions_json, batch, node)):
+            question = questions[qi]
+            canonical = validation_spec.canonicalize(user)
+            py = [
+                AnswerValidator.validate(user, question),
+                canonical,
+                AnswerValidator.validate(canonical, question),
+            ]
+            for check, p, j in zip(("verdict", "canonical", "canonical_verdict"), py, js):
+                if p != j and len(report.divergences) < max_divergences:
+                    report.divergences.append(Divergence(
+                        check, user, question.question_type, list(question.acceptable_answers), p, j,
+                    ))
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--node", default="node", help="node executable")
+    parser.add_argument("--show", type=int, default=20, help="divergences to print")
+    args = parser.parse_args(argv)
+
+    if not node_available(args.node):
+        print(f"Error: '{args.node}' not found; the JavaScript validator needs Node.js.")
+        return 2
+
+    report = run(args.cases, args.seed, args.batch_size, args.node)
+    print(f"{report.cases} cases in {report.seconds:.1f}s, {len(report.divergences)} divergences")
+    for d in report.divergences[:args.show]:
+        print(
+            f"  [{d.check}] {d.question_type} input={d.user_answer!r} "
+            f"acceptable={d.acceptable_answers!r} python={d.python!r} js={d.javascript!r}"
+        )
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
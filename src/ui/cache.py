@@ -0,0 +1,95 @@
+"""Streamlit caches for the database manager, dashboard data and charts.
+
+- ``get_db_manager``: one ``DatabaseManager`` per process, shared by all
+  browser sessions, instead of one per session.
+- ``dashboard_tracker``: the dashboards' ``DashboardSnapshot`` lives in
+  ``st.cache_data``, keyed by database file, data version and day. Every
+  hit hands out an unpickled copy, so pages cannot corrupt the shared
+  entry. The derived metrics on top of it are memoized per data version
+  (see ``src.analytics.memo``).
+- ``figure``: chart objects from ``src.analytics.visualizations`` live in
+  ``st.cache_resource``, keyed by builder and arguments. Streamlit hashes
+  DataFrame arguments by content, so a chart is rebuilt only when its
+  data changes. Streamlit serializes figures without modifying them,
+  which is why they can be shared.
+
+Saving a session bumps the data version, so later reads miss the cache.
+``on_session_saved`` also drops the superseded snapshots right away,
+rather than leaving them to age out.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Callable, Iterable
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.analytics import memo, visualizations
+from src.analytics.dashboard_snapshot import DashboardSnapshot, SnapshotPerformanceTracker
+from src.database.db_manager import DatabaseManager
+
+DEFAULT_DB_PATH = "data/mentalmath.db"
+
+
+@st.cache_resource(show_spinner=False)
+def get_db_manager(db_path: str = DEFAULT_DB_PATH) -> DatabaseManager:
+    """The process-wide ``DatabaseManager`` for ``db_path``."""
+    return DatabaseManager(db_path)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _dashboard_snapshot(
+    _db_manager: DatabaseManager,
+    db_path: str,
+    data_version: int,
+    day: date,
+    windows: tuple[int, ...],
+    recent_limit: int,
+    session_days: int,
+) -> DashboardSnapshot:
+    # db_path, data_version and day only form the key; the leading
+    # underscore keeps Streamlit from hashing the manager itself.
+    return DashboardSnapshot.build(_db_manager, windows, recent_limit, session_days)
+
+
+def dashboard_tracker(
+    db_manager: DatabaseManager,
+    windows: Iterable[int] = (),
+    recent_limit: int = 25,
+    session_days: int = 7,
+) -> SnapshotPerformanceTracker:
+    """A dashboard tracker over the cached snapshot for the current data version."""
+    snapshot = _dashboard_snapshot(
+        db_manager,
+        db_manager.db_path,
+        db_manager.data_version,
+        memo.today(),
+        tuple(sorted(set(windows))),
+        recent_limit,
+        session_days,
+    )
+    return SnapshotPerformanceTracker(db_manager, snapshot)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _figure(builder_name: str, *args: Any, **kwargs: Any) -> go.Figure:
+    return getattr(visualizations, builder_name)(*args, **kwargs)
+
+
+def figure(builder: Callable[..., go.Figure], *args: Any, **kwargs: Any) -> go.Figure:
+    """``builder(*args, **kwargs)``, shared while its arguments are unchanged.
+
+    ``builder`` must be a function from ``src.analytics.visualizations``.
+    The returned figure is shared; do not modify it.
+    """
+    if getattr(visualizations, builder.__name__, None) is not builder:
+        raise ValueError(f"{builder.__name__} is not a chart builder")
+    return _figure(builder.__name__, *args, **kwargs)
+
+
+def on_session_saved(db_manager: DatabaseManager):
+    """Invalidate the dashboard data after a session was saved."""
+    db_manager.bump_data_version()
+    _dashboard_snapshot.clear()
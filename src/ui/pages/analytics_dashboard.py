@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import streamlit as st
 
-from src.analytics.performance_tracker import GoalSettings, PerformanceTracker
+from src.analytics.performance_tracker import GoalSettings
 from src.analytics.visualizations import (
     create_accuracy_trend_chart,
     create_category_breakdown_chart,
@@ -16,18 +16,21 @@ from src.analytics.visualizations import (
     create_weekly_consistency_chart,
 )
 from src.gamification.badge_manager import BadgeManager
+from src.ui.cache import dashboard_tracker, figure
 from src.ui.components import badge_display, coach_note, hero_panel, stat_card
 
 
 def show_analytics_dashboard(db_manager):
     """Display analytics dashboard."""
-    tracker = PerformanceTracker(db_manager)
     badge_mgr = BadgeManager(db_manager)
 
     days_lookup = {"7 Days": 7, "30 Days": 30, "90 Days": 90, "All Time": 36500}
     selected_range = st.selectbox("Time range", list(days_lookup.keys()), index=1)
     days = days_lookup[selected_range]
 
+    # Every widget below is served from one snapshot read.
+    tracker = dashboard_tracker(db_manager, windows=(days,), recent_limit=25)
+
     overall = tracker.get_overall_stats(days=days)
     trend_data = tracker.get_historical_trend(days=days)
     weekly_data = tracker.get_weekly_summary(weeks=8)
@@ -98,14 +101,16 @@ def show_analytics_dashboard(db_manager):
     st.subheader("Goal Progress")
     gauge_a, gauge_b = st.columns(2)
     with gauge_a:
-        acc_gauge = create_progress_gauge(
+        acc_gauge = figure(
+            create_progress_gauge,
             current=float(goal_progress["accuracy_last_week"]),
             target=float(goal_progress["accuracy_target"]),
             title="Weekly Accuracy vs Target",
         )
         st.plotly_chart(acc_gauge, use_container_width=True, config={"displayModeBar": False})
     with gauge_b:
-        volume_gauge = create_progress_gauge(
+        volume_gauge = figure(
+            create_progress_gauge,
             current=float(goal_progress["questions_last_week"]),
             target=float(goal_progress["question_target_week"]),
             title="Weekly Volume vs Target",
@@ -149,19 +154,19 @@ def show_analytics_dashboard(db_manager):
         trend_tab_a, trend_tab_b, trend_tab_c = st.tabs(["Accuracy", "Speed", "Volume"])
         with trend_tab_a:
             st.plotly_chart(
-                create_accuracy_trend_chart(trend_data),
+                figure(create_accuracy_trend_chart, trend_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
         with trend_tab_b:
             st.plotly_chart(
-                create_speed_trend_chart(trend_data),
+                figure(create_speed_trend_chart, trend_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
         with trend_tab_c:
             st.plotly_chart(
-                create_question_volume_chart(trend_data),
+                figure(create_question_volume_chart, trend_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
@@ -173,13 +178,13 @@ def show_analytics_dashboard(db_manager):
         cat_a, cat_b = st.columns([1.35, 1])
         with cat_a:
             st.plotly_chart(
-                create_category_breakdown_chart(category_data),
+                figure(create_category_breakdown_chart, category_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
         with cat_b:
             st.plotly_chart(
-                create_category_radar_chart(category_data),
+                figure(create_category_radar_chart, category_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
@@ -218,7 +223,7 @@ def show_analytics_dashboard(db_manager):
             st.info("Need more historical sessions for weekly consistency analytics.")
         else:
             st.plotly_chart(
-                create_weekly_consistency_chart(weekly_data),
+                figure(create_weekly_consistency_chart, weekly_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
@@ -227,7 +232,7 @@ def show_analytics_dashboard(db_manager):
             st.info("Complete sessions at different times to view timing performance.")
         else:
             st.plotly_chart(
-                create_heatmap_chart(time_of_day_data),
+                figure(create_heatmap_chart, time_of_day_data),
                 use_container_width=True,
                 config={"displayModeBar": False},
             )
@@ -23,11 +23,13 @@ import streamlit as st
 from src.daily.challenge import DAILY_CHALLENGE_SIZE, DailyChallenge
 from src.game_logic.scoring import ScoreCalculator
 from src.game_logic.validator import AnswerValidator
+from src.gamification.badge_manager import BadgeManager
 from src.models.session import (
     QuestionResult,
     SessionConfig,
     SessionSummary,
 )
+from src.ui.cache import on_session_saved
 from src.ui.components import (
     coach_note,
     feedback_display,
@@ -244,6 +246,8 @@ def _finalize_daily(db_manager, state: dict, challenge: DailyChallenge):
 
     # Mark today as done so the home dashboard / mode picker show the locked state.
     challenge.mark_completed(db_manager)
+    on_session_saved(db_manager)
+    BadgeManager(db_manager).evaluate_session(summary)
 
     st.session_state.session_summary = summary
     st.session_state.pop(_DAILY_STATE_KEY, None)
@@ -15,8 +15,11 @@ from datetime import date
 
 import streamlit as st
 
-from src.analytics.performance_tracker import PerformanceTracker
 from src.daily.challenge import DailyChallenge
+from src.game_logic.finalize import SessionFinalizer
+from src.game_logic.session_manager import SessionManager
+from src.models.compact import ResultBatch
+from src.ui.cache import dashboard_tracker, on_session_saved
 from src.ui.components import (
     coach_note,
     empty_state,
@@ -42,6 +45,50 @@ def _go(page: str):
     st.rerun()
 
 
+def _session_manager(db_manager) -> SessionManager:
+    if "session_manager" not in st.session_state:
+        st.session_state.session_manager = SessionManager(db_manager)
+    return st.session_state.session_manager
+
+
+def _show_unfinished_sessions(db_manager):
+    """Offer to save or discard sessions journaled before a restart."""
+    sm = _session_manager(db_manager)
+    if st.session_state.pop("save_failed", False):
+        st.error("Your last session couldn't be saved. Its answers are kept; you can save it below.")
+    for journal in sm.journal.orphaned():
+        key = journal["session_key"]
+        config = journal["config"]
+        coach_note(
+            "Unfinished session",
+            (
+                f"{config.mode_type.title()} · {config.category.title()} from "
+                f"{journal['start_time']:%b %d %H:%M} was interrupted after "
+                f"{journal['answers']} answers."
+            ),
+            tone="neutral",
+        )
+        save_col, discard_col = st.columns(2)
+        with save_col:
+            if st.button("Save it", key=f"journal_save_{key}", use_container_width=True):
+                # The journal may hold client verdicts; check them first.
+                finalizer = SessionFinalizer(sm)
+                recovered = finalizer.recover(key)
+                if recovered is not None:
+                    state, _ = recovered
+                    summary = sm.end_session(state)
+                    on_session_saved(db_manager)
+                    finalizer.badges.evaluate_session(summary)
+                    summary.results = ResultBatch(summary.results)
+                    st.session_state.session_summary = summary
+                    _go("results")
+                st.rerun()
+        with discard_col:
+            if st.button("Discard", key=f"journal_discard_{key}", use_container_width=True):
+                sm.journal.discard(key)
+                st.rerun()
+
+
 def _has_coaching_data(coaching_score) -> bool:
     """Coaching score may be None or negative as a sentinel for 'no data yet'."""
     if coaching_score is None:
@@ -80,7 +127,8 @@ def _quick_configs(primary_category: str) -> dict[str, dict]:
 
 def show_home_dashboard(db_manager):
     """Display the home dashboard."""
-    tracker = PerformanceTracker(db_manager)
+    # Every widget below is served from one snapshot read.
+    tracker = dashboard_tracker(db_manager, recent_limit=6)
 
     overall = tracker.get_overall_stats()
     week_stats = tracker.get_overall_stats(days=7)
@@ -114,6 +162,8 @@ def show_home_dashboard(db_manager):
         chips,
     )
 
+    _show_unfinished_sessions(db_manager)
+
     # ---------------- Action-first block ----------------
     if not has_data:
         empty_state(
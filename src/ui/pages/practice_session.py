@@ -2,18 +2,41 @@
 
 The custom component (``src/components/practice_loop``) owns the entire
 client-side game loop (timer, question, input, score, combo, skip, quit).
-This page only sets up (pre-generate questions, mount component) and tears
-down (replay results through SessionManager for combo/score/persistence).
+This page only sets up (start a question prefetcher, mount component), feeds
+refills when the component runs low, journals the answers each mid-session
+update carries, and tears down (replay results through SessionManager for
+combo/score/persistence).
+
+Running sessions live in the process-wide ``SessionStore``, not in
+``st.session_state`` (which only keeps the session ID), so abandoned tabs
+are evicted instead of pinning their questions and results in memory.
 """
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import sqlite3
+from pathlib import Path
 
 import streamlit as st
 
 from src.components.practice_loop import practice_loop
+from src.game_logic import validation_spec
+from src.game_logic.finalize import SessionFinalizer, question_payloads
+from src.game_logic.prefetch import QuestionPrefetcher
 from src.game_logic.session_manager import SessionManager
+from src.game_logic.session_store import SessionStore, StoredSession, default_store
+from src.models.compact import ResultBatch
 from src.models.session import SessionConfig
+from src.ui.cache import on_session_saved
+
+# Questions handed to the component on mount. Kept small so the first
+# question shows up quickly; the prefetcher fills the rest in the background.
+INITIAL_BATCH = 10
+# The component asks for a refill once this many unanswered questions remain.
+# Must cover the Streamlit round-trip at sprint pace.
+REFILL_AT = 6
+# The component reports its answers at every refill, and also after this
+# many unjournaled answers so they survive a restart (see SessionJournal).
+CHECKPOINT_EVERY = 10
 
 
 def _make_config(state) -> SessionConfig | None:
@@ -29,48 +52,102 @@ def _make_config(state) -> SessionConfig | None:
     )
 
 
-def _pregenerate(sm: SessionManager, sess, target: int):
-    """Materialise `target` questions up front so the JS loop never starves."""
-    qs = []
-    if sess.current_question is not None:
-        qs.append(sess.current_question)
-    for _ in range(max(0, target - len(qs))):
-        qs.append(sm.get_next_question(sess))
-    return qs
-
-
-def _serialize(questions):
-    out = []
-    for idx, q in enumerate(questions):
-        acceptable = [str(a) for a in (q.acceptable_answers or [q.correct_answer])]
-        out.append({
-            "id": idx,
-            "text": q.question_text,
-            "acceptable_answers": acceptable,
-            "correct_answer": str(q.correct_answer),
-            "needs_fraction_keyboard": any("/" in a for a in acceptable),
-        })
-    return out
-
-
-def _replay(sm: SessionManager, sess, questions, results):
-    """Walk component results through submit_answer so scoring/persistence run."""
-    for cr in results:
-        qid = cr.get("question_id")
-        if qid is None or qid >= len(questions):
-            continue
-        sess.current_question = questions[qid]
-        sess.question_started_at = datetime.now() - timedelta(seconds=float(cr.get("time_taken") or 0))
-        sm.submit_answer(sess, cr.get("user_answer") or "", was_skipped=bool(cr.get("was_skipped")))
-    sess.is_complete = True
+def _question_limit(config: SessionConfig) -> int | None:
+    """Most questions a session can consume (None = unbounded sprint)."""
+    if config.mode_type == "sprint":
+        return None
+    return int(config.question_count or 25) + 5
+
+
+def _start_prefetch(sm: SessionManager, db_manager, sess) -> tuple[QuestionPrefetcher, list]:
+    """Start the background producer and return it with the initial batch."""
+    try:
+        avg_time = float(db_manager.get_performance_stats().get("avg_time") or 0) or None
+    except Exception:
+        avg_time = None
+    limit = _question_limit(sess.config)
+    initial = [sess.current_question] if sess.current_question is not None else []
+    prefetcher = QuestionPrefetcher(
+        sm,
+        sess,
+        limit=(limit - len(initial)) if limit is not None else None,
+        avg_time=avg_time,
+    )
+    initial.extend(prefetcher.take(INITIAL_BATCH - len(initial), minimum=INITIAL_BATCH - len(initial)))
+    prefetcher.start()
+    return prefetcher, initial
+
+
+def _resume_prefetch(sm: SessionManager, db_manager, entry: StoredSession) -> QuestionPrefetcher:
+    """A fresh producer for a session restored from the store's spill."""
+    try:
+        avg_time = float(db_manager.get_performance_stats().get("avg_time") or 0) or None
+    except Exception:
+        avg_time = None
+    limit = _question_limit(entry.state.config)
+    return QuestionPrefetcher(
+        sm,
+        entry.state,
+        limit=max(limit - len(entry.questions), 0) if limit is not None else None,
+        avg_time=avg_time,
+    ).start()
+
+
+def _handle_update(finalizer: SessionFinalizer, entry: StoredSession, update: dict) -> bool:
+    """Journal a mid-session update's answers and append a refill batch if
+    it asks for one. Returns True if questions were added."""
+    seq = int(update.get("seq") or 0)
+    if seq <= entry.refill_seq:
+        return False
+    entry.refill_seq = seq
+    if update.get("results"):
+        entry.journaled = finalizer.checkpoint(
+            entry.state, entry.questions, update["results"], int(update.get("results_from") or 0)
+        )
+    if not update.get("refill"):
+        return False
+    entry.prefetcher.observe_rate(update.get("answered"), update.get("elapsed_seconds"))
+    entry.questions.extend(entry.prefetcher.take(entry.prefetcher.capacity, minimum=REFILL_AT))
+    return True
+
+
+def _replay(finalizer: SessionFinalizer, sess, questions, results):
+    """Walk component results through submit_answer so scoring/persistence run.
+
+    The component's verdicts are trusted and audited on a sample; see
+    ``SessionFinalizer``.
+    """
+    return finalizer.replay(sess, questions, results)
+
+
+def _session_store(db_manager) -> SessionStore:
+    return default_store(spill_dir=Path(db_manager.db_path).parent / "session_spill")
+
+
+def _new_session(sm: SessionManager, db_manager, config: SessionConfig) -> tuple[str, StoredSession]:
+    sess = sm.start_session(config)
+    prefetcher, initial = _start_prefetch(sm, db_manager, sess)
+    entry = StoredSession(
+        state=sess,
+        questions=initial,
+        component_key="practice_loop_" + sess.start_time.strftime("%Y%m%d%H%M%S%f"),
+        prefetcher=prefetcher,
+    )
+    return sess.journal_key, entry
 
 
 def show_practice_session(db_manager):
     if "session_manager" not in st.session_state:
         st.session_state.session_manager = SessionManager(db_manager)
     sm: SessionManager = st.session_state.session_manager
-
-    if not st.session_state.get("active_session") or not st.session_state.get("_practice_questions"):
+    store = _session_store(db_manager)
+    store.sweep()
+
+    session_id = st.session_state.get("practice_session_id")
+    entry = store.get(session_id)
+    if entry is None:
+        if session_id:
+            st.info("Your previous session was closed after sitting idle. Any answers it recorded can be saved from the home page.")
         config = _make_config(st.session_state)
         if config is None:
             st.error("No session configuration found.")
@@ -78,40 +155,72 @@ def show_practice_session(db_manager):
                 st.session_state.page = "home"
                 st.rerun()
             return
-        sess = sm.start_session(config)
-        target = max(60, int(config.duration_seconds or 0) // 2 + 20) if config.mode_type == "sprint" else int(config.question_count or 25) + 5
-        st.session_state.active_session = sess
-        st.session_state._practice_questions = _pregenerate(sm, sess, target)
-        st.session_state._practice_key = "practice_loop_" + sess.start_time.strftime("%Y%m%d%H%M%S%f")
-
-    sess = st.session_state.active_session
-    questions = st.session_state._practice_questions
+        session_id, entry = _new_session(sm, db_manager, config)
+        st.session_state.practice_session_id = session_id
+        store.put(session_id, entry)
+    elif entry.prefetcher is None:
+        # Restored from disk: the producer thread didn't survive the spill.
+        entry.prefetcher = _resume_prefetch(sm, db_manager, entry)
+
+    sess = entry.state
+    questions = entry.questions
+    prefetcher: QuestionPrefetcher = entry.prefetcher
+    finalizer = SessionFinalizer(sm)
 
     st.markdown(f"### {sess.config.mode_type.title()} Session")
 
     result = practice_loop(
-        questions=_serialize(questions),
+        questions=question_payloads(questions),
         mode=sess.config.mode_type,
         duration_seconds=sess.config.duration_seconds,
         question_count=sess.config.question_count,
         category_label=sess.config.category.title(),
         difficulty_label=sess.config.difficulty.title(),
-        key=st.session_state._practice_key,
+        has_more=not prefetcher.exhausted,
+        refill_at=REFILL_AT,
+        journaled=entry.journaled,
+        checkpoint_every=CHECKPOINT_EVERY,
+        validation_spec=validation_spec.SPEC,
+        key=entry.component_key,
         height=640,
     )
 
+    if result and not result.get("completed"):
+        refilled = _handle_update(finalizer, entry, result)
+        # Re-measure: the question list may have grown.
+        store.put(session_id, entry)
+        if refilled:
+            st.rerun()
+        return
+
     if result and result.get("completed"):
+        # Join the producer before replay so it can't touch the session
+        # state while submit_answer walks it. No timeout: a producer still
+        # mid-generation must finish before the replay starts.
+        prefetcher.stop(timeout=None)
         comp_results = result.get("results") or []
+        summary = None
         if comp_results:
-            _replay(sm, sess, questions, comp_results)
+            _replay(finalizer, sess, questions, comp_results)
             try:
-                st.session_state.session_summary = sm.end_session(sess)
+                summary = sm.end_session(sess)
             except ValueError:
-                st.session_state.session_summary = None
-        else:
-            st.session_state.session_summary = None
-        st.session_state.active_session = None
-        st.session_state._practice_questions = None
-        st.session_state._practice_key = None
-        st.session_state.page = "results" if st.session_state.session_summary else "home"
+                pass
+            except sqlite3.Error as e:
+                # Not saved: hand the journal to the home page's
+                # "Unfinished session" prompt.
+                print(f"Failed to save session: {e}")
+                if sess.journal_key is not None:
+                    sm.journal.close(sess.journal_key)
+                st.session_state.save_failed = True
+        store.pop(session_id)
+        if summary is not None:
+            on_session_saved(db_manager)
+            finalizer.badges.evaluate_session(summary)
+            # The results page only reads these; keep them columnar
+            # rather than one object graph per answer.
+            summary.results = ResultBatch(summary.results)
+        st.session_state.session_summary = summary
+        st.session_state.practice_session_id = None
+        st.session_state.page = "results" if summary else "home"
         st.rerun()
@@ -19,20 +19,15 @@ from src.ui.components import (
 )
 
 
-def _near_miss_badges(badge_mgr: BadgeManager, db_manager, *, gap_pct: float = 0.85):
+def _near_miss_badges(progress_map: dict, *, gap_pct: float = 0.85):
     """Return a list of (text, progress, target, icon) for almost-earned badges.
 
-    Uses ``BadgeManager.get_progress_to_badges`` if it surfaces enough info,
-    and supplements with locally-computed near-miss checks for badges the
-    manager doesn't currently track (e.g. "No Miss" 50-streak).
+    ``progress_map`` is the session's ``BadgeSnapshot.progress``, which
+    covers every rule with a progress template (including the "No Miss"
+    50-streak).
     """
     hints: list[tuple[str, int, int, str]] = []
 
-    try:
-        progress_map = badge_mgr.get_progress_to_badges() or {}
-    except Exception:
-        progress_map = {}
-
     for name, info in progress_map.items():
         target = int(info.get("target", 0) or 0)
         progress = int(info.get("progress", 0) or 0)
@@ -52,33 +47,6 @@ def _near_miss_badges(badge_mgr: BadgeManager, db_manager, *, gap_pct: float = 0
             )
         )
 
-    # Supplement: "No Miss" — 50 consecutive correct.
-    try:
-        conn = db_manager.get_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT is_correct FROM questions_answered
-            ORDER BY timestamp DESC
-            LIMIT 50
-            """
-        )
-        rows = cur.fetchall()
-        conn.close()
-        streak_back = 0
-        for row in rows:
-            if row["is_correct"] == 1:
-                streak_back += 1
-            else:
-                break
-        if 40 <= streak_back < 50:
-            remaining = 50 - streak_back
-            hints.append(
-                (f"{remaining} more correct in a row for No Miss", streak_back, 50, "🎯")
-            )
-    except Exception:
-        pass
-
     return hints
 
 
@@ -94,7 +62,6 @@ def show_results(db_manager):
     summary = st.session_state.session_summary
     tracker = PerformanceTracker(db_manager)
     insights_gen = InsightsGenerator(db_manager)
-    badge_mgr = BadgeManager(db_manager)
     streak_tracker = StreakTracker(db_manager)
 
     accuracy = summary.correct_answers / max(summary.total_questions, 1) * 100
@@ -137,7 +104,17 @@ def show_results(db_manager):
     for insight in insights:
         insight_card(insight["text"], insight["type"])
 
-    newly_earned = badge_mgr.check_earned_badges(summary)
+    # Computed once at finalize; sessions that reach this page another way
+    # get theirs here, stored on the summary for later reruns.
+    snapshot = summary.badges
+    if snapshot is None:
+        snapshot = BadgeManager(db_manager).evaluate_session(summary)
+    # The snapshot outlives reruns of this page; celebrate its awards on the
+    # first render only.
+    newly_earned = snapshot.earned
+    if summary.session_id is not None and st.session_state.get("badges_shown_for") == summary.session_id:
+        newly_earned = []
+    st.session_state.badges_shown_for = summary.session_id
     if newly_earned:
         st.subheader("New Badges")
         cols = st.columns(min(4, len(newly_earned)))
@@ -147,7 +124,7 @@ def show_results(db_manager):
         st.balloons()
 
     # Surface near-miss badges (e.g. 48/50 No Miss, 95/100 Century Club).
-    hints = _near_miss_badges(badge_mgr, db_manager)
+    hints = _near_miss_badges(snapshot.progress)
     if hints:
         st.subheader("Almost there")
         for text, progress, target, icon in hints[:4]:
@@ -197,7 +174,7 @@ def show_results(db_manager):
                 "question_count": summary.config.question_count,
             }
             st.session_state.page = "practice_session"
-            st.session_state.active_session = None
+            st.session_state.practice_session_id = None
             st.rerun()
     with nxt_b:
         if st.button("New Session Setup", use_container_width=True):
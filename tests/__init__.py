@@ -9,4 +9,27 @@ Covers:
 - Analytics + insights (`tests/test_analytics.py`)
 - DB schema migrations (`tests/test_db_migration.py`)
 - `was_skipped` end-to-end behaviour (`tests/test_was_skipped.py`)
+- Background question prefetching (`tests/test_prefetch.py`)
+- Incremental adaptive-difficulty windows (`tests/test_difficulty_window.py`)
+- Weighted generator sampling (`tests/test_sampling.py`)
+- Spaced-repetition reviews (`tests/test_review_scheduler.py`)
+- Duplicate-question suppression (`tests/test_dedup.py`)
+- Vectorized session evaluation (`tests/test_batch_eval.py`)
+- Exact rational validation (`tests/test_exact_validator.py`)
+- Shared validation spec + JS/Python differential fuzzing (`tests/test_validator_fuzz.py`)
+- Trusted-verdict finalize with sampled audits (`tests/test_finalize.py`)
+- Compact result storage (`tests/test_compact.py`)
+- Per-answer session journal and recovery (`tests/test_journal.py`)
+- Running-session store with LRU/TTL eviction and spill (`tests/test_session_store.py`)
+- Headless ASGI API (`tests/test_api.py`)
+- Concurrent-trainee load-test harness (`tests/test_load_test.py`)
+- Single-read dashboard snapshot (`tests/test_dashboard_snapshot.py`)
+- Data-version-keyed memoization (`tests/test_memo.py`)
+- Streamlit caches for the database, dashboard data and charts (`tests/test_ui_cache.py`)
+- Week, month and quarter summaries (`tests/test_resample.py`)
+- Response-time sketches and percentiles (`tests/test_latency_sketch.py`)
+- Chunked, typed history reads (`tests/test_reader.py`)
+- Incremental badge counters (`tests/test_badge_counters.py`)
+- Declarative badge rules (`tests/test_badge_rules.py`)
+- Practice-day bitmap and streaks (`tests/test_activity.py`)
 """
@@ -0,0 +1,191 @@
+"""Tests for the practice-day bitmap.
+
+Covers:
+- `ActivityBitmap` streaks agree with a plain date scan (gap-tolerant
+  current streak, longest run, future-dated days). Also windows, counts
+  and the byte round trip.
+- `ActivityFold` folds `daily_streaks` into `activity_bitmap` on
+  `save_session`; `get_activity_bitmap` sees days recorded by other
+  paths and serves repeat lookups from memory until the data version
+  moves.
+- `StreakTracker` stats, calendar and active-day window.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.gamification.activity import EPOCH, ActivityBitmap, day_index, get_activity_bitmap
+from src.gamification.streak_tracker import StreakTracker
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _scan_current(days, today):
+    """The date scan the bitmap replaced (newest first, one idle day tolerated)."""
+    streak, cursor = 0, today
+    for day in sorted(days, reverse=True):
+        if day == cursor or day == cursor - timedelta(days=1):
+            streak += 1
+            cursor = day - timedelta(days=1)
+        else:
+            break
+    return streak
+
+
+def _scan_longest(days):
+    days = sorted(days)
+    best = run = 1 if days else 0
+    for before, after in zip(days, days[1:]):
+        run = run + 1 if after == before + timedelta(days=1) else 1
+        best = max(best, run)
+    return best
+
+
+def _summary(when: datetime) -> SessionSummary:
+    question = Question(
+        question_type="addition", category="arithmetic", difficulty="easy",
+        question_text="2 + 2", correct_answer="4",
+    )
+    return SessionSummary(
+        session_id=None,
+        config=SessionConfig(mode_type="sprint", category="mixed", difficulty="easy", duration_seconds=60),
+        total_questions=1,
+        correct_answers=1,
+        total_score=10,
+        avg_time_per_question=2.0,
+        duration_seconds=60,
+        results=[QuestionResult(question=question, user_answer="4", is_correct=True, time_taken=2.0, timestamp=when)],
+        timestamp=when,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Bitmap
+# ---------------------------------------------------------------------------
+
+
+def test_streaks_match_date_scan():
+    rnd = random.Random(6)
+    today = date(2026, 3, 15)
+    for _ in range(2000):
+        density = rnd.random()
+        days = {today - timedelta(days=i) for i in range(rnd.randint(0, 45)) if rnd.random() < density}
+        if rnd.random() < 0.05:
+            days.add(today + timedelta(days=1))
+        bitmap = ActivityBitmap.from_dates(days)
+        assert bitmap.current_streak(today) == _scan_current(days, today)
+        assert bitmap.longest_streak() == _scan_longest(days)
+        assert len(bitmap) == len(days)
+
+
+def test_gap_tolerance_and_future_days():
+    today = date(2026, 3, 15)
+    ago = lambda n: today - timedelta(days=n)  # noqa: E731
+    assert ActivityBitmap.from_dates([ago(1), ago(2)]).current_streak(today) == 2
+    # One idle day is skipped over; two end the streak.
+    assert ActivityBitmap.from_dates([ago(0), ago(2), ago(4)]).current_streak(today) == 3
+    assert ActivityBitmap.from_dates([ago(0), ago(3)]).current_streak(today) == 1
+    assert ActivityBitmap.from_dates([ago(2)]).current_streak(today) == 0
+    assert ActivityBitmap.from_dates([ago(0), today + timedelta(days=2)]).current_streak(today) == 0
+
+
+def test_windows_and_bytes():
+    days = [date(2025, 12, 30), "2026-01-02", datetime(2026, 1, 3, 18, 30)]
+    bitmap = ActivityBitmap.from_dates(days)
+    assert day_index(EPOCH) == 0
+    assert date(2026, 1, 2) in bitmap and date(2026, 1, 1) not in bitmap
+    assert bitmap.window(date(2026, 1, 1), date(2026, 1, 31)) == [date(2026, 1, 2), date(2026, 1, 3)]
+    assert bitmap.count(date(2025, 12, 1), date(2026, 1, 2)) == 2
+    assert bitmap.longest_streak() == 2
+    assert ActivityBitmap.from_bytes(bitmap.to_bytes()) == bitmap
+    assert len(bitmap.to_bytes()) <= (day_index(date(2026, 1, 3)) + 8) // 8
+    assert ActivityBitmap.from_bytes(b"") == ActivityBitmap()
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def test_save_session_folds_days(db):
+    now = datetime.now()
+    for back in (0, 1, 2, 5):
+        db.save_session(_summary(now - timedelta(days=back)))
+    db.save_session(_summary(now))
+
+    conn = db.get_connection()
+    blob = conn.execute("SELECT bits FROM activity_bitmap").fetchone()[0]
+    conn.close()
+    tracker = StreakTracker(db)
+    assert ActivityBitmap.from_bytes(blob) == get_activity_bitmap(db)
+    assert tracker.get_current_streak() == 3
+    assert tracker.get_longest_streak() == 3
+
+    # Days recorded another way count before the next save folds them.
+    tracker.record_activity(date.today() - timedelta(days=3))
+    assert tracker.get_longest_streak() == 4
+    assert tracker.get_current_streak() == 5  # day 4 alone doesn't break it
+    db.save_session(_summary(now))
+    conn = db.get_connection()
+    blob = conn.execute("SELECT bits FROM activity_bitmap").fetchone()[0]
+    conn.close()
+    assert len(ActivityBitmap.from_bytes(blob)) == 5
+
+
+def test_lookups_served_from_memory(db, monkeypatch):
+    db.save_session(_summary(datetime.now()))
+    tracker = StreakTracker(db)
+    assert tracker.get_current_streak() == 1
+    connections = []
+    original = db.get_connection
+    monkeypatch.setattr(db, "get_connection", lambda: connections.append(1) or original())
+
+    stats = tracker.get_streak_stats()
+    assert stats == {"current_streak": 1, "longest_streak": 1, "at_risk": False, "practiced_today": True}
+    assert tracker.is_streak_at_risk() is False and tracker.practiced_today()
+    assert tracker.get_longest_streak() == 1
+    assert connections == []
+
+    db.bump_data_version()
+    tracker.get_current_streak()
+    assert len(connections) == 1
+
+
+# ---------------------------------------------------------------------------
+# StreakTracker
+# ---------------------------------------------------------------------------
+
+
+def test_at_risk_and_calendar(db):
+    tracker = StreakTracker(db)
+    assert tracker.get_streak_calendar().empty
+    assert tracker.get_streak_stats()["at_risk"] is False
+
+    yesterday = date.today() - timedelta(days=1)
+    tracker.record_activity(yesterday)
+    tracker.record_activity(yesterday)
+    tracker.record_activity(date.today() - timedelta(days=70))
+    assert tracker.is_streak_at_risk() is True
+    assert not tracker.practiced_today()
+    assert tracker.get_active_days(weeks=2) == [yesterday]
+
+    calendar = tracker.get_streak_calendar(weeks=2)
+    assert calendar["sessions_completed"].tolist() == [2]
@@ -0,0 +1,232 @@
+"""Tests for the headless ASGI API (`api.py`), driven in-process.
+
+Covers:
+- Starting a session returns its first question batch and the validation
+  spec; invalid configs, bad JSON and unknown routes/methods are rejected.
+- Question batches continue the id sequence and stop at the session's
+  question limit.
+- Mid-session result posts are journaled; a completing post replays,
+  audits and saves the session, awards its badges, and the session is
+  then gone. A failed save leaves the session in place for a retry.
+- Abandoning discards the journal.
+- Analytics endpoints return JSON-safe data.
+- Concurrent sessions complete independently; lifespan startup works.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from api import InProcessClient, MentalMathAPI
+from src.database.db_manager import DatabaseManager
+from src.gamification.badge_manager import BadgeManager
+from src.game_logic.session_store import SessionStore
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@pytest.fixture
+def client(db):
+    return InProcessClient(MentalMathAPI(db, store=SessionStore(), audit_rate=1.0))
+
+
+MARATHON = {"mode_type": "marathon", "category": "arithmetic", "difficulty": "easy", "question_count": 5}
+
+
+def _answers(questions, wrong=()):
+    return [
+        {
+            "question_id": q["id"],
+            "user_answer": "nope" if q["id"] in wrong else q["correct_answer"],
+            "is_correct": q["id"] not in wrong,
+            "was_skipped": False,
+            "time_taken": 2.0,
+        }
+        for q in questions
+    ]
+
+
+def test_start_session(client):
+    r = client.post("/sessions", {**MARATHON, "batch": 3})
+    assert r.status == 201
+    body = r.json()
+    assert [q["id"] for q in body["questions"]] == [0, 1, 2]
+    assert {"text", "acceptable_answers", "rule"} <= set(body["questions"][0])
+    assert body["validation_spec"]["percent"]
+    assert body["config"]["question_count"] == 5 and body["has_more"]
+    assert client.get(f"/sessions/{body['session_id']}").json()["questions_served"] == 3
+
+
+@pytest.mark.parametrize("payload, message", [
+    ({"mode_type": "relay"}, "mode_type"),
+    ({"mode_type": "sprint"}, "duration_seconds"),
+    ({**MARATHON, "difficulty": "brutal"}, "difficulty"),
+    ({**MARATHON, "category": "calculus"}, "category"),
+    ({**MARATHON, "batch": 1000}, "count"),
+])
+def test_start_session_validation(client, payload, message):
+    r = client.post("/sessions", payload)
+    assert r.status == 400
+    assert message in r.json()["error"]
+
+
+def test_routing_errors(client):
+    assert client.get("/nope").status == 404
+    assert client.request("PUT", "/sessions").status == 405
+    assert client.get("/sessions/abc123").status == 404
+    r = asyncio.run(_raw_post(client.app, "/sessions", b"{not json"))
+    assert r == 400
+
+
+async def _raw_post(app, path, body):
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app({"type": "http", "method": "POST", "path": path, "query_string": b""}, receive, send)
+    return status
+
+
+def test_question_batches_stop_at_limit(client):
+    session_id = client.post("/sessions", {**MARATHON, "batch": 4}).json()["session_id"]
+    more = client.post(f"/sessions/{session_id}/questions", {"count": 20}).json()
+    # question_count 5 plus 5 spare.
+    assert [q["id"] for q in more["questions"]] == list(range(4, 10))
+    assert not more["has_more"]
+    assert client.post(f"/sessions/{session_id}/questions", {"count": 5}).json()["questions"] == []
+
+
+def test_checkpoint_then_complete(client, db):
+    body = client.post("/sessions", {**MARATHON, "batch": 5}).json()
+    session_id = body["session_id"]
+    results = _answers(body["questions"], wrong={3})
+
+    r = client.post(f"/sessions/{session_id}/results", {"results": results[:2]})
+    assert r.json()["journaled"] == 2
+    assert len(db.get_journal_answers(session_id)) == 2
+
+    r = client.post(f"/sessions/{session_id}/results", {"results": results, "completed": True})
+    assert r.status == 200
+    summary = r.json()["summary"]
+    assert summary["total_questions"] == 5 and summary["correct_answers"] == 4
+    assert r.json()["finalize"]["validated"] == 5
+    assert db.get_journal_sessions() == []
+    assert db.get_performance_stats()["total_questions"] == 5
+    assert client.get(f"/sessions/{session_id}").status == 404
+
+
+def test_failed_save_can_be_retried(client, db, monkeypatch):
+    body = client.post("/sessions", {**MARATHON, "batch": 5}).json()
+    session_id = body["session_id"]
+    results = _answers(body["questions"], wrong={1})
+    save = db.save_session
+
+    def locked(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(db, "save_session", locked)
+    r = client.post(f"/sessions/{session_id}/results", {"results": results, "completed": True})
+    assert r.status == 500
+    assert client.get(f"/sessions/{session_id}").json()["questions_served"] == 5
+
+    monkeypatch.setattr(db, "save_session", save)
+    r = client.post(f"/sessions/{session_id}/results", {"results": results, "completed": True})
+    assert r.status == 200
+    summary = r.json()["summary"]
+    assert summary["total_questions"] == 5 and summary["correct_answers"] == 4
+    assert db.get_performance_stats()["total_questions"] == 5
+    assert db.get_journal_sessions() == []
+
+
+def test_perfect_session_earns_perfectionist(client, db):
+    body = client.post("/sessions", {**MARATHON, "question_count": 10, "batch": 10}).json()
+    r = client.post(f"/sessions/{body['session_id']}/results", {"results": _answers(body["questions"]), "completed": True})
+    summary = r.json()["summary"]
+    earned = {b["badge_name"] for b in summary["badges_earned"]}
+    assert {"First Steps", "Perfectionist"} <= earned
+    assert summary["badge_progress"]["Century Club"]["progress"] == 10
+    assert "Perfectionist" in {b.badge_name for b in BadgeManager(db).get_all_badges() if b.earned}
+
+
+def test_completing_post_needs_all_results(client):
+    body = client.post("/sessions", {**MARATHON, "batch": 5}).json()
+    r = client.post(
+        f"/sessions/{body['session_id']}/results",
+        {"results": _answers(body["questions"]), "results_from": 2, "completed": True},
+    )
+    assert r.status == 400
+
+
+def test_abandon(client, db):
+    body = client.post("/sessions", {**MARATHON, "batch": 5}).json()
+    session_id = body["session_id"]
+    client.post(f"/sessions/{session_id}/results", {"results": _answers(body["questions"][:2])})
+    assert client.delete(f"/sessions/{session_id}").json()["discarded"]
+    assert db.get_journal_sessions() == []
+    assert client.delete(f"/sessions/{session_id}").status == 404
+
+
+def test_analytics(client):
+    body = client.post("/sessions", {**MARATHON, "batch": 5}).json()
+    client.post(f"/sessions/{body['session_id']}/results", {"results": _answers(body["questions"]), "completed": True})
+
+    overview = client.get("/analytics/overview", {"days": 7}).json()
+    assert overview["total_questions"] == 5 and overview["current_streak"] == 1
+    categories = client.get("/analytics/categories").json()
+    assert sum(row["questions_answered"] for row in categories) == 5
+    assert client.get("/analytics/trend", {"days": 7}).json()[0]["questions"] == 5
+    assert client.get("/analytics/sessions", {"limit": 1}).json()[0]["total_questions"] == 5
+    assert client.get("/analytics/weak-areas").json() == {"weak_areas": []}
+    assert client.get("/analytics/trend", {"days": "x"}).status == 400
+
+
+def test_concurrent_sessions(client, db):
+    async def run_session():
+        body = (await client.request_async("POST", "/sessions", {**MARATHON, "batch": 5})).json()
+        return await client.request_async(
+            "POST", f"/sessions/{body['session_id']}/results",
+            {"results": _answers(body["questions"]), "completed": True},
+        )
+
+    async def main():
+        return await asyncio.gather(*(run_session() for _ in range(6)))
+
+    responses = asyncio.run(main())
+    assert [r.status for r in responses] == [200] * 6
+    assert len({r.json()["summary"]["session_id"] for r in responses}) == 6
+    assert db.get_performance_stats()["total_questions"] == 30
+
+
+def test_lifespan(db):
+    app = MentalMathAPI(db_path=db.db_path)
+    messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+    sent = []
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(app({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
@@ -0,0 +1,223 @@
+"""Tests for incrementally maintained badge counters.
+
+Covers:
+- `BadgeCounters` folding: per-type and mixed accuracy, the trailing
+  correct run, the recent-form bit window and `with_pending`.
+- `BadgeCounterFold` keeps `badge_counters` equal to the history queries
+  the badge checks used to run, on `save_session` and when
+  `get_badge_counters` catches up rows written by other paths (exactly
+  once).
+- `BadgeManager` reads the counters and the streak once per pass.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.gamification import badge_manager
+from src.gamification.badge_manager import BadgeManager
+from src.gamification.counters import FORM_BITS, BadgeCounters, get_badge_counters
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+
+TYPES = ["addition", "division", "percentage", "fractions"]
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _summary(verdicts, *, category="mixed", difficulty="easy", question_type="addition",
+             skipped=(), when=None) -> SessionSummary:
+    when = when or datetime.now()
+    question = Question(
+        question_type=question_type, category="arithmetic", difficulty=difficulty,
+        question_text="2 + 2", correct_answer="4",
+    )
+    results = [
+        QuestionResult(
+            question=question, user_answer="4" if ok else "5", is_correct=ok and i not in skipped,
+            time_taken=2.0, timestamp=when + timedelta(seconds=i), was_skipped=i in skipped,
+        )
+        for i, ok in enumerate(verdicts)
+    ]
+    return SessionSummary(
+        session_id=None,
+        config=SessionConfig(mode_type="sprint", category=category, difficulty=difficulty, duration_seconds=60),
+        total_questions=len(results),
+        correct_answers=sum(r.is_correct for r in results),
+        total_score=10,
+        avg_time_per_question=2.0,
+        duration_seconds=60,
+        results=results,
+        timestamp=when,
+    )
+
+
+def _random_history(db, sessions: int = 30, seed: int = 3):
+    rnd = random.Random(seed)
+    start = datetime.now() - timedelta(days=sessions)
+    for n in range(sessions):
+        size = rnd.randint(1, 12)
+        db.save_session(_summary(
+            [rnd.random() < 0.85 for _ in range(size)],
+            category=rnd.choice(["mixed", "arithmetic"]),
+            difficulty=rnd.choice(["easy", "hard"]),
+            question_type=rnd.choice(TYPES),
+            skipped={i for i in range(size) if rnd.random() < 0.1},
+            when=start + timedelta(days=n),
+        ))
+
+
+def _from_queries(db) -> dict:
+    """The values the per-badge queries used to compute."""
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM sessions WHERE difficulty = 'hard' AND completed = 1")
+    hard = cursor.fetchone()[0]
+    cursor.execute("SELECT question_type, COUNT(*), SUM(is_correct) FROM questions_answered GROUP BY question_type")
+    per_type = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    cursor.execute("""
+        SELECT COUNT(*), COALESCE(SUM(is_correct), 0) FROM questions_answered qa
+        JOIN sessions s ON qa.session_id = s.id WHERE s.category = 'mixed'
+    """)
+    mixed = tuple(cursor.fetchone())
+    cursor.execute("SELECT is_correct FROM questions_answered ORDER BY timestamp DESC")
+    run = 0
+    for (ok,) in cursor.fetchall():
+        if not ok:
+            break
+        run += 1
+    cursor.execute("SELECT is_correct FROM questions_answered WHERE was_skipped = 0 ORDER BY timestamp DESC LIMIT 50")
+    last_50 = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return {"hard": hard, "per_type": per_type, "mixed": mixed, "run": run, "last_50": last_50}
+
+
+def _assert_matches_queries(counters: BadgeCounters, expected: dict):
+    assert counters.hard_sessions == expected["hard"]
+    for question_type, (total, correct) in expected["per_type"].items():
+        assert counters.accuracy_over([question_type]) == (total, correct)
+    assert (counters.mixed_total, counters.mixed_correct) == expected["mixed"]
+    assert counters.correct_run == expected["run"]
+    if len(expected["last_50"]) == 50:
+        assert counters.recent_form(50) == sum(expected["last_50"])
+
+
+# ---------------------------------------------------------------------------
+# Counters
+# ---------------------------------------------------------------------------
+
+
+def test_runs_and_form_window():
+    counters = BadgeCounters()
+    for ok in [True] * 5 + [False] + [True] * 3:
+        counters.add_answer("addition", ok, False, in_mixed=False)
+    assert counters.correct_run == 3
+    assert counters.recent_form(4) == 3
+    assert counters.recent_form(9) == 8
+    assert counters.recent_form(10) is None
+
+    # Skips break the run but stay out of the form window.
+    counters.add_answer("addition", False, True, in_mixed=False)
+    assert counters.correct_run == 0
+    assert counters.recent_form(4) == 3
+    assert counters.attempts == 9 and counters.type_total["addition"] == 10
+
+    for _ in range(FORM_BITS + 5):
+        counters.add_answer("division", True, False, in_mixed=True)
+    assert counters.form_count == FORM_BITS
+    assert counters.recent_form(FORM_BITS) == FORM_BITS
+    with pytest.raises(ValueError):
+        counters.recent_form(FORM_BITS + 1)
+
+
+def test_with_pending_leaves_saved_counters_alone():
+    saved = BadgeCounters()
+    saved.add_session("hard", True)
+    saved.add_answer("addition", True, False, in_mixed=True)
+    pending = saved.with_pending(_summary([True, False], category="arithmetic", question_type="addition"))
+    assert pending.accuracy_over(["addition"]) == (3, 2)
+    assert pending.mixed_total == 1 and pending.correct_run == 0
+    assert pending.sessions == saved.sessions == 1
+    assert saved.accuracy_over(["addition"]) == (1, 1) and saved.correct_run == 1
+    assert saved.with_pending(None) is saved
+
+
+def test_rows_round_trip():
+    counters = BadgeCounters()
+    counters.add_session("hard", True)
+    counters.add_answer("percentage", True, False, in_mixed=True)
+    counters.add_answer("ratios", False, False, in_mixed=False)
+    assert BadgeCounters.from_rows(counters.to_rows().items()) == counters
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def test_save_session_matches_history_queries(db):
+    _random_history(db, sessions=40)
+    counters = get_badge_counters(db)
+    _assert_matches_queries(counters, _from_queries(db))
+    assert counters.stats() == {
+        key: db.get_performance_stats()[key] for key in ("total_sessions", "total_questions")
+    }
+
+
+def test_catch_up_folds_existing_rows_once(db):
+    _random_history(db, sessions=10)
+    conn = db.get_connection()
+    conn.execute("DELETE FROM badge_counters")
+    conn.execute("DELETE FROM derived_watermarks WHERE name LIKE 'badge_counters.%'")
+    conn.commit()
+    conn.close()
+
+    rebuilt = get_badge_counters(db)
+    _assert_matches_queries(rebuilt, _from_queries(db))
+    assert get_badge_counters(db) == rebuilt
+
+    db.save_session(_summary([True, True], difficulty="hard"))
+    after = get_badge_counters(db)
+    assert after.sessions == rebuilt.sessions + 1
+    _assert_matches_queries(after, _from_queries(db))
+
+
+# ---------------------------------------------------------------------------
+# BadgeManager
+# ---------------------------------------------------------------------------
+
+
+def test_one_read_per_pass(db, monkeypatch):
+    _random_history(db, sessions=5)
+    badges = BadgeManager(db)
+    calls = {"counters": 0, "streak": 0}
+    counters, streak = badge_manager.get_badge_counters, badge_manager.get_activity_bitmap
+
+    def count(name, read):
+        return lambda *a: calls.__setitem__(name, calls[name] + 1) or read(*a)
+
+    monkeypatch.setattr(badge_manager, "get_badge_counters", count("counters", counters))
+    monkeypatch.setattr(badge_manager, "get_activity_bitmap", count("streak", streak))
+
+    summary = _summary([True] * 12)
+    db.save_session(summary)
+    badges.check_earned_badges(summary)
+    assert calls == {"counters": 1, "streak": 1}
+
+    badges.preview_verdict_badges(_summary([True] * 12))
+    assert calls == {"counters": 2, "streak": 1}
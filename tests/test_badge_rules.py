@@ -0,0 +1,175 @@
+"""Tests for declarative badge rules.
+
+Covers:
+- Every shipped badge has a rule, and `VERDICT_BADGES` follows from the
+  rules' metrics.
+- `compile_rules` merges the counter rows of all rules into one read and
+  only asks for the streak when a rule needs it.
+- Rule evaluation: thresholds, `<` comparisons, minimum samples and
+  progress descriptions.
+- `BadgeManager` runs one counters query per check regardless of how
+  many badges are pending, and serves progress from the same plan.
+- `evaluate_session` stores awards and progress on the summary in one
+  read, and the results page's near-miss hints come from that snapshot.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.gamification import badge_manager
+from src.gamification.badge_manager import BadgeManager
+from src.gamification.counters import BadgeCounters
+from src.gamification.rules import DEFAULT_RULES, BadgeRule, RuleContext, compile_rules
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+from src.ui.pages.results import _near_miss_badges
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _summary(verdicts, *, question_type="addition", category="mixed", time_taken=2.0) -> SessionSummary:
+    now = datetime.now()
+    question = Question(
+        question_type=question_type, category="arithmetic", difficulty="easy",
+        question_text="2 + 2", correct_answer="4",
+    )
+    results = [
+        QuestionResult(
+            question=question, user_answer="4" if ok else "5", is_correct=ok,
+            time_taken=time_taken, timestamp=now + timedelta(seconds=i),
+        )
+        for i, ok in enumerate(verdicts)
+    ]
+    return SessionSummary(
+        session_id=None,
+        config=SessionConfig(mode_type="marathon", category=category, difficulty="easy", question_count=len(results)),
+        total_questions=len(results),
+        correct_answers=sum(verdicts),
+        total_score=10,
+        avg_time_per_question=time_taken,
+        duration_seconds=int(time_taken * len(results)),
+        results=results,
+        timestamp=now,
+    )
+
+
+def _count_counter_reads(db, monkeypatch) -> list:
+    calls = []
+    original = badge_manager.get_badge_counters
+    monkeypatch.setattr(
+        badge_manager, "get_badge_counters", lambda db, names=None: calls.append(names) or original(db, names)
+    )
+    return calls
+
+
+def test_every_badge_has_a_rule(db):
+    names = {b.badge_name for b in BadgeManager(db).get_all_badges()}
+    assert names == set(BadgeManager.BADGE_RULES)
+    assert "No Miss" in BadgeManager.VERDICT_BADGES
+    assert "Week Warrior" not in BadgeManager.VERDICT_BADGES
+    assert "Lightning Round" not in BadgeManager.VERDICT_BADGES
+
+    with pytest.raises(ValueError):
+        BadgeRule("Nope", "unknown_metric", 1)
+    with pytest.raises(ValueError):
+        BadgeRule("Nope", "sessions", 1, op="==")
+
+
+def test_compile_merges_counter_reads():
+    plan = compile_rules(DEFAULT_RULES)
+    assert plan.needs_streak
+    assert len(plan.counter_names) == len(set(plan.counter_names))
+    assert {"sessions", "attempts", "correct_run", "type_total:addition", "form_bits"} <= set(plan.counter_names)
+
+    session_only = compile_rules(r for r in DEFAULT_RULES if r.badge_name in ("Perfectionist", "Hot Streak"))
+    assert session_only.counter_names == () and not session_only.needs_streak
+
+
+def test_evaluate_and_progress():
+    counters = BadgeCounters()
+    for i in range(60):
+        counters.add_answer("percentage", i % 20 != 0, False, in_mixed=False)
+    rules = [
+        BadgeRule("Pro", "accuracy", 0.95, filter=("percentage",), min_count=50),
+        BadgeRule("Strict", "accuracy", 0.95, filter=("percentage",), min_count=100),
+        BadgeRule("Quick", "session_avg_time", 3.0, op="<", min_count=10),
+        BadgeRule("Hundred", "questions", 100, progress="{progress}/{target} questions"),
+    ]
+    plan = compile_rules(rules)
+    ctx = RuleContext(counters=counters, stats=counters.stats(), summary=_summary([True] * 10, time_taken=2.5))
+    assert plan.evaluate(ctx) == {"Pro": True, "Strict": False, "Quick": True, "Hundred": False}
+    assert plan.progress(ctx) == {"Hundred": (60, 100, "60/100 questions")}
+
+
+def test_one_counters_query_per_check(db, monkeypatch):
+    badges = BadgeManager(db)
+    calls = _count_counter_reads(db, monkeypatch)
+    summary = _summary([True] * 12)
+    db.save_session(summary)
+
+    earned = {b.badge_name for b in badges.check_earned_badges(summary)}
+    assert {"First Steps", "Marathon Finisher", "Perfectionist", "Speed Demon", "Lightning Round"} <= earned
+    assert len(calls) == 1
+
+    # Earned badges drop out of the next plan.
+    badges.check_earned_badges(summary)
+    assert len(calls) == 2
+    assert "sessions" not in calls[-1]
+
+
+def test_progress_served_from_one_plan(db, monkeypatch):
+    for _ in range(9):
+        db.save_session(_summary([True] * 5))
+    badges = BadgeManager(db)
+    calls = _count_counter_reads(db, monkeypatch)
+    progress = badges.get_progress_to_badges()
+    assert len(calls) == 1
+    assert progress["Century Club"]["progress"] == 45
+    assert progress["Century Club"]["description"] == "45/100 questions answered"
+    assert progress["No Miss"]["progress"] == 45 and progress["No Miss"]["target"] == 50
+    assert progress["Hard Mode Hero"]["progress"] == 0
+
+
+def test_session_snapshot(db, monkeypatch):
+    for _ in range(9):
+        db.save_session(_summary([True] * 5))
+    badges = BadgeManager(db)
+    calls = _count_counter_reads(db, monkeypatch)
+    monkeypatch.setattr(db, "get_performance_stats", lambda **kw: pytest.fail("stats re-read"))
+
+    summary = _summary([True] * 10)
+    db.save_session(summary)
+    snapshot = badges.evaluate_session(summary)
+    assert len(calls) == 1
+    assert summary.badges is snapshot
+    assert {"First Steps", "Perfectionist", "No Miss"} <= {b.badge_name for b in snapshot.earned}
+    # Badges earned just now have no progress bar.
+    assert "No Miss" not in snapshot.progress
+    assert snapshot.progress["Century Club"]["progress"] == 55
+
+    hints = _near_miss_badges({
+        **snapshot.progress,
+        "No Miss": {"badge": None, "progress": 46, "target": 50},
+    })
+    assert hints == [("4 more for No Miss", 46, 50, "🎯")]
+    assert len(calls) == 1
+
+    # Empty sessions award nothing but still report progress.
+    empty = _summary([])
+    assert badges.evaluate_session(empty).earned == []
+    assert "Century Club" in empty.badges.progress
@@ -0,0 +1,159 @@
+"""Parity tests for the vectorized session evaluator.
+
+Covers:
+- `validate_arrays` agrees with `AnswerValidator.validate` on randomized
+  answers, including blanks, skips and multiple acceptable answers, and
+  routes exact-type rows to the exact engine (raising without questions).
+- `combo_counts` / `score_arrays` reproduce `SessionManager.submit_answer`
+  combo tracking and `ScoreCalculator.calculate_question_score` exactly,
+  including combo resets at session boundaries.
+- `evaluate_results` re-grades real sessions to the same total score.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.batch_eval import (
+    combo_counts,
+    evaluate_results,
+    score_arrays,
+    validate_arrays,
+)
+from src.game_logic.scoring import ScoreCalculator
+from src.game_logic.session_manager import SessionManager
+from src.game_logic.validator import AnswerValidator
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig
+
+ATOMS = ["0", "1", "5", "10", "11", "15", "0.15", "12,3", "1,000", "1/2", "2/4", "1/0", "%", "+", "-", " ", "abc", "e3"]
+DIFFICULTIES = ["easy", "medium", "hard", "adaptive", "bogus"]
+
+
+def _text(rng: random.Random) -> str:
+    return "".join(rng.choice(ATOMS) for _ in range(rng.randint(1, 3)))
+
+
+def _scalar_scores(is_correct, times, difficulties):
+    combo, out = 0, []
+    for correct, t, d in zip(is_correct, times, difficulties):
+        combo = combo + 1 if correct else 0
+        question = Question(question_type="addition", category="arithmetic", difficulty=d,
+                            question_text="q", correct_answer="0")
+        result = QuestionResult(question=question, user_answer="", is_correct=bool(correct),
+                                time_taken=t, timestamp=datetime.now())
+        out.append(ScoreCalculator.calculate_question_score(result, combo))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_validate_arrays_matches_scalar(seed):
+    rng = random.Random(seed)
+    n = 500
+    acceptable = [[_text(rng) for _ in range(rng.randint(1, 3))] for _ in range(n)]
+    users = [
+        rng.choice([None, "", "  ", rng.choice(acc), _text(rng)]) for acc in acceptable
+    ]
+    skipped = [rng.random() < 0.1 for _ in range(n)]
+    questions = [Question("addition", "arithmetic", "easy", "q", acc[0], list(acc)) for acc in acceptable]
+
+    expected = [
+        False if skip else AnswerValidator.validate(user, q)
+        for user, q, skip in zip(users, questions, skipped)
+    ]
+    got = validate_arrays(users, [q.acceptable_answers for q in questions], ["addition"] * n, skipped)
+    assert got.tolist() == expected
+
+
+def test_validate_arrays_rejects_length_mismatch():
+    with pytest.raises(ValueError):
+        validate_arrays(["1"], [], [])
+    with pytest.raises(ValueError):
+        validate_arrays(["1"], [["1"]], [])
+
+
+def test_exact_types_use_the_exact_engine():
+    questions = [
+        Question("fractions", "fractions", "easy", "1/3 as a decimal", "333/1000", ["333/1000"]),
+        Question("addition", "arithmetic", "easy", "q", "0.333", ["0.333"]),
+    ]
+    users = ["0.33", "0.333"]
+    acceptable = [q.acceptable_answers for q in questions]
+    types = [q.question_type for q in questions]
+    got = validate_arrays(users, acceptable, types, questions=questions)
+    assert got.tolist() == [AnswerValidator.validate(u, q) for u, q in zip(users, questions)]
+    assert got.tolist() == [False, True]
+
+    with pytest.raises(ValueError, match="source questions"):
+        validate_arrays(users, acceptable, types)
+    # Without exact rows, questions aren't needed.
+    assert validate_arrays(users[1:], acceptable[1:], types[1:]).tolist() == [True]
+
+
+def test_combo_counts():
+    assert combo_counts([True, True, False, True, True, True]).tolist() == [1, 2, 0, 1, 2, 3]
+    assert combo_counts([True, True, True, True], session_ids=[1, 1, 2, 2]).tolist() == [1, 2, 1, 2]
+    assert combo_counts([]).tolist() == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_score_arrays_matches_scalar(seed):
+    rng = random.Random(seed)
+    n = 400
+    is_correct = [rng.random() < 0.85 for _ in range(n)]
+    # Include exact tier boundaries (2.0, 3.0, 5.0) and NaN-free edge values.
+    times = [rng.choice([1.999, 2.0, 2.5, 3.0, 4.99, 5.0, rng.uniform(0, 8)]) for _ in range(n)]
+    difficulties = [rng.choice(DIFFICULTIES) for _ in range(n)]
+
+    _, scores = score_arrays(np.array(is_correct), times, difficulties)
+    assert scores.tolist() == _scalar_scores(is_correct, times, difficulties)
+
+
+def test_session_boundaries_reset_combo():
+    is_correct = [True] * 20
+    times = [1.0] * 20
+    difficulties = ["hard"] * 20
+    session_ids = [1] * 10 + [2] * 10
+    _, scores = score_arrays(np.array(is_correct), times, difficulties, session_ids)
+    per_session = _scalar_scores(is_correct[:10], times[:10], difficulties[:10])
+    assert scores.tolist() == per_session * 2
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@pytest.mark.parametrize("category", ["arithmetic", "percentage", "fractions", "mixed"])
+def test_regrades_real_session(db, category):
+    rng = random.Random(category)
+    manager = SessionManager(db)
+    state = manager.start_session(
+        SessionConfig(mode_type="marathon", category=category, difficulty="adaptive", question_count=40)
+    )
+    while not state.is_complete:
+        question = state.current_question
+        roll = rng.random()
+        if roll < 0.1:
+            manager.submit_answer(state, "", was_skipped=True)
+        elif roll < 0.7:
+            manager.submit_answer(state, question.correct_answer)
+        else:
+            manager.submit_answer(state, _text(rng))
+
+    batch = evaluate_results(state.questions_answered)
+    assert batch.is_correct.tolist() == [r.is_correct for r in state.questions_answered]
+    assert batch.total_score == state.total_score
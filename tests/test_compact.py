@@ -0,0 +1,95 @@
+"""Tests for the compact model representations.
+
+Covers:
+- The live models are slotted (no per-instance ``__dict__``).
+- `ResultBatch` round-trips results exactly (including unicode answers,
+  non-JSON metadata and extra acceptable answers), supports indexing,
+  slicing and counts, and stands in for a results list in badge checks.
+- `bench_memory.measure` shows the batch is several times smaller.
+"""
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime
+
+import pytest
+
+from src.gamification.badge_manager import BadgeManager
+from src.models.compact import ResultBatch
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionState, SessionConfig
+from src.tools import bench_memory
+
+
+def _q(answer="5", acceptable=None, **metadata) -> Question:
+    return Question(
+        question_type="ratios",
+        category="ratios",
+        difficulty="medium",
+        question_text=f"? = {answer}",
+        correct_answer=answer,
+        acceptable_answers=acceptable,
+        metadata=metadata,
+    )
+
+
+def _result(question, answer="5", correct=True, skipped=False, seconds=2.5):
+    return QuestionResult(
+        question=question,
+        user_answer=answer,
+        is_correct=correct,
+        time_taken=seconds,
+        timestamp=datetime(2026, 3, 1, 12, 30, 15, 123456),
+        was_skipped=skipped,
+    )
+
+
+def test_live_models_are_slotted():
+    for obj in (_q(), _result(_q()), SessionState(config=SessionConfig("sprint", "mixed", "easy"))):
+        assert not hasattr(obj, "__dict__")
+
+
+class TestResultBatch:
+
+    def test_round_trip(self):
+        results = [
+            _result(_q(x=1.25, kind="a")),
+            _result(_q("3/4", acceptable=["0.75", "3/4"]), answer="٣/٤ ✓", correct=False),
+            _result(_q(when=datetime(2026, 1, 1), pair=(1, 2), ints={1: "one"}), answer="", skipped=True, correct=False),
+        ]
+        batch = ResultBatch(results)
+        assert len(batch) == 3
+        assert batch.to_results() == results
+        assert batch[-1] == results[-1]
+        assert batch[1:] == results[1:]
+        assert batch.correct_count == 1 and batch.skipped_count == 1
+        with pytest.raises(IndexError):
+            batch[3]
+
+    def test_append_matches_constructor(self):
+        results = [_result(_q(str(i)), answer=str(i)) for i in range(5)]
+        batch = ResultBatch()
+        for result in results:
+            batch.append(result)
+        assert list(batch) == list(ResultBatch.from_results(results))
+
+    def test_stands_in_for_results_list(self):
+        results = [_result(_q(str(i)), answer=str(i)) for i in range(10)]
+        assert BadgeManager._check_in_session_streak(
+            dataclasses.replace(_summary(results), results=ResultBatch(results)), 10
+        )
+
+
+def _summary(results):
+    from src.models.session import SessionSummary
+    return SessionSummary(
+        session_id=None, config=SessionConfig("marathon", "ratios", "medium"),
+        total_questions=len(results), correct_answers=len(results), total_score=0,
+        avg_time_per_question=2.5, duration_seconds=25, results=results,
+        timestamp=datetime(2026, 3, 1),
+    )
+
+
+def test_benchmark_shows_severalfold_saving():
+    results = bench_memory.measure(answers=200, sessions=3, seed=1)
+    assert results["batch"].total_bytes * 3 < results["list"].total_bytes
@@ -0,0 +1,156 @@
+"""Tests for the single-read dashboard snapshot.
+
+Covers:
+- Every `PerformanceTracker` read (overall stats per window, trend,
+  category/difficulty/time-of-day breakdowns, weak and slow areas, recent
+  sessions, goals) and the derived metrics built on them (goal progress,
+  baseline, weekly summary, recommendations) match the tracker's own
+  queries on a mixed history with skips and old rows.
+- The snapshot is read over one connection; windows it was not built
+  with fall through to the database.
+- Empty database.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.analytics.dashboard_snapshot import DashboardSnapshot, SnapshotPerformanceTracker
+from src.analytics.performance_tracker import PerformanceTracker
+from src.database.db_manager import DatabaseManager
+
+TYPES = ["addition", "multiplication", "percentage", "fraction_add", "ratio"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _seed(db: DatabaseManager, seed: int = 3):
+    """Sessions over the last ~120 days, some incomplete, with skips."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    for n in range(60):
+        started = now - timedelta(days=rng.choice([0, 0, 1, 2, 3, 5, 6, 8, 10, 13, 20, 29, 40, 55, 90, 120]),
+                                  hours=rng.randint(0, 23), minutes=rng.randint(0, 59))
+        cursor.execute(
+            """
+            INSERT INTO sessions (timestamp, mode_type, category, difficulty, total_questions,
+                                  correct_answers, total_score, avg_time_per_question, completed)
+            VALUES (?, 'sprint', 'mixed', 'medium', 12, 8, ?, 3.0, ?)
+            """,
+            (started, rng.randint(0, 400), int(n % 9 != 0)),
+        )
+        session_id = cursor.lastrowid
+        skill = rng.uniform(0.4, 0.95)
+        for i in range(12):
+            skipped = rng.random() < 0.1
+            cursor.execute(
+                """
+                INSERT INTO questions_answered (session_id, question_type, difficulty, question_text,
+                    correct_answer, user_answer, is_correct, was_skipped, time_taken_seconds, timestamp)
+                VALUES (?, ?, ?, 'q', '1', '1', ?, ?, ?, ?)
+                """,
+                (
+                    session_id, rng.choice(TYPES), rng.choice(DIFFICULTIES),
+                    int(not skipped and rng.random() < skill), int(skipped),
+                    round(rng.uniform(0.5, 9.0), 2), started + timedelta(seconds=5 * i),
+                ),
+            )
+    for back in (0, 1, 2, 4, 5, 9, 10, 11, 12):
+        db.update_streak(cursor, date.today() - timedelta(days=back))
+    conn.commit()
+    conn.close()
+    db.set_user_preference("goal_daily_questions", "30")
+    db.set_user_preference("goal_target_accuracy", "70")
+
+
+def _assert_frames(actual: pd.DataFrame, expected: pd.DataFrame):
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False, check_exact=False
+    )
+
+
+def _assert_same_reads(snap: PerformanceTracker, base: PerformanceTracker, days: int):
+    for window in (None, 7, days):
+        assert snap.get_overall_stats(window) == pytest.approx(base.get_overall_stats(window))
+    for window in (7, 14, 30, 56, days):
+        _assert_frames(snap.get_historical_trend(window), base.get_historical_trend(window))
+    _assert_frames(snap.get_stats_by_category(), base.get_stats_by_category())
+    _assert_frames(snap.get_stats_by_difficulty(), base.get_stats_by_difficulty())
+    _assert_frames(snap.get_time_of_day_performance(), base.get_time_of_day_performance())
+    for threshold in (0.5, 0.75, 0.9):
+        assert snap.identify_weak_areas(threshold) == sorted(base.identify_weak_areas(threshold))
+    assert snap.identify_slow_areas(5.0) == base.identify_slow_areas(5.0)
+    _assert_frames(snap.get_recent_sessions(limit=6), base.get_recent_sessions(limit=6))
+    _assert_frames(snap.get_recent_sessions(limit=25), base.get_recent_sessions(limit=25))
+    _assert_frames(snap.get_recent_sessions(limit=500, days=7), base.get_recent_sessions(limit=500, days=7))
+    assert snap.get_goal_settings() == base.get_goal_settings()
+    assert snap.get_goal_progress(lookback_days=7) == pytest.approx(base.get_goal_progress(lookback_days=7))
+    assert snap.get_personal_baseline(days=30) == pytest.approx(base.get_personal_baseline(days=30))
+    _assert_frames(snap.get_weekly_summary(weeks=8), base.get_weekly_summary(weeks=8))
+    assert snap.get_training_recommendations() == base.get_training_recommendations()
+
+
+@pytest.mark.parametrize("days", [7, 30, 90, 36500])
+def test_snapshot_matches_tracker(db, days):
+    _seed(db)
+    base = PerformanceTracker(db)
+    snap = SnapshotPerformanceTracker.build(db, windows=(days,))
+    _assert_same_reads(snap, base, days)
+
+
+def test_snapshot_reads_over_one_connection(db, monkeypatch):
+    _seed(db)
+    snapshot = DashboardSnapshot.build(db, windows=(90,))
+    tracker = SnapshotPerformanceTracker(db, snapshot)
+
+    def no_connection():
+        raise AssertionError("widget read hit the database")
+
+    monkeypatch.setattr(db, "get_connection", no_connection)
+    tracker.get_overall_stats(90)
+    tracker.get_goal_progress(lookback_days=7)
+    tracker.get_training_recommendations()
+    tracker.get_weekly_summary(weeks=8)
+    tracker.get_stats_by_difficulty()
+    tracker.get_time_of_day_performance()
+    tracker.get_recent_sessions(limit=25)
+
+
+def test_uncovered_windows_fall_through(db):
+    _seed(db)
+    base = PerformanceTracker(db)
+    snap = SnapshotPerformanceTracker.build(db, recent_limit=5)
+    assert not snap.snapshot.covers(45)
+    assert snap.get_overall_stats(45) == pytest.approx(base.get_overall_stats(45))
+    _assert_frames(snap.get_historical_trend(45), base.get_historical_trend(45))
+    _assert_frames(snap.get_recent_sessions(limit=20), base.get_recent_sessions(limit=20))
+    _assert_frames(snap.get_recent_sessions(limit=50, days=30), base.get_recent_sessions(limit=50, days=30))
+
+
+def test_empty_database(db):
+    snap = SnapshotPerformanceTracker.build(db)
+    stats = snap.get_overall_stats()
+    assert stats["total_questions"] == 0 and stats["accuracy"] == 0 and stats["current_streak"] == 0
+    assert snap.get_historical_trend(14).empty
+    assert snap.get_stats_by_category().empty
+    assert snap.get_weekly_summary().empty
+    assert snap.get_goal_progress()["coaching_score"] == PerformanceTracker.COACHING_SCORE_FRESH_INSTALL
+    assert snap.get_training_recommendations() == PerformanceTracker(db).get_training_recommendations()
@@ -0,0 +1,171 @@
+"""Tests for within-session duplicate suppression.
+
+Covers:
+- `SeenSet` / `BloomFilter` membership (Bloom: no false negatives, false
+  positive rate near target) and `make_seen_filter` selection.
+- `QuestionGenerator.generate_unique` retries are bounded and counted,
+  and any container of fingerprints works as `seen`.
+- `SessionManager` avoids repeats from small pools and seeds the filter
+  from recent history.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import tempfile
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.dedup import EXACT_LIMIT, BloomFilter, SeenSet, make_seen_filter
+from src.game_logic.session_manager import SessionManager
+from src.models.question import Question
+from src.models.session import SessionConfig
+from src.question_generator.base import QuestionGenerator
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class CyclingGenerator(QuestionGenerator):
+    """Deterministic generator over a fixed list of prompts."""
+
+    def __init__(self, texts):
+        self._texts = itertools.cycle(texts)
+        self.calls = 0
+
+    @property
+    def question_type(self) -> str:
+        return "addition"
+
+    @property
+    def category(self) -> str:
+        return "arithmetic"
+
+    def generate(self, difficulty: str) -> Question:
+        self.calls += 1
+        return Question(
+            question_type=self.question_type,
+            category=self.category,
+            difficulty=difficulty,
+            question_text=next(self._texts),
+            correct_answer="0",
+        )
+
+
+class TestFilters:
+
+    def test_seen_set(self):
+        seen = SeenSet(["a"])
+        seen.add("b")
+        assert "a" in seen and "b" in seen and "c" not in seen
+        assert len(seen) == 2
+
+    def test_bloom_has_no_false_negatives(self):
+        bloom = BloomFilter(5000, 0.01)
+        items = [f"item-{i}" for i in range(5000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_bloom_false_positive_rate(self):
+        bloom = BloomFilter(5000, 0.01, items=(f"in-{i}" for i in range(5000)))
+        false_positives = sum(f"out-{i}" in bloom for i in range(20000))
+        assert false_positives / 20000 < 0.02
+
+    def test_bloom_rejects_bad_parameters(self):
+        with pytest.raises(ValueError):
+            BloomFilter(0)
+        with pytest.raises(ValueError):
+            BloomFilter(10, error_rate=1.5)
+
+    def test_make_seen_filter_switches_on_size(self):
+        assert isinstance(make_seen_filter(EXACT_LIMIT), SeenSet)
+        big = make_seen_filter(EXACT_LIMIT + 1, items=["x"])
+        assert isinstance(big, BloomFilter)
+        assert "x" in big
+
+
+class TestGenerateUnique:
+
+    def test_retries_past_duplicates(self):
+        gen = CyclingGenerator(["1 + 1", "1 + 2", "1 + 3"])
+        seen = SeenSet()
+        seen.add(gen.generate("easy").fingerprint)
+        gen.calls = 0
+        question = gen.generate_unique("easy", seen)
+        assert question.question_text == "1 + 2"
+        assert gen.calls == 1
+        assert seen.stats.retries == 0
+
+        seen.add(question.fingerprint)
+        question = gen.generate_unique("easy", seen)  # "1 + 3"
+        seen.add(question.fingerprint)
+        question = gen.generate_unique("easy", seen)  # cycles 1, 2, 3 ... all seen
+        assert seen.stats.exhausted == 1
+        assert seen.stats.retries == gen.MAX_UNIQUE_ATTEMPTS - 1
+
+    def test_attempts_are_bounded(self):
+        gen = CyclingGenerator(["only"])
+        seen = SeenSet([gen.generate("easy").fingerprint])
+        gen.calls = 0
+        question = gen.generate_unique("easy", seen, max_attempts=3)
+        assert question.question_text == "only"
+        assert gen.calls == 3
+        assert seen.stats.exhausted == 1
+        assert seen.stats.retry_rate == 2.0
+
+    def test_accepts_any_container(self):
+        gen = CyclingGenerator(["1 + 1", "1 + 2"])
+        seen = {gen.generate("easy").fingerprint}
+        gen.calls = 0
+        assert gen.generate_unique("easy", seen).question_text == "1 + 2"
+        assert gen.calls == 1
+        assert gen.generate_unique("easy", frozenset(), max_attempts=2).question_text == "1 + 1"
+
+
+class TestSessionDedup:
+
+    def test_small_pool_session_has_no_repeats(self, db):
+        manager = SessionManager(db)
+        random.seed(0)
+        state = manager.start_session(
+            SessionConfig(mode_type="marathon", category="fractions", difficulty="easy", question_count=10)
+        )
+        fingerprints = []
+        while not state.is_complete:
+            fingerprints.append(state.current_question.fingerprint)
+            manager.submit_answer(state, "x")
+        assert len(set(fingerprints)) == len(fingerprints)
+        assert state.seen_questions.stats.generated == len(fingerprints)
+
+    def test_filter_seeded_from_history(self, db):
+        manager = SessionManager(db)
+        config = SessionConfig(mode_type="marathon", category="arithmetic", difficulty="medium", question_count=5)
+        state = manager.start_session(config)
+        while not state.is_complete:
+            manager.submit_answer(state, "19")
+        manager.end_session(state)
+
+        history = db.get_recent_question_fingerprints()
+        assert history[0] == state.questions_answered[-1].question.fingerprint
+        fresh = manager.start_session(config)
+        assert all(fp in fresh.seen_questions for fp in history)
+
+    def test_history_window_can_be_disabled(self, db, monkeypatch):
+        monkeypatch.setattr(SessionManager, "DEDUP_HISTORY_WINDOW", 0)
+        manager = SessionManager(db)
+        state = manager.start_session(
+            SessionConfig(mode_type="marathon", category="arithmetic", difficulty="easy", question_count=3)
+        )
+        assert len(state.seen_questions) == 1
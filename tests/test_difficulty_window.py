@@ -0,0 +1,132 @@
+"""Equivalence tests for `IncrementalDifficultyAdjuster`.
+
+The incremental adjuster must make exactly the same call as
+`DifficultyAdjuster.analyze_performance` after every answer. The
+property test below drives both with many seeded random answer streams
+(no extra test dependency needed) and compares them step by step. Time
+draws deliberately include values at and a hair either side of the 4.0s
+threshold, plus 0.1-step values whose float sums don't round-trip, so
+the guard-band fallback is exercised.
+
+Also covers:
+- `sync` folds only the unseen tail and rebuilds if the list is replaced.
+- `SessionManager` attaches one window per adaptive session.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+
+import pytest
+
+from src.game_logic.difficulty import DifficultyAdjuster, IncrementalDifficultyAdjuster
+from src.models.question import Question
+from src.models.session import QuestionResult
+
+EDGE_TIMES = [
+    4.0,
+    3.9999999999999996,
+    4.000000000000001,
+    0.1,
+    0.2,
+    0.3,
+    0.7,
+    1.1,
+    2.2,
+    3.3,
+    5.5,
+]
+
+
+def _result(is_correct: bool, time_taken: float, difficulty: str) -> QuestionResult:
+    return QuestionResult(
+        question=Question(
+            question_type="addition",
+            category="arithmetic",
+            difficulty=difficulty,
+            question_text="1 + 1",
+            correct_answer="2",
+        ),
+        user_answer="2" if is_correct else "x",
+        is_correct=is_correct,
+        time_taken=time_taken,
+        timestamp=datetime.now(),
+    )
+
+
+def _random_stream(rng: random.Random, length: int) -> list[QuestionResult]:
+    # Bias accuracy per stream so both step-up and step-down paths fire.
+    p_correct = rng.choice([0.3, 0.6, 0.85, 0.95, 1.0])
+    out = []
+    for _ in range(length):
+        if rng.random() < 0.6:
+            t = rng.choice(EDGE_TIMES)
+        else:
+            t = rng.uniform(0.2, 9.0)
+        out.append(_result(rng.random() < p_correct, t, rng.choice(["easy", "medium", "hard"])))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_reference_after_every_answer(seed):
+    rng = random.Random(seed)
+    stream = _random_stream(rng, rng.randint(1, 60))
+    window = IncrementalDifficultyAdjuster()
+    for i, result in enumerate(stream, start=1):
+        window.record(result)
+        assert window.suggest() == DifficultyAdjuster.analyze_performance(stream[:i]), (seed, i)
+
+
+def test_exact_threshold_windows():
+    # Seven answers averaging exactly 4.0s must NOT step up (strict <).
+    stream = [_result(True, 4.0, "medium") for _ in range(14)]
+    window = IncrementalDifficultyAdjuster()
+    for i, result in enumerate(stream, start=1):
+        window.record(result)
+        assert window.suggest() == DifficultyAdjuster.analyze_performance(stream[:i])
+    assert window.suggest() == "medium"
+
+
+def test_long_stream_resyncs_without_drift():
+    rng = random.Random(7)
+    stream = _random_stream(rng, 3 * IncrementalDifficultyAdjuster.RESYNC_EVERY)
+    window = IncrementalDifficultyAdjuster()
+    for i, result in enumerate(stream, start=1):
+        window.record(result)
+        if i % 97 == 0 or i == len(stream):
+            assert window.suggest() == DifficultyAdjuster.analyze_performance(stream[:i])
+
+
+class TestSync:
+
+    def test_sync_folds_only_new_results(self):
+        stream = _random_stream(random.Random(1), 20)
+        window = IncrementalDifficultyAdjuster()
+        window.sync(stream[:10])
+        window.sync(stream)
+        assert window.count == 20
+        assert window.suggest() == DifficultyAdjuster.analyze_performance(stream)
+
+    def test_sync_rebuilds_when_list_replaced(self):
+        first = _random_stream(random.Random(2), 15)
+        second = _random_stream(random.Random(3), 15)
+        window = IncrementalDifficultyAdjuster()
+        window.sync(first)
+        window.sync(second)
+        assert window.count == 15
+        assert window.suggest() == DifficultyAdjuster.analyze_performance(second)
+
+
+def test_session_manager_attaches_window(tmp_path):
+    from src.database.db_manager import DatabaseManager
+    from src.game_logic.session_manager import SessionManager
+    from src.models.session import SessionConfig
+
+    manager = SessionManager(DatabaseManager(str(tmp_path / "t.db")))
+    state = manager.start_session(
+        SessionConfig(mode_type="marathon", category="arithmetic", difficulty="adaptive", question_count=20)
+    )
+    for _ in range(5):
+        manager.submit_answer(state, "nope")
+    assert state.difficulty_window is not None
+    assert state.difficulty_window.count == 5
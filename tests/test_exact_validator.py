@@ -0,0 +1,148 @@
+"""Tests for the exact rational validation engine.
+
+Covers:
+- `parse_rational` formats (decimals, a/b, %, commas, exponents) and
+  rejections.
+- Dispatch: only fractions/ratios/compound/estimation use the exact
+  engine; other types (and questions missing metadata) fall back.
+- Fractions: rational equality, and correctly rounded decimals for
+  fraction-to-decimal questions.
+- Estimation: accepted exactly when inside the generator's
+  `min_acceptable`/`max_acceptable` band (checked against the metadata
+  for random inputs).
+- Ratios/compound: legacy tolerance without float error.
+"""
+from __future__ import annotations
+
+import random
+from fractions import Fraction
+
+import pytest
+
+from src.game_logic.exact_validator import ExactMatcher, parse_rational
+from src.game_logic.validator import AnswerValidator, CompiledMatcher
+from src.models.question import Question
+from src.question_generator.estimation import EstimationGenerator
+from src.question_generator.fractions import FractionsGenerator
+
+
+def _q(qtype: str, correct: str, acceptable=None, **metadata) -> Question:
+    return Question(
+        question_type=qtype,
+        category=qtype,
+        difficulty="easy",
+        question_text="<test>",
+        correct_answer=correct,
+        acceptable_answers=list(acceptable) if acceptable else [],
+        metadata=metadata,
+    )
+
+
+class TestParseRational:
+
+    @pytest.mark.parametrize(
+        "text, value, places",
+        [
+            ("5", (5, 1), 0),
+            ("+5.50", (11, 2), 2),
+            ("-.25", (-1, 4), 2),
+            ("1e3", (1000, 1), -3),
+            ("1,000", (1000, 1), 0),
+            ("12,3", (123, 10), 1),
+            ("50%", (1, 2), 2),
+            ("12.5%", (1, 8), 3),
+            ("2/4", (1, 2), None),
+            (" 1 / 3 ", (1, 3), None),
+            ("0.5/2", (1, 4), None),
+            ("3/-6", (-1, 2), None),
+        ],
+    )
+    def test_parses(self, text, value, places):
+        assert parse_rational(text) == (value, places)
+
+    @pytest.mark.parametrize("text", ["", "abc", "1/0", "1/2/3", "inf", "nan", "1e999999", "5 apples", "--5"])
+    def test_rejects(self, text):
+        assert parse_rational(text) is None
+
+
+class TestDispatch:
+
+    def test_exact_types_use_exact_engine(self):
+        for qtype in ("fractions", "ratios", "compound"):
+            assert isinstance(AnswerValidator.compile(_q(qtype, "1/2")), ExactMatcher)
+
+    def test_other_types_keep_float_cascade(self):
+        assert isinstance(AnswerValidator.compile(_q("addition", "5")), CompiledMatcher)
+        assert isinstance(AnswerValidator.compile(_q("percentage", "15")), CompiledMatcher)
+
+    def test_estimation_without_bounds_falls_back(self):
+        assert isinstance(AnswerValidator.compile(_q("estimation", "100")), CompiledMatcher)
+
+
+class TestFractions:
+
+    def test_equivalent_fractions_match(self):
+        q = _q("fractions", "1/2")
+        assert AnswerValidator.validate("2/4", q) is True
+        assert AnswerValidator.validate("0.5", q) is True
+        assert AnswerValidator.validate("50%", q) is True
+
+    def test_near_misses_rejected(self):
+        # The float cascade accepted both of these.
+        assert AnswerValidator.validate("833/1000", _q("fractions", "5/6")) is False
+        assert AnswerValidator.validate("0.3", _q("fractions", "1/3", ["1/3", "333/1000", "0.333"])) is False
+
+    def test_correctly_rounded_decimals(self):
+        q = _q("fractions", "0.43", ["0.43", "0.429"], numerator=3, denominator=7, type="fraction_to_decimal")
+        for ok in ("0.43", "0.429", "0.4286", "0.42857", "42.86%"):
+            assert AnswerValidator.validate(ok, q) is True, ok
+        for bad in ("0.4", "0.42", "0.4285", "0.5"):
+            assert AnswerValidator.validate(bad, q) is False, bad
+
+    def test_generated_answers_validate(self):
+        gen = FractionsGenerator()
+        for difficulty in ("easy", "medium", "hard"):
+            for _ in range(100):
+                q = gen.generate(difficulty)
+                assert all(AnswerValidator.validate(a, q) for a in q.acceptable_answers)
+
+
+class TestEstimation:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_agrees_with_metadata_band(self, seed):
+        rng = random.Random(seed)
+        random.seed(seed)
+        gen = EstimationGenerator()
+        for _ in range(100):
+            q = gen.generate(rng.choice(["easy", "medium", "hard"]))
+            low, high = q.metadata["min_acceptable"], q.metadata["max_acceptable"]
+            span = high - low
+            for _ in range(20):
+                guess = round(rng.uniform(low - span, high + span), rng.choice([0, 1, 2]))
+                text = str(guess)
+                expected = Fraction(low) <= Fraction(text) <= Fraction(high) or text in q.acceptable_answers
+                assert AnswerValidator.validate(text, q) is expected, (text, low, high)
+
+    def test_band_edges_are_inclusive(self):
+        q = _q("estimation", "100", min_acceptable=90.0, max_acceptable=110.0)
+        assert AnswerValidator.validate("90", q) is True
+        assert AnswerValidator.validate("110.0", q) is True
+        assert AnswerValidator.validate("89.999", q) is False
+
+
+class TestTolerantTypes:
+
+    def test_relative_tolerance_above_ten(self):
+        q = _q("ratios", "1000")
+        assert AnswerValidator.validate("1009", q) is True
+        assert AnswerValidator.validate("1010", q) is False  # exactly 1%: strict <
+
+    def test_absolute_tolerance_up_to_ten(self):
+        q = _q("compound", "5")
+        assert AnswerValidator.validate("5.09", q) is True
+        assert AnswerValidator.validate("5.1", q) is False  # float cascade said 5.1-5 < 0.1
+
+    def test_percentage_quirk_dropped(self):
+        # The float cascade read "0.5" as 50% and matched it to 50.
+        assert AnswerValidator.validate("0.5", _q("compound", "50")) is False
@@ -0,0 +1,160 @@
+"""Tests for trusted-verdict finalize with sampled server audits.
+
+Covers:
+- `submit_answer(client_verdict=...)` uses the given verdict without
+  re-validating (skips stay wrong).
+- `SessionFinalizer.replay`: trusted mode validates only the audit sample;
+  a mismatch escalates to full validation with server verdicts; results
+  without a client verdict are always validated.
+- Badge preview: a session whose client verdicts would earn a
+  verdict-dependent badge is fully validated, and the preview counts the
+  unsaved session without awarding anything.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.finalize import MODE_FULL, MODE_TRUSTED, SessionFinalizer
+from src.game_logic.session_manager import SessionManager
+from src.gamification.badge_manager import BadgeManager
+from src.models.question import Question
+from src.models.session import SessionConfig
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _q(answer: str, qtype: str = "addition") -> Question:
+    return Question(
+        question_type=qtype,
+        category="arithmetic",
+        difficulty="easy",
+        question_text=f"? = {answer}",
+        correct_answer=answer,
+    )
+
+
+def _session(manager: SessionManager, count: int = 50):
+    return manager.start_session(
+        SessionConfig(mode_type="marathon", category="arithmetic", difficulty="easy", question_count=count)
+    )
+
+
+def _results(verdicts, answers=None, skipped=()):
+    """Component result dicts; question i has answer str(i)."""
+    answers = answers or {}
+    return [
+        {
+            "question_id": i,
+            "user_answer": answers.get(i, str(i)),
+            "is_correct": verdict,
+            "was_skipped": i in skipped,
+            "time_taken": 5.0,
+        }
+        for i, verdict in enumerate(verdicts)
+    ]
+
+
+class CountingValidator:
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def validate(self, answer, question):
+        self.calls += 1
+        return self.inner.validate(answer, question)
+
+
+class TestSubmitClientVerdict:
+
+    def test_client_verdict_is_used(self, db):
+        manager = SessionManager(db)
+        state = _session(manager)
+        state.current_question = _q("5")
+        assert manager.submit_answer(state, "6", client_verdict=True).is_correct is True
+        state.current_question = _q("5")
+        assert manager.submit_answer(state, "5", client_verdict=False).is_correct is False
+        state.current_question = _q("5")
+        assert manager.submit_answer(state, "5", was_skipped=True, client_verdict=True).is_correct is False
+
+
+class TestFinalizer:
+
+    def _replay(self, db, results, count=None, **kwargs):
+        manager = SessionManager(db)
+        manager.validator = CountingValidator(manager.validator)
+        state = _session(manager, count or len(results))
+        questions = [_q(str(i)) for i in range(len(results))]
+        report = SessionFinalizer(manager, rng=random.Random(0), **kwargs).replay(state, questions, results)
+        return manager, state, report
+
+    def test_trusted_mode_validates_only_the_sample(self, db):
+        # Alternate right/wrong so no badge is in reach.
+        results = _results([i % 2 == 0 for i in range(40)], answers={i: "x" for i in range(1, 40, 2)})
+        manager, state, report = self._replay(db, results, audit_rate=0.1)
+        assert report.mode == MODE_TRUSTED and report.escalation is None
+        assert 1 <= report.validated < 20
+        assert manager.validator.calls == report.validated
+        assert [r.is_correct for r in state.questions_answered] == [i % 2 == 0 for i in range(40)]
+        assert state.is_complete
+
+    def test_mismatch_escalates_to_full_validation(self, db, capsys):
+        verdicts = [i % 2 == 0 for i in range(20)]
+        verdicts[1] = True  # the client wrongly accepts "x"
+        answers = {i: "x" for i in range(1, 20, 2)}  # odd answers are wrong
+        manager, state, report = self._replay(db, _results(verdicts, answers), audit_rate=1.0)
+        assert report.mode == MODE_FULL and report.escalation == "mismatch"
+        assert [m.question_id for m in report.mismatches] == [1]
+        assert state.questions_answered[1].is_correct is False
+        assert report.validated == 20 == manager.validator.calls
+        assert "mismatch" in capsys.readouterr().out
+
+    def test_missing_client_verdicts_are_validated(self, db):
+        results = _results([None, False, None], answers={1: "x"})
+        manager, state, report = self._replay(db, results, audit_rate=0.0)
+        assert report.validated == 2
+        assert [r.is_correct for r in state.questions_answered] == [True, False, True]
+
+    def test_badge_session_is_fully_validated(self, db):
+        # 10/10 correct would earn Perfectionist and Hot Streak.
+        manager, state, report = self._replay(db, _results([True] * 10), audit_rate=0.0)
+        assert report.mode == MODE_FULL and report.escalation == "badge"
+        assert "Perfectionist" in report.badges and "Hot Streak" in report.badges
+        assert report.validated == 10
+
+    def test_rejects_bad_audit_rate(self, db):
+        with pytest.raises(ValueError):
+            SessionFinalizer(SessionManager(db), audit_rate=1.5)
+
+
+class TestBadgePreview:
+
+    def test_preview_counts_unsaved_session_without_awarding(self, db):
+        badges = BadgeManager(db)
+        state = _session(SessionManager(db), 50)
+        questions = [_q(str(i)) for i in range(50)]
+        rows = SessionFinalizer._rows(questions, _results([True] * 50))
+        summary = SessionFinalizer._provisional(state, rows)
+
+        preview = {b.badge_name for b in badges.preview_verdict_badges(summary)}
+        assert {"Arithmetic Ace", "No Miss", "In Form", "Perfectionist"} <= preview
+        assert not any(b.earned for b in badges.get_all_badges())
+        # Without the pending session there is no history to earn them from.
+        assert not any(
+            badges._check_badge_condition(b, summary, {}) for b in badges.get_all_badges()
+            if b.badge_name in ("Arithmetic Ace", "No Miss", "In Form")
+        )
@@ -0,0 +1,258 @@
+"""Tests for the per-answer session journal.
+
+Covers:
+- `submit_answer` journals every answer; `end_session` compacts the
+  journal into `questions_answered` rows identical to an unjournaled save,
+  and falls back to in-memory results when the journal is incomplete.
+- `SessionFinalizer.checkpoint` journals client verdicts mid-session;
+  `replay` overwrites them in a single buffered write.
+- `recover_session` rebuilds score, combo and answers from the journal;
+  `orphaned` only lists journals no process is running: not open here,
+  and not written by another process within `STALE_AFTER`.
+- `SessionFinalizer.recover` checks journaled client verdicts before
+  scoring them, escalating to full validation for badge sessions.
+- A failing journal write doesn't interrupt the session.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.finalize import SessionFinalizer
+from src.game_logic import journal
+from src.game_logic.journal import SessionJournal
+from src.game_logic.session_manager import SessionManager
+from src.models.question import Question
+from src.models.session import SessionConfig
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@pytest.fixture
+def manager(db):
+    return SessionManager(db)
+
+
+def _config(count: int = 20) -> SessionConfig:
+    return SessionConfig(mode_type="marathon", category="arithmetic", difficulty="easy", question_count=count)
+
+
+def _q(answer: str) -> Question:
+    return Question(
+        question_type="addition",
+        category="arithmetic",
+        difficulty="easy",
+        question_text=f"? = {answer}",
+        correct_answer=answer,
+        metadata={"operands": [1, 2]},
+    )
+
+
+def _answer_all(manager, state, wrong=()):
+    for i in range(len(state.questions_answered), state.config.question_count):
+        q = state.current_question
+        manager.submit_answer(state, "nope" if i in wrong else q.correct_answer)
+
+
+def _journal_count(db, key=None) -> int:
+    conn = db.get_connection()
+    if key is None:
+        count = conn.execute("SELECT COUNT(*) FROM journal_answers").fetchone()[0]
+    else:
+        count = conn.execute("SELECT COUNT(*) FROM journal_answers WHERE session_key = ?", (key,)).fetchone()[0]
+    conn.close()
+    return count
+
+
+def _saved_rows(db, session_id):
+    conn = db.get_connection()
+    rows = conn.execute(
+        """
+        SELECT question_type, difficulty, question_text, correct_answer, user_answer,
+               is_correct, was_skipped, time_taken_seconds, timestamp
+        FROM questions_answered WHERE session_id = ? ORDER BY id
+        """,
+        (session_id,),
+    ).fetchall()
+    conn.close()
+    return [tuple(r) for r in rows]
+
+
+def test_submit_answer_journals_each_answer(manager, db):
+    state = manager.start_session(_config(5))
+    manager.submit_answer(state, state.current_question.correct_answer)
+    manager.submit_answer(state, "", was_skipped=True)
+    assert _journal_count(db, state.journal_key) == 2
+
+    journaled = db.get_journal_answers(state.journal_key)
+    assert journaled == state.questions_answered
+
+
+def test_end_session_compacts_journal(manager, db):
+    state = manager.start_session(_config(6))
+    _answer_all(manager, state, wrong={2})
+    key = state.journal_key
+    summary = manager.end_session(state)
+
+    assert _journal_count(db, key) == 0
+    assert db.get_journal_sessions() == []
+    assert state.journal_key is None
+
+    # Same rows as a save straight from memory.
+    expected = db.save_session(summary)
+    assert _saved_rows(db, summary.session_id) == _saved_rows(db, expected)
+    assert len(_saved_rows(db, summary.session_id)) == 6
+
+
+def test_incomplete_journal_falls_back_to_results(manager, db):
+    state = manager.start_session(_config(4))
+    _answer_all(manager, state)
+    db.delete_journal(state.journal_key)
+    db.append_journal(state.journal_key, state.config, state.start_time, [(0, state.questions_answered[0])])
+
+    summary = manager.end_session(state)
+    assert len(_saved_rows(db, summary.session_id)) == 4
+    assert _journal_count(db) == 0
+
+
+def test_checkpoint_then_replay_overwrites_client_verdicts(manager, db):
+    state = manager.start_session(_config(50))
+    finalizer = SessionFinalizer(manager, audit_rate=1.0)
+    questions = [_q(str(i)) for i in range(4)]
+    results = [
+        {"question_id": i, "user_answer": str(i), "is_correct": i != 1, "was_skipped": False, "time_taken": 3.0}
+        for i in range(4)
+    ]
+    # The client wrongly marks answer 1 as incorrect.
+    assert finalizer.checkpoint(state, questions, results[:2]) == 2
+    assert finalizer.checkpoint(state, questions, results[2:], start=2) == 4
+    assert [r.is_correct for r in db.get_journal_answers(state.journal_key)] == [True, False, True, True]
+
+    writes = []
+    original = db.append_journal
+    db.append_journal = lambda *args, **kwargs: (writes.append(args), original(*args, **kwargs))[1]
+    finalizer.replay(state, questions, results)
+    assert len(writes) == 1
+    assert [r.is_correct for r in db.get_journal_answers(state.journal_key)] == [True, True, True, True]
+
+
+def test_recover_session_rebuilds_state(manager, db):
+    state = manager.start_session(_config(10))
+    for i in range(6):
+        q = state.current_question
+        manager.submit_answer(state, "nope" if i == 2 else q.correct_answer)
+    key = state.journal_key
+    assert key not in {s["session_key"] for s in manager.journal.orphaned()}
+
+    # Simulate a restart: the key is no longer live in this process.
+    SessionJournal.close(key)
+    orphaned = manager.journal.orphaned()
+    assert [(s["session_key"], s["answers"]) for s in orphaned] == [(key, 6)]
+    assert orphaned[0]["config"] == state.config
+
+    recovered = SessionManager(db).recover_session(key)
+    assert recovered.questions_answered == state.questions_answered
+    assert recovered.total_score == state.total_score
+    assert recovered.combo_count == state.combo_count == 3
+    assert recovered.start_time == state.start_time
+    assert recovered.current_question is not None and not recovered.is_complete
+    assert key not in {s["session_key"] for s in manager.journal.orphaned()}
+
+    _answer_all(manager, recovered)
+    summary = manager.end_session(recovered)
+    assert summary.total_questions == 10
+    assert _journal_count(db) == 0
+
+
+def test_journals_live_in_another_process(manager, db, monkeypatch):
+    state = manager.start_session(_config(10))
+    manager.submit_answer(state, state.current_question.correct_answer)
+    key = state.journal_key
+    # As seen from a second process sharing the database.
+    SessionJournal.close(key)
+    monkeypatch.setattr(journal, "PROCESS_ID", "other")
+    assert manager.journal.orphaned() == []
+
+    conn = db.get_connection()
+    conn.execute(
+        "UPDATE journal_sessions SET heartbeat_at = ?",
+        (datetime.now() - journal.STALE_AFTER - timedelta(minutes=1),),
+    )
+    conn.commit()
+    conn.close()
+    assert [s["session_key"] for s in manager.journal.orphaned()] == [key]
+
+
+def test_recover_unknown_key(manager):
+    assert manager.recover_session("missing") is None
+    assert SessionFinalizer(manager).recover("missing") is None
+
+
+def _orphan_checkpoint(manager, verdicts):
+    """Journal client-graded answers to ``_q(i)`` and orphan the journal."""
+    state = manager.start_session(_config(len(verdicts)))
+    questions = [_q(str(i)) for i in range(len(verdicts))]
+    results = [
+        {"question_id": i, "user_answer": str(i), "is_correct": ok, "was_skipped": False, "time_taken": 2.0}
+        for i, ok in enumerate(verdicts)
+    ]
+    # The client claims answer 1 was wrong; the server disagrees.
+    SessionFinalizer(manager).checkpoint(state, questions, results)
+    SessionJournal.close(state.journal_key)
+    return state.journal_key
+
+
+def test_recover_checks_client_verdicts(manager, db):
+    key = _orphan_checkpoint(manager, [True, False, True, True])
+    state, report = SessionFinalizer(manager, audit_rate=1.0).recover(key)
+    assert report.escalation == "mismatch" and report.validated == 4
+    assert [r.is_correct for r in state.questions_answered] == [True] * 4
+    assert state.combo_count == 4
+
+    summary = manager.end_session(state)
+    assert summary.correct_answers == 4
+    assert [row[5] for row in _saved_rows(db, summary.session_id)] == [1, 1, 1, 1]
+
+
+def test_recover_escalates_badge_sessions(manager, db):
+    # A flawless ten-answer session would earn Perfectionist.
+    key = _orphan_checkpoint(manager, [True] * 10)
+    _, report = SessionFinalizer(manager, audit_rate=0.0).recover(key)
+    assert report.escalation == "badge" and report.validated == 10
+    assert "Perfectionist" in report.badges
+
+
+def test_discard(manager, db):
+    state = manager.start_session(_config(5))
+    manager.submit_answer(state, state.current_question.correct_answer)
+    manager.journal.discard(state.journal_key)
+    assert db.get_journal_sessions() == []
+
+
+def test_journal_failure_does_not_interrupt(manager, db, capsys):
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    state = manager.start_session(_config(3))
+    db.append_journal = broken
+    _answer_all(manager, state)
+    assert "Failed to journal answers" in capsys.readouterr().out
+
+    del db.append_journal
+    summary = manager.end_session(state)
+    assert len(_saved_rows(db, summary.session_id)) == 3
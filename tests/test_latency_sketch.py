@@ -0,0 +1,290 @@
+"""Tests for response-time sketches and percentile analytics.
+
+Covers:
+- `DDSketch` quantiles stay within the relative accuracy, sketches merge
+  losslessly, round-trip through bytes and build histograms.
+- `LatencyFold` keeps `latency_sketches` current on `save_session`;
+  `src.analytics.latency` catches up rows written by other paths exactly
+  once, rebuilds from scratch and filters by day.
+- `save_session` reads each source table once for every registered fold,
+  and each fold only sees rows past its own watermark.
+- `PerformanceTracker.get_latency_percentiles` / `get_latency_histogram`
+  agree with the raw answers.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.latency import LatencyFold, catch_up_latency_sketches, get_latency_sketches, rebuild_latency_sketches
+from src.analytics.performance_tracker import PerformanceTracker
+from src.analytics.sketch import DDSketch, merged
+from src.database.db_manager import DatabaseManager
+from src.database.derived import SOURCE_QUERIES
+from src.gamification.activity import ActivityFold
+from src.gamification.counters import BadgeCounterFold, get_badge_counters
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _summary(times, question_type="addition", difficulty="easy", skipped=(), when=None) -> SessionSummary:
+    when = when or datetime.now()
+    question = Question(
+        question_type=question_type, category="arithmetic", difficulty=difficulty,
+        question_text="2 + 2", correct_answer="4",
+    )
+    results = [
+        QuestionResult(
+            question=question, user_answer="4", is_correct=True, time_taken=t,
+            timestamp=when, was_skipped=i in skipped,
+        )
+        for i, t in enumerate(times)
+    ]
+    return SessionSummary(
+        session_id=None,
+        config=SessionConfig(mode_type="sprint", category="mixed", difficulty=difficulty, duration_seconds=60),
+        total_questions=len(times),
+        correct_answers=len(times),
+        total_score=10,
+        avg_time_per_question=float(np.mean(times)),
+        duration_seconds=60,
+        results=results,
+        timestamp=when,
+    )
+
+
+def _insert_raw(db, rows):
+    conn = db.get_connection()
+    conn.executemany(
+        """
+        INSERT INTO questions_answered
+            (session_id, question_type, difficulty, question_text, correct_answer,
+             user_answer, is_correct, was_skipped, time_taken_seconds, timestamp)
+        VALUES (1, ?, ?, 'q', '1', '1', 1, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _answers(db) -> pd.DataFrame:
+    conn = db.get_connection()
+    df = pd.read_sql_query(
+        "SELECT question_type, difficulty, time_taken_seconds FROM questions_answered WHERE was_skipped = 0",
+        conn,
+    )
+    conn.close()
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Sketch
+# ---------------------------------------------------------------------------
+
+
+def test_quantiles_within_relative_accuracy():
+    values = np.random.default_rng(5).lognormal(mean=1.2, sigma=0.6, size=20000)
+    sketch = DDSketch()
+    sketch.extend(values)
+    assert sketch.count == len(values)
+    for q in (0.0, 0.25, 0.5, 0.9, 0.99, 1.0):
+        exact = np.quantile(values, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert sketch.total == pytest.approx(values.sum())
+
+
+def test_add_matches_extend_and_zero_bin():
+    values = [0.0, 0.0005, 1.5, 2.5, 2.5, 40.0]
+    one, many = DDSketch(), DDSketch()
+    for value in values:
+        one.add(value)
+    many.extend(values)
+    assert one.bins == many.bins
+    assert one.zero_count == many.zero_count == 2
+    assert one.quantile(0.0) == 0.0
+    assert one.quantile(1.0) == pytest.approx(40.0, rel=0.01)
+
+
+def test_merge_equals_single_sketch():
+    rng = np.random.default_rng(9)
+    parts = [rng.uniform(0.5, 12.0, size=500) for _ in range(4)]
+    whole = DDSketch()
+    whole.extend(np.concatenate(parts))
+    pieces = []
+    for part in parts:
+        sketch = DDSketch()
+        sketch.extend(part)
+        pieces.append(sketch)
+    combined = merged(pieces)
+    assert combined.bins == whole.bins
+    assert combined.min == whole.min and combined.max == whole.max
+
+    with pytest.raises(ValueError):
+        whole.merge(DDSketch(relative_accuracy=0.02))
+
+
+def test_bytes_round_trip_and_empty():
+    assert DDSketch().quantile(0.5) is None
+    sketch = DDSketch()
+    sketch.extend([0.0, 1.0, 2.0, 3.5, 120.0])
+    restored = DDSketch.from_bytes(sketch.to_bytes())
+    assert restored.bins == sketch.bins
+    assert restored.zero_count == sketch.zero_count
+    assert (restored.total, restored.min, restored.max) == (sketch.total, sketch.min, sketch.max)
+    assert restored.quantiles([0.5, 0.9]) == sketch.quantiles([0.5, 0.9])
+
+
+def test_histogram_counts():
+    sketch = DDSketch()
+    sketch.extend([0.0, 0.4, 1.5, 1.7, 2.5, 9.0, 75.0])
+    assert sketch.histogram([0.0, 1.0, 2.0, 5.0, 60.0]) == [2, 2, 1, 1]
+    assert sum(sketch.histogram([0.0, 1.0, float("inf")])) == 7
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def test_save_session_updates_sketches(db):
+    db.save_session(_summary([1.0, 2.0, 3.0, 9.0], skipped={3}))
+    sketches = get_latency_sketches(db)
+    assert list(sketches) == [("addition", "easy")]
+    sketch = sketches[("addition", "easy")]
+    assert sketch.count == 3
+    assert sketch.max == pytest.approx(3.0)
+
+    db.save_session(_summary([4.0, 5.0]))
+    assert get_latency_sketches(db)[("addition", "easy")].count == 5
+
+
+def test_catch_up_folds_existing_rows_once(db):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    _insert_raw(db, [("division", "hard", 0, 6.0, now), ("division", "hard", 1, 0.0, now)])
+
+    assert catch_up_latency_sketches(db) == 2
+    assert catch_up_latency_sketches(db) == 0
+    db.save_session(_summary([1.0]))
+    sketches = get_latency_sketches(db)
+    assert sketches[("division", "hard")].count == 1
+    assert sketches[("addition", "easy")].count == 1
+
+
+def test_rebuild_matches_incremental(db):
+    rnd = random.Random(2)
+    for _ in range(5):
+        db.save_session(_summary([rnd.uniform(0.5, 9.0) for _ in range(20)], difficulty=rnd.choice(["easy", "hard"])))
+    incremental = {key: s.bins for key, s in get_latency_sketches(db).items()}
+    rebuild_latency_sketches(db)
+    assert {key: s.bins for key, s in get_latency_sketches(db).items()} == incremental
+
+
+def test_save_session_reads_sources_once(db, monkeypatch):
+    assert {LatencyFold, BadgeCounterFold, ActivityFold} <= set(DatabaseManager._FOLDS)
+    db.save_session(_summary([1.0, 2.0]))
+    # Badge counters fall behind; the next save folds both from one read.
+    conn = db.get_connection()
+    conn.execute("DELETE FROM badge_counters")
+    conn.execute("DELETE FROM derived_watermarks WHERE name LIKE 'badge_counters.%'")
+    conn.commit()
+    conn.close()
+
+    statements = []
+    original = db.get_connection
+
+    def traced():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(db, "get_connection", traced)
+    db.save_session(_summary([3.0]))
+    monkeypatch.undo()
+
+    for query in SOURCE_QUERIES.values():
+        head = query.split("FROM")[0].strip()
+        assert sum(1 for sql in statements if sql.strip().startswith(head)) == 1
+    assert get_latency_sketches(db)[("addition", "easy")].count == 3
+    counters = get_badge_counters(db)
+    assert counters.sessions == 2 and counters.attempts == 3
+
+
+def test_days_filter(db):
+    db.save_session(_summary([2.0, 2.0], when=datetime.now() - timedelta(days=40)))
+    db.save_session(_summary([5.0]))
+    assert get_latency_sketches(db, days=7)[("addition", "easy")].count == 1
+    assert get_latency_sketches(db)[("addition", "easy")].count == 3
+
+    # ``days`` calendar days, today included.
+    db.save_session(_summary([3.0], when=datetime.now() - timedelta(days=7)))
+    db.save_session(_summary([4.0], when=datetime.now() - timedelta(days=6)))
+    assert get_latency_sketches(db, days=7)[("addition", "easy")].count == 2
+    assert get_latency_sketches(db, days=1)[("addition", "easy")].count == 1
+
+
+# ---------------------------------------------------------------------------
+# Tracker
+# ---------------------------------------------------------------------------
+
+
+def test_percentiles_match_raw_answers(db):
+    rnd = random.Random(8)
+    now = datetime.now()
+    rows = [
+        (
+            rnd.choice(["addition", "division", "percentage"]),
+            rnd.choice(["easy", "medium", "hard"]),
+            int(rnd.random() < 0.1),
+            rnd.lognormvariate(1.0, 0.5),
+            (now - timedelta(days=rnd.uniform(0, 700))).strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        for _ in range(4000)
+    ]
+    _insert_raw(db, rows)
+    tracker = PerformanceTracker(db)
+    answers = _answers(db)
+
+    by_type = tracker.get_latency_percentiles(by="question_type")
+    assert list(by_type.columns) == ["question_type", "count", "p50", "p90", "p99", "avg_time"]
+    for row in by_type.itertuples():
+        times = answers.loc[answers["question_type"] == row.question_type, "time_taken_seconds"].to_numpy()
+        assert row.count == len(times)
+        for q, value in ((0.5, row.p50), (0.9, row.p90), (0.99, row.p99)):
+            assert value == pytest.approx(np.quantile(times, q, method="lower"), rel=0.01)
+        assert row.avg_time == pytest.approx(times.mean())
+
+    overall = tracker.get_latency_percentiles(by=None, quantiles=(0.5,))
+    assert list(overall.columns) == ["group", "count", "p50", "avg_time"]
+    assert overall.loc[0, "count"] == len(answers)
+
+    histogram = tracker.get_latency_histogram(by="difficulty")
+    assert set(histogram["difficulty"]) == {"easy", "medium", "hard"}
+    assert histogram["count"].sum() == len(answers)
+
+    with pytest.raises(ValueError):
+        tracker.get_latency_percentiles(by="category")
+
+
+def test_empty_database(db):
+    tracker = PerformanceTracker(db)
+    assert tracker.get_latency_percentiles().empty
+    assert tracker.get_latency_histogram().empty
@@ -0,0 +1,88 @@
+"""Tests for the concurrent-trainee load-test harness.
+
+Covers:
+- Nearest-rank percentiles.
+- Lock waits on the instrumented connections are counted, and statements
+  proceed once the other writer lets go.
+- A small run drives every operation, saves every session and reports
+  sane throughput/latency figures without errors.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import pytest
+
+from src.tools.load_test import (
+    OPERATIONS, InstrumentedDatabaseManager, LoadConfig, format_report, percentile, run,
+)
+
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        yield os.path.join(tmp, "load.db")
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_lock_waits_are_counted(db_path):
+    db = InstrumentedDatabaseManager(db_path)
+    blocker = sqlite3.connect(db_path, check_same_thread=False)
+    blocker.execute("BEGIN EXCLUSIVE")
+    released = threading.Event()
+
+    def release():
+        time.sleep(0.05)
+        blocker.commit()
+        released.set()
+
+    threading.Thread(target=release).start()
+    db.set_user_preference("theme", "dark")
+    blocker.close()
+
+    assert released.is_set()
+    assert db.get_user_preference("theme") == "dark"
+    assert db.lock_stats.waits >= 1
+    assert db.lock_stats.retries >= 1
+    assert db.lock_stats.wait_seconds > 0
+    assert db.lock_stats.failures == 0
+
+
+def test_small_run_exercises_every_operation(db_path):
+    config = LoadConfig(
+        users=4, sessions_per_user=2, questions=12, batch=5, refill_at=3,
+        checkpoint_every=5, time_scale=0.0, ramp_up=0.0, seed=7,
+    )
+    report = run(config, db_path)
+
+    assert report.errors == {}
+    assert report.sessions == 8
+    assert report.answers == 8 * 12
+    counts = {op.name: op.count for op in report.operations}
+    assert set(counts) == set(OPERATIONS)
+    for name in ("start_session", "pregenerate", "replay", "end_session", "check_badges", "dashboard"):
+        assert counts[name] == 8
+    assert counts["checkpoint"] == 8 * 2
+    for op in report.operations:
+        assert 0 <= op.p50 <= op.p95 <= op.p99 <= op.max
+        assert op.throughput > 0
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 8
+        assert conn.execute("SELECT COUNT(*) FROM questions_answered").fetchone()[0] == 8 * 12
+        assert conn.execute("SELECT COUNT(*) FROM journal_answers").fetchone()[0] == 0
+
+    text = format_report(report)
+    assert "end_session" in text and "SQLite lock waits" in text
@@ -0,0 +1,240 @@
+"""Tests for data-version-keyed memoization.
+
+Covers:
+- `LRUCache` eviction order and stats.
+- `memoize`: positional and keyword calls share an entry, results are
+  copies, unhashable arguments and a None scope bypass the cache.
+- `DatabaseManager.data_version` is per database file and bumped by
+  `save_session`, `award_badge`, `set_user_preference` and
+  `StreakTracker.record_activity`, including when another process makes
+  those writes.
+- `PerformanceTracker` reads are served from the cache until the data
+  version (or the day) changes, across tracker instances.
+- `SnapshotPerformanceTracker.build` reuses the snapshot for the current
+  version.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.analytics import memo
+from src.analytics.dashboard_snapshot import SnapshotPerformanceTracker
+from src.analytics.memo import LRUCache, memoize
+from src.analytics.performance_tracker import PerformanceTracker
+from src.database.db_manager import DatabaseManager
+from src.gamification.streak_tracker import StreakTracker
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _summary(correct: int, total: int = 4) -> SessionSummary:
+    question = Question(
+        question_type="addition", category="arithmetic", difficulty="easy",
+        question_text="2 + 2", correct_answer="4",
+    )
+    now = datetime.now()
+    results = [
+        QuestionResult(question=question, user_answer="4", is_correct=i < correct, time_taken=2.0, timestamp=now)
+        for i in range(total)
+    ]
+    return SessionSummary(
+        session_id=None,
+        config=SessionConfig(mode_type="sprint", category="mixed", difficulty="easy", duration_seconds=60),
+        total_questions=total,
+        correct_answers=correct,
+        total_score=10 * correct,
+        avg_time_per_question=2.0,
+        duration_seconds=60,
+        results=results,
+        timestamp=now,
+    )
+
+
+def _forbid_reads(monkeypatch, db):
+    def no_connection():
+        raise AssertionError("read hit the database")
+
+    monkeypatch.setattr(db, "get_connection", no_connection)
+
+
+# ---------------------------------------------------------------------------
+# Building blocks
+# ---------------------------------------------------------------------------
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1) and cache.get("c") == (True, 3)
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1 and cache.stats.hits == 3 and cache.stats.misses == 1
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+class Counter:
+    def __init__(self, scope="s"):
+        self.scope = scope
+        self.calls = 0
+
+    def memo_scope(self):
+        return self.scope
+
+    @memoize(maxsize=4)
+    def frame(self, days: int = 7, extra=None):
+        self.calls += 1
+        return pd.DataFrame({"days": [days]})
+
+
+def test_memoize_normalizes_arguments_and_copies():
+    Counter.frame.cache_clear()
+    counter = Counter()
+    first = counter.frame(7)
+    first.loc[0, "days"] = -1
+    assert counter.frame().loc[0, "days"] == 7
+    assert counter.frame(days=7).loc[0, "days"] == 7
+    assert counter.calls == 1
+
+    counter.frame(extra=[1])  # unhashable: computed every time
+    counter.frame(extra=[1])
+    assert counter.calls == 3
+
+    unscoped = Counter(scope=None)
+    unscoped.frame()
+    unscoped.frame()
+    assert unscoped.calls == 2
+
+
+# ---------------------------------------------------------------------------
+# Data version
+# ---------------------------------------------------------------------------
+
+
+def test_data_version_bumped_by_writes(db):
+    versions = [db.data_version]
+
+    db.save_session(_summary(3))
+    versions.append(db.data_version)
+    db.award_badge("First Steps")
+    versions.append(db.data_version)
+    db.set_user_preference("theme", "dark")
+    versions.append(db.data_version)
+    StreakTracker(db).record_activity(date.today() - timedelta(days=3))
+    versions.append(db.data_version)
+
+    assert versions == sorted(set(versions))
+
+    # Reads, and writes that do not touch analytics, leave it alone.
+    before = db.data_version
+    PerformanceTracker(db).get_overall_stats()
+    db.append_journal("k", SessionConfig(mode_type="sprint", category="mixed", difficulty="easy"), datetime.now(), [])
+    assert db.data_version == before
+
+
+def test_data_version_is_per_database_file(db):
+    other = DatabaseManager(db.db_path)  # same file, another browser session
+    with tempfile.TemporaryDirectory() as tmp:
+        elsewhere = DatabaseManager(os.path.join(tmp, "other.db"))
+        before = elsewhere.data_version
+        db.set_user_preference("theme", "dark")
+        assert other.data_version == db.data_version
+        assert elsewhere.data_version == before
+
+
+def test_data_version_sees_other_processes(db):
+    db.save_session(_summary(3))
+    stats = PerformanceTracker(db).get_overall_stats()
+    before = db.data_version
+
+    # Another process saves to the same file; this one's counter stays put.
+    conn = sqlite3.connect(db.db_path)
+    db.update_streak(conn.cursor(), date.today() - timedelta(days=1))
+    conn.commit()
+    conn.close()
+
+    assert db.data_version != before
+    assert stats["current_streak"] == 1
+    assert PerformanceTracker(db).get_overall_stats()["current_streak"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Tracker caching
+# ---------------------------------------------------------------------------
+
+
+def test_tracker_reads_cached_until_data_changes(db, monkeypatch):
+    db.save_session(_summary(3))
+    PerformanceTracker(db).get_overall_stats()
+    PerformanceTracker(db).get_training_recommendations()
+    PerformanceTracker(db).get_weekly_summary()
+
+    with monkeypatch.context() as patch:
+        _forbid_reads(patch, db)
+        tracker = PerformanceTracker(db)  # a new rerun
+        assert tracker.get_overall_stats()["total_questions"] == 4
+        tracker.get_training_recommendations()
+        tracker.get_weekly_summary(weeks=8)
+
+    db.save_session(_summary(1))
+    stats = PerformanceTracker(db).get_overall_stats()
+    assert stats["total_questions"] == 8
+    assert stats["correct_answers"] == 4
+
+
+def test_goal_settings_refresh_after_preference_write(db):
+    tracker = PerformanceTracker(db)
+    assert tracker.get_goal_settings().daily_questions == 40
+    tracker.get_goal_settings().daily_questions = 99  # a copy
+    assert tracker.get_goal_settings().daily_questions == 40
+    db.set_user_preference("goal_daily_questions", "25")
+    assert tracker.get_goal_settings().daily_questions == 25
+
+
+def test_cache_expires_with_the_day(db, monkeypatch):
+    db.save_session(_summary(3))
+    PerformanceTracker(db).get_overall_stats()
+    monkeypatch.setattr(memo, "today", lambda: date.today() + timedelta(days=1))
+    calls = []
+    original = db.get_performance_stats
+    monkeypatch.setattr(db, "get_performance_stats", lambda **kw: calls.append(kw) or original(**kw))
+    PerformanceTracker(db).get_overall_stats()
+    assert calls == [{"days": None}]
+
+
+def test_snapshot_reused_for_current_version(db, monkeypatch):
+    db.save_session(_summary(3))
+    first = SnapshotPerformanceTracker.build(db, recent_limit=6)
+    first.get_goal_progress()
+
+    with monkeypatch.context() as patch:
+        _forbid_reads(patch, db)
+        again = SnapshotPerformanceTracker.build(db, recent_limit=6)
+        assert again.snapshot is first.snapshot
+        assert again.get_goal_progress() == first.get_goal_progress()
+
+    db.save_session(_summary(0))
+    fresh = SnapshotPerformanceTracker.build(db, recent_limit=6)
+    assert fresh.snapshot is not first.snapshot
+    assert fresh.get_overall_stats()["total_questions"] == 8
@@ -0,0 +1,171 @@
+"""Tests for `QuestionPrefetcher`.
+
+Covers:
+- Buffer sizing from the answer rate (clamped to MIN/MAX capacity).
+- `take` tops up synchronously when the producer hasn't started, so
+  the practice loop can't starve.
+- The background producer fills the buffer to capacity and no further.
+- `limit` caps the total number of questions ever produced (marathon).
+- `stop` shuts the producer thread down; `stop(timeout=None)` waits out a
+  question that is still being generated.
+- A producer error is re-raised by the next `take`.
+- Producer draws and the daily challenge's seeded draws share one lock.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from src.daily.challenge import DailyChallenge
+from src.database.db_manager import DatabaseManager
+from src.game_logic.prefetch import QuestionPrefetcher
+from src.game_logic.session_manager import SessionManager
+from src.models.session import SessionConfig
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@pytest.fixture
+def manager(db):
+    return SessionManager(db)
+
+
+@pytest.fixture
+def sprint_state(manager):
+    return manager.start_session(
+        SessionConfig(mode_type="sprint", category="arithmetic", difficulty="easy", duration_seconds=60)
+    )
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestSizing:
+
+    def test_capacity_scales_with_answer_rate(self):
+        slow = QuestionPrefetcher.capacity_for(10.0)
+        fast = QuestionPrefetcher.capacity_for(1.0)
+        assert fast > slow
+
+    def test_capacity_is_clamped(self):
+        assert QuestionPrefetcher.capacity_for(1000.0) == QuestionPrefetcher.MIN_CAPACITY
+        assert QuestionPrefetcher.capacity_for(0.0001) <= QuestionPrefetcher.MAX_CAPACITY
+
+    def test_observe_rate_replaces_estimate(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state, avg_time=8.0)
+        before = prefetcher.capacity
+        prefetcher.observe_rate(answered=20, elapsed_seconds=30.0)
+        assert prefetcher.avg_time == pytest.approx(1.5)
+        assert prefetcher.capacity > before
+
+    def test_observe_rate_ignores_tiny_samples(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state, avg_time=8.0)
+        prefetcher.observe_rate(answered=1, elapsed_seconds=0.2)
+        assert prefetcher.avg_time == 8.0
+
+
+class TestTake:
+
+    def test_take_generates_synchronously_without_producer(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state)
+        questions = prefetcher.take(5, minimum=5)
+        assert len(questions) == 5
+        assert all(q.category == "arithmetic" for q in questions)
+
+    def test_take_respects_limit(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state, limit=3)
+        assert len(prefetcher.take(10, minimum=10)) == 3
+        assert prefetcher.take(5, minimum=5) == []
+        assert prefetcher.exhausted is True
+
+
+class TestProducer:
+
+    def test_background_fill_stops_at_capacity(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state, avg_time=1000.0).start()
+        try:
+            capacity = prefetcher.capacity
+            assert _wait_for(lambda: len(prefetcher._buffer) == capacity)
+            time.sleep(0.05)
+            assert len(prefetcher._buffer) == capacity
+            drained = prefetcher.take(capacity, minimum=0)
+            assert len(drained) == capacity
+            # Producer refills after the drain.
+            assert _wait_for(lambda: len(prefetcher._buffer) == capacity)
+        finally:
+            prefetcher.stop()
+
+    def test_producer_honours_limit(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state, limit=4, avg_time=0.5).start()
+        try:
+            assert _wait_for(lambda: len(prefetcher._buffer) == 4)
+            assert len(prefetcher.take(100, minimum=100)) == 4
+            assert prefetcher.exhausted is True
+        finally:
+            prefetcher.stop()
+
+    def test_stop_joins_thread(self, manager, sprint_state):
+        prefetcher = QuestionPrefetcher(manager, sprint_state).start()
+        prefetcher.stop()
+        assert not prefetcher._thread.is_alive()
+
+    def test_stop_without_timeout_waits_for_generation(self, manager, sprint_state, monkeypatch):
+        generating, release = threading.Event(), threading.Event()
+        original = manager.get_next_question
+
+        def slow(state):
+            generating.set()
+            release.wait(2.0)
+            return original(state)
+
+        monkeypatch.setattr(manager, "get_next_question", slow)
+        prefetcher = QuestionPrefetcher(manager, sprint_state).start()
+        assert generating.wait(2.0)
+        assert prefetcher.stop(timeout=0.01) is False
+        threading.Timer(0.05, release.set).start()
+        assert prefetcher.stop(timeout=None) is True
+        assert not prefetcher._thread.is_alive()
+
+    def test_producer_error_surfaces_in_take(self, manager, sprint_state, monkeypatch):
+        def broken(state):
+            raise RuntimeError("generator failed")
+
+        monkeypatch.setattr(manager, "get_next_question", broken)
+        prefetcher = QuestionPrefetcher(manager, sprint_state).start()
+        assert _wait_for(lambda: not prefetcher._thread.is_alive())
+        with pytest.raises(RuntimeError, match="generator failed"):
+            prefetcher.take(1, minimum=0)
+        # Reported once; later takes fall back to synchronous generation.
+        monkeypatch.undo()
+        assert len(prefetcher.take(1)) == 1
+
+    def test_daily_challenge_is_deterministic_while_producing(self, manager, sprint_state):
+        challenge = DailyChallenge()
+        expected = [q.question_text for q in challenge.get_questions_for_today()]
+        prefetcher = QuestionPrefetcher(manager, sprint_state, avg_time=0.5).start()
+        try:
+            for _ in range(20):
+                prefetcher.take(prefetcher.capacity, minimum=0)
+                assert [q.question_text for q in challenge.get_questions_for_today()] == expected
+        finally:
+            prefetcher.stop()
@@ -0,0 +1,179 @@
+"""Tests for chunked, typed history reads.
+
+Covers:
+- `ChunkedReader.answers` streams fixed-size chunks with compact dtypes
+  and stable categorical codes, and applies its filters.
+- `ChunkedReader.concat` rebuilds the full table.
+- `aggregate_answers` matches the SQL analytics and keeps peak memory
+  bounded by the chunk size.
+- `ChunkedReader.sessions` and the `DatabaseManager` shortcuts.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.performance_tracker import PerformanceTracker
+from src.database.db_manager import DatabaseManager
+from src.database.reader import ChunkedReader
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+
+TYPES = ["addition", "division", "percentage", "estimation"]
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _seed(db, rows: int = 2500):
+    rnd = random.Random(4)
+    now = datetime.now()
+    conn = db.get_connection()
+    conn.executemany(
+        """
+        INSERT INTO questions_answered
+            (session_id, question_type, difficulty, question_text, correct_answer,
+             user_answer, is_correct, was_skipped, time_taken_seconds, timestamp)
+        VALUES (?, ?, ?, 'q', '1', '1', ?, ?, ?, ?)
+        """,
+        [
+            (
+                i // 25 + 1,
+                # Types first appear in different chunks.
+                TYPES[min(i // 600, rnd.randrange(len(TYPES)))],
+                rnd.choice(["easy", "medium", "hard"]),
+                int(rnd.random() < 0.8),
+                int(rnd.random() < 0.1),
+                rnd.uniform(0.5, 9.0),
+                (now - timedelta(days=rows - i)).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+            for i in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_chunks_are_compact_and_bounded(db):
+    _seed(db)
+    chunks = list(ChunkedReader(db, chunk_size=400).answers())
+    assert [len(c) for c in chunks] == [400] * 6 + [100]
+    first = chunks[0]
+    assert first["id"].dtype == np.int32
+    assert first["time_taken_seconds"].dtype == np.float32
+    assert first["is_correct"].dtype == bool
+    assert isinstance(first["question_type"].dtype, pd.CategoricalDtype)
+    assert "question_text" not in first.columns
+
+    # Vocabularies only grow, so earlier codes keep their meaning.
+    for before, after in zip(chunks, chunks[1:]):
+        old = list(before["question_type"].cat.categories)
+        assert list(after["question_type"].cat.categories)[: len(old)] == old
+
+
+def test_concat_matches_table(db):
+    _seed(db, rows=900)
+    reader = ChunkedReader(db, chunk_size=250)
+    full = reader.concat(reader.answers(["id", "question_type", "question_text", "time_taken_seconds"]))
+    conn = db.get_connection()
+    expected = pd.read_sql_query(
+        "SELECT id, question_type, question_text, time_taken_seconds FROM questions_answered ORDER BY id", conn
+    )
+    conn.close()
+    assert len(full) == 900
+    assert full["id"].tolist() == expected["id"].tolist()
+    assert full["question_type"].astype(str).tolist() == expected["question_type"].tolist()
+    assert full["question_text"].tolist() == expected["question_text"].tolist()
+    np.testing.assert_allclose(full["time_taken_seconds"], expected["time_taken_seconds"], rtol=1e-6)
+
+
+def test_filters(db):
+    _seed(db)
+    reader = ChunkedReader(db, chunk_size=300)
+    division = reader.concat(reader.answers(question_type="division"))
+    assert set(division["question_type"].astype(str)) == {"division"}
+    attempted = reader.concat(reader.answers(include_skipped=False))
+    assert not attempted["was_skipped"].any()
+    recent = reader.concat(reader.answers(since=datetime.now() - timedelta(days=10)))
+    assert 0 < len(recent) <= 11
+    session = reader.concat(reader.answers(session_id=3))
+    assert len(session) == 25
+    with pytest.raises(ValueError):
+        next(reader.answers(["nope"]))
+
+
+def test_aggregate_matches_sql(db):
+    _seed(db)
+    aggregate = ChunkedReader(db, chunk_size=350).aggregate_answers()
+    expected = PerformanceTracker(db).get_stats_by_category().sort_values("question_type", ignore_index=True)
+    assert aggregate["question_type"].astype(str).tolist() == expected["question_type"].tolist()
+    assert aggregate["attempts"].tolist() == expected["questions_answered"].tolist()
+    assert aggregate["correct"].tolist() == expected["correct_answers"].tolist()
+    np.testing.assert_allclose(aggregate["accuracy"], expected["accuracy"])
+    np.testing.assert_allclose(aggregate["avg_time"], expected["avg_time"], rtol=1e-6)
+    assert aggregate["questions"].sum() == 2500
+
+    by_both = ChunkedReader(db, chunk_size=350).aggregate_answers(by=("question_type", "difficulty"))
+    assert len(by_both) == len(TYPES) * 3
+    assert by_both["questions"].sum() == 2500
+
+
+def test_aggregate_memory_is_flat(db):
+    _seed(db, rows=20000)
+    reader = ChunkedReader(db, chunk_size=1000)
+
+    tracemalloc.start()
+    reader.aggregate_answers(by=("question_type", "difficulty"))
+    _, streamed = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    conn = db.get_connection()
+    pd.read_sql_query("SELECT * FROM questions_answered", conn)
+    conn.close()
+    _, materialized = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert streamed < materialized / 3
+
+
+def test_sessions_and_manager_shortcuts(db):
+    question = Question(
+        question_type="addition", category="arithmetic", difficulty="easy",
+        question_text="2 + 2", correct_answer="4",
+    )
+    now = datetime.now()
+    for mode in ("sprint", "marathon"):
+        db.save_session(SessionSummary(
+            session_id=None,
+            config=SessionConfig(mode_type=mode, category="mixed", difficulty="easy", duration_seconds=None),
+            total_questions=1,
+            correct_answers=1,
+            total_score=10,
+            avg_time_per_question=2.0,
+            duration_seconds=None,
+            results=[QuestionResult(question=question, user_answer="4", is_correct=True, time_taken=2.0, timestamp=now)],
+            timestamp=now,
+        ))
+    sessions = ChunkedReader.concat(db.iter_sessions(chunk_size=1))
+    assert sessions["mode_type"].astype(str).tolist() == ["sprint", "marathon"]
+    assert sessions["total_questions"].dtype == np.int32
+    answers = ChunkedReader.concat(db.iter_answers(columns=["session_id", "question_type"]))
+    assert answers["session_id"].tolist() == sessions["id"].tolist()
+    assert ChunkedReader.concat(ChunkedReader(db).answers(question_type="division")).empty
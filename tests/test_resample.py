@@ -0,0 +1,149 @@
+"""Tests for calendar bucketing of the daily trend.
+
+Covers:
+- `Frequency.parse`, `bucket_start` and `shift` for weeks, months,
+  quarters and multiples of them.
+- `bucket_starts` (numpy) agrees with `Frequency.bucket_start`.
+- SQL bucketing in `PerformanceTracker.get_summary` agrees with
+  `summarize` over a multi-year history.
+- `get_weekly_summary` keeps its trailing-days window and columns, and
+  the snapshot tracker buckets its in-memory trend.
+"""
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.analytics.dashboard_snapshot import SnapshotPerformanceTracker
+from src.analytics.performance_tracker import PerformanceTracker
+from src.analytics.resample import Frequency, bucket_starts, summarize
+from src.database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _seed(db, days: int = 1000, rows: int = 3000):
+    rnd = random.Random(11)
+    now = datetime.now()
+    conn = db.get_connection()
+    conn.executemany(
+        """
+        INSERT INTO questions_answered
+            (session_id, question_type, difficulty, question_text, correct_answer,
+             user_answer, is_correct, was_skipped, time_taken_seconds, timestamp)
+        VALUES (1, 'addition', 'easy', '2 + 2', '4', '4', ?, ?, ?, ?)
+        """,
+        [
+            (
+                int(rnd.random() < 0.8),
+                int(rnd.random() < 0.1),
+                rnd.uniform(1.0, 8.0),
+                (now - timedelta(days=rnd.uniform(0, days))).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+            for _ in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("W", Frequency("W", 1)),
+    ("2w", Frequency("W", 2)),
+    ("M", Frequency("M", 1)),
+    ("Q", Frequency("M", 3)),
+    ("2Q", Frequency("M", 6)),
+])
+def test_parse(spec, expected):
+    assert Frequency.parse(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["", "D", "0W", "W2"])
+def test_parse_rejects_unknown(spec):
+    with pytest.raises(ValueError):
+        Frequency.parse(spec)
+
+
+def test_bucket_start_and_shift():
+    assert Frequency("W").bucket_start(date(2024, 5, 5)) == date(2024, 4, 29)  # Sunday -> Monday
+    assert Frequency("W").bucket_start(date(2024, 4, 29)) == date(2024, 4, 29)
+    assert Frequency.parse("Q").bucket_start(date(2024, 8, 17)) == date(2024, 7, 1)
+    assert Frequency.parse("2Q").bucket_start(date(2024, 8, 17)) == date(2024, 7, 1)
+    assert Frequency.parse("2Q").bucket_start(date(2024, 5, 17)) == date(2024, 1, 1)
+    assert Frequency.parse("Q").shift(date(2024, 1, 1), -1) == date(2023, 10, 1)
+    assert Frequency.parse("2W").shift(date(2024, 4, 29), -2) == date(2024, 4, 1)
+
+
+@pytest.mark.parametrize("spec", ["W", "2W", "M", "Q", "2Q"])
+def test_vectorized_bucket_starts_match(spec):
+    freq = Frequency.parse(spec)
+    days = [date(2021, 12, 20) + timedelta(days=i) for i in range(800)]
+    starts = bucket_starts(pd.Series(pd.to_datetime(days)), freq)
+    assert [pd.Timestamp(s).date() for s in starts] == [freq.bucket_start(d) for d in days]
+
+
+@pytest.mark.parametrize("spec, periods", [("W", 130), ("2W", 20), ("M", 36), ("Q", 12), ("2Q", 3)])
+def test_sql_buckets_match_in_memory(db, spec, periods):
+    _seed(db)
+    tracker = PerformanceTracker(db)
+    summary = tracker.get_summary(spec, periods=periods)
+
+    freq = Frequency.parse(spec)
+    start = freq.shift(freq.bucket_start(date.today()), 1 - periods)
+    trend = tracker.get_historical_trend(days=(date.today() - start).days + 1)
+    expected = summarize(trend[trend["date"] >= pd.Timestamp(start)], freq)
+
+    pd.testing.assert_frame_equal(summary, expected, check_exact=False)
+    assert len(summary) <= periods
+    assert summary["bucket_start"].min() >= pd.Timestamp(start)
+    assert summary["questions"].sum() == expected["questions"].sum()
+
+
+def test_weekly_summary_keeps_trailing_window(db):
+    _seed(db, days=120)
+    tracker = PerformanceTracker(db)
+    weekly = tracker.get_weekly_summary(weeks=8)
+    assert list(weekly.columns) == ["week_start", "questions", "accuracy", "avg_time"]
+    assert (weekly["week_start"].dt.weekday == 0).all()
+
+    trend = tracker.get_historical_trend(days=56)
+    assert weekly["questions"].sum() == trend["questions"].sum()
+    first = weekly.iloc[0]
+    in_first = trend[trend["date"] < first["week_start"] + pd.Timedelta(days=7)]
+    expected = (in_first["accuracy"] * in_first["questions"]).sum() / in_first["questions"].sum()
+    assert first["accuracy"] == pytest.approx(expected)
+
+
+def test_snapshot_summary_from_memory(db, monkeypatch):
+    _seed(db, days=120)
+    expected = PerformanceTracker(db).get_weekly_summary(weeks=8)
+    snap = SnapshotPerformanceTracker.build(db, windows=(56,))
+
+    def no_connection():
+        raise AssertionError("summary read hit the database")
+
+    monkeypatch.setattr(db, "get_connection", no_connection)
+    pd.testing.assert_frame_equal(snap.get_weekly_summary(weeks=8), expected, check_exact=False)
+
+
+def test_empty_history(db):
+    tracker = PerformanceTracker(db)
+    assert tracker.get_summary("M", periods=12).empty
+    assert tracker.get_weekly_summary().empty
+    with pytest.raises(ValueError):
+        tracker.get_summary("W", periods=0)
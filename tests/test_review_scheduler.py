@@ -0,0 +1,247 @@
+"""Tests for spaced-repetition review scheduling.
+
+Covers:
+- `Question.fingerprint` ignores case/whitespace but not question type.
+- SM-2 interval progression, lapses, and the easiness floor.
+- `review_items` round-trip and due-ordered, type- and
+  difficulty-filtered lookup.
+- `ReviewQueue` lazy loading, due ordering, and the review share cap.
+- `SessionManager` tracks misses at `end_session` and interleaves due
+  reviews into later sessions, matching fixed session difficulties.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.review_scheduler import SM2, ReviewQueue, ReviewScheduler
+from src.game_logic.session_manager import SessionManager
+from src.models.question import Question
+from src.models.review import ReviewItem
+from src.models.session import QuestionResult, SessionConfig
+
+NOW = datetime(2026, 5, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _question(text: str = "12 + 7", question_type: str = "addition", difficulty: str = "easy") -> Question:
+    return Question(
+        question_type=question_type,
+        category="arithmetic",
+        difficulty=difficulty,
+        question_text=text,
+        correct_answer="19",
+        metadata={"operand1": 12, "operand2": 7},
+    )
+
+
+def _result(question: Question, is_correct: bool, time_taken: float = 2.0, skipped: bool = False):
+    return QuestionResult(
+        question=question,
+        user_answer="19" if is_correct else "0",
+        is_correct=is_correct,
+        time_taken=time_taken,
+        timestamp=NOW,
+        was_skipped=skipped,
+    )
+
+
+def _item(text: str, due_at: datetime, question_type: str = "addition", difficulty: str = "easy") -> ReviewItem:
+    return ReviewItem.from_question(_question(text, question_type, difficulty), due_at=due_at)
+
+
+class TestFingerprint:
+
+    def test_normalises_whitespace_and_case(self):
+        assert _question("12 + 7").fingerprint == _question("  12  +   7 ").fingerprint
+
+    def test_includes_question_type(self):
+        assert _question("x", "addition").fingerprint != _question("x", "subtraction").fingerprint
+
+
+class TestSM2:
+
+    def test_quality_grades(self):
+        q = _question()
+        assert SM2.quality_for(_result(q, False, skipped=True)) == 0
+        assert SM2.quality_for(_result(q, False)) == 1
+        assert SM2.quality_for(_result(q, True, 2.0)) == 5
+        assert SM2.quality_for(_result(q, True, 10.0)) == 4
+        assert SM2.quality_for(_result(q, True, 30.0)) == 3
+
+    def test_interval_progression(self):
+        item = _item("a", NOW)
+        SM2.schedule(item, 5, NOW)
+        assert item.interval_days == 1.0
+        SM2.schedule(item, 5, NOW)
+        assert item.interval_days == 6.0
+        easiness = item.easiness
+        SM2.schedule(item, 5, NOW)
+        assert item.interval_days == pytest.approx(6.0 * easiness)
+        assert item.repetitions == 3
+        assert item.due_at == NOW + timedelta(days=item.interval_days)
+
+    def test_lapse_resets_and_relearns_soon(self):
+        item = _item("a", NOW)
+        for _ in range(3):
+            SM2.schedule(item, 5, NOW)
+        SM2.schedule(item, 1, NOW)
+        assert item.repetitions == 0
+        assert item.lapses == 1
+        assert item.due_at == NOW + SM2.RELEARN_DELAY
+
+    def test_easiness_floor(self):
+        item = _item("a", NOW)
+        for _ in range(20):
+            SM2.schedule(item, 0, NOW)
+        assert item.easiness == SM2.MIN_EASINESS
+
+
+class TestStorage:
+
+    def test_round_trip(self, db):
+        item = _item("round trip", NOW)
+        SM2.schedule(item, 1, NOW)
+        db.save_review_items([item])
+        loaded = db.get_review_items([item.fingerprint])[item.fingerprint]
+        assert loaded == item
+        assert loaded.to_question().metadata == {"operand1": 12, "operand2": 7}
+
+    def test_due_lookup_is_ordered_and_filtered(self, db):
+        db.save_review_items([
+            _item("later", NOW + timedelta(hours=1)),
+            _item("second", NOW - timedelta(minutes=5)),
+            _item("first", NOW - timedelta(days=2)),
+            _item("other type", NOW - timedelta(days=3), question_type="division"),
+        ])
+        due = db.get_due_reviews(NOW, ["addition"])
+        assert [i.question_text for i in due] == ["first", "second"]
+        assert len(db.get_due_reviews(NOW)) == 3
+        assert db.get_due_reviews(NOW, []) == []
+
+    def test_due_lookup_filters_difficulty(self, db):
+        db.save_review_items([
+            _item("easy", NOW - timedelta(days=1)),
+            _item("hard", NOW - timedelta(days=2), difficulty="hard"),
+        ])
+        assert [i.question_text for i in db.get_due_reviews(NOW, difficulty="easy")] == ["easy"]
+        assert [i.question_text for i in db.get_due_reviews(NOW, ["addition"], difficulty="hard")] == ["hard"]
+        assert len(db.get_due_reviews(NOW, ["addition"])) == 2
+
+    def test_upsert_updates_schedule(self, db):
+        item = _item("a", NOW)
+        db.save_review_items([item])
+        SM2.schedule(item, 5, NOW)
+        db.save_review_items([item])
+        assert db.get_review_items([item.fingerprint])[item.fingerprint].repetitions == 1
+
+
+class TestReviewQueue:
+
+    def test_loads_lazily_and_pops_due_first(self, db):
+        db.save_review_items([
+            _item("b", NOW - timedelta(minutes=1)),
+            _item("a", NOW - timedelta(hours=1)),
+        ])
+        queue = ReviewQueue(db, ["addition"])
+        queue.MAX_SHARE = 1.0
+        assert not queue.loaded
+        assert queue.next_question(NOW).question_text == "a"
+        assert queue.loaded
+        assert queue.next_question(NOW).question_text == "b"
+        assert queue.next_question(NOW) is None
+
+    def test_not_yet_due_items_wait(self, db):
+        db.save_review_items([_item("soon", NOW + timedelta(minutes=5))])
+        queue = ReviewQueue(db)
+        queue.MAX_SHARE = 1.0
+        assert queue.next_question(NOW) is None
+        assert queue.next_question(NOW + timedelta(minutes=6)).question_text == "soon"
+
+    def test_share_cap(self, db):
+        db.save_review_items([_item(f"q{i}", NOW - timedelta(minutes=i)) for i in range(50)])
+        queue = ReviewQueue(db)
+        served = sum(queue.next_question(NOW) is not None for _ in range(40))
+        assert served == int(40 * ReviewQueue.MAX_SHARE)
+
+
+class TestRecordSession:
+
+    def test_tracks_misses_only(self, db):
+        hit, miss = _question("1 + 1"), _question("2 + 2")
+        written = ReviewScheduler(db).record_session([_result(hit, True), _result(miss, False)], now=NOW)
+        assert written == 1
+        tracked = db.get_review_items([hit.fingerprint, miss.fingerprint])
+        assert list(tracked) == [miss.fingerprint]
+        assert tracked[miss.fingerprint].lapses == 1
+
+    def test_updates_tracked_item_when_answered_correctly(self, db):
+        q = _question()
+        scheduler = ReviewScheduler(db)
+        scheduler.record_session([_result(q, False)], now=NOW)
+        scheduler.record_session([_result(q, True)], now=NOW + timedelta(hours=1))
+        item = db.get_review_items([q.fingerprint])[q.fingerprint]
+        assert item.repetitions == 1
+        assert item.due_at == NOW + timedelta(hours=1, days=1)
+
+
+def test_missed_questions_come_back_next_session(db):
+    manager = SessionManager(db)
+    config = SessionConfig(mode_type="marathon", category="arithmetic", difficulty="easy", question_count=8)
+
+    state = manager.start_session(config)
+    missed = set()
+    while not state.is_complete:
+        missed.add(state.current_question.fingerprint)
+        manager.submit_answer(state, "wrong")
+    manager.end_session(state)
+
+    # Make everything due now.
+    items = list(db.get_review_items(missed).values())
+    for item in items:
+        item.due_at = datetime.now() - timedelta(minutes=1)
+    db.save_review_items(items)
+
+    state = manager.start_session(config)
+    seen = []
+    while not state.is_complete:
+        seen.append(state.current_question.fingerprint)
+        manager.submit_answer(state, "wrong")
+    # The first question of the session is a due review.
+    assert seen[0] in missed
+
+
+def test_fixed_difficulty_sessions_only_review_that_difficulty(db):
+    due = datetime.now() - timedelta(minutes=1)
+    db.save_review_items([
+        _item("40 + 2", due, difficulty="hard"),
+        _item("4 + 2", due - timedelta(minutes=1), difficulty="easy"),
+    ])
+    manager = SessionManager(db)
+
+    # The older easy item would come first if difficulty were ignored.
+    hard = manager.start_session(
+        SessionConfig(mode_type="marathon", category="arithmetic", difficulty="hard", question_count=8)
+    )
+    assert hard.current_question.question_text == "40 + 2"
+    assert len(hard.review_queue) == 0
+
+    adaptive = manager.start_session(
+        SessionConfig(mode_type="marathon", category="arithmetic", difficulty="adaptive", question_count=8)
+    )
+    assert adaptive.review_queue.difficulty is None
@@ -0,0 +1,146 @@
+"""Tests for `AliasSampler` and weighted generator selection.
+
+Covers:
+- Alias-table draws converge on the requested weights (seeded).
+- Zero-weight items are never drawn; invalid (negative, non-finite)
+  weights raise, and non-finite preference weights are ignored.
+- `SessionManager` biases mixed sessions toward weak question types,
+  honours the `generator_weights` preference, and only rebuilds a
+  cached sampler when the weights change.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.sampling import AliasSampler
+from src.game_logic.session_manager import SessionManager
+from src.models.session import SessionConfig
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _plant_weak_area(db: DatabaseManager, question_type: str):
+    """10 attempts at 20% accuracy — enough for get_weak_areas to flag it."""
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO sessions
+            (timestamp, mode_type, category, difficulty, duration_seconds,
+             total_questions, correct_answers, total_score, avg_time_per_question, completed)
+        VALUES (?, 'marathon', 'mixed', 'medium', 60, 10, 2, 0, 4.0, 1)
+        """,
+        (datetime.now(),),
+    )
+    session_id = cursor.lastrowid
+    for i in range(10):
+        cursor.execute(
+            """
+            INSERT INTO questions_answered
+                (session_id, question_type, difficulty, question_text, correct_answer,
+                 user_answer, is_correct, was_skipped, time_taken_seconds, timestamp)
+            VALUES (?, ?, 'medium', 'q', '1', 'x', ?, 0, 4.0, ?)
+            """,
+            (session_id, question_type, 1 if i < 2 else 0, datetime.now()),
+        )
+    conn.commit()
+    conn.close()
+
+
+class TestAliasSampler:
+
+    def test_draws_follow_weights(self):
+        sampler = AliasSampler(["a", "b", "c"], [1, 3, 6])
+        rng = random.Random(42)
+        n = 60_000
+        counts = Counter(sampler.sample(rng) for _ in range(n))
+        for item, expected in {"a": 0.1, "b": 0.3, "c": 0.6}.items():
+            assert counts[item] / n == pytest.approx(expected, abs=0.01)
+
+    def test_zero_weight_never_drawn(self):
+        sampler = AliasSampler(["a", "b"], [0, 1])
+        rng = random.Random(0)
+        assert {sampler.sample(rng) for _ in range(500)} == {"b"}
+
+    def test_single_item(self):
+        assert AliasSampler(["only"], [5]).sample() == "only"
+
+    @pytest.mark.parametrize(
+        "items, weights",
+        [
+            (["a"], [1, 2]),
+            (["a", "b"], [1, -1]),
+            (["a", "b"], [0, 0]),
+            (["a", "b"], [float("inf"), 1.0]),
+            (["a", "b"], [float("nan"), 1.0]),
+        ],
+    )
+    def test_invalid_weights_raise(self, items, weights):
+        with pytest.raises(ValueError):
+            AliasSampler(items, weights)
+
+
+class TestGeneratorWeights:
+
+    def test_mixed_biases_weak_areas(self, db):
+        _plant_weak_area(db, "division")
+        manager = SessionManager(db)
+        probs = manager.refresh_sampler(
+            SessionConfig(mode_type="sprint", category="mixed", difficulty="easy", duration_seconds=60)
+        ).probabilities()
+        others = [p for key, p in probs.items() if key != "division"]
+        assert probs["division"] == pytest.approx(manager.MIXED_WEAK_BIAS * others[0])
+
+    def test_targeted_uses_only_weak_types(self, db):
+        _plant_weak_area(db, "fractions")
+        manager = SessionManager(db)
+        config = SessionConfig(mode_type="targeted", category="targeted", difficulty="easy", question_count=5)
+        state = manager.start_session(config)
+        for _ in range(5):
+            assert manager.get_next_question(state).question_type == "fractions"
+
+    def test_preference_overrides_multiply(self, db):
+        db.set_user_preference(
+            DatabaseManager.GENERATOR_WEIGHTS_PREF_KEY,
+            json.dumps({"addition": 4, "subtraction": 0, "bogus": "x"}),
+        )
+        manager = SessionManager(db)
+        probs = manager.refresh_sampler(
+            SessionConfig(mode_type="sprint", category="arithmetic", difficulty="easy", duration_seconds=60)
+        ).probabilities()
+        assert "subtraction" not in probs
+        assert probs["addition"] == pytest.approx(4 / 6)
+
+    def test_malformed_preference_ignored(self, db):
+        db.set_user_preference(DatabaseManager.GENERATOR_WEIGHTS_PREF_KEY, "{not json")
+        assert db.get_generator_weight_overrides() == {}
+        db.set_user_preference(
+            DatabaseManager.GENERATOR_WEIGHTS_PREF_KEY, '{"addition": Infinity, "division": NaN, "ratios": 2}'
+        )
+        assert db.get_generator_weight_overrides() == {"ratios": 2.0}
+
+    def test_sampler_cached_until_weights_change(self, db):
+        manager = SessionManager(db)
+        config = SessionConfig(mode_type="sprint", category="arithmetic", difficulty="easy", duration_seconds=60)
+        first = manager.refresh_sampler(config)
+        assert manager.refresh_sampler(config) is first
+        db.set_user_preference(DatabaseManager.GENERATOR_WEIGHTS_PREF_KEY, json.dumps({"division": 2}))
+        assert manager.refresh_sampler(config) is not first
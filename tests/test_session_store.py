@@ -0,0 +1,215 @@
+"""Tests for the process-wide running-session store.
+
+Covers:
+- LRU eviction past `max_sessions` and past the memory budget, in access
+  order, never evicting the session being stored.
+- Idle-TTL eviction by `sweep` and on `get`.
+- Eviction stops the prefetcher; with a spill directory the session
+  round-trips through disk and `get` restores it, otherwise its journal is
+  released as an unfinished session.
+- `put` measures an entry once, then adds only what was appended.
+- `pop` removes spill files; stale spill files are purged by `sweep`, at
+  most once per `purge_interval`.
+- Memory plateaus under a stream of abandoned sessions.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.game_logic.session_manager import SessionManager
+from src.game_logic.session_store import SessionStore, StoredSession
+from src.models.session import SessionConfig, SessionState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakePrefetcher:
+    def __init__(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    yield db
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _entry(n_questions: int = 0) -> StoredSession:
+    state = SessionState(config=SessionConfig("sprint", "mixed", "easy", duration_seconds=60))
+    return StoredSession(state=state, questions=[None] * n_questions, prefetcher=FakePrefetcher())
+
+
+def _store(clock, **kwargs) -> SessionStore:
+    kwargs.setdefault("sizer", lambda entry: 100 + len(entry.questions))
+    kwargs.setdefault("item_sizer", len)
+    return SessionStore(clock=clock, **kwargs)
+
+
+def test_lru_eviction_by_count(clock):
+    store = _store(clock, max_sessions=2)
+    a, b, c = _entry(), _entry(), _entry()
+    store.put("a", a)
+    store.put("b", b)
+    assert store.get("a") is a  # "b" is now least recently used
+    store.put("c", c)
+    assert "b" not in store and "a" in store and "c" in store
+    assert b.prefetcher is None and store.stats.evicted == 1
+
+
+def test_memory_budget(clock):
+    store = _store(clock, memory_budget=1000)
+    store.put("a", _entry(450))
+    store.put("b", _entry(450))
+    assert len(store) == 1 and "b" in store
+    assert store.memory_bytes == 550
+    # A single oversized session is kept rather than evicting itself.
+    store.put("big", _entry(5000))
+    assert list(store._slots) == ["big"]
+
+
+def test_put_grows_estimate(clock):
+    measured = []
+    store = _store(clock, sizer=lambda entry: measured.append(entry) or 100 + len(entry.questions))
+    entry = _entry(10)
+    store.put("a", entry)
+    entry.questions.extend([None] * 90)
+    store.put("a", entry)
+    assert store.memory_bytes == 200 and len(store) == 1
+    # Only the additions are measured on a re-put; a new entry is measured whole.
+    assert len(measured) == 1
+    store.put("a", _entry(5))
+    assert store.memory_bytes == 105 and len(measured) == 2
+
+
+def test_idle_ttl(clock):
+    store = _store(clock, idle_ttl=60)
+    store.put("old", _entry())
+    clock.now = 50
+    store.put("new", _entry())
+    clock.now = 100
+    assert store.sweep() == 1
+    assert "old" not in store and "new" in store
+    clock.now = 200
+    assert store.get("new") is None
+    assert store.stats.expired == 2 and len(store) == 0
+
+
+def test_spill_and_restore(clock, db, tmp_path):
+    sm = SessionManager(db)
+    state = sm.start_session(SessionConfig("marathon", "arithmetic", "easy", question_count=20))
+    questions = [state.current_question] + [sm.get_next_question(state) for _ in range(5)]
+    for _ in range(3):
+        sm.submit_answer(state, state.current_question.correct_answer)
+    prefetcher = FakePrefetcher()
+    entry = StoredSession(state=state, questions=questions, component_key="k", refill_seq=2, journaled=3,
+                          prefetcher=prefetcher)
+
+    store = SessionStore(clock=clock, idle_ttl=60, spill_dir=tmp_path)
+    store.put("s1", entry)
+    clock.now = 100
+    store.sweep()
+    assert "s1" not in store and prefetcher.stopped
+    assert (tmp_path / "s1.pkl").exists()
+    # Still spilled, so not offered as an unfinished session.
+    assert state.journal_key not in {s["session_key"] for s in sm.journal.orphaned()}
+
+    restored = store.get("s1")
+    assert restored is not None and "s1" in store
+    assert restored.prefetcher is None
+    assert restored.questions == questions
+    assert restored.state.questions_answered == state.questions_answered
+    assert restored.state.total_score == state.total_score
+    assert (restored.refill_seq, restored.journaled, restored.component_key) == (2, 3, "k")
+    assert not (tmp_path / "s1.pkl").exists()
+    # The restored state keeps working.
+    sm.submit_answer(restored.state, restored.state.current_question.correct_answer)
+    assert len(restored.state.questions_answered) == 4
+
+
+def test_eviction_without_spill_releases_journal(clock, db):
+    sm = SessionManager(db)
+    state = sm.start_session(SessionConfig("marathon", "arithmetic", "easy", question_count=20))
+    sm.submit_answer(state, state.current_question.correct_answer)
+    store = _store(clock, idle_ttl=60)
+    store.put("s1", StoredSession(state=state))
+    clock.now = 100
+    store.sweep()
+    assert store.get("s1") is None
+    assert state.journal_key in {s["session_key"] for s in sm.journal.orphaned()}
+
+
+def test_pop_removes_spill(clock, tmp_path):
+    store = _store(clock, max_sessions=1, spill_dir=tmp_path)
+    store.put("a", _entry())
+    store.put("b", _entry())
+    assert (tmp_path / "a.pkl").exists()
+    assert store.pop("a") is None
+    assert not (tmp_path / "a.pkl").exists()
+    assert store.pop("b") is not None and len(store) == 0 and store.memory_bytes == 0
+
+
+def test_stale_spill_files_purged(clock, tmp_path):
+    store = _store(clock, max_sessions=1, spill_dir=tmp_path, spill_ttl=3600)
+    store.put("a", _entry())
+    store.put("b", _entry())
+    path = tmp_path / "a.pkl"
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+    store.sweep()
+    assert not path.exists()
+    assert store.get("a") is None
+
+
+def test_spill_purge_throttled(clock, tmp_path):
+    store = _store(clock, max_sessions=1, spill_dir=tmp_path, spill_ttl=3600, purge_interval=60)
+    store.sweep()
+    store.put("a", _entry())
+    store.put("b", _entry())
+    path = tmp_path / "a.pkl"
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+    clock.now = 30
+    store.sweep()
+    assert path.exists()
+    clock.now = 60
+    store.sweep()
+    assert not path.exists()
+
+
+def test_memory_plateaus_under_abandoned_sessions(clock):
+    store = _store(clock, max_sessions=50, idle_ttl=600, memory_budget=20_000)
+    peak_sessions = peak_bytes = 0
+    for i in range(2000):
+        clock.now = i * 5.0  # a new abandoned tab every 5 seconds
+        store.sweep()
+        store.put(f"s{i}", _entry(i % 300))
+        peak_sessions = max(peak_sessions, len(store))
+        peak_bytes = max(peak_bytes, store.memory_bytes)
+    assert peak_sessions <= 50
+    assert peak_bytes <= 20_000
+    assert store.stats.evicted + store.stats.expired == 2000 - len(store)
@@ -0,0 +1,124 @@
+"""Tests for the Streamlit caches in `src.ui.cache`.
+
+Covers:
+- `get_db_manager` returns one shared manager per database path.
+- `dashboard_tracker` reuses the cached snapshot until the data version
+  moves, and hands out copies.
+- `on_session_saved` invalidates the cached snapshots.
+- `figure` shares chart objects per builder and data, and rejects
+  functions that are not chart builders.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.analytics import visualizations
+from src.database.db_manager import DatabaseManager
+from src.models.question import Question
+from src.models.session import QuestionResult, SessionConfig, SessionSummary
+from src.ui import cache
+
+
+@pytest.fixture
+def db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db = DatabaseManager(path)
+    cache._dashboard_snapshot.clear()
+    yield db
+    cache._dashboard_snapshot.clear()
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _summary(correct: int, total: int = 4) -> SessionSummary:
+    question = Question(
+        question_type="addition", category="arithmetic", difficulty="easy",
+        question_text="2 + 2", correct_answer="4",
+    )
+    now = datetime.now()
+    results = [
+        QuestionResult(question=question, user_answer="4", is_correct=i < correct, time_taken=2.0, timestamp=now)
+        for i in range(total)
+    ]
+    return SessionSummary(
+        session_id=None,
+        config=SessionConfig(mode_type="sprint", category="mixed", difficulty="easy", duration_seconds=60),
+        total_questions=total,
+        correct_answers=correct,
+        total_score=10 * correct,
+        avg_time_per_question=2.0,
+        duration_seconds=60,
+        results=results,
+        timestamp=now,
+    )
+
+
+def test_db_manager_is_shared_per_path(db):
+    first = cache.get_db_manager(db.db_path)
+    assert cache.get_db_manager(db.db_path) is first
+    assert first.db_path == db.db_path
+
+
+def test_dashboard_tracker_reads_once_per_version(db, monkeypatch):
+    db.save_session(_summary(correct=3))
+    builds = []
+    real_build = cache.DashboardSnapshot.build
+
+    def counting_build(*args, **kwargs):
+        builds.append(args)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(cache.DashboardSnapshot, "build", counting_build)
+
+    first = cache.dashboard_tracker(db, recent_limit=6)
+    second = cache.dashboard_tracker(db, recent_limit=6)
+    assert len(builds) == 1
+    assert first.snapshot is not second.snapshot  # cache_data hands out copies
+    assert first.get_overall_stats()["total_questions"] == 4
+
+    db.save_session(_summary(correct=4))
+    assert cache.dashboard_tracker(db, recent_limit=6).get_overall_stats()["total_questions"] == 8
+    assert len(builds) == 2
+
+
+def test_on_session_saved_invalidates(db, monkeypatch):
+    cache.dashboard_tracker(db)
+    version = db.data_version
+    builds = []
+    real_build = cache.DashboardSnapshot.build
+
+    def counting_build(*args, **kwargs):
+        builds.append(args)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(cache.DashboardSnapshot, "build", counting_build)
+
+    cache.on_session_saved(db)
+    assert db.data_version != version
+    cache.dashboard_tracker(db)
+    assert len(builds) == 1
+
+
+def test_figure_is_shared_per_data():
+    data = pd.DataFrame({"question_type": ["addition", "division"], "accuracy": [80.0, 65.0]})
+    first = cache.figure(visualizations.create_category_radar_chart, data)
+    assert cache.figure(visualizations.create_category_radar_chart, data.copy()) is first
+
+    changed = data.assign(accuracy=[80.0, 70.0])
+    assert cache.figure(visualizations.create_category_radar_chart, changed) is not first
+
+    gauge = cache.figure(visualizations.create_progress_gauge, current=50.0, target=80.0, title="Accuracy")
+    assert cache.figure(visualizations.create_progress_gauge, current=50.0, target=80.0, title="Accuracy") is gauge
+
+
+def test_figure_rejects_other_callables():
+    with pytest.raises(ValueError):
+        cache.figure(lambda: None)
@@ -11,9 +11,14 @@ because every generator funnels through it. These tests exercise:
 - Empty / None / whitespace-only rejection.
 - Iteration over `acceptable_answers`.
 - Edge cases: scientific notation, negatives, trailing zeros.
+- The compiled per-question matcher agrees with the reference
+  `_compare_answers` loop on randomized inputs, and is rebuilt when
+  `acceptable_answers` changes.
 """
 from __future__ import annotations
 
+import random
+
 import pytest
 
 from src.game_logic.validator import AnswerValidator
@@ -210,3 +215,55 @@ class TestEdgeCases:
     def test_mixed_number_string(self):
         # "5 apples" can't be parsed as a number nor an exact match.
         assert AnswerValidator.validate("5 apples", _q("5")) is False
+
+
+def _reference_validate(user: str, question: Question) -> bool:
+    """The pre-compilation algorithm: compare against each acceptable answer."""
+    if not user or not user.strip():
+        return False
+    return any(AnswerValidator._compare_answers(user.strip(), a) for a in question.acceptable_answers)
+
+
+_FUZZ_ATOMS = [
+    "0", "1", "5", "10", "11", "15", "100", "1000", "0.15", "0.5", ".5", "4.95",
+    "12,3", "1,000", "1/2", "2/4", "1/0", "3/8", "x/2", "%", "+", "-", " ", ",",
+    ".", "e3", "inf", "nan", "abc", "/",
+]
+
+
+def _fuzz_answer(rng: random.Random) -> str:
+    return "".join(rng.choice(_FUZZ_ATOMS) for _ in range(rng.randint(1, 3)))
+
+
+class TestCompiledMatcher:
+    """Compiled matching must be indistinguishable from the reference loop."""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_reference(self, seed):
+        rng = random.Random(seed)
+        for _ in range(200):
+            acceptable = [_fuzz_answer(rng) for _ in range(rng.randint(1, 4))]
+            question = _q(acceptable[0], acceptable=acceptable)
+            for _ in range(10):
+                user = rng.choice(acceptable) if rng.random() < 0.2 else _fuzz_answer(rng)
+                assert AnswerValidator.validate(user, question) == _reference_validate(user, question), (
+                    user, acceptable,
+                )
+
+    def test_matcher_is_cached(self):
+        question = _q("5")
+        first = AnswerValidator.compile(question)
+        AnswerValidator.validate("5", question)
+        assert AnswerValidator.compile(question) is first
+
+    def test_rebuilt_when_acceptable_answers_change(self):
+        question = _q("4")
+        assert AnswerValidator.validate("four", question) is False
+        question.acceptable_answers.append("four")
+        assert AnswerValidator.validate("four", question) is True
+
+    def test_matcher_excluded_from_equality_and_repr(self):
+        a, b = _q("5"), _q("5")
+        AnswerValidator.compile(a)
+        assert a == b
+        assert "_matcher" not in repr(a)
@@ -0,0 +1,94 @@
+"""Tests for the shared validation spec and the JS/Python differential fuzzer.
+
+Covers:
+- Spec-driven normalization: look-alike separators, ASCII-only case
+  folding, and the strict number grammar ("inf", "0x10", non-ASCII digits
+  are text, not numbers).
+- `to_spec` rule descriptors for the frontend.
+- `validator_fuzz.run`: zero divergences between `AnswerValidator` and
+  `frontend/validator.js` over generated inputs, and a deliberately skewed
+  spec is caught (skipped when Node.js is not installed).
+"""
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from src.game_logic import validation_spec
+from src.game_logic.exact_validator import ExactMatcher
+from src.game_logic.validator import AnswerValidator, CompiledMatcher
+from src.models.question import Question
+from src.tools import validator_fuzz
+
+
+def _q(correct: str, qtype: str = "addition", acceptable=None, **metadata) -> Question:
+    return Question(
+        question_type=qtype,
+        category="test",
+        difficulty="easy",
+        question_text="?",
+        correct_answer=correct,
+        acceptable_answers=acceptable or [correct],
+        metadata=metadata,
+    )
+
+
+needs_node = pytest.mark.skipif(not validator_fuzz.node_available(), reason="Node.js not installed")
+
+
+class TestSpecNormalization:
+
+    def test_lookalike_separators_mapped(self):
+        assert validation_spec.normalize("　１２，５ ") == "１２,５"
+        assert AnswerValidator.validate("12，5", _q("12.5")) is True
+        assert AnswerValidator.validate("12٫5", _q("12.5")) is True
+
+    def test_case_folding_is_ascii_only(self):
+        assert validation_spec.ascii_lower("ABC İ") == "abc İ"
+        assert AnswerValidator.validate("YES", _q("yes")) is True
+        assert AnswerValidator.validate("İ", _q("i̇")) is False
+
+    @pytest.mark.parametrize("text", ["inf", "nan", "Infinity", "0x10", "1_000", "١٢", "５"])
+    def test_non_grammar_numbers_are_text(self, text):
+        assert validation_spec.parse_number(text) is None
+        assert AnswerValidator.validate(text, _q("12")) is False
+
+    def test_grammar_accepts_decimal_forms(self):
+        for text, value in [("5.", 5.0), (".5", 0.5), ("-1e3", -1000.0), ("+2.5E-1", 0.25)]:
+            assert validation_spec.parse_number(text) == value
+
+    def test_canonicalize(self):
+        assert validation_spec.canonicalize(" 12,5 ") == "12.5"
+        assert validation_spec.canonicalize("1,000") == "1,000"
+
+    def test_rule_descriptors(self):
+        assert AnswerValidator.compile(_q("5")).to_spec() == {"kind": "cascade"}
+        rule = AnswerValidator.compile(_q("1/2", qtype="fractions")).to_spec()
+        assert rule["kind"] == "exact"
+        assert rule["values"] == [["1", "2"]]
+        assert rule["tolerance"] == [["10", "1"], ["1", "100"], ["1", "10"]]
+        assert isinstance(AnswerValidator.compile(_q("1/2", qtype="fractions")), ExactMatcher)
+        assert isinstance(AnswerValidator.compile(_q("5")), CompiledMatcher)
+
+
+@needs_node
+class TestDifferentialFuzz:
+
+    def test_no_divergences(self):
+        report = validator_fuzz.run(count=20_000, seed=1, batch_size=10_000)
+        assert report.cases == 20_000
+        assert report.divergences == []
+
+    def test_detects_a_skewed_spec(self, monkeypatch):
+        skewed = copy.deepcopy(validation_spec.SPEC)
+        skewed["numeric"]["absolute_tolerance"] = 0.5
+        skewed["char_map"] = {}
+        monkeypatch.setattr(validation_spec, "SPEC", skewed)
+        report = validator_fuzz.run(count=5_000, seed=2)
+        checks = {d.check for d in report.divergences}
+        assert "verdict" in checks and "canonical" in checks
+
+    def test_cli_exit_code(self, capsys):
+        assert validator_fuzz.main(["--cases", "500", "--seed", "3"]) == 0
+        assert "0 divergences" in capsys.readouterr().out